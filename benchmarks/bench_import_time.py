@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Gulppy import time benchmark
+
+Measure the cost of importing gulppy core modules in a fresh interpreter and check that no heavy module (pandas,
+yaml, numpy, or the standard asyncio, multiprocessing and ctypes only needed by optional features) is pulled in at
+import time.
+
+Usage :
+    python benchmarks/bench_import_time.py [--repeat N] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+GULPPY_REPO_PATH = os.path.normpath(os.path.join(os.path.abspath(__file__), '..', '..'))
+
+IMPORT_TARGETS = ['gulppy.config',
+                  'gulppy.core',
+                  'gulppy.core.glpp_plugin_manager']
+"""
+Modules whose import time is measured
+"""
+
+FORBIDDEN_MODULES = ['pandas', 'yaml', 'numpy', 'asyncio', 'multiprocessing', 'ctypes']
+"""
+Modules that must not be imported as a side effect of importing gulppy : the standard ones are imported on use by the
+asyncio loads, the plugin hosts and the repository watcher
+"""
+
+_PROBE = '''
+import sys, time, json
+t0 = time.perf_counter()
+import {target}
+t1 = time.perf_counter()
+print(json.dumps({{"time": t1 - t0,
+                  "n_modules": len(sys.modules),
+                  "forbidden": [m for m in {forbidden!r} if m in sys.modules]}}))
+'''
+
+
+def probe_import(target: str) -> dict:
+    """
+    Import a module in a fresh interpreter and return the measured informations
+    :param target: the module to import
+    :return: a dictionary with the keys : time (seconds), n_modules and forbidden (list of forbidden modules imported)
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([GULPPY_REPO_PATH] + [p for p in [env.get('PYTHONPATH')] if p])
+    out = subprocess.run([sys.executable, '-c', _PROBE.format(target=target, forbidden=FORBIDDEN_MODULES)],
+                         env=env, check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def run(repeat: int = 5) -> dict:
+    """
+    Run the import benchmark
+    :param repeat: number of fresh interpreters to launch per target
+    :return: a dictionary of results per target
+    """
+    results = {}
+    for target in IMPORT_TARGETS:
+        probes = [probe_import(target) for _ in range(repeat)]
+        results[target] = {'median_time': statistics.median(p['time'] for p in probes),
+                           'min_time': min(p['time'] for p in probes),
+                           'n_modules': probes[-1]['n_modules'],
+                           'forbidden': probes[-1]['forbidden']}
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='number of fresh interpreters per target')
+    parser.add_argument('--json', action='store_true', help='print results as json')
+    args = parser.parse_args()
+
+    results = run(repeat=args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for target, res in results.items():
+            print('{:<40} median = {:8.2f} ms  min = {:8.2f} ms  modules = {:5d}  forbidden = {}'.format(
+                target, res['median_time'] * 1e3, res['min_time'] * 1e3, res['n_modules'], res['forbidden']))
+    return 1 if any(res['forbidden'] for res in results.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
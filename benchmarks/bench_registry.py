@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Gulppy plugin registry scaling benchmark
+
+Measure the time needed by GlppPluginManager to merge the plugins of several repositories (@see
+GlppPluginManager._merge_repository_plugins) and to look plugins up by name, version and repository, against the
+number of plugins. Synthetic plugins are used : nothing is read on disk nor imported. Half of the plugins of each
+repository (but the first one) duplicate plugins of the previous repository.
+
+The former pandas based merge (dataframes merge and membership tests on the merged values) can be measured as a
+reference with --reference (it is quadratic : keep the sizes small).
+
+Usage :
+    python benchmarks/bench_registry.py [--sizes 10000 30000 100000] [--repos 4] [--repeat N] [--reference] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+GULPPY_REPO_PATH = os.path.normpath(os.path.join(os.path.abspath(__file__), '..', '..'))
+if GULPPY_REPO_PATH not in sys.path:
+    sys.path.insert(0, GULPPY_REPO_PATH)
+
+from gulppy.core.glpp_abstract_plugin import GlppPluginLoadStatus
+from gulppy.core.glpp_plugin_manager import GlppPluginManager, GlppPluginDuplicatePolicy
+from gulppy.core.glpp_plugin_registry import GlppPluginRegistry
+
+DEFAULT_SIZES = (10000, 30000, 100000)
+"""
+Total numbers of synthetic plugins to measure
+"""
+
+
+class _SyntheticPlugin(object):
+    """
+    Minimal stand-in of a loaded plugin
+    """
+    __slots__ = ('name', 'version', 'load_status')
+
+    def __init__(self, name: str, version: float) -> None:
+        self.name = name
+        self.version = version
+        self.load_status = GlppPluginLoadStatus.LOADED
+
+
+class _SyntheticRepository(object):
+    """
+    Minimal stand-in of a loaded repository
+    """
+    def __init__(self, repo_path: str, plugins) -> None:
+        self.repo_path = repo_path
+        self.plugins = GlppPluginRegistry(((p.name, p.version), p) for p in plugins)
+
+    def get_list_of_plugins_as_dataframe(self, only_loaded: bool = False):
+        import pandas as pd
+        return pd.DataFrame([{'name': p.name, 'version': p.version, 'status': p.load_status}
+                             for p in self.plugins.values()], columns=['name', 'version', 'status'])
+
+
+def make_repositories(size: int, n_repos: int):
+    """
+    Create the synthetic repositories
+    :param size: total number of plugins
+    :param n_repos: number of repositories
+    :return: the list of repositories
+    """
+    per_repo = max(size // n_repos, 2)
+    repositories = []
+    first = 0
+    for r in range(n_repos):
+        plugins = [_SyntheticPlugin('plugin_{}'.format(i // 2), float(i % 2)) for i in range(first, first + per_repo)]
+        repositories.append(_SyntheticRepository('/repo_{}'.format(r), plugins))
+        # half of the next repository duplicates this one
+        first += per_repo // 2
+    return repositories
+
+
+def merge(repositories, policy: GlppPluginDuplicatePolicy) -> GlppPluginRegistry:
+    plugins = GlppPluginManager._new_registry()
+    for repo in repositories:
+        GlppPluginManager._merge_repository_plugins(plugins, repo, policy)
+    return plugins
+
+
+def reference_merge(repositories, policy: GlppPluginDuplicatePolicy) -> dict:
+    """
+    The former pandas based merge
+    """
+    import pandas as pd
+    plugins = {}
+    for repo in repositories:
+        df_plugins = pd.DataFrame([{'name': n, 'version': v} for (n, v) in plugins], columns=['name', 'version'])
+        df_repo = repo.get_list_of_plugins_as_dataframe(only_loaded=True)
+        plugins_duplicates = pd.merge(df_plugins, df_repo, on=['name', 'version'], how='inner')
+        if len(plugins_duplicates) > 0 and policy == GlppPluginDuplicatePolicy.IGNORE:
+            values = plugins_duplicates[['name', 'version']].values.tolist()
+            plugin_to_add = {key: (cplugin, repo) for key, cplugin in repo.plugins.items() if list(key) not in values}
+        else:
+            plugin_to_add = {key: (cplugin, repo) for key, cplugin in repo.plugins.items()}
+        plugins.update(plugin_to_add)
+    return plugins
+
+
+def time_it(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings)
+
+
+def run(sizes=DEFAULT_SIZES, n_repos: int = 4, repeat: int = 5, reference: bool = False) -> dict:
+    """
+    Run the benchmark
+    :param sizes: total numbers of plugins
+    :param n_repos: number of repositories
+    :param repeat: number of runs per measure
+    :param reference: boolean flag to measure the former pandas based merge too
+    :return: {size: {measure: median time in seconds}}
+    """
+    results = {}
+    for size in sizes:
+        repositories = make_repositories(size, n_repos)
+        res = {'n_plugins': sum(len(r.plugins) for r in repositories)}
+        for policy in (GlppPluginDuplicatePolicy.IGNORE, GlppPluginDuplicatePolicy.OVERLOAD):
+            res['merge_{}'.format(policy.name.lower())] = time_it(lambda: merge(repositories, policy), repeat)
+        # without duplicates : first repository alone
+        res['merge_error'] = time_it(lambda: merge(repositories[:1], GlppPluginDuplicatePolicy.ERROR), repeat)
+        plugins = merge(repositories, GlppPluginDuplicatePolicy.OVERLOAD)
+        names = plugins.get_names()
+        res['lookup_by_name'] = time_it(lambda: [plugins.get_versions(n) for n in names], repeat) / len(names)
+        res['lookup_by_repo'] = time_it(lambda: [plugins.get_keys_by_repository(r.repo_path)
+                                                 for r in repositories], repeat) / n_repos
+        if reference:
+            res['reference_merge_ignore'] = time_it(lambda: reference_merge(repositories,
+                                                                            GlppPluginDuplicatePolicy.IGNORE), 1)
+        results[size] = res
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help='numbers of plugins')
+    parser.add_argument('--repos', type=int, default=4, help='number of repositories')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs per measure')
+    parser.add_argument('--reference', action='store_true', help='measure the former pandas based merge')
+    parser.add_argument('--json', action='store_true', help='print results as json')
+    args = parser.parse_args()
+
+    # keep the merges silent : the debug logs would dominate the measures
+    from gulppy.config import GLPP_LOGGER
+    GLPP_LOGGER.setLevel('WARNING')
+    results = run(sizes=args.sizes, n_repos=args.repos, repeat=args.repeat, reference=args.reference)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print('{:>10} {:>14} {:>14} {:>14} {:>16} {:>16} {:>16}'.format(
+            'plugins', 'merge ignore', 'merge overload', 'merge error', 'lookup by name', 'lookup by repo',
+            'reference'))
+        for res in results.values():
+            reference_time = res.get('reference_merge_ignore')
+            print('{:>10d} {:>11.1f} ms {:>11.1f} ms {:>11.1f} ms {:>13.2f} us {:>13.1f} us {:>16}'.format(
+                res['n_plugins'], res['merge_ignore'] * 1e3, res['merge_overload'] * 1e3, res['merge_error'] * 1e3,
+                res['lookup_by_name'] * 1e6, res['lookup_by_repo'] * 1e6,
+                '-' if reference_time is None else '{:.1f} ms'.format(reference_time * 1e3)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
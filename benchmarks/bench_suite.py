@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+Gulppy benchmark suite on synthetic repositories
+
+Build synthetic repositories (@see synthetic_repository) at several scales and measure :
+- initialize : GlppPluginRepository.initialize of all the repositories (discovery and description files parsing)
+- load : GlppPluginManager.load in immutable mode (plugins creation excluded)
+- load_lazy : GlppPluginManager.load in lazy mode
+- lookup : one GlppPluginManager.get_plugin_by_name_and_version call
+- get_module : one get_module call on a loaded plugin
+- get_module_lazy : first get_module call on a lazily loaded plugin (the module is executed)
+Times are medians over the repeats, in seconds.
+
+Results can be written as json (--output) and compared with a previous json output (--baseline) : a measure slower
+than the baseline by more than the tolerance is reported as a regression and the exit code is 1.
+
+Usage :
+    python benchmarks/bench_suite.py [--scales 10 100 500] [--repos 2] [--main-modules 2] [--fan-out 2]
+                                     [--depth 2] [--hacks] [--duplicates 0.5] [--repeat N]
+                                     [--output results.json] [--baseline baseline.json] [--tolerance 0.2]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+GULPPY_REPO_PATH = os.path.normpath(os.path.join(os.path.abspath(__file__), '..', '..'))
+if GULPPY_REPO_PATH not in sys.path:
+    sys.path.insert(0, GULPPY_REPO_PATH)
+
+from gulppy.core.glpp_plugin_factory import MutableModeEnum
+from gulppy.core.glpp_plugin_manager import GlppPluginManager, GlppPluginDuplicatePolicy
+from gulppy.core.glpp_plugin_repository import GlppPluginRepository
+from benchmarks.synthetic_repository import write_synthetic_repositories, count_modules
+
+DEFAULT_SCALES = (10, 100, 500)
+"""
+Numbers of plugins per repository to measure
+"""
+
+MEASURES = ('initialize', 'load', 'load_lazy', 'lookup', 'get_module', 'get_module_lazy')
+"""
+Names of the measures of a scale
+"""
+
+LOOKUP_PASSES = 20
+"""
+Number of passes over all the plugins timed by the lookup and get_module measures (too fast to be timed alone)
+"""
+
+
+def _median_time(func: Callable, repeat: int, setup: Callable or None = None) -> float:
+    timings = []
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        t0 = time.perf_counter()
+        func(arg)
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings)
+
+
+def _new_manager(repo_paths: List[str]) -> GlppPluginManager:
+    pmanager = GlppPluginManager()
+    for i, repo_path in enumerate(repo_paths):
+        pmanager.add_repository(repo_path=repo_path, repo_tag='repo_{}'.format(i))
+    return pmanager
+
+
+def run_scale(n_plugins: int,
+              n_repos: int = 2,
+              n_main_modules: int = 2,
+              fan_out: int = 2,
+              depth: int = 2,
+              hacks: bool = False,
+              duplicates: float = 0.,
+              repeat: int = 3) -> Dict:
+    """
+    Run the measures at a given scale
+    :param n_plugins: number of plugins per repository
+    :param n_repos: number of repositories
+    :param n_main_modules: number of main modules per plugin
+    :param fan_out: number of modules imported by each module
+    :param depth: number of levels of internal modules
+    :param hacks: boolean flag to give a hack script to every plugin
+    :param duplicates: ratio of duplicated plugins between consecutive repositories
+    :param repeat: number of runs per measure
+    :return: {measure: median time in seconds} with the counters n_plugins and n_modules
+    """
+    root = tempfile.mkdtemp()
+    try:
+        synthetic = write_synthetic_repositories(root, n_plugins=n_plugins, n_repos=n_repos,
+                                                 n_main_modules=n_main_modules, fan_out=fan_out, depth=depth,
+                                                 hacks=hacks, duplicates=duplicates)
+        repo_paths = synthetic['repo_paths']
+        plugins = synthetic['plugins']
+        policy = GlppPluginDuplicatePolicy.OVERLOAD if duplicates > 0 else GlppPluginDuplicatePolicy.ERROR
+        res = {'n_plugins': len(plugins),
+               'n_modules': len(plugins) * count_modules(n_main_modules, fan_out, depth)}
+
+        res['initialize'] = _median_time(
+            lambda repos: [crepo.initialize() for crepo in repos], repeat,
+            setup=lambda: [GlppPluginRepository(repo_path=p, repo_tag=None, auto_initialize=False)
+                           for p in repo_paths])
+        res['load'] = _median_time(
+            lambda pmanager: pmanager.load(plugin_duplicate_policy=policy, mutable_mode=MutableModeEnum.IMMUTABLE),
+            repeat, setup=lambda: _new_manager(repo_paths))
+        res['load_lazy'] = _median_time(
+            lambda pmanager: pmanager.load(plugin_duplicate_policy=policy, mutable_mode=MutableModeEnum.IMMUTABLE,
+                                           lazy=True),
+            repeat, setup=lambda: _new_manager(repo_paths))
+
+        pmanager = _new_manager(repo_paths)
+        pmanager.load(plugin_duplicate_policy=policy, mutable_mode=MutableModeEnum.IMMUTABLE)
+        res['lookup'] = _median_time(
+            lambda _: [pmanager.get_plugin_by_name_and_version(name, version)
+                       for _ in range(LOOKUP_PASSES) for name, version, _ in plugins],
+            repeat) / (len(plugins) * LOOKUP_PASSES)
+        targets = [(pmanager.get_plugin_by_name_and_version(name, version), tag)
+                   for name, version, tags in plugins for tag in tags]
+        res['get_module'] = _median_time(
+            lambda _: [cplugin.get_module(tag) for _ in range(LOOKUP_PASSES) for cplugin, tag in targets],
+            repeat) / (len(targets) * LOOKUP_PASSES)
+
+        def _lazy_targets():
+            lazy_manager = _new_manager(repo_paths)
+            lazy_manager.load(plugin_duplicate_policy=policy, mutable_mode=MutableModeEnum.IMMUTABLE, lazy=True)
+            return [(lazy_manager.get_plugin_by_name_and_version(name, version), tags[0])
+                    for name, version, tags in plugins]
+        res['get_module_lazy'] = _median_time(lambda lazy: [cplugin.get_module(tag) for cplugin, tag in lazy],
+                                              repeat, setup=_lazy_targets) / len(plugins)
+        return res
+    finally:
+        shutil.rmtree(root)
+
+
+def run(scales=DEFAULT_SCALES, repeat: int = 3, **params) -> Dict:
+    """
+    Run the benchmark suite
+    :param scales: numbers of plugins per repository
+    :param repeat: number of runs per measure
+    :param params: synthetic repositories parameters (@see run_scale)
+    :return: {'meta': {...}, 'results': {scale: {measure: median time}}}
+    """
+    return {'meta': {'python': platform.python_version(),
+                     'platform': platform.platform(),
+                     'repeat': repeat,
+                     'params': params},
+            'results': {str(n_plugins): run_scale(n_plugins, repeat=repeat, **params) for n_plugins in scales}}
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float = 0.2) -> List[Dict]:
+    """
+    Compare results with a baseline
+    :param results: the results of run
+    :param baseline: the results of a previous run
+    :param tolerance: relative slow down above which a measure is a regression
+    :return: the list of {scale, measure, baseline, current, ratio, regression} for the measures present in both
+    """
+    rows = []
+    for scale, measures in results['results'].items():
+        base_measures = baseline.get('results', {}).get(scale)
+        if base_measures is None:
+            continue
+        for measure in MEASURES:
+            current, base = measures.get(measure), base_measures.get(measure)
+            if current is None or base is None or base <= 0:
+                continue
+            ratio = current / base
+            rows.append({'scale': scale, 'measure': measure, 'baseline': base, 'current': current, 'ratio': ratio,
+                         'regression': ratio > 1. + tolerance})
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=list(DEFAULT_SCALES),
+                        help='numbers of plugins per repository')
+    parser.add_argument('--repos', type=int, default=2, help='number of repositories')
+    parser.add_argument('--main-modules', type=int, default=2, help='number of main modules per plugin')
+    parser.add_argument('--fan-out', type=int, default=2, help='number of modules imported by each module')
+    parser.add_argument('--depth', type=int, default=2, help='number of levels of internal modules')
+    parser.add_argument('--hacks', action='store_true', help='give a hack script to every plugin')
+    parser.add_argument('--duplicates', type=float, default=0., help='ratio of duplicated plugins between repositories')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs per measure')
+    parser.add_argument('--output', help='json file where to write the results')
+    parser.add_argument('--baseline', help='json results to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='relative slow down reported as a regression')
+    args = parser.parse_args()
+
+    # keep the loads silent : the debug logs would dominate the measures
+    from gulppy.config import GLPP_LOGGER
+    GLPP_LOGGER.setLevel('WARNING')
+    results = run(scales=args.scales, repeat=args.repeat, n_repos=args.repos, n_main_modules=args.main_modules,
+                  fan_out=args.fan_out, depth=args.depth, hacks=args.hacks, duplicates=args.duplicates)
+    if args.output is not None:
+        with open(args.output, 'w') as fp:
+            json.dump(results, fp, indent=2)
+
+    print('{:>8} {:>8} {:>14} {:>14} {:>14} {:>12} {:>12} {:>16}'.format(
+        'plugins', 'modules', 'initialize', 'load', 'load lazy', 'lookup', 'get_module', 'get_module lazy'))
+    for res in results['results'].values():
+        print('{:>8d} {:>8d} {:>11.1f} ms {:>11.1f} ms {:>11.1f} ms {:>9.2f} us {:>9.2f} us {:>13.1f} us'.format(
+            res['n_plugins'], res['n_modules'], res['initialize'] * 1e3, res['load'] * 1e3, res['load_lazy'] * 1e3,
+            res['lookup'] * 1e6, res['get_module'] * 1e6, res['get_module_lazy'] * 1e6))
+
+    if args.baseline is None:
+        return 0
+    with open(args.baseline) as fp:
+        baseline = json.load(fp)
+    if baseline.get('meta', {}).get('params') != results['meta']['params']:
+        print('\nWARNING : the baseline has been measured with other parameters : {}'.format(
+            baseline.get('meta', {}).get('params')))
+    rows = compare(results, baseline, tolerance=args.tolerance)
+    print('\n{:>8} {:>16} {:>14} {:>14} {:>8}'.format('plugins', 'measure', 'baseline', 'current', 'ratio'))
+    for row in rows:
+        print('{:>8} {:>16} {:>11.1f} us {:>11.1f} us {:>7.2f}x{}'.format(
+            row['scale'], row['measure'], row['baseline'] * 1e6, row['current'] * 1e6, row['ratio'],
+            '  REGRESSION' if row['regression'] else ''))
+    return 1 if any(row['regression'] for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
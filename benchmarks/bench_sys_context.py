@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Gulppy module loading overhead benchmark
+
+Measure the time needed to load a small module with glpp_module_loader.load_module in immutable and mutable mode
+against the size of sys.modules. sys.modules is inflated with dummy modules. The incremental changes tracking is
+compared with the full sys.modules comparison (glpp_module_loader.FULL_SYS_MODULES_DIFF).
+
+Usage :
+    python benchmarks/bench_sys_context.py [--sizes 1000 3000 10000] [--repeat N] [--json]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import types
+
+GULPPY_REPO_PATH = os.path.normpath(os.path.join(os.path.abspath(__file__), '..', '..'))
+if GULPPY_REPO_PATH not in sys.path:
+    sys.path.insert(0, GULPPY_REPO_PATH)
+
+from gulppy.core import glpp_module_loader
+
+DEFAULT_SIZES = (1000, 3000, 10000, 30000)
+"""
+Sizes of sys.modules to measure
+"""
+
+_DUMMY_PREFIX = '_glpp_bench_dummy_'
+
+
+def write_package(root: str, package: str) -> str:
+    """
+    Write a small package whose main module imports two internal modules
+    :param root: directory where to write the package
+    :param package: name of the package
+    :return: the main module file
+    """
+    os.makedirs(os.path.join(root, package))
+    for name, content in (('__init__.py', ''),
+                          ('lib_a.py', 'VALUE = 1\n'),
+                          ('lib_b.py', 'from . import lib_a\nVALUE = lib_a.VALUE + 1\n'),
+                          ('main.py', 'from {0} import lib_a, lib_b\nVALUE = lib_b.VALUE\n'.format(package))):
+        with open(os.path.join(root, package, name), 'w') as fp:
+            fp.write(content)
+    return os.path.join(root, package, 'main.py')
+
+
+def inflate_sys_modules(size: int) -> None:
+    """
+    Add or remove dummy modules so that sys.modules contains size entries (if possible)
+    :param size: the expected size of sys.modules
+    """
+    dummies = [k for k in sys.modules if k.startswith(_DUMMY_PREFIX)]
+    i = len(dummies)
+    while len(sys.modules) < size:
+        module = types.ModuleType('{}{}'.format(_DUMMY_PREFIX, i))
+        module.__file__ = '/dummy/{}.py'.format(i)
+        sys.modules[module.__name__] = module
+        i += 1
+    while len(sys.modules) > size and len(dummies) > 0:
+        del sys.modules[dummies.pop()]
+
+
+def time_load(root: str, package: str, module_file: str, immutable: bool, repeat: int) -> float:
+    """
+    Measure the median time of a module load
+    :return: the median time in seconds
+    """
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        glpp_module_loader.load_module(module_fullname='{}.main'.format(package),
+                                       module_path=module_file,
+                                       module_root_path=[root],
+                                       immutable=immutable)
+        timings.append(time.perf_counter() - t0)
+        if not immutable:
+            for k in [k for k in sys.modules if k == package or k.startswith(package + '.')]:
+                del sys.modules[k]
+    return statistics.median(timings)
+
+
+def run(sizes=DEFAULT_SIZES, repeat: int = 20) -> dict:
+    """
+    Run the benchmark
+    :param sizes: sizes of sys.modules to measure
+    :param repeat: number of loads per measure
+    :return: {size: {mode: median time in seconds}}
+    """
+    root = tempfile.mkdtemp()
+    package = 'glpp_bench_pkg'
+    module_file = write_package(root, package)
+    full_diff = glpp_module_loader.FULL_SYS_MODULES_DIFF
+    results = {}
+    try:
+        for size in sizes:
+            inflate_sys_modules(size)
+            res = {'n_modules': len(sys.modules)}
+            for full in (False, True):
+                glpp_module_loader.FULL_SYS_MODULES_DIFF = full
+                for immutable in (True, False):
+                    key = '{}_{}'.format('immutable' if immutable else 'mutable', 'full' if full else 'incremental')
+                    res[key] = time_load(root, package, module_file, immutable, repeat)
+            results[size] = res
+    finally:
+        glpp_module_loader.FULL_SYS_MODULES_DIFF = full_diff
+        inflate_sys_modules(0)
+        shutil.rmtree(root)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help='sizes of sys.modules')
+    parser.add_argument('--repeat', type=int, default=20, help='number of loads per measure')
+    parser.add_argument('--json', action='store_true', help='print results as json')
+    args = parser.parse_args()
+
+    # keep the loads silent : the debug logs would dominate the measures
+    glpp_module_loader.GLPP_LOGGER.setLevel('WARNING')
+    results = run(sizes=args.sizes, repeat=args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print('{:>10} {:>22} {:>22} {:>22} {:>22}'.format('modules', 'immutable incremental', 'immutable full',
+                                                          'mutable incremental', 'mutable full'))
+        for res in results.values():
+            print('{:>10d} {:>19.1f} us {:>19.1f} us {:>19.1f} us {:>19.1f} us'.format(
+                res['n_modules'], res['immutable_incremental'] * 1e6, res['immutable_full'] * 1e6,
+                res['mutable_incremental'] * 1e6, res['mutable_full'] * 1e6))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Gulppy synthetic repositories generator
+
+Write plugin repositories of any size on disk for benchmarks. Each plugin is a python package whose main modules
+import a tree of internal modules :
+- the main modules import the fan_out modules of the first level
+- each module of level L imports the fan_out modules of level L + 1, down to the depth level
+- the modules of level L are located in nested subpackages : <package>.n1.n2...nL.mod_<k>
+A plugin has then n_main_modules + fan_out * depth modules and depth + 1 packages.
+"""
+import os
+from pathlib import Path
+from typing import Dict
+
+HACK_SCRIPT = '''
+def sys_context_callback_init(**kwargs):
+    from gulppy.core import glpp_module_loader
+    glpp_module_loader.sys_context_callback_init(**kwargs)
+'''
+
+
+def get_level_package(package: str, level: int) -> str:
+    """
+    Get the name of the subpackage holding the modules of a level
+    :param package: the plugin package
+    :param level: the level (0 for the main modules)
+    :return: the subpackage name
+    """
+    return '.'.join([package] + ['n{}'.format(i) for i in range(1, level + 1)])
+
+
+def write_synthetic_plugin(plugin_root: str or Path,
+                           name: str,
+                           version: str or float,
+                           package: str,
+                           n_main_modules: int = 1,
+                           fan_out: int = 2,
+                           depth: int = 2,
+                           hacks: bool = False) -> Path:
+    """
+    Write a synthetic plugin
+    :param plugin_root: directory of the plugin
+    :param name: plugin name
+    :param version: plugin version
+    :param package: python package of the plugin
+    :param n_main_modules: number of main modules
+    :param fan_out: number of modules imported by each module
+    :param depth: number of levels of internal modules
+    :param hacks: boolean flag to declare a sys_context_callback_init hack script
+    :return: the path of the description file
+    """
+    plugin_root = Path(plugin_root)
+    files = {}
+    for level in range(depth + 1):
+        level_dir = Path(*get_level_package(package, level).split('.'))
+        files[level_dir.joinpath('__init__.py')] = ''
+        if level == 0:
+            continue
+        imports = ''
+        if level < depth:
+            imports = ''.join('from {} import mod_{}\n'.format(get_level_package(package, level + 1), k)
+                              for k in range(fan_out))
+        for k in range(fan_out):
+            files[level_dir.joinpath('mod_{}.py'.format(k))] = '{}\nVALUE = {}\n'.format(imports, level * 100 + k)
+    main_imports = ''.join('from {} import mod_{}\n'.format(get_level_package(package, 1), k)
+                           for k in range(fan_out)) if depth > 0 else ''
+    main_modules = {}
+    for m in range(n_main_modules):
+        main_file = Path(package, 'main_{}.py'.format(m))
+        files[main_file] = '{}\n\ndef get_value():\n    return {}\n'.format(main_imports, m)
+        main_modules['{}.main_{}'.format(package, m)] = main_file.as_posix()
+    for rel_path, content in files.items():
+        cfile = plugin_root.joinpath(rel_path)
+        cfile.parent.mkdir(parents=True, exist_ok=True)
+        cfile.write_text(content)
+
+    lines = ['---',
+             'plugin_name: {}'.format(name),
+             'plugin_version: "{}"'.format(version),
+             'plugin_mode: module',
+             'plugin_main_modules:']
+    lines += ['    {} : {}'.format(k, v) for k, v in main_modules.items()]
+    lines += ['python_path:', '  - "."']
+    if hacks:
+        plugin_root.joinpath('hacks.py').write_text(HACK_SCRIPT)
+        lines += ['plugin_hacks:', '    sys_context_callback_init: "@PLUGIN_ROOT@/hacks.py"']
+    desc_file = plugin_root.joinpath('descr.yaml')
+    desc_file.write_text('\n'.join(lines) + '\n')
+    return desc_file
+
+
+def write_synthetic_repositories(root: str or Path,
+                                 n_plugins: int,
+                                 n_repos: int = 1,
+                                 n_main_modules: int = 1,
+                                 fan_out: int = 2,
+                                 depth: int = 2,
+                                 hacks: bool = False,
+                                 duplicates: float = 0.,
+                                 prefix: str = 'glpp_synth') -> Dict:
+    """
+    Write synthetic repositories
+    :param root: directory where to write the repositories
+    :param n_plugins: number of plugins per repository
+    :param n_repos: number of repositories
+    :param n_main_modules: number of main modules per plugin
+    :param fan_out: number of modules imported by each module (@see write_synthetic_plugin)
+    :param depth: number of levels of internal modules (@see write_synthetic_plugin)
+    :param hacks: boolean flag to give a hack script to every plugin
+    :param duplicates: ratio of the plugins of a repository (but the first one) duplicating (same name and version)
+                       plugins of the previous repository
+    :param prefix: prefix of the plugins names and packages
+    :return: a dictionary with the keys repo_paths (list of the repositories paths) and plugins (list of the
+             (name, version, main module tags) of the distinct plugins)
+    """
+    root = Path(root)
+    repo_paths = []
+    plugins = {}
+    first = 0
+    for r in range(n_repos):
+        repo_path = root.joinpath('repo_{}'.format(r))
+        for i in range(first, first + n_plugins):
+            name = '{}_{}'.format(prefix, i)
+            package = '{}_{}_pkg_{}'.format(prefix, r, i)
+            write_synthetic_plugin(repo_path.joinpath(name), name, '1.0', package, n_main_modules=n_main_modules,
+                                   fan_out=fan_out, depth=depth, hacks=hacks)
+            plugins[(name, '1.0')] = ['{}.main_{}'.format(package, m) for m in range(n_main_modules)]
+        repo_paths.append(os.fspath(repo_path))
+        first += n_plugins - int(round(n_plugins * duplicates))
+    return {'repo_paths': repo_paths,
+            'plugins': [(name, version, tags) for (name, version), tags in plugins.items()]}
+
+
+def count_modules(n_main_modules: int, fan_out: int, depth: int) -> int:
+    """
+    Get the number of modules (packages included) of a synthetic plugin
+    """
+    return n_main_modules + fan_out * depth + depth + 1
+
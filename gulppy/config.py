@@ -5,8 +5,8 @@ Gulppy config
 import logging
 import os
 import sys
-import inspect
-GULPPY_ROOT_PATH = os.path.normpath(os.path.join(os.path.abspath(inspect.stack()[0][1]), '..'))
+# Use __file__ rather than inspect.stack() : the latter walks the whole interpreter stack at import time
+GULPPY_ROOT_PATH = os.path.normpath(os.path.join(os.path.abspath(__file__), '..'))
 
 # Set a variable to store path to implicitly add at module loading
 # @see glpp_module_loader.sys_context
@@ -3,13 +3,24 @@
 Gulppy Abstract Plugin class definition
 """
 from abc import ABCMeta, abstractmethod
-import yaml
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from functools import partial
+import gc
+import linecache
+import os
+import sys
+import weakref
 from pathlib import Path
-from typing import NoReturn
+from typing import NoReturn, List, Dict, Generator, Tuple
 import types
-import pandas as pd
 from enum import Enum
-from gulppy.core import glpp_exceptions, glpp_module_loader
+from gulppy.core import glpp_exceptions, glpp_module_loader, glpp_namespace
+from gulppy.core.glpp_plugin_descriptor import GlppPluginDescriptor
+from gulppy.core.glpp_hack_cache import HACK_CACHE
+from gulppy.core import glpp_load_stats
+from gulppy.core.glpp_import_profiler import GlppImportProfiler
+from gulppy.core.glpp_package_index import get_module_dependencies, sort_modules
 from gulppy.config import GLPP_LOGGER
 
 DESCR_FILENAME = 'descr.yaml'
@@ -27,6 +38,25 @@ def safe_python_path(path: str or Path, root: str or Path) -> Path:
         return Path(root).joinpath(Path(path))
 
 
+def _describe_referrers(obj) -> List[str]:
+    """
+    Describe the objects referencing an object (to report a leak)
+    :return: one description per referrer : the owner module for a module dictionary, the type otherwise
+    """
+    module_dicts = {id(vars(m)): k for k, m in list(sys.modules.items()) if isinstance(m, types.ModuleType)}
+    descriptions = []
+    for referrer in gc.get_referrers(obj):
+        if isinstance(referrer, types.FrameType):
+            continue
+        if id(referrer) in module_dicts:
+            descriptions.append('module {}'.format(module_dicts[id(referrer)]))
+        elif isinstance(referrer, dict) and referrer.get('__name__') is not None and '__spec__' in referrer:
+            descriptions.append('module {}'.format(referrer['__name__']))
+        else:
+            descriptions.append(type(referrer).__name__)
+    return descriptions
+
+
 class GlppPluginLoadStatus(Enum):
     """
     Plugin load status enumeration
@@ -58,26 +88,41 @@ class GlppAbstractPlugin(object, metaclass=ABCMeta):
     """
     IMMUTABLE_SYS_PATH_MODULE = True
 
+    NAMESPACED_SYS_MODULES = False
+    """
+    Import the plugin modules under a namespace of the plugin in mutable mode (@see glpp_namespace)
+    """
+
     def __init__(self,
                  plugin_desc: str,
-                 load: bool = True) -> None:
+                 load: bool = True,
+                 descriptor: GlppPluginDescriptor or None = None) -> None:
         """
         Constructor
         :param plugin_desc: path of the plugin description yaml file
         :param load: boolean flag to load modules at creation
+        :param descriptor: already parsed plugin descriptor. If None the plugin description file is parsed.
         """
-        self.name = None
-        self.version = None
-        self.desc_main_modules = None
-        self.python_path = None
-        self.plugin_desc = plugin_desc
+        self._plugin_desc = plugin_desc
         self.sys_context_callback_init = glpp_module_loader.sys_context_callback_init
         self.sys_context_callback_terminate = glpp_module_loader.sys_context_callback_terminate
-        self.sys_context_callback_init_script = None
-        self.sys_context_callback_terminate_script = None
         self._modules = {}
         self._i_modules = {}
-        self._introspect()
+        self._lazy = False
+        self._batch = False
+        self._load_stats = {}
+        self._modules_stats = {}
+        self._descriptor_time = None
+        self._import_profile = None
+        self._immutable = self.__class__.IMMUTABLE_SYS_PATH_MODULE
+        self._namespace = None
+        self._module_dependencies = {}
+        self._signatures = {}
+        self._dependencies = []
+        # the mutable loads leftovers removed at unload
+        self._sys_path_added = []
+        self._sys_modules_added = {}
+        self._introspect(descriptor=descriptor)
         self._load_status = GlppPluginLoadStatus.NOT_LOADED
         if load:
             self.load()
@@ -89,53 +134,160 @@ class GlppAbstractPlugin(object, metaclass=ABCMeta):
         """
         return self._plugin_desc
 
-    @plugin_desc.setter
-    def plugin_desc(self, value):
-        self._plugin_desc = value
+    @property
+    def descriptor(self) -> GlppPluginDescriptor:
+        """
+        Get _descriptor
+        """
+        return self._descriptor
 
     @property
     def name(self):
         """
-        Get _name
+        Get the plugin name
         """
-        return self._name
-
-    @name.setter
-    def name(self, value):
-        self._name = value
+        return self._descriptor.name
 
     @property
     def version(self):
         """
-        Get _plugin_desc
+        Get the plugin version
+        """
+        return self._descriptor.version
+
+    @property
+    def desc_main_modules(self) -> Dict[str, str]:
+        """
+        Get the main modules declared in the description file
+        """
+        return self._descriptor.get_main_modules()
+
+    @property
+    def python_path(self) -> List[Path]:
+        """
+        Get the python paths resolved against the plugin root
+        """
+        return self._descriptor.get_python_path()
+
+    @property
+    def plugin_root(self) -> Path:
+        """
+        Get the plugin root directory
+        """
+        return Path(self._descriptor.plugin_root)
+
+    @property
+    def sys_context_callback_init_script(self) -> str or None:
+        """
+        Get the sys_context_callback_init hack script
+        """
+        return self._descriptor.hacks_init
+
+    @property
+    def sys_context_callback_terminate_script(self) -> str or None:
         """
-        return self._version
+        Get the sys_context_callback_terminate hack script
+        """
+        return self._descriptor.hacks_terminate
 
-    @version.setter
-    def version(self, value):
-        self._version = value
+    @property
+    def requires(self) -> Tuple[Tuple[str, str or None], ...]:
+        """
+        Get the plugin requirements declared in the description file : (plugin name, version constraint) pairs
+        """
+        return self._descriptor.requires
 
     @property
-    def desc_main_modules(self):
+    def dependencies(self) -> List['GlppAbstractPlugin']:
         """
-        Get _desc_main_modules
+        Get _dependencies : the plugins satisfying the plugin requirements (@see set_dependencies)
         """
-        return self._desc_main_modules
+        return list(self._dependencies)
 
-    @desc_main_modules.setter
-    def desc_main_modules(self, value):
-        self._desc_main_modules = value
+    def set_dependencies(self, plugins: List['GlppAbstractPlugin']) -> None:
+        """
+        Set the plugins satisfying the plugin requirements (@see glpp_dependencies). Their modules are put in
+        sys.modules while the plugin modules are executed, so that the plugin imports them without executing them
+        again (@see _get_dependency_modules).
+        :param plugins: the dependencies, in the requirements order
+        :return:
+        """
+        self._dependencies = list(plugins)
+
+    def get_dependency(self, name: str) -> 'GlppAbstractPlugin':
+        """
+        Get the plugin satisfying a requirement
+        :param name: the required plugin name
+        :return: the dependency
+        """
+        for dependency in self._dependencies:
+            if dependency.name == name:
+                return dependency
+        raise glpp_exceptions.PluginNotFound(name, dict(self.requires).get(name))
+
+    def _get_dependency_modules(self) -> Dict[str, types.ModuleType]:
+        """
+        Get the modules of the loaded dependencies (and of their own dependencies) that are located in their roots.
+        The main modules of the dependencies loaded in lazy mode are executed first.
+        :return: {module name: module}
+        """
+        modules = {}
+        for dependency in self._dependencies:
+            if dependency.load_status != GlppPluginLoadStatus.LOADED:
+                continue
+            for module_tag in dependency.desc_main_modules:
+                dependency.get_module(module_tag)
+            modules.update(dependency._get_dependency_modules())
+            modules.update(dependency._get_owned_modules())
+        return modules
+
+    def _get_dependency_python_path(self) -> List[Path]:
+        """
+        Get the python paths of the loaded dependencies (and of their own dependencies), added after the plugin python
+        paths while the plugin modules are executed : the dependencies modules that are not loaded yet (their
+        packages for instance) can be imported. The python paths of the namespaced dependencies are served by their
+        namespace (@see _get_dependency_aliases).
+        :return: the list of python paths, without duplicates
+        """
+        paths = []
+        for dependency in self._dependencies:
+            if dependency.load_status == GlppPluginLoadStatus.LOADED:
+                if dependency.namespace is None:
+                    paths.extend(dependency.python_path)
+                paths.extend(dependency._get_dependency_python_path())
+        return [p for p in dict.fromkeys(paths) if p not in self.python_path]
+
+    def _get_dependency_aliases(self) -> Dict[str, str]:
+        """
+        Get the top level modules names of the loaded namespaced dependencies (and of their own dependencies)
+        :return: {top level module name: namespace prefix} (@see glpp_namespace.GlppNamespace)
+        """
+        aliases = {}
+        for dependency in self._dependencies:
+            if dependency.load_status == GlppPluginLoadStatus.LOADED:
+                if dependency.namespace is not None:
+                    for name in dependency.namespace.local_names:
+                        aliases.setdefault(name, dependency.namespace.prefix)
+                for name, prefix in dependency._get_dependency_aliases().items():
+                    aliases.setdefault(name, prefix)
+        return aliases
 
     @property
-    def python_path(self):
+    def namespace(self) -> glpp_namespace.GlppNamespace or None:
         """
-        Get _python_path
+        Get _namespace : the namespace the plugin modules are imported under if the plugin has been loaded in
+        namespaced mode (@see NAMESPACED_SYS_MODULES), None otherwise
         """
-        return self._python_path
+        return self._namespace
 
-    @python_path.setter
-    def python_path(self, value):
-        self._python_path = value
+    def _get_module_root_path(self) -> List[Path]:
+        """
+        Get the python paths given to the module loader : the plugin python paths, unless they are served by the plugin
+        namespace, and the dependencies python paths
+        """
+        if self._namespace is not None:
+            return self._get_dependency_python_path()
+        return self.python_path + self._get_dependency_python_path()
 
     @property
     def load_status(self):
@@ -165,31 +317,21 @@ class GlppAbstractPlugin(object, metaclass=ABCMeta):
         """
         return self.__class__.get_unique_id_cls(self.name, self.version)
 
-    def _introspect(self) -> NoReturn:
+    def _introspect(self, descriptor: GlppPluginDescriptor or None = None) -> NoReturn:
         """
         Introspection from yaml plugin description file
+        :param descriptor: already parsed plugin descriptor. If None the plugin description file is parsed.
         :return: None
         """
-        self.plugin_root = Path(self._plugin_desc).resolve().parent
-        with open(Path(self._plugin_desc).resolve()) as fp:
-            parsed = yaml.load(fp, Loader=yaml.FullLoader)
-            self.name = parsed['plugin_name']
-            self.version = parsed['plugin_version']
-            self.desc_main_modules = parsed['plugin_main_modules']
-            self.python_path = [safe_python_path(path=cpath, root=Path(self.plugin_desc).resolve().parent)
-                                for cpath in parsed['python_path']]
-            try:
-                self.sys_context_callback_init_script = parsed["plugin_hacks"]["sys_context_callback_init"]
-            except KeyError:
-                self.sys_context_callback_init_script = None
-            else:
-                GLPP_LOGGER.debug("A hack is defined for sys_context_callback_init")
-            try:
-                self.sys_context_callback_terminate_script = parsed["plugin_hacks"]["sys_context_callback_terminate"]
-            except KeyError:
-                self.sys_context_callback_terminate_script = None
-            else:
-                GLPP_LOGGER.debug("A hack is defined for sys_context_callback_terminate")
+        if descriptor is None:
+            with glpp_load_stats.measure() as stats:
+                descriptor = GlppPluginDescriptor.from_file(self._plugin_desc)
+            self._descriptor_time = stats['wall_time']
+        self._descriptor = descriptor
+        if descriptor.hacks_init is not None:
+            GLPP_LOGGER.debug("A hack is defined for sys_context_callback_init")
+        if descriptor.hacks_terminate is not None:
+            GLPP_LOGGER.debug("A hack is defined for sys_context_callback_terminate")
 
     def get_path(self, path: str or Path) -> Path:
         """
@@ -197,28 +339,238 @@ class GlppAbstractPlugin(object, metaclass=ABCMeta):
         """
         return Path(str(path).replace("@PLUGIN_ROOT@", str(self.plugin_root)))
 
-    def load(self):
+    @property
+    def load_stats(self) -> Dict:
+        """
+        Get _load_stats : metrics of the last load (@see load). Times are in seconds. Memory metrics are None unless
+        the load traced the memory.
+        - wall_time, cpu_time, allocated_bytes, peak_bytes : measures of the whole load
+        - descriptor_time : parse time of the description file (None if the descriptor was given, from a cache for
+                            instance, and its parse time unknown)
+        - hacks_time : time spent getting the hack scripts callables, hacks_cache : their cache hits and misses
+        - n_sys_modules_added : number of modules added to sys.modules by the modules executions
+        - modules : {module_tag: {wall_time, cpu_time, allocated_bytes, n_sys_modules_added}} for the executed
+                    modules. In lazy mode, modules are added (and n_sys_modules_added updated) as they are executed.
+        - lazy, batch, trace_memory : the load options
+        - failed : True if the load raised an exception
+        """
+        return self._load_stats
+
+    @property
+    def descriptor_time(self) -> float or None:
+        """
+        Get _descriptor_time : parse time of the description file in seconds (None if unknown)
+        """
+        return self._descriptor_time
+
+    @descriptor_time.setter
+    def descriptor_time(self, value: float or None):
+        self._descriptor_time = value
+
+    def _add_module_stats(self, module_tag: str, stats: Dict, n_sys_modules_added: int) -> None:
+        """
+        Record the load statistics of a module (@see load_stats)
+        :param module_tag: the module tag
+        :param stats: the measure of the module load (@see glpp_load_stats.measure)
+        :param n_sys_modules_added: number of modules added to sys.modules by the module load
+        :return:
+        """
+        self._modules_stats[module_tag] = glpp_load_stats.new_module_stats(stats, n_sys_modules_added)
+        if 'n_sys_modules_added' in self._load_stats:
+            # lazy mode : the module is executed after the load
+            self._load_stats['n_sys_modules_added'] += n_sys_modules_added
+
+    @property
+    def import_profile(self) -> GlppImportProfiler or None:
+        """
+        Get _import_profile : the tree of the imports made by the modules executions of the last load if it profiled
+        the imports (@see load), None otherwise. Each executed main module is a root of the tree. In lazy mode, the
+        modules are added as they are executed.
+        """
+        return self._import_profile
+
+    @contextmanager
+    def _profile_imports(self, module_tag: str or None = None) -> Generator[GlppImportProfiler or None, None, None]:
+        """
+        Context recording the imports in the import profile, if the imports are profiled (@see import_profile)
+        :param module_tag: tag of the main module executed in the context, recorded as a root of the profile. If
+                           None, the code executed in the context has to record the main modules itself.
+        :return: the import profiler, None if the imports are not profiled
+        """
+        profiler = self._import_profile
+        if profiler is None:
+            yield None
+            return
+        started = not profiler.is_recording()
+        if started:
+            profiler.start()
+        try:
+            if module_tag is None:
+                yield profiler
+            else:
+                with profiler.section(module_tag):
+                    yield profiler
+        finally:
+            if started:
+                profiler.stop()
+
+    @property
+    def module_dependencies(self) -> Dict[str, List[str]]:
+        """
+        Get _module_dependencies : {module name: names of the plugin modules imported by its execution} for the
+        modules executed since the last load (@see reload_changed)
+        """
+        return self._module_dependencies
+
+    def _record_dependencies(self, module_name: str, context_modules: List) -> None:
+        """
+        Record the plugin modules imported by the execution of a module, and the signatures of the executed files
+        (@see reload_changed). In mutable mode, the sys.modules entries added by the execution are recorded as well
+        (@see unload).
+        :param module_name: name of the executed module
+        :param context_modules: the modules added to sys.modules by its execution (@see glpp_module_loader.load_module)
+        :return:
+        """
+        if not self._immutable:
+            to_sys = (lambda k: k) if self._namespace is None else self._namespace.to_sys
+            self._sys_modules_added.update((to_sys(k), v) for k, v in context_modules)
+        # imported lazily : the refresh helpers depend on the plugin discovery
+        from gulppy.core.glpp_refresh import get_files_signature
+        roots = self._get_roots()
+        files = {k: Path(os.path.abspath(v.__file__)) for k, v in context_modules
+                 if isinstance(getattr(v, '__file__', None), str) and self._is_plugin_path(v.__file__, roots)}
+        self._module_dependencies[module_name] = [k for k in files if k != module_name]
+        module = self._modules.get(module_name, self._i_modules.get(module_name))
+        if isinstance(getattr(module, '__file__', None), str):
+            files[module_name] = Path(os.path.abspath(module.__file__))
+        self._signatures.update(get_files_signature(set(files.values())))
+
+    @property
+    def lazy(self) -> bool:
+        """
+        Get _lazy : True if the plugin has been loaded in lazy mode (@see load)
+        """
+        return self._lazy
+
+    @property
+    def batch(self) -> bool:
+        """
+        Get _batch : True if the plugin modules are loaded in a single context (@see load)
+        """
+        return self._batch
+
+    def load(self,
+             lazy: bool = False,
+             batch: bool = False,
+             trace_memory: bool = False,
+             profile_imports: bool = False,
+             immutable: bool or None = None,
+             namespaced: bool or None = None):
         """
         This method wraps the call of _load abstract method
+        :param lazy: boolean flag to only register the modules at load : each module is then executed the first time
+                     it is requested (@see get_module). Plugin implementations that do not support the lazy mode load
+                     all their modules.
+        :param batch: boolean flag to load all the plugin modules in a single sys_context
+                      (@see glpp_module_loader.load_modules). Ignored in lazy mode.
+        :param trace_memory: boolean flag to measure the memory allocated by the load with tracemalloc
+                             (@see load_stats). This slows down the load.
+        :param profile_imports: boolean flag to record the tree of the imports made by the modules executions
+                                (@see import_profile)
+        :param immutable: mutable mode of the load. If None, the IMMUTABLE_SYS_PATH_MODULE class variable is used.
+        :param namespaced: boolean flag to import the modules under a namespace in mutable mode. If None, the
+                           NAMESPACED_SYS_MODULES class variable is used.
         :return:
         """
-        # We set here the sys_context hacks if defined
-        if self.sys_context_callback_init_script is not None:
-            sys_context_callback_init_script = self.get_path(path=self.sys_context_callback_init_script)
-            with open(sys_context_callback_init_script, 'rb') as fp:
-                c_locals = {}
-                exec(compile(fp.read(), sys_context_callback_init_script, 'exec'), globals(), c_locals)
-                self.sys_context_callback_init = c_locals['sys_context_callback_init']
-
-        if self.sys_context_callback_terminate_script is not None:
-            sys_context_callback_terminate_script = self.get_path(path=self.sys_context_callback_terminate_script)
-            with open(sys_context_callback_terminate_script, 'rb') as fp:
-                c_locals = {}
-                exec(compile(fp.read(), sys_context_callback_terminate_script, 'exec'), globals(), c_locals)
-                self.sys_context_callback_terminate = c_locals['sys_context_callback_terminate']
+        self._lazy = lazy
+        self._batch = batch
+        # keep the mutable mode for the modules executions after load
+        self._immutable = self.__class__.IMMUTABLE_SYS_PATH_MODULE if immutable is None else immutable
+        if namespaced is None:
+            namespaced = self.__class__.NAMESPACED_SYS_MODULES
+        if self._namespace is not None:
+            glpp_namespace.release(self._namespace)
+            self._namespace = None
+        if namespaced and not self._immutable:
+            self._namespace = glpp_namespace.GlppNamespace(self.get_unique_id(),
+                                                           self.python_path,
+                                                           names=self.desc_main_modules,
+                                                           aliases=self._get_dependency_aliases())
+            glpp_namespace.register(self._namespace)
+        self._module_dependencies = {}
+        self._signatures = {}
+        self._import_profile = GlppImportProfiler() if profile_imports else None
+        self._modules_stats = {}
+        self._load_stats = {}
+        hacks_stats = {'hits': 0, 'misses': 0}
+        memory_stats, load_stats, hacks_time = {}, {}, {}
+        failed = True
+        try:
+            with glpp_load_stats.trace_memory(enabled=trace_memory) as memory_stats, \
+                    glpp_load_stats.measure() as load_stats:
+                # We set here the sys_context hacks if defined
+                # Hack scripts are compiled and executed once per process (@see GlppHackCache)
+                with glpp_load_stats.measure() as hacks_time:
+                    for attr_name, script in (('sys_context_callback_init', self.sys_context_callback_init_script),
+                                              ('sys_context_callback_terminate',
+                                               self.sys_context_callback_terminate_script)):
+                        if script is not None:
+                            callback, hit = HACK_CACHE.get_callback(self.get_path(path=script), attr_name, globals())
+                            setattr(self, attr_name, callback)
+                            hacks_stats['hits' if hit else 'misses'] += 1
+
+                with self._plugin_errors():
+                    self._load()
+            failed = False
+        finally:
+            # the measures are complete once their contexts are exited
+            self._load_stats = dict(load_stats,
+                                    peak_bytes=memory_stats.get('peak_bytes'),
+                                    descriptor_time=self._descriptor_time,
+                                    hacks_time=hacks_time.get('wall_time'),
+                                    hacks_cache=hacks_stats,
+                                    n_sys_modules_added=sum(m['n_sys_modules_added']
+                                                            for m in self._modules_stats.values()),
+                                    modules=self._modules_stats,
+                                    lazy=lazy,
+                                    batch=batch,
+                                    trace_memory=trace_memory,
+                                    failed=failed)
+
+    async def load_async(self,
+                         lazy: bool = False,
+                         batch: bool = False,
+                         trace_memory: bool = False,
+                         profile_imports: bool = False,
+                         immutable: bool or None = None,
+                         namespaced: bool or None = None,
+                         executor: Executor or None = None) -> None:
+        """
+        Asyncio counterpart of load : the load runs in an executor so that the event loop is not blocked. The modules
+        executions of the threads are serialized (@see glpp_module_loader.SYS_CONTEXT_LOCK) : the other steps of the
+        loads run concurrently.
+        :param immutable: @see load
+        :param namespaced: @see load
+        :param executor: the executor running the load. If None, the default executor of the event loop is used.
+        :return:
+        """
+        import asyncio
+        await asyncio.get_running_loop().run_in_executor(executor, partial(self.load,
+                                                                           lazy=lazy,
+                                                                           batch=batch,
+                                                                           trace_memory=trace_memory,
+                                                                           profile_imports=profile_imports,
+                                                                           immutable=immutable,
+                                                                           namespaced=namespaced))
 
+    @contextmanager
+    def _plugin_errors(self) -> Generator[None, None, None]:
+        """
+        Context converting the errors raised while executing the plugin modules into plugin errors
+        :return:
+        """
         try:
-            self._load()
+            yield
         except glpp_exceptions.ModuleAlreadyExistsError as e:
             raise glpp_exceptions.PluginModuleSysModuleDuplicateError(e.msg_args[0],
                                                                       self.name,
@@ -256,15 +608,210 @@ class GlppAbstractPlugin(object, metaclass=ABCMeta):
             except KeyError:
                 raise glpp_exceptions.UnknownModuleError(self.name, self.version, key)
 
+    def get_source_files(self) -> List[Path]:
+        """
+        Get the files the plugin is made of : the description file, the hack scripts, the main modules files and,
+        once loaded, the files of the loaded modules that are located in the plugin root or in its python paths.
+        :return: the list of files, without duplicates
+        """
+        files = [Path(self._descriptor.plugin_desc)]
+        for script in (self.sys_context_callback_init_script, self.sys_context_callback_terminate_script):
+            if script is not None:
+                files.append(self.get_path(path=script))
+        files.extend(safe_python_path(path=cfile, root=self.plugin_root) for _, cfile in self._descriptor.main_modules)
+        files.extend(Path(os.path.abspath(module.__file__)) for module in self._get_owned_modules().values())
+        return list(dict.fromkeys(files))
+
+    def _get_roots(self) -> List[Path]:
+        """
+        Get the directories holding the plugin files : the plugin root and the python paths
+        """
+        return [self.plugin_root] + [Path(os.path.abspath(p)) for p in self.python_path]
+
+    def _is_plugin_path(self, path: str or Path, roots: List[Path] or None = None) -> bool:
+        """
+        Check if a path is located in the plugin root or in its python paths
+        """
+        path = Path(os.path.abspath(path))
+        return any(root == path or root in path.parents for root in roots or self._get_roots())
+
+    def _get_owned_modules(self) -> Dict[str, types.ModuleType]:
+        """
+        Get the loaded modules whose file is located in the plugin root or in its python paths, as opposed to the
+        third party or standard modules the plugin imports
+        :return: {module name: module}
+        """
+        roots = self._get_roots()
+        return {k: v for k, v in list(self._i_modules.items()) + list(self._modules.items())
+                if isinstance(getattr(v, '__file__', None), str) and self._is_plugin_path(v.__file__, roots)}
+
+    def _clear_modules(self) -> None:
+        """
+        Drop the references to the loaded modules. Plugin implementations holding other references override it.
+        :return:
+        """
+        self._modules = {}
+        self._i_modules = {}
+
+    def _replace_module(self, module_name: str, module: types.ModuleType, context_modules: List) -> None:
+        """
+        Replace a module executed again by reload_changed. Plugin implementations holding other references override
+        it.
+        :param module_name: name of the module
+        :param module: the new module
+        :param context_modules: the modules added to sys.modules by its execution
+        :return:
+        """
+        if module_name in self._modules:
+            self._modules[module_name] = module
+        else:
+            self._i_modules[module_name] = module
+        for k, v in context_modules:
+            if k not in self._modules:
+                self._i_modules[k] = v
+
+    def reload_changed(self) -> List[str]:
+        """
+        Execute again the plugin modules whose file changed since their execution, and the modules depending on
+        them, keeping the other modules.
+        The dependencies of a module are the plugin modules its execution imported (@see module_dependencies) and the
+        plugin modules its source imports (@see glpp_package_index.get_module_dependencies), so that the dependents
+        of a module already loaded at their execution are found as well. The modules are executed in dependency
+        order (@see glpp_package_index.sort_modules) in a single context where the kept modules are available, with
+        the mutable mode of the load. The other references to the replaced modules (in application code or in third
+        party modules) are not updated.
+        Changes are detected from the files signatures (mtime, size, inode) recorded at execution.
+        :return: the names of the executed modules, in execution order
+        """
+        if self._load_status != GlppPluginLoadStatus.LOADED:
+            return []
+        from gulppy.core.glpp_refresh import get_files_signature
+        owned = self._get_owned_modules()
+        files = {k: Path(os.path.abspath(v.__file__)) for k, v in owned.items()}
+        signatures = get_files_signature(set(files.values()))
+        changed = [k for k, f in files.items()
+                   if os.fspath(f) in self._signatures and self._signatures[os.fspath(f)] != signatures[os.fspath(f)]]
+        if len(changed) == 0:
+            return []
+        dependents = {k: set() for k in files}
+        for k, f in files.items():
+            for dependency in get_module_dependencies(k, f, files) | set(self._module_dependencies.get(k, ())):
+                if dependency in dependents:
+                    dependents[dependency].add(k)
+        affected = set(changed)
+        stack = list(changed)
+        while len(stack) > 0:
+            for k in dependents[stack.pop()] - affected:
+                affected.add(k)
+                stack.append(k)
+        ordered = sort_modules(files, [k for k in files if k in affected])
+        GLPP_LOGGER.debug('Reloading modules {} of plugin {} {} (changed : {})'.format(
+            ordered, self.name, self.version, changed))
+        if not self._immutable:
+            for k in ordered:
+                sys_name = k if self._namespace is None else self._namespace.to_sys(k)
+                if sys.modules.get(sys_name) is owned[k]:
+                    del sys.modules[sys_name]
+        with self._plugin_errors(), self._profile_imports() as profiler:
+            loaded = glpp_module_loader.load_modules(modules=[(k, files[k]) for k in ordered],
+                                                     module_root_path=self._get_module_root_path(),
+                                                     immutable=self._immutable,
+                                                     namespace=self._namespace,
+                                                     callback_init=self.sys_context_callback_init,
+                                                     callback_terminate=self.sys_context_callback_terminate,
+                                                     profiler=profiler,
+                                                     added_paths=self._sys_path_added,
+                                                     preload=dict(self._get_dependency_modules(),
+                                                                  **{k: v for k, v in owned.items()
+                                                                     if k not in affected}))
+        for k, (module, context_modules) in zip(ordered, loaded):
+            self._replace_module(k, module, context_modules)
+            self._record_dependencies(k, context_modules)
+        return ordered
+
+    def unload(self, check_leaks: bool = True) -> Dict:
+        """
+        Unload the plugin : drop every reference gulppy holds on its modules so that they can be reclaimed.
+        - the modules, the hack scripts callbacks and the import profile are dropped
+        - the sys.modules entries added by the plugin loads in mutable mode are removed, as well as the entries they
+          inserted in sys.path. The plugin modules loaded by others, as well as third party and standard modules, are
+          left in sys.modules.
+        - the importer caches (sys.path_importer_cache) and the source lines cache (linecache) entries of the plugin
+          directories are removed
+        The plugin can be loaded again afterwards.
+        If check_leaks is True, the reclamation of the plugin modules is verified through weak references after a
+        garbage collection : a module still alive is referenced elsewhere (by the application or by another module)
+        and is reported as leaked with a description of its referrers.
+        :param check_leaks: boolean flag to verify the reclamation of the plugin modules
+        :return: a dictionary with the keys :
+                 - released : names of the plugin modules released
+                 - sys_modules_removed : names of the entries removed from sys.modules
+                 - leaked : list of {name, referrers} of the plugin modules still alive (empty if not checked)
+        """
+        owned = self._get_owned_modules()
+        refs = {k: weakref.ref(v) for k, v in owned.items()} if check_leaks else {}
+        owned_ids = {id(v) for v in owned.values()}
+        # only the entries the plugin loads added : a plugin module already in sys.modules is left as it is
+        removed = [k for k, v in self._sys_modules_added.items() if id(v) in owned_ids and sys.modules.get(k) is v]
+        for k in removed:
+            del sys.modules[k]
+        self._sys_modules_added = {}
+        if self._namespace is not None:
+            # the namespace packages
+            removed.extend(glpp_namespace.release(self._namespace))
+            self._namespace = None
+        roots = self._get_roots()
+        for cpath in self._sys_path_added:
+            if cpath in sys.path:
+                sys.path.remove(cpath)
+        self._sys_path_added = []
+        for path in [p for p in sys.path_importer_cache if isinstance(p, str) and self._is_plugin_path(p, roots)]:
+            sys.path_importer_cache.pop(path, None)
+        for filename in [f for f in list(linecache.cache) if self._is_plugin_path(f, roots)]:
+            linecache.cache.pop(filename, None)
+
+        self._clear_modules()
+        self.sys_context_callback_init = glpp_module_loader.sys_context_callback_init
+        self.sys_context_callback_terminate = glpp_module_loader.sys_context_callback_terminate
+        self._import_profile = None
+        self._module_dependencies = {}
+        self._signatures = {}
+        self._load_status = GlppPluginLoadStatus.NOT_LOADED
+        del owned
+        leaked = []
+        if check_leaks:
+            gc.collect()
+            for name, ref in refs.items():
+                module = ref()
+                if module is not None:
+                    leaked.append({'name': name, 'referrers': _describe_referrers(module)})
+                    GLPP_LOGGER.warning('Module {} of plugin {} {} is still referenced after unload by : {}'.format(
+                        name, self.name, self.version, leaked[-1]['referrers']))
+                del module
+        GLPP_LOGGER.debug('Plugin {} {} unloaded : {} modules released'.format(self.name, self.version, len(refs)))
+        return {'released': list(refs) if check_leaks else [],
+                'sys_modules_removed': removed,
+                'leaked': leaked}
+
+    def get_list_of_modules(self) -> List[Dict]:
+        """
+        Get the list of plugin modules informations without requiring pandas.
+        Each row is a dictionary with the keys : name, files and main_flag
+        :return: a list of dictionaries, direct modules first
+        """
+        return [{'name': k, 'files': getattr(v, '__file__', None), 'main_flag': True}
+                for k, v in self._modules.items()] + \
+               [{'name': k, 'files': getattr(v, '__file__', None), 'main_flag': False}
+                for k, v in self._i_modules.items()]
+
     def display_modules(self) -> NoReturn:
         """
         Display plugin modules informations
         :return:
         """
-        names = [k for k, _ in self._modules.items()] + [k for k, _ in self._i_modules.items()]
-        files = [v.__file__ for _, v in self._modules.items()] + [v.__file__ for _, v in self._i_modules.items()]
-        flags = [True for k, _ in self._modules.items()] + [False for k, _ in self._i_modules.items()]
-        df = pd.DataFrame({'name': names, 'files': files, 'main_flag': flags})
+        # pandas is only needed for display purpose : import it lazily
+        import pandas as pd
+        df = pd.DataFrame(self.get_list_of_modules(), columns=['name', 'files', 'main_flag'])
         pd.set_option('display.max_rows', None)
         pd.set_option('display.max_columns', None)
         GLPP_LOGGER.info(df.to_string(index=False))
@@ -276,9 +823,7 @@ class GlppAbstractPlugin(object, metaclass=ABCMeta):
         :param plugin_desc:
         :return: the plugin mode
         """
-        with open(str(plugin_desc), 'r') as fp:
-            try:
-                parsed = yaml.load(fp, Loader=yaml.FullLoader)
-                return parsed['plugin_mode']
-            except KeyError:
-                raise glpp_exceptions.PluginDescriptionMissingProperty("plugin_mode", plugin_desc)
+        plugin_mode = GlppPluginDescriptor.from_file(plugin_desc).mode
+        if plugin_mode is None:
+            raise glpp_exceptions.PluginDescriptionMissingProperty("plugin_mode", plugin_desc)
+        return plugin_mode
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+Gulppy plugin archives (zip and wheel files)
+
+A repository, or a single plugin of a repository, can be packed in a zip archive (or a wheel, which is a zip
+archive). The files of an archive are addressed by paths going through the archive file, as done by the zipimport
+module : /repo/plugins.zip/plugin_1/descr.yaml. The archive is opened once : its central directory is read at open
+and its content is memory mapped, so that reading a file of the archive only costs a stat of the archive file (to
+detect its changes).
+
+The python paths of a plugin located in an archive are handled by zipimport when inserted in sys.path : the
+isolation of sys_context is the same as for plain directories. The main modules are executed with GlppArchiveLoader.
+"""
+import io
+import mmap
+import os
+import sys
+import threading
+import zipfile
+from importlib import abc as importlib_abc
+from importlib import util as importlib_util
+from importlib.machinery import ModuleSpec
+from pathlib import Path
+from typing import List, Tuple
+from gulppy.config import GLPP_LOGGER
+
+ARCHIVE_SUFFIXES = ('.zip', '.whl')
+"""
+Suffixes of the files handled as archives
+"""
+
+
+class _GlppMappedFile(io.RawIOBase):
+    """
+    Read only seekable file object over a memory mapped file (zipfile requires a seekable file object)
+    """
+    def __init__(self, buffer: mmap.mmap) -> None:
+        super().__init__()
+        self._buffer = buffer
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._buffer)
+        self._pos = max(offset, 0)
+        return self._pos
+
+    def readinto(self, b) -> int:
+        data = self._buffer[self._pos:self._pos + len(b)]
+        b[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+
+class GlppArchive(object):
+    """
+    An opened archive. The members are addressed by their path inside the archive, using "/" as separator and
+    without leading "/" ('' is the archive root).
+    """
+    def __init__(self, path: str) -> None:
+        """
+        Constructor
+        :param path: the resolved path of the archive file
+        """
+        self.path = path
+        with open(path, 'rb') as fp:
+            st = os.fstat(fp.fileno())
+            self.signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+            try:
+                self._buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+                fileobj = _GlppMappedFile(self._buffer)
+            except (OSError, ValueError):
+                # empty file or file system without mmap support
+                self._buffer = None
+                fileobj = io.BytesIO(fp.read())
+        self._zip = zipfile.ZipFile(fileobj)
+        self._lock = threading.Lock()
+        self._files = set()
+        self._dirs = {'': ([], [])}
+        for name in sorted(self._zip.namelist()):
+            parts = name.strip('/').split('/')
+            for i in range(len(parts)):
+                parent, child = '/'.join(parts[:i]), '/'.join(parts[:i + 1])
+                is_dir = i < len(parts) - 1 or name.endswith('/')
+                if is_dir and child not in self._dirs:
+                    self._dirs[child] = ([], [])
+                    self._dirs[parent][0].append(parts[i])
+                elif not is_dir and child not in self._files:
+                    self._files.add(child)
+                    self._dirs[parent][1].append(parts[i])
+
+    def is_file(self, name: str) -> bool:
+        """
+        Check if a member is a file
+        """
+        return name in self._files
+
+    def is_dir(self, name: str) -> bool:
+        """
+        Check if a member is a directory
+        """
+        return name in self._dirs
+
+    def list_dir(self, name: str) -> Tuple[List[str], List[str]]:
+        """
+        List a directory of the archive
+        :param name: the directory member
+        :return: a tuple (directories, files) of the sorted names of its entries
+        """
+        dirs, files = self._dirs[name]
+        return list(dirs), list(files)
+
+    def read(self, name: str) -> bytes:
+        """
+        Read a file of the archive
+        """
+        if name not in self._files:
+            raise FileNotFoundError('No file {} in archive {}'.format(name, self.path))
+        # the mapped file position is shared by the readers
+        with self._lock:
+            return self._zip.read(name)
+
+
+_ARCHIVES = {}
+_ARCHIVES_LOCK = threading.Lock()
+
+
+def is_archive_name(path: str or Path) -> bool:
+    """
+    Check if a path has an archive suffix
+    """
+    return os.fspath(path).lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def get_archive(path: str or Path) -> GlppArchive:
+    """
+    Get an opened archive. Archives are opened once per process and opened again if their file changes : the
+    importers of the previous archive are then dropped from sys.path_importer_cache.
+    :param path: path of the archive file
+    :return: the archive
+    """
+    path = os.path.realpath(os.fspath(path))
+    st = os.stat(path)
+    signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+    with _ARCHIVES_LOCK:
+        archive = _ARCHIVES.get(path)
+        if archive is not None and archive.signature == signature:
+            return archive
+        if archive is not None:
+            GLPP_LOGGER.debug('Archive {} changed : opening it again'.format(path))
+            prefix = path + os.sep
+            stale = [k for k in sys.path_importer_cache
+                     if isinstance(k, str) and (k == path or k.startswith(prefix))]
+            for key in stale:
+                sys.path_importer_cache.pop(key, None)
+        archive = GlppArchive(path)
+        _ARCHIVES[path] = archive
+        return archive
+
+
+def split_archive_path(path: str or Path) -> Tuple[str, str] or None:
+    """
+    Split a path going through an archive file
+    :param path: a path
+    :return: a tuple (archive file path, member name) or None if the path does not go through an archive
+    """
+    path = os.path.abspath(os.fspath(path))
+    if not any(suffix in path.lower() for suffix in ARCHIVE_SUFFIXES):
+        return None
+    parts = Path(path).parts
+    for i in range(1, len(parts) + 1):
+        if is_archive_name(parts[i - 1]):
+            archive = os.path.join(*parts[:i])
+            if os.path.isfile(archive):
+                return archive, '/'.join(parts[i:])
+    return None
+
+
+def is_archive(path: str or Path) -> bool:
+    """
+    Check if a path is an archive file
+    """
+    return is_archive_name(path) and os.path.isfile(os.fspath(path))
+
+
+def is_file(path: str or Path) -> bool:
+    """
+    Check if a path is a file, in an archive or not
+    """
+    split = split_archive_path(path)
+    if split is None or split[1] == '':
+        return os.path.isfile(os.fspath(path))
+    return get_archive(split[0]).is_file(split[1])
+
+
+def read_bytes(path: str or Path) -> bytes:
+    """
+    Read a file, in an archive or not
+    """
+    split = split_archive_path(path)
+    if split is None or split[1] == '':
+        with open(os.fspath(path), 'rb') as fp:
+            return fp.read()
+    return get_archive(split[0]).read(split[1])
+
+
+def list_dir(path: str or Path) -> Tuple[List[str], List[str]] or None:
+    """
+    List a directory of an archive (or the root of an archive file)
+    :param path: a path going through an archive
+    :return: a tuple (directories, files) of the sorted names of its entries, None if the path does not go through
+             an archive
+    """
+    split = split_archive_path(path)
+    if split is None:
+        return None
+    archive = get_archive(split[0])
+    if not archive.is_dir(split[1]):
+        raise NotADirectoryError('No directory {} in archive {}'.format(split[1], split[0]))
+    return archive.list_dir(split[1])
+
+
+def get_file_signature(path: str or Path) -> List[int]:
+    """
+    Get the signature of a file : [mtime_ns, size, inode]. The signature of a file of an archive is the signature of
+    the archive file.
+    """
+    split = split_archive_path(path)
+    st = os.stat(os.fspath(path) if split is None else split[0])
+    if split is not None and split[1] != '' and not get_archive(split[0]).is_file(split[1]):
+        raise FileNotFoundError('No file {} in archive {}'.format(split[1], split[0]))
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def is_same_file(path: str or Path, other: str or Path) -> bool:
+    """
+    Check if two paths point to the same file, in an archive or not
+    """
+    if split_archive_path(path) is None and split_archive_path(other) is None:
+        return Path(path).resolve().samefile(Path(other).resolve())
+    return os.path.realpath(os.fspath(path)) == os.path.realpath(os.fspath(other))
+
+
+class GlppArchiveLoader(importlib_abc.SourceLoader):
+    """
+    Loader of a python source file located in an archive
+    """
+    def __init__(self, fullname: str, path: str) -> None:
+        self.name = fullname
+        self.path = path
+
+    def get_filename(self, fullname: str or None = None) -> str:
+        return self.path
+
+    def get_data(self, path: str) -> bytes:
+        return read_bytes(path)
+
+    def is_package(self, fullname: str) -> bool:
+        return os.path.basename(self.path).startswith('__init__')
+
+
+def spec_from_file_location(module_fullname: str, module_path: str or Path) -> ModuleSpec:
+    """
+    Get the spec of a python source file, in an archive or not (@see importlib.util.spec_from_file_location)
+    """
+    module_path = os.fspath(module_path)
+    if split_archive_path(module_path) is None:
+        return importlib_util.spec_from_file_location(module_fullname, module_path)
+    return importlib_util.spec_from_file_location(module_fullname, module_path,
+                                                  loader=GlppArchiveLoader(module_fullname, module_path))
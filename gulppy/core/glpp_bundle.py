@@ -0,0 +1,385 @@
+# -*- coding: utf-8 -*-
+"""
+Gulppy frozen repository bundles
+
+A bundle is a single file holding what a cold start of a repository needs : the parsed descriptors of its plugins
+and the code objects of their python files (main modules, modules of their python paths and hack scripts), compiled
+at freeze (@see GlppBundle.freeze). A repository created with a bundle (@see GlppPluginRepository) registers its
+plugins from the bundle descriptors and, once the bundle is installed, the frozen files are executed from their code
+objects : the main modules by the module loader (@see find_frozen_spec), the modules imported from the plugins python
+paths by a path hook, and the hack scripts by the hack scripts cache. The files that are not frozen are loaded from
+their sources.
+
+The bundle starts with the interpreter bytecode magic number : a bundle written by another python version is not
+used. Its paths are relative to the repository root, so that the repository and its bundle can be moved together.
+"""
+import hashlib
+import importlib.machinery
+import marshal
+import os
+import sys
+import threading
+import types
+from importlib import abc as importlib_abc
+from importlib import util as importlib_util
+from importlib.machinery import ModuleSpec
+from pathlib import Path
+from typing import Dict, List, Iterable
+from gulppy.core import glpp_archive
+from gulppy.config import GLPP_LOGGER
+
+BUNDLE_FILENAME = '.gulppy_bundle'
+"""
+Default bundle file name, at the repository root
+"""
+
+BUNDLE_FORMAT_VERSION = 2
+
+_BUNDLE_TAG = b'GLPPBNDL'
+
+BUNDLE_CHECKS = ('none', 'signature', 'hash')
+"""
+Checks of the bundle freshness at open (@see GlppBundle.is_stale) :
+- none : the bundle is trusted (deployment artifact), nothing is read but the bundle
+- signature : the frozen files mtime, size and inode are compared with the ones recorded at freeze
+- hash : the frozen files content is compared with the content hash recorded at freeze
+Both signature and hash checks also compare the discovered description files with the ones recorded at freeze : a
+plugin added or removed since the freeze makes the bundle stale.
+"""
+
+_SKIPPED_DIRS = ('__pycache__',)
+
+
+class GlppFrozenLoader(importlib_abc.ExecutionLoader):
+    """
+    Loader of a module frozen in a bundle : the module is executed from its code object
+    """
+    def __init__(self, fullname: str, path: str, code: types.CodeType) -> None:
+        self.name = fullname
+        self.path = path
+        self._code = code
+
+    def get_filename(self, fullname: str or None = None) -> str:
+        return self.path
+
+    def is_package(self, fullname: str) -> bool:
+        return os.path.basename(self.path).startswith('__init__')
+
+    def get_code(self, fullname: str) -> types.CodeType:
+        return self._code
+
+    def get_source(self, fullname: str) -> None:
+        return None
+
+
+_FROZEN = {}
+"""
+{file path: code object} of the installed bundles
+"""
+_FROZEN_DIRS = set()
+"""
+Directories holding frozen files or frozen packages, served by the path hook
+"""
+_FROZEN_LOCK = threading.Lock()
+
+_FALLBACK_LOADERS = [(importlib.machinery.ExtensionFileLoader, importlib.machinery.EXTENSION_SUFFIXES),
+                     (importlib.machinery.SourceFileLoader, importlib.machinery.SOURCE_SUFFIXES),
+                     (importlib.machinery.SourcelessFileLoader, importlib.machinery.BYTECODE_SUFFIXES)]
+
+
+def _normalize(path: str or Path) -> str:
+    return os.path.normpath(os.path.abspath(os.fspath(path)))
+
+
+def _frozen_spec(fullname: str, path: str, code: types.CodeType) -> ModuleSpec:
+    return importlib_util.spec_from_file_location(fullname, path, loader=GlppFrozenLoader(fullname, path, code))
+
+
+class _GlppFrozenPathFinder(object):
+    """
+    Path entry finder of a directory holding frozen files. The modules that are not frozen are found by a regular
+    FileFinder.
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._fallback = None
+
+    def find_spec(self, fullname: str, target: types.ModuleType or None = None) -> ModuleSpec or None:
+        name = fullname.rpartition('.')[2]
+        for path in (os.path.join(self.path, name, '__init__.py'), os.path.join(self.path, name + '.py')):
+            code = _FROZEN.get(path)
+            if code is not None:
+                return _frozen_spec(fullname, path, code)
+        if self._fallback is None:
+            self._fallback = importlib.machinery.FileFinder(self.path, *_FALLBACK_LOADERS)
+        return self._fallback.find_spec(fullname, target)
+
+    def invalidate_caches(self) -> None:
+        if self._fallback is not None:
+            self._fallback.invalidate_caches()
+
+
+def _frozen_path_hook(path: str) -> _GlppFrozenPathFinder:
+    """
+    sys.path_hooks entry serving the directories holding frozen files
+    """
+    if _normalize(path) not in _FROZEN_DIRS:
+        raise ImportError('No frozen file in {}'.format(path))
+    return _GlppFrozenPathFinder(_normalize(path))
+
+
+def _get_frozen_dirs(paths: Iterable[str]) -> set:
+    """
+    Get the directories the path hook serves for frozen files : their directories and, for packages, the directories
+    the packages are found from
+    """
+    dirs = set()
+    for path in paths:
+        dirs.add(os.path.dirname(path))
+        if os.path.basename(path) == '__init__.py':
+            dirs.add(os.path.dirname(os.path.dirname(path)))
+    return dirs
+
+
+def _drop_importers(dirs: Iterable[str]) -> None:
+    """
+    Drop the cached importers of directories so that the path hooks are queried again
+    """
+    for key in [k for k in sys.path_importer_cache if isinstance(k, str) and _normalize(k) in dirs]:
+        sys.path_importer_cache.pop(key, None)
+
+
+def find_frozen_spec(module_fullname: str, module_path: str or Path) -> ModuleSpec or None:
+    """
+    Get the spec of a frozen file (@see glpp_module_loader)
+    :param module_fullname: name of the module
+    :param module_path: path of the module file
+    :return: the spec of the module executing the frozen code object, None if the file is not frozen
+    """
+    if len(_FROZEN) == 0:
+        return None
+    path = _normalize(module_path)
+    code = _FROZEN.get(path)
+    return None if code is None else _frozen_spec(module_fullname, path, code)
+
+
+def get_frozen_code(path: str or Path) -> types.CodeType or None:
+    """
+    Get the code object of a frozen file
+    :return: the code object, None if the file is not frozen
+    """
+    return _FROZEN.get(_normalize(path)) if len(_FROZEN) > 0 else None
+
+
+def _hash_files(repo_root: str, rel_paths: Iterable[str]) -> str:
+    """
+    Hash the content of files of a repository
+    :param repo_root: path of the repository
+    :param rel_paths: paths of the files relative to the repository, in hash order
+    :return: the sha1 hexdigest of the files paths and contents
+    """
+    sha1 = hashlib.sha1()
+    for rel_path in rel_paths:
+        sha1.update(rel_path.encode('utf-8'))
+        sha1.update(glpp_archive.read_bytes(os.path.join(repo_root, rel_path)))
+    return sha1.hexdigest()
+
+
+def _get_rel_desc_files(repo_root: str, desc_files: Iterable[str or Path]) -> List[str]:
+    """
+    Get the sorted paths of description files relative to a repository
+    """
+    return sorted({os.path.relpath(os.path.realpath(f), repo_root) for f in desc_files})
+
+
+class GlppBundle(object):
+    """
+    A frozen repository bundle
+    """
+    def __init__(self, repo_path: str or Path, content: Dict) -> None:
+        """
+        Constructor
+        :param repo_path: path of the repository the bundle is used for
+        :param content: the bundle content (@see freeze)
+        """
+        self.repo_root = os.path.realpath(os.fspath(repo_path))
+        self.content_hash = content['content_hash']
+        self.plugins = content['plugins']
+        self.desc_files = content['desc_files']
+        self._code = content['code']
+        self._installed = []
+
+    def get_path(self, rel_path: str) -> str:
+        """
+        Get the path of a bundle file in the repository
+        """
+        return _normalize(os.path.join(self.repo_root, rel_path))
+
+    def get_descriptions(self) -> List[Dict]:
+        """
+        Get the descriptions of the frozen plugins
+        :return: list of {desc_file (path), description (content of the description file), signatures
+                 ({file: (mtime_ns, size, inode)} of the plugin files)}, in discovery order
+        """
+        return [{'desc_file': self.get_path(p['desc_file']),
+                 'description': p['description'],
+                 'signatures': {self.get_path(f): tuple(s) for f, s in p['signatures'].items()}}
+                for p in self.plugins]
+
+    def is_stale(self, check: str = 'signature', desc_files: Iterable[str or Path] or None = None) -> bool:
+        """
+        Check if the frozen files changed since the freeze
+        :param check: the check to perform (@see BUNDLE_CHECKS)
+        :param desc_files: the description files currently discovered in the repository. If they differ from the
+                           ones discovered at freeze, the bundle is stale. None skips the comparison.
+        :return: True if the bundle is stale
+        """
+        if check not in BUNDLE_CHECKS:
+            raise ValueError('Unknown bundle check {}, expected one of {}'.format(check, BUNDLE_CHECKS))
+        if check == 'none':
+            return False
+        if desc_files is not None and _get_rel_desc_files(self.repo_root, desc_files) != self.desc_files:
+            GLPP_LOGGER.debug('Plugins of repository {} added or removed since the freeze'.format(self.repo_root))
+            return True
+        files = sorted({f for p in self.plugins for f in p['signatures']})
+        try:
+            if check == 'hash':
+                return _hash_files(self.repo_root, files) != self.content_hash
+            signatures = {f: s for p in self.plugins for f, s in p['signatures'].items()}
+            return any(glpp_archive.get_file_signature(self.get_path(f)) != list(signatures[f]) for f in files)
+        except OSError:
+            return True
+
+    def install(self) -> None:
+        """
+        Make the frozen code objects available to the loaders (@see find_frozen_spec). The importers already cached
+        for the frozen directories are dropped.
+        :return:
+        """
+        with _FROZEN_LOCK:
+            for rel_path, code in self._code.items():
+                path = self.get_path(rel_path)
+                _FROZEN[path] = code
+                self._installed.append(path)
+            dirs = _get_frozen_dirs(self._installed)
+            _FROZEN_DIRS.update(dirs)
+            if _frozen_path_hook not in sys.path_hooks:
+                sys.path_hooks.insert(0, _frozen_path_hook)
+            _drop_importers(dirs)
+        GLPP_LOGGER.debug('Bundle of repository {} installed : {} frozen files'.format(self.repo_root,
+                                                                                      len(self._installed)))
+
+    def release(self, desc_file: str or None = None) -> None:
+        """
+        Remove frozen code objects from the loaders, the files being then loaded from their sources
+        :param desc_file: path of the description file of the plugin whose files are released. If None, all the
+                          bundle files are released.
+        :return:
+        """
+        released = set(self._installed)
+        if desc_file is not None:
+            desc_file = _normalize(desc_file)
+            released = {self.get_path(f) for p in self.plugins if self.get_path(p['desc_file']) == desc_file
+                        for f in p['signatures']} & released
+        with _FROZEN_LOCK:
+            for path in released:
+                _FROZEN.pop(path, None)
+            self._installed = [p for p in self._installed if p not in released]
+            dirs = _get_frozen_dirs(released)
+            _FROZEN_DIRS.difference_update(dirs - _get_frozen_dirs(_FROZEN))
+            _drop_importers(dirs)
+
+    @staticmethod
+    def _get_plugin_files(plugin) -> List[str]:
+        """
+        Get the python files of a plugin to freeze : its main modules, the modules of its python paths located in the
+        plugin root and its hack scripts
+        """
+        files = [plugin.get_path(path=script) for script in (plugin.sys_context_callback_init_script,
+                                                             plugin.sys_context_callback_terminate_script)
+                 if script is not None]
+        files.extend(plugin.plugin_root.joinpath(cfile) for _, cfile in plugin.descriptor.main_modules)
+        plugin_root = os.path.realpath(plugin.plugin_root)
+        for python_path in plugin.python_path:
+            python_path = os.path.realpath(python_path)
+            if python_path != plugin_root and not python_path.startswith(plugin_root + os.sep):
+                GLPP_LOGGER.debug('Python path {} of plugin {} is not frozen : it is not located in the plugin'.format(
+                    python_path, plugin.name))
+                continue
+            for root, dirs, names in os.walk(python_path):
+                dirs[:] = sorted(d for d in dirs if d not in _SKIPPED_DIRS and not d.startswith('.'))
+                files.extend(os.path.join(root, name) for name in sorted(names) if name.endswith('.py'))
+        return list(dict.fromkeys(_normalize(f) for f in files))
+
+    @classmethod
+    def freeze(cls,
+               repo_path: str or Path,
+               plugins: List,
+               bundle_file: str or Path or None = None,
+               desc_files: Iterable[str or Path] or None = None) -> Path:
+        """
+        Freeze plugins of a repository in a bundle file
+        :param repo_path: path of the repository
+        :param plugins: the plugins of the repository (@see GlppPluginRepository.plugins_to_load)
+        :param bundle_file: path of the bundle file. If None, BUNDLE_FILENAME at the repository root is used.
+        :param desc_files: the description files discovered in the repository, compared at open (@see is_stale).
+                           If None, the description files of the plugins are recorded.
+        :return: the path of the bundle file
+        """
+        repo_root = os.path.realpath(os.fspath(repo_path))
+        bundle_file = Path(repo_root, BUNDLE_FILENAME) if bundle_file is None else Path(bundle_file)
+        code = {}
+        descriptions = []
+        rel_files = set()
+        for plugin in plugins:
+            files = [os.fspath(plugin.descriptor.plugin_desc)] + cls._get_plugin_files(plugin)
+            for cfile in files[1:]:
+                code[os.path.relpath(cfile, repo_root)] = compile(glpp_archive.read_bytes(cfile), cfile, 'exec')
+            descriptions.append({'desc_file': os.path.relpath(plugin.descriptor.plugin_desc, repo_root),
+                                 'description': plugin.descriptor.to_dict(),
+                                 'signatures': {os.path.relpath(f, repo_root): glpp_archive.get_file_signature(f)
+                                                for f in files}})
+            rel_files.update(os.path.relpath(f, repo_root) for f in files)
+        if desc_files is None:
+            desc_files = [plugin.descriptor.plugin_desc for plugin in plugins]
+        content = {'version': BUNDLE_FORMAT_VERSION,
+                   'content_hash': _hash_files(repo_root, sorted(rel_files)),
+                   'plugins': descriptions,
+                   'desc_files': _get_rel_desc_files(repo_root, desc_files),
+                   'code': code}
+        tmp_file = bundle_file.with_name('{}.{}.tmp'.format(bundle_file.name, os.getpid()))
+        with open(tmp_file, 'wb') as fp:
+            fp.write(importlib_util.MAGIC_NUMBER + _BUNDLE_TAG + marshal.dumps(content))
+        os.replace(tmp_file, bundle_file)
+        GLPP_LOGGER.info('Repository {} frozen in {} : {} plugins, {} files'.format(repo_root, bundle_file,
+                                                                                  len(descriptions), len(code)))
+        return bundle_file
+
+    @classmethod
+    def open(cls, repo_path: str or Path, bundle_file: str or Path or None = None) -> 'GlppBundle' or None:
+        """
+        Open the bundle of a repository
+        :param repo_path: path of the repository
+        :param bundle_file: path of the bundle file. If None, BUNDLE_FILENAME at the repository root is used.
+        :return: the bundle, None if the file is missing, unreadable or written by another python version
+        """
+        bundle_file = Path(repo_path, BUNDLE_FILENAME) if bundle_file is None else Path(bundle_file)
+        try:
+            with open(bundle_file, 'rb') as fp:
+                data = fp.read()
+        except OSError as e:
+            GLPP_LOGGER.warning('Cannot read bundle {} : {}'.format(bundle_file, e))
+            return None
+        header = importlib_util.MAGIC_NUMBER + _BUNDLE_TAG
+        if not data.startswith(header):
+            GLPP_LOGGER.warning('Bundle {} was not written by this python version'.format(bundle_file))
+            return None
+        try:
+            content = marshal.loads(data[len(header):])
+        except (EOFError, ValueError, TypeError) as e:
+            GLPP_LOGGER.warning('Cannot read bundle {} : {}'.format(bundle_file, e))
+            return None
+        if not isinstance(content, dict) or content.get('version') != BUNDLE_FORMAT_VERSION:
+            GLPP_LOGGER.warning('Bundle {} format is not supported'.format(bundle_file))
+            return None
+        return cls(repo_path, content)
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Gulppy inter-plugin dependencies
+
+A plugin declares the plugins it depends on in the plugin_requires property of its description file, as a dictionary
+{plugin name: version constraint} (@see glpp_version.parse_constraint, a null constraint accepting any version) :
+
+    plugin_requires:
+        base_plugin: ">=1.2,<2"
+        tools_plugin: null
+
+The requirements are resolved against the plugins to load (of all the repositories) before any module is executed :
+a missing dependency or a dependency cycle is an error. The plugins are then loaded level by level
+(@see get_load_levels), the dependencies of a plugin being loaded before it (@see GlppPluginManager.load).
+"""
+from typing import Any, Dict, List, Tuple
+from gulppy.core.glpp_plugin_registry import GlppPluginRegistry
+from gulppy.core.glpp_version import GlppVersionResolver
+from gulppy.core import glpp_exceptions
+
+
+def resolve_requirements(plugins: Dict[Tuple[str, Any], Any]) -> Dict[Tuple[str, Any], List[Tuple[str, Any]]]:
+    """
+    Resolve the requirements of plugins : each requirement is satisfied by the newest plugin version matching its
+    constraint (@see GlppVersionResolver.resolve)
+    :param plugins: {(name, version): plugin} of the plugins to load
+    :return: the dependency graph {(name, version): [(name, version) of its dependencies]}, in the plugins order
+    """
+    registry = GlppPluginRegistry(plugins)
+    resolver = GlppVersionResolver(get_registry=lambda: registry)
+    graph = {}
+    for key, cplugin in plugins.items():
+        dependencies = []
+        for name, constraint in cplugin.requires:
+            resolved = resolver.resolve(name, constraint=constraint)
+            if resolved is None:
+                raise glpp_exceptions.PluginDependencyNotFound(cplugin.name, cplugin.version, name,
+                                                               constraint if constraint is not None else 'any version')
+            dependencies.append((name, resolved[0]))
+        graph[key] = dependencies
+    return graph
+
+
+def _find_cycle(graph: Dict[Tuple[str, Any], List[Tuple[str, Any]]], nodes: List[Tuple[str, Any]]) -> List:
+    """
+    Find a dependency cycle among nodes that cannot be ordered : each of them has a dependency among them
+    """
+    remaining = set(nodes)
+    path = [nodes[0]]
+    while True:
+        node = next(d for d in graph[path[-1]] if d in remaining)
+        if node in path:
+            return path[path.index(node):] + [node]
+        path.append(node)
+
+
+def get_load_levels(graph: Dict[Tuple[str, Any], List[Tuple[str, Any]]]) -> List[List[Tuple[str, Any]]]:
+    """
+    Split a dependency graph in load levels (topological sort) : the plugins of a level only depend on plugins of the
+    previous levels, so that the plugins of a level are independent from each other.
+    :param graph: the dependency graph (@see resolve_requirements)
+    :return: the levels, each of them in the graph order
+    """
+    levels = []
+    done = set()
+    remaining = list(graph)
+    while len(remaining) > 0:
+        level = [key for key in remaining if all(d in done for d in graph[key])]
+        if len(level) == 0:
+            cycle = _find_cycle(graph, remaining)
+            raise glpp_exceptions.PluginDependencyCycleError(' -> '.join('{}:{}'.format(*key) for key in cycle))
+        levels.append(level)
+        done.update(level)
+        remaining = [key for key in remaining if key not in done]
+    return levels
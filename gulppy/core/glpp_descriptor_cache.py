@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Gulppy persistent plugin description cache
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List
+from gulppy.core import glpp_archive
+from gulppy.core.glpp_plugin_descriptor import GlppPluginDescriptor
+from gulppy.config import GLPP_LOGGER
+
+CACHE_FILENAME = '.gulppy_cache'
+CACHE_FORMAT_VERSION = 2
+
+
+def get_file_signature(path: str or Path) -> List[int]:
+    """
+    Get the signature of a file used to check cache entries validity (@see glpp_archive.get_file_signature)
+    :param path: path of the file
+    :return: [mtime_ns, size, inode]
+    """
+    return glpp_archive.get_file_signature(path)
+
+
+class GlppDescriptorCache(object):
+    """
+    An on-disk cache of parsed plugin description files.
+
+    Entries are keyed by the resolved path of the description file and are validated against the file signature
+    (mtime, size and inode, @see get_file_signature). A valid entry is served without opening nor parsing the yaml
+    file. An entry whose signature does not match anymore is invalidated and the description is parsed again.
+
+    The cache is stored as a json file and only contains the fields used by gulppy
+    (@see glpp_plugin_descriptor.DESCR_FIELDS).
+    """
+    def __init__(self, cache_file: str or Path) -> None:
+        """
+        Constructor
+        :param cache_file: path of the cache file. It is read if it exists.
+        """
+        self.cache_file = Path(cache_file)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = {}
+        self._seen = set()
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._read()
+
+    @classmethod
+    def for_repository(cls, repo_path: str or Path, cache_dir: str or Path or None = None) -> 'GlppDescriptorCache':
+        """
+        Create the cache associated with a repository
+        :param repo_path: path of the repository
+        :param cache_dir: directory where to store the cache file. If None the cache file is stored at the repository
+                          root as CACHE_FILENAME, otherwise a file named after the repository path hash is used. The
+                          cache of an archive repository is stored next to the archive.
+        :return: a cache instance
+        """
+        if cache_dir is None and glpp_archive.is_archive_name(repo_path):
+            cache_dir = Path(repo_path).parent
+        if cache_dir is None:
+            return cls(Path(repo_path).joinpath(CACHE_FILENAME))
+        repo_hash = hashlib.sha1(os.fspath(Path(repo_path).resolve()).encode('utf-8')).hexdigest()
+        return cls(Path(cache_dir).joinpath('{}.json'.format(repo_hash)))
+
+    def _read(self) -> None:
+        """
+        Read the cache file. A missing, unreadable or incompatible cache file is considered as empty.
+        :return: None
+        """
+        try:
+            with open(str(self.cache_file), 'r') as fp:
+                content = json.load(fp)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            GLPP_LOGGER.warning('Cannot read descriptor cache {} : {}'.format(self.cache_file, e))
+            return
+        if content.get('version') != CACHE_FORMAT_VERSION:
+            GLPP_LOGGER.debug('Descriptor cache {} format is outdated : ignored'.format(self.cache_file))
+            return
+        self._entries = content.get('entries', {})
+
+    def get_descriptor(self, plugin_desc: str or Path) -> GlppPluginDescriptor:
+        """
+        Get the descriptor of a plugin description file, from the cache if the entry is still valid or by
+        parsing the file otherwise.
+        :param plugin_desc: path of the plugin description file
+        :return: the plugin descriptor
+        """
+        key = os.fspath(Path(plugin_desc).resolve())
+        signature = get_file_signature(key)
+        with self._lock:
+            self._seen.add(key)
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry['signature'] == signature:
+                    self.hits += 1
+                    return GlppPluginDescriptor.from_dict(key, entry['description'])
+                self.invalidations += 1
+            self.misses += 1
+        descriptor = GlppPluginDescriptor.from_file(key)
+        with self._lock:
+            self._entries[key] = {'signature': signature, 'description': descriptor.to_dict()}
+            self._dirty = True
+        return descriptor
+
+    def save(self) -> bool:
+        """
+        Write the cache file if it has changed. Entries that were not requested since the cache creation are dropped
+        (their description file does not exist anymore or is not part of the repository).
+        A failure to write the cache is not an error : it is logged and the cache is just not persisted.
+        :return: True if the cache file has been written, False otherwise
+        """
+        with self._lock:
+            stale = [k for k in self._entries if k not in self._seen]
+            for k in stale:
+                del self._entries[k]
+            if not self._dirty and len(stale) == 0:
+                return False
+            content = {'version': CACHE_FORMAT_VERSION, 'entries': self._entries}
+            tmp_file = self.cache_file.with_name('{}.{}.tmp'.format(self.cache_file.name, os.getpid()))
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(str(tmp_file), 'w') as fp:
+                    json.dump(content, fp)
+                os.replace(str(tmp_file), str(self.cache_file))
+            except (OSError, TypeError, ValueError) as e:
+                GLPP_LOGGER.warning('Cannot write descriptor cache {} : {}'.format(self.cache_file, e))
+                try:
+                    tmp_file.unlink()
+                except OSError:
+                    pass
+                return False
+            self._dirty = False
+            return True
+
+    def clear(self) -> None:
+        """
+        Drop all cache entries and reset the counters. The cache file is rewritten at the next save.
+        :return: None
+        """
+        with self._lock:
+            self._entries = {}
+            self._seen = set()
+            self._dirty = True
+            self.hits = self.misses = self.invalidations = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters
+        :return: a dictionary with the keys : hits, misses, invalidations and entries
+        """
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries)}
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+"""
+Gulppy plugin discovery engine
+"""
+import os
+import re
+import zipfile
+from pathlib import Path
+from typing import Tuple, Pattern, Iterable, Dict, Set, Generator
+from gulppy.core.glpp_abstract_plugin import DESCR_FILENAME
+from gulppy.core import glpp_archive
+from gulppy.config import GLPP_LOGGER
+
+DEFAULT_EXCLUDE_PATTERNS = ('.git/', '.hg/', '.svn/', '__pycache__/', '.venv/', 'venv/', '.tox/', '.nox/',
+                            'node_modules/', '.mypy_cache/', '.pytest_cache/', '*.egg-info/')
+"""
+Directories that are never expected to contain plugins
+"""
+
+
+def compile_exclude_pattern(pattern: str) -> Tuple[Pattern, bool, bool]:
+    """
+    Compile a gitignore style pattern.
+
+    Supported syntax :
+    - a pattern without "/" (except a trailing one) matches a name at any depth : "build", "*.egg-info"
+    - a pattern containing a "/" is anchored to the walked root directory : "data/raw", "/tmp"
+    - "*" matches anything but "/", "?" matches a single character but "/", "[...]" matches a characters range
+    - "**/" matches zero or more directories, a trailing "/**" matches everything inside a directory
+    - a trailing "/" only matches directories
+    - a leading "!" negates the pattern (a previously excluded path is included again)
+
+    :param pattern: a gitignore style pattern
+    :return: a tuple (regex, negate, dir_only). The regex has to be matched against the path relative to the
+             walked root directory, using "/" as separator.
+    """
+    negate = pattern.startswith('!')
+    if negate:
+        pattern = pattern[1:]
+    dir_only = pattern.endswith('/')
+    pattern = pattern.rstrip('/')
+    anchored = '/' in pattern
+    pattern = pattern.lstrip('/')
+
+    regex = ''
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith('**/', i):
+            regex += '(?:.*/)?'
+            i += 3
+        elif pattern.startswith('/**', i) and i + 3 == n:
+            regex += '/.*'
+            i += 3
+        elif pattern.startswith('**', i):
+            regex += '.*'
+            i += 2
+        elif c == '*':
+            regex += '[^/]*'
+            i += 1
+        elif c == '?':
+            regex += '[^/]'
+            i += 1
+        elif c == '[':
+            j = pattern.find(']', i + 1)
+            if j == -1:
+                regex += re.escape(c)
+                i += 1
+            else:
+                content = pattern[i + 1:j]
+                if content.startswith('!'):
+                    content = '^' + content[1:]
+                regex += '[{}]'.format(content.replace('\\', '\\\\'))
+                i = j + 1
+        else:
+            regex += re.escape(c)
+            i += 1
+    if not anchored:
+        regex = '(?:.*/)?' + regex
+    return re.compile('^{}$'.format(regex)), negate, dir_only
+
+
+class GlppDiscoveryResult(object):
+    """
+    Result of a plugin discovery walk
+    """
+    def __init__(self) -> None:
+        self.descriptors = []
+        """
+        Paths of the plugin description files found, in walk order
+        """
+        self.visited_dirs = 0
+        """
+        Number of directories listed
+        """
+        self.excluded_dirs = 0
+        """
+        Number of directories skipped because of an exclude pattern
+        """
+        self.pruned_dirs = 0
+        """
+        Number of directories not descended into because they are inside a plugin root or deeper than max_depth
+        """
+        self.skipped_links = 0
+        """
+        Number of symbolic links skipped (already visited directory or symlinks not followed)
+        """
+        self.visited_archives = 0
+        """
+        Number of archive files walked
+        """
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the walk counters
+        :return: a dictionary with the keys : descriptors, visited_dirs, excluded_dirs, pruned_dirs, skipped_links
+                 and visited_archives
+        """
+        return {'descriptors': len(self.descriptors),
+                'visited_dirs': self.visited_dirs,
+                'excluded_dirs': self.excluded_dirs,
+                'pruned_dirs': self.pruned_dirs,
+                'skipped_links': self.skipped_links,
+                'visited_archives': self.visited_archives}
+
+
+class GlppDiscoveryWalker(object):
+    """
+    Plugin description files discovery engine based on os.scandir.
+
+    Compared to a recursive glob, the walker :
+    - stops descending in a directory once it contains a plugin description file (the plugin root) if
+      stop_at_plugin_root is True
+    - does not descend deeper than max_depth (the walked root directory is at depth 0)
+    - skips the directories matching the exclude patterns (@see compile_exclude_pattern)
+    - follows symbolic links to directories only once (symlink loops protection)
+    - walks the zip and wheel archives (@see glpp_archive) as directories, from their central directory. The walked
+      root can be an archive file.
+    Entries are walked in sorted order so that the discovery order is deterministic.
+    """
+    def __init__(self,
+                 descr_filename: str = DESCR_FILENAME,
+                 stop_at_plugin_root: bool = False,
+                 max_depth: int or None = None,
+                 exclude_patterns: Iterable[str] = DEFAULT_EXCLUDE_PATTERNS,
+                 follow_symlinks: bool = True) -> None:
+        """
+        Constructor
+        :param descr_filename: name of the plugin description files
+        :param stop_at_plugin_root: boolean flag to not walk the sub directories of a plugin root
+        :param max_depth: maximal depth of the walked directories. None means no limit.
+        :param exclude_patterns: gitignore style patterns of the paths to exclude
+        :param follow_symlinks: boolean flag to follow symbolic links to directories
+        """
+        self.descr_filename = descr_filename
+        self.stop_at_plugin_root = stop_at_plugin_root
+        self.max_depth = max_depth
+        self.exclude_patterns = list(exclude_patterns)
+        self.follow_symlinks = follow_symlinks
+        self._compiled_patterns = [compile_exclude_pattern(p) for p in self.exclude_patterns]
+
+    def is_excluded(self, rel_path: str, is_dir: bool) -> bool:
+        """
+        Check if a path is excluded by the exclude patterns. The last matching pattern wins.
+        :param rel_path: path relative to the walked root directory, using "/" as separator
+        :param is_dir: boolean flag indicating whether the path is a directory
+        :return: True if the path is excluded
+        """
+        excluded = False
+        for regex, negate, dir_only in self._compiled_patterns:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                excluded = not negate
+        return excluded
+
+    def walk(self, root: str or Path) -> GlppDiscoveryResult:
+        """
+        Walk a directory tree looking for plugin description files
+        :param root: the directory to walk
+        :return: the discovery result
+        """
+        result = GlppDiscoveryResult()
+        root = os.fspath(root)
+        try:
+            st = os.stat(root)
+        except OSError as e:
+            GLPP_LOGGER.warning('Cannot walk {} : {}'.format(root, e))
+            return result
+        visited = {(st.st_dev, st.st_ino)}
+        # depth first walk using a stack of (path, relative path, depth, archive flag)
+        stack = [(root, '', 0, glpp_archive.is_archive(root))]
+        while len(stack) > 0:
+            path, rel_path, depth, archive = stack.pop()
+            if archive:
+                self._walk_archive(path, rel_path, depth, result)
+                continue
+            try:
+                with os.scandir(path) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError as e:
+                GLPP_LOGGER.warning('Cannot list directory {} : {}'.format(path, e))
+                continue
+            result.visited_dirs += 1
+
+            sub_dirs = []
+            is_plugin_root = False
+            for entry in entries:
+                entry_rel_path = entry.name if rel_path == '' else '{}/{}'.format(rel_path, entry.name)
+                try:
+                    if entry.name == self.descr_filename and entry.is_file():
+                        if not self.is_excluded(entry_rel_path, is_dir=False):
+                            result.descriptors.append(Path(entry.path))
+                            is_plugin_root = True
+                        continue
+                    archive = glpp_archive.is_archive_name(entry.name) and entry.is_file()
+                    if not archive and not entry.is_dir():
+                        continue
+                except OSError:
+                    continue
+                if self.is_excluded(entry_rel_path, is_dir=not archive):
+                    result.excluded_dirs += 1
+                    continue
+                sub_dirs.append((entry, entry_rel_path, archive))
+
+            if (is_plugin_root and self.stop_at_plugin_root) or \
+                    (self.max_depth is not None and depth >= self.max_depth):
+                result.pruned_dirs += len(sub_dirs)
+                continue
+
+            children = []
+            for entry, entry_rel_path, archive in sub_dirs:
+                if archive:
+                    children.append((entry.path, entry_rel_path, depth + 1, True))
+                    continue
+                key = self._visit_dir(entry, visited)
+                if key is False:
+                    result.skipped_links += 1
+                elif key is not None:
+                    children.append((entry.path, entry_rel_path, depth + 1, False))
+            # push in reverse order so that directories are popped in sorted order
+            stack.extend(reversed(children))
+        return result
+
+    def _visit_dir(self, entry: os.DirEntry, visited: Set[Tuple[int, int]]) -> Tuple[int, int] or bool or None:
+        """
+        Check if a sub directory has to be walked : symbolic links are followed if follow_symlinks is True, and each
+        directory is walked once (symlink loops protection)
+        :param entry: the sub directory entry
+        :param visited: (st_dev, st_ino) of the directories already walked. The sub directory key is added to it.
+        :return: the (st_dev, st_ino) key of the sub directory to walk, False for a skipped link or None if the
+                 directory cannot be accessed
+        """
+        try:
+            if entry.is_symlink():
+                if not self.follow_symlinks:
+                    return False
+                st = os.stat(entry.path)
+            else:
+                st = entry.stat(follow_symlinks=False)
+        except OSError:
+            return None
+        key = (st.st_dev, st.st_ino)
+        if key in visited:
+            # already visited directory : symlink loop or several links to the same directory
+            return False
+        visited.add(key)
+        return key
+
+    def walk_dirs(self,
+                  root: str or Path,
+                  rel_path: str = '',
+                  visited: Set[Tuple[int, int]] or None = None) -> Generator[Tuple[str, str, Tuple], None, None]:
+        """
+        Walk the directories of a tree with the exclude patterns, the symbolic links options and the symlink loops
+        protection of walk. The description files and the archives are not looked for.
+        :param root: the directory to walk
+        :param rel_path: path of root relative to the directory the exclude patterns apply to
+        :param visited: (st_dev, st_ino) of the directories already walked, completed with the walked ones. A
+                        directory already visited is not walked again.
+        :return: generator of (path, relative path, (st_dev, st_ino)) of the walked directories, root included
+        """
+        visited = set() if visited is None else visited
+        root = os.fspath(root)
+        try:
+            st = os.stat(root)
+        except OSError:
+            return
+        key = (st.st_dev, st.st_ino)
+        if key in visited:
+            return
+        visited.add(key)
+        stack = [(root, rel_path, key)]
+        while len(stack) > 0:
+            path, rel_path, key = stack.pop()
+            yield path, rel_path, key
+            try:
+                with os.scandir(path) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+            children = []
+            for entry in entries:
+                entry_rel_path = entry.name if rel_path == '' else '{}/{}'.format(rel_path, entry.name)
+                try:
+                    if not entry.is_dir():
+                        continue
+                except OSError:
+                    continue
+                if self.is_excluded(entry_rel_path, is_dir=True):
+                    continue
+                entry_key = self._visit_dir(entry, visited)
+                if entry_key:
+                    children.append((entry.path, entry_rel_path, entry_key))
+            stack.extend(reversed(children))
+
+    def _walk_archive(self, path: str, rel_path: str, depth: int, result: GlppDiscoveryResult) -> None:
+        """
+        Walk the tree of an archive file as a directory (@see walk)
+        :param path: path of the archive file
+        :param rel_path: path of the archive relative to the walked root directory
+        :param depth: depth of the archive
+        :param result: the discovery result to complete
+        :return:
+        """
+        try:
+            archive = glpp_archive.get_archive(path)
+        except (OSError, zipfile.BadZipFile) as e:
+            GLPP_LOGGER.warning('Cannot open archive {} : {}'.format(path, e))
+            return
+        result.visited_archives += 1
+        stack = [('', rel_path, depth)]
+        while len(stack) > 0:
+            member, member_rel_path, member_depth = stack.pop()
+            dirs, files = archive.list_dir(member)
+            result.visited_dirs += 1
+            member_path = Path(path).joinpath(*member.split('/'))
+            is_plugin_root = False
+            if self.descr_filename in files:
+                descr_rel_path = '/'.join(p for p in (member_rel_path, self.descr_filename) if p != '')
+                if not self.is_excluded(descr_rel_path, is_dir=False):
+                    result.descriptors.append(member_path.joinpath(self.descr_filename))
+                    is_plugin_root = True
+            sub_dirs = []
+            for name in dirs:
+                dir_rel_path = name if member_rel_path == '' else '{}/{}'.format(member_rel_path, name)
+                if self.is_excluded(dir_rel_path, is_dir=True):
+                    result.excluded_dirs += 1
+                    continue
+                sub_dirs.append(('/'.join(p for p in (member, name) if p != ''), dir_rel_path, member_depth + 1))
+            if (is_plugin_root and self.stop_at_plugin_root) or \
+                    (self.max_depth is not None and member_depth >= self.max_depth):
+                result.pruned_dirs += len(sub_dirs)
+                continue
+            stack.extend(reversed(sub_dirs))
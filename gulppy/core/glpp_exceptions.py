@@ -3,11 +3,10 @@
 Gulppy dynamic exceptions definition
 """
 import json
-import inspect
 import os
 from typing import Type
 
-LOCAL_PATH = os.path.normpath(os.path.join(os.path.abspath(inspect.stack()[0][1]), '..'))
+LOCAL_PATH = os.path.normpath(os.path.join(os.path.abspath(__file__), '..'))
 EXCEPTIONS_DESC_FILE = os.path.join(LOCAL_PATH, "exceptions.json")
 EXCEPTIONS_MSG = {}
 
@@ -51,9 +50,15 @@ PluginRepositoryDuplicateError = create_exception("PluginRepositoryDuplicateErro
 PluginModuleSysModuleDuplicateError = create_exception("PluginModuleSysModuleDuplicateError")
 PluginImportError = create_exception("PluginImportError")
 PluginNotFound = create_exception("PluginNotFound")
+RepositoryNotFound = create_exception("RepositoryNotFound")
 PluginNotExistsInRepository = create_exception("PluginNotExistsInRepository")
+PluginVersionConstraintError = create_exception("PluginVersionConstraintError")
 UnknownModuleError = create_exception("UnknownModuleError")
 PluginDescriptionMissingProperty = create_exception("PluginDescriptionMissingProperty")
 UnknownPluginMode = create_exception("UnknownPluginMode")
+PluginHostError = create_exception("PluginHostError")
+PluginHostCallError = create_exception("PluginHostCallError")
 
 
+PluginDependencyNotFound = create_exception("PluginDependencyNotFound")
+PluginDependencyCycleError = create_exception("PluginDependencyCycleError")
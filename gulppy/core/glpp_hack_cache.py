@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Gulppy compiled hack scripts cache
+"""
+import hashlib
+import importlib.util
+import marshal
+import os
+import threading
+import types
+from pathlib import Path
+from typing import Dict, Callable, Tuple
+from gulppy.core.glpp_archive import read_bytes
+from gulppy.core.glpp_bundle import get_frozen_code
+from gulppy.core.glpp_descriptor_cache import get_file_signature
+from gulppy.config import GLPP_LOGGER
+
+
+class GlppHackCache(object):
+    """
+    A process wide cache of the plugin hack scripts (@see GlppAbstractPlugin.load).
+
+    Entries are keyed by the resolved path of the script and validated against the file signature (mtime, size and
+    inode, @see get_file_signature) or, if use_hash is True, against the sha1 of its content. A valid entry gives the
+    callables defined by the script without reading, compiling nor executing it again : plugins sharing a hack script
+    share its callables.
+
+    If cache_dir is set, the compiled code is also persisted as marshalled bytecode (one file per script, tagged
+    with the interpreter magic number) so that a new process does not compile the scripts again.
+    """
+    def __init__(self, cache_dir: str or Path or None = None, use_hash: bool = False) -> None:
+        """
+        Constructor
+        :param cache_dir: directory where to store the marshalled bytecode. If None, nothing is written on disk.
+        :param use_hash: boolean flag to validate entries against the scripts content instead of their signature
+        """
+        self.cache_dir = cache_dir
+        self.use_hash = use_hash
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.bytecode_hits = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _get_signature(self, script: str) -> Tuple:
+        if self.use_hash:
+            return hashlib.sha1(read_bytes(script)).hexdigest(),
+        return tuple(get_file_signature(script))
+
+    def _get_bytecode_file(self, script: str) -> Path:
+        return Path(self.cache_dir).joinpath('{}.hack'.format(hashlib.sha1(script.encode('utf-8')).hexdigest()))
+
+    def _read_bytecode(self, script: str, signature: Tuple) -> types.CodeType or None:
+        """
+        Read the persisted bytecode of a script
+        :return: the code object or None if there is no valid bytecode
+        """
+        try:
+            with open(str(self._get_bytecode_file(script)), 'rb') as fp:
+                content = fp.read()
+        except OSError:
+            return None
+        magic = importlib.util.MAGIC_NUMBER
+        if not content.startswith(magic):
+            return None
+        try:
+            cached_signature, code = marshal.loads(content[len(magic):])
+        except (EOFError, ValueError, TypeError):
+            return None
+        if tuple(cached_signature) != signature or not isinstance(code, types.CodeType):
+            return None
+        return code
+
+    def _write_bytecode(self, script: str, signature: Tuple, code: types.CodeType) -> None:
+        """
+        Persist the bytecode of a script (atomic write)
+        """
+        bytecode_file = self._get_bytecode_file(script)
+        tmp_file = bytecode_file.with_name('{}.{}.tmp'.format(bytecode_file.name, os.getpid()))
+        try:
+            bytecode_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(str(tmp_file), 'wb') as fp:
+                fp.write(importlib.util.MAGIC_NUMBER + marshal.dumps((list(signature), code)))
+            os.replace(str(tmp_file), str(bytecode_file))
+        except OSError as e:
+            GLPP_LOGGER.warning('Cannot write hack bytecode cache {} : {}'.format(bytecode_file, e))
+
+    def _compile(self, script: str, signature: Tuple) -> types.CodeType:
+        code = get_frozen_code(script)
+        if code is not None:
+            # compiled at freeze (@see glpp_bundle)
+            return code
+        if self.cache_dir is not None:
+            code = self._read_bytecode(script, signature)
+            if code is not None:
+                self.bytecode_hits += 1
+                return code
+        code = compile(read_bytes(script), script, 'exec')
+        if self.cache_dir is not None:
+            self._write_bytecode(script, signature, code)
+        return code
+
+    def get_callback(self, script: str or Path, name: str, exec_globals: Dict) -> Tuple[Callable, bool]:
+        """
+        Get a callable defined by a hack script
+        :param script: path of the script
+        :param name: name of the callable
+        :param exec_globals: globals used to execute the script at first use
+        :return: a tuple (callable, hit) where hit is True if the script has been served from the cache
+        """
+        script = os.path.realpath(os.fspath(script))
+        signature = self._get_signature(script)
+        with self._lock:
+            entry = self._entries.get(script)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                return entry[1][name], True
+            if entry is not None:
+                self.invalidations += 1
+            self.misses += 1
+            c_locals = {}
+            exec(self._compile(script, signature), exec_globals, c_locals)
+            self._entries[script] = (signature, c_locals)
+            return c_locals[name], False
+
+    def clear(self) -> None:
+        """
+        Clear the in memory entries (persisted bytecode is kept) and the counters
+        :return: None
+        """
+        with self._lock:
+            self._entries = {}
+            self.hits = self.misses = self.invalidations = self.bytecode_hits = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters
+        :return: a dictionary with the keys : hits, misses, invalidations, bytecode_hits and entries
+        """
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'invalidations': self.invalidations,
+                    'bytecode_hits': self.bytecode_hits,
+                    'entries': len(self._entries)}
+
+
+HACK_CACHE = GlppHackCache()
+"""
+The process wide hack scripts cache. Set HACK_CACHE.cache_dir to persist the compiled scripts.
+"""
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Gulppy per-plugin import finders
+
+An alternative to the insertion of the plugins python paths in sys.path while their modules are executed
+(@see glpp_module_loader.META_PATH_ISOLATION) : the python paths are given to a finder (@see GlppPluginFinder) that is
+only queried by the imports of the thread executing the plugin modules. The imports of the other threads neither see
+the plugins modules nor pay for the scan of the plugins directories, and the modules they import meanwhile are not
+attributed to the plugin load (@see finder_context).
+
+The finders are served by a single sys.meta_path entry (@see install). The top level modules are looked up in the
+plugin python paths before the other finders, as when the paths are inserted at the beginning of sys.path ; the
+submodules are found by the standard path finder from the __path__ of their package.
+"""
+import importlib.machinery
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from importlib import abc as importlib_abc
+from importlib.machinery import ModuleSpec
+from pathlib import Path
+from typing import Generator, List, Set
+import types
+
+
+class GlppPluginFinder(importlib_abc.MetaPathFinder):
+    """
+    Meta path finder of the top level modules located in python paths
+    """
+    def __init__(self, paths: List[str or Path]) -> None:
+        """
+        Constructor
+        :param paths: the python paths, in priority order
+        """
+        self.paths = [os.fspath(Path(p).resolve()) for p in paths]
+        self.foreign = set()
+        """
+        Names of the modules requested by the imports of the other threads while the finder is used
+        """
+
+    def find_spec(self,
+                  fullname: str,
+                  path: List[str] or None = None,
+                  target: types.ModuleType or None = None) -> ModuleSpec or None:
+        if path is not None or fullname in sys.builtin_module_names or len(self.paths) == 0:
+            return None
+        return importlib.machinery.PathFinder.find_spec(fullname, self.paths, target)
+
+    def invalidate_caches(self) -> None:
+        for cpath in self.paths:
+            finder = sys.path_importer_cache.get(cpath)
+            if finder is not None and hasattr(finder, 'invalidate_caches'):
+                finder.invalidate_caches()
+
+
+_LOCAL = threading.local()
+
+_ACTIVE = []
+"""
+The finders in use by any thread
+"""
+
+
+class _GlppFinderDispatcher(importlib_abc.MetaPathFinder):
+    """
+    sys.meta_path entry giving the imports of a thread to the finder it uses (@see finder_context). The imports of
+    the other threads are recorded as foreign by the finders in use.
+    """
+    def find_spec(self,
+                  fullname: str,
+                  path: List[str] or None = None,
+                  target: types.ModuleType or None = None) -> ModuleSpec or None:
+        finders = getattr(_LOCAL, 'finders', None)
+        if not finders:
+            for finder in list(_ACTIVE):
+                finder.foreign.add(fullname)
+            return None
+        # the finders of nested contexts come first
+        for finder in reversed(finders):
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                return spec
+        return None
+
+    def invalidate_caches(self) -> None:
+        for finder in list(_ACTIVE):
+            finder.invalidate_caches()
+
+
+_DISPATCHER = _GlppFinderDispatcher()
+_INSTALL_LOCK = threading.Lock()
+
+
+def install() -> None:
+    """
+    Insert the finders dispatcher at the beginning of sys.meta_path (once)
+    :return:
+    """
+    with _INSTALL_LOCK:
+        if _DISPATCHER not in sys.meta_path:
+            sys.meta_path.insert(0, _DISPATCHER)
+
+
+@contextmanager
+def finder_context(paths: List[str or Path]) -> Generator[GlppPluginFinder, None, None]:
+    """
+    Context where the imports of the current thread find their top level modules in python paths first
+    :param paths: the python paths
+    :return: the finder, whose foreign attribute gives the modules imported meanwhile by the other threads
+    """
+    install()
+    finder = GlppPluginFinder(paths)
+    finders = getattr(_LOCAL, 'finders', None)
+    if finders is None:
+        finders = _LOCAL.finders = []
+    finders.append(finder)
+    _ACTIVE.append(finder)
+    try:
+        yield finder
+    finally:
+        finders.pop()
+        _ACTIVE.remove(finder)
+
+
+def get_foreign_modules() -> Set[str]:
+    """
+    Get the modules requested by other threads while the finders of the current thread are in use
+    :return: the set of module names
+    """
+    return set().union(*[finder.foreign for finder in getattr(_LOCAL, 'finders', None) or []])
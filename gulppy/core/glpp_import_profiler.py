@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""
+Gulppy import-tree profiler
+
+Record the tree of the imports made while loading a plugin, like python -X importtime but scoped to a block of code.
+"""
+import builtins
+import importlib.util
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+from typing import Dict, Generator, List, Tuple
+
+
+class GlppImportNode(object):
+    """
+    A module of the import tree.
+
+    The node of a newly executed module holds its find and execution times, the modules it imported being its
+    children. The node of an already cached module (found in sys.modules by an import statement) holds the time of
+    the import statement and has no children.
+    """
+    __slots__ = ('name', 'cached', 'find_time', 'exec_time', 'error', 'children')
+
+    def __init__(self, name: str, cached: bool = False) -> None:
+        self.name = name
+        self.cached = cached
+        self.find_time = 0.
+        self.exec_time = 0.
+        self.error = None
+        """
+        Name of the exception raised by the module execution, if any
+        """
+        self.children = []
+
+    @property
+    def cumulative_time(self) -> float:
+        """
+        Get the time spent importing the module and its imports, in seconds
+        """
+        return self.find_time + self.exec_time
+
+    @property
+    def self_time(self) -> float:
+        """
+        Get the time spent importing the module, its imports excluded, in seconds
+        """
+        return max(0., self.cumulative_time - sum(child.cumulative_time for child in self.children))
+
+    def walk(self, stack: Tuple[str, ...] = ()) -> Generator[Tuple[Tuple[str, ...], 'GlppImportNode'], None, None]:
+        """
+        Walk the subtree depth first
+        :param stack: names of the ancestors
+        :return: generator of (stack, node), the stack ending with the node name
+        """
+        stack = stack + (self.name,)
+        yield stack, self
+        for child in self.children:
+            yield from child.walk(stack)
+
+    def to_dict(self) -> Dict:
+        """
+        Get the subtree as a dictionary
+        """
+        return {'name': self.name,
+                'cached': self.cached,
+                'self_time': self.self_time,
+                'cumulative_time': self.cumulative_time,
+                'error': self.error,
+                'children': [child.to_dict() for child in self.children]}
+
+
+class _GlppProfilingLoader(object):
+    """
+    Loader proxy timing a module execution. The original loader is put back in the module and its spec before the
+    execution, so that the profiling does not show in the loaded modules.
+    """
+    def __init__(self, loader, node: GlppImportNode, profiler: 'GlppImportProfiler') -> None:
+        self._loader = loader
+        self._node = node
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        spec = getattr(module, '__spec__', None)
+        if spec is not None and spec.loader is self:
+            spec.loader = self._loader
+        if getattr(module, '__loader__', None) is self:
+            module.__loader__ = self._loader
+        with self._profiler.section(self._node):
+            self._loader.exec_module(module)
+
+
+class _GlppProfilingFinder(MetaPathFinder):
+    """
+    Meta path finder inserted first in sys.meta_path while profiling. It delegates the lookup to the next finders and
+    wraps the found loader to time the module execution.
+    """
+    def __init__(self, profiler: 'GlppImportProfiler') -> None:
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        profiler = self._profiler
+        if not profiler.is_recording():
+            return None
+        try:
+            finders = sys.meta_path[sys.meta_path.index(self) + 1:]
+        except ValueError:
+            return None
+        start = time.perf_counter()
+        spec = None
+        for finder in finders:
+            find_spec = getattr(finder, 'find_spec', None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        if spec is None:
+            # the import system reports the missing module
+            return None
+        node = GlppImportNode(fullname)
+        node.find_time = time.perf_counter() - start
+        profiler.add_node(node)
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _GlppProfilingLoader(spec.loader, node, profiler)
+        return spec
+
+
+_IMPORTLIB_MODULES = frozenset(('_frozen_importlib', '_frozen_importlib_external', 'importlib._bootstrap',
+                                'importlib._bootstrap_external'))
+"""
+Modules of the import system : their own import statements are not recorded
+"""
+
+
+def _resolve_import_name(name: str, globals_: Dict or None, level: int) -> str or None:
+    """
+    Get the absolute name of the module imported by an import statement
+    :return: the name, None if it cannot be resolved
+    """
+    if level == 0:
+        return name
+    try:
+        package = globals_.get('__package__')
+        if package is None:
+            package = globals_['__name__']
+            if '__path__' not in globals_:
+                package = package.rpartition('.')[0]
+        return importlib.util.resolve_name('.' * level + name, package)
+    except (AttributeError, KeyError, ImportError, ValueError):
+        return None
+
+
+class GlppImportProfiler(object):
+    """
+    Import-tree profiler.
+
+    While started, the profiler records the imports of the thread that started it :
+    - the modules executed by the import system, timed by a finder inserted first in sys.meta_path
+    - the import statements resolved from sys.modules (cached modules), timed by a builtins.__import__ hook
+    Code executed outside the import system (such as the plugins main modules) can be recorded with section.
+
+    Usage :
+        with GlppImportProfiler() as profiler:
+            import foo
+        print(profiler.format_report())
+    """
+    def __init__(self) -> None:
+        self.roots = []
+        """
+        Root nodes of the recorded tree
+        """
+        self._stack = []
+        self._thread = None
+        self._finder = _GlppProfilingFinder(self)
+        self._import = None
+
+    def is_recording(self) -> bool:
+        """
+        Check if the current thread imports are recorded
+        """
+        return self._thread is not None and self._thread == threading.get_ident()
+
+    def start(self) -> None:
+        """
+        Start recording the current thread imports. The recorded tree is kept : a profiler can be started again to
+        complete it.
+        :return:
+        """
+        if self._thread is not None:
+            return
+        self._thread = threading.get_ident()
+        sys.meta_path.insert(0, self._finder)
+        self._import = builtins.__import__
+        builtins.__import__ = self._import_hook
+
+    def stop(self) -> None:
+        """
+        Stop recording
+        :return:
+        """
+        if self._thread is None:
+            return
+        self._thread = None
+        try:
+            sys.meta_path.remove(self._finder)
+        except ValueError:
+            pass
+        if builtins.__import__ == self._import_hook:
+            builtins.__import__ = self._import
+        self._import = None
+
+    def __enter__(self) -> 'GlppImportProfiler':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def add_node(self, node: GlppImportNode) -> None:
+        """
+        Add a node to the tree, as a child of the current section
+        :param node: the node
+        :return:
+        """
+        if len(self._stack) > 0:
+            self._stack[-1].children.append(node)
+        else:
+            self.roots.append(node)
+
+    @contextmanager
+    def section(self, node: GlppImportNode or str) -> Generator[GlppImportNode, None, None]:
+        """
+        Record a block of code as a node of the tree : the imports made in the block are its children
+        :param node: the node, or a name to add a new node
+        :return: the node
+        """
+        if not isinstance(node, GlppImportNode):
+            node = GlppImportNode(node)
+            self.add_node(node)
+        self._stack.append(node)
+        start = time.perf_counter()
+        try:
+            yield node
+        except BaseException as e:
+            node.error = type(e).__name__
+            raise
+        finally:
+            node.exec_time += time.perf_counter() - start
+            self._stack.pop()
+
+    def _import_hook(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._import
+        if not self.is_recording() or (globals is not None and globals.get('__name__') in _IMPORTLIB_MODULES):
+            return original(name, globals, locals, fromlist, level)
+        fullname = _resolve_import_name(name, globals, level)
+        cached = []
+        if fullname is not None:
+            targets = [fullname] + ['{}.{}'.format(fullname, item) for item in fromlist or ()
+                                    if isinstance(item, str) and item != '*']
+            cached = [k for k in targets if k in sys.modules]
+        if len(cached) == 0:
+            return original(name, globals, locals, fromlist, level)
+        siblings = self._stack[-1].children if len(self._stack) > 0 else self.roots
+        n_siblings = len(siblings)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            # the modules executed by the statement (submodules of a cached package) have their own nodes
+            elapsed = max(0., time.perf_counter() - start -
+                          sum(node.cumulative_time for node in siblings[n_siblings:]))
+            for i, k in enumerate(cached):
+                node = GlppImportNode(k, cached=True)
+                # the statement time is given to its first cached module
+                node.exec_time = elapsed if i == 0 else 0.
+                self.add_node(node)
+
+    def walk(self) -> Generator[Tuple[Tuple[str, ...], GlppImportNode], None, None]:
+        """
+        Walk the recorded tree depth first (@see GlppImportNode.walk)
+        """
+        for root in self.roots:
+            yield from root.walk()
+
+    def get_rows(self, sort: str or None = 'cumulative_time') -> List[Dict]:
+        """
+        Get the recorded nodes as a flat list
+        :param sort: key to sort the rows by decreasing value (self_time or cumulative_time). If None, the rows are
+                     in tree order.
+        :return: list of {name, stack, depth, cached, self_time, cumulative_time, error}
+        """
+        rows = [{'name': node.name,
+                 'stack': list(stack),
+                 'depth': len(stack) - 1,
+                 'cached': node.cached,
+                 'self_time': node.self_time,
+                 'cumulative_time': node.cumulative_time,
+                 'error': node.error} for stack, node in self.walk()]
+        if sort is not None:
+            rows.sort(key=lambda row: row[sort], reverse=True)
+        return rows
+
+    def format_report(self, sort: str or None = 'cumulative_time', limit: int or None = None,
+                      cached: bool = True) -> str:
+        """
+        Format the recorded nodes as a text table (times in microseconds)
+        :param sort: @see get_rows. If None, the rows are in tree order and indented by depth like -X importtime.
+        :param limit: maximum number of rows
+        :param cached: boolean flag to include the cached modules
+        :return: the report
+        """
+        rows = [row for row in self.get_rows(sort=sort) if cached or not row['cached']]
+        if limit is not None:
+            rows = rows[:limit]
+        lines = ['{:>12} | {:>12} | {:>8} | module'.format('self [us]', 'cumul [us]', 'status')]
+        for row in rows:
+            status = 'cached' if row['cached'] else 'error' if row['error'] is not None else 'executed'
+            indent = '  ' * row['depth'] if sort is None else ''
+            lines.append('{:>12.0f} | {:>12.0f} | {:>8} | {}{}'.format(row['self_time'] * 1e6,
+                                                                        row['cumulative_time'] * 1e6,
+                                                                        status, indent, row['name']))
+        return '\n'.join(lines)
+
+    def to_folded(self, prefix: str or None = None) -> List[str]:
+        """
+        Get the recorded tree as folded stacks, the input format of flamegraph.pl, speedscope or inferno : one line
+        "frame;frame;frame value" per node, the value being its self time in microseconds. Cached modules frames are
+        suffixed by " (cached)".
+        :param prefix: frame to add at the base of every stack (a plugin id for instance)
+        :return: the lines
+        """
+        lines = []
+        for stack, node in self.walk():
+            frames = list(stack[:-1]) + [node.name + ' (cached)' if node.cached else node.name]
+            if prefix is not None:
+                frames.insert(0, prefix)
+            # the value is the last space separated field : frames may contain spaces but not ';'
+            lines.append('{} {}'.format(';'.join(f.replace(';', ':') for f in frames),
+                                        int(round(node.self_time * 1e6))))
+        return lines
+
+    def to_dict(self) -> List[Dict]:
+        """
+        Get the recorded tree as a list of dictionaries (@see GlppImportNode.to_dict)
+        """
+        return [root.to_dict() for root in self.roots]
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Gulppy load instrumentation
+"""
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Generator, Iterable
+
+
+@contextmanager
+def measure() -> Generator[Dict, None, None]:
+    """
+    Measure a block of code. The yielded dictionary is filled at exit (even if an exception is raised) with :
+    - wall_time : elapsed time in seconds
+    - cpu_time : CPU time of the current thread in seconds
+    - allocated_bytes : memory allocated and not released by the block, as traced by tracemalloc. None if tracemalloc
+      is not tracing (@see trace_memory).
+    :return: the statistics dictionary
+    """
+    stats = {}
+    tracing = tracemalloc.is_tracing()
+    memory = tracemalloc.get_traced_memory()[0] if tracing else None
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield stats
+    finally:
+        stats['wall_time'] = time.perf_counter() - wall
+        stats['cpu_time'] = time.thread_time() - cpu
+        if tracing and tracemalloc.is_tracing():
+            stats['allocated_bytes'] = tracemalloc.get_traced_memory()[0] - memory
+        else:
+            stats['allocated_bytes'] = None
+
+
+@contextmanager
+def trace_memory(enabled: bool = True) -> Generator[Dict, None, None]:
+    """
+    Trace the memory allocations of a block of code with tracemalloc. Tracing is started (and stopped at exit) if it
+    is not already active. The traced peak is reset at enter : the yielded dictionary is filled at exit with
+    peak_bytes, the peak of traced memory during the block above the traced memory at enter (None if not enabled).
+    Tracing slows down python allocations a lot : only use it to investigate.
+    :param enabled: boolean flag to trace the memory. If False, nothing is done.
+    :return: the statistics dictionary
+    """
+    stats = {'peak_bytes': None}
+    if not enabled:
+        yield stats
+        return
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    memory = tracemalloc.get_traced_memory()[0]
+    try:
+        yield stats
+    finally:
+        stats['peak_bytes'] = tracemalloc.get_traced_memory()[1] - memory
+        if started:
+            tracemalloc.stop()
+
+
+def new_module_stats(stats: Dict, n_sys_modules_added: int) -> Dict:
+    """
+    Build the load statistics of a module
+    :param stats: the measure of the module load (@see measure)
+    :param n_sys_modules_added: number of modules added to sys.modules by the module load
+    :return: the module statistics
+    """
+    return {'wall_time': stats.get('wall_time'),
+            'cpu_time': stats.get('cpu_time'),
+            'allocated_bytes': stats.get('allocated_bytes'),
+            'n_sys_modules_added': n_sys_modules_added}
+
+
+def sum_load_stats(plugins_stats: Iterable[Dict]) -> Dict:
+    """
+    Aggregate the load statistics of plugins (@see GlppAbstractPlugin.load_stats)
+    :param plugins_stats: the load statistics of the plugins
+    :return: the sums of wall_time, cpu_time and allocated_bytes and the maximum of peak_bytes. The memory metrics are
+             None if a plugin load did not trace the memory.
+    """
+    plugins_stats = list(plugins_stats)
+
+    def total(key, function=sum):
+        values = [stats.get(key) for stats in plugins_stats]
+        return None if len(values) == 0 or None in values else function(values)
+
+    return {'wall_time': sum(stats.get('wall_time') or 0.0 for stats in plugins_stats),
+            'cpu_time': sum(stats.get('cpu_time') or 0.0 for stats in plugins_stats),
+            'allocated_bytes': total('allocated_bytes'),
+            'peak_bytes': total('peak_bytes', max)}
@@ -3,13 +3,16 @@
 Gulppy module loading core functions
 """
 from importlib import util as importlib_util
+from collections import Counter
 import sys
 import os
+import threading
 from pathlib import Path
 from typing import Generator, List, Tuple, Callable, Dict
 import types
-from contextlib import contextmanager
-from gulppy.core import glpp_exceptions
+from contextlib import contextmanager, nullcontext
+from gulppy.core import glpp_exceptions, glpp_load_stats, glpp_archive, glpp_bundle, glpp_import_finder, glpp_namespace
+from gulppy.core.glpp_import_profiler import GlppImportProfiler
 from gulppy.config import GLPP_LOGGER, GLPP_SYS_PATH
 
 
@@ -20,7 +23,11 @@ def sys_context_callback_init(**kwargs):
 
     :param modules_changes: list to serve as a buffer to store the changes that have occurred to sys.modules
     :param immutable: boolean flag to restore sys.path and sys.modules states at exit
+    :param meta_path_isolation: boolean flag set if the modules are found by a finder of the context instead of
+                                sys.path (@see META_PATH_ISOLATION)
     """
+    if kwargs.get("meta_path_isolation"):
+        return
     for cpath in kwargs["dir_path"][::-1]:
         sys.path.insert(0, os.fspath(Path(cpath).resolve()))
 
@@ -32,17 +39,181 @@ def sys_context_callback_terminate(**kwargs):
 
     :param modules_changes: list to serve as a buffer to store the changes that have occurred to sys.modules
     :param immutable: boolean flag to restore sys.path and sys.modules states at exit
+    :param changed_keys: sys.modules keys added, replaced or deleted in the context. Only those entries are restored.
+    :param meta_path_isolation: boolean flag set if the modules are found by a finder of the context instead of
+                                sys.path (@see META_PATH_ISOLATION) : sys.path is left as it is, the other threads may
+                                have changed it meanwhile.
     """
     # restore previous states
     if kwargs["immutable"]:
         GLPP_LOGGER.debug('Context | sys.path and sys.modules : restore previous state')
-        sys.path = kwargs["old_path"]
-        # Fix issue #1 - KeyError can occur when loading a module
-        for k, v in kwargs["old_modules"].items():
-            sys.modules[k] = v
-        to_del = [k for k in sys.modules if k not in kwargs["old_modules"]]
-        for k in to_del:
-            del sys.modules[k]
+        if not kwargs.get("meta_path_isolation"):
+            sys.path = kwargs["old_path"]
+        old_modules = kwargs["old_modules"]
+        changed_keys = kwargs.get("changed_keys")
+        if changed_keys is None:
+            # Fix issue #1 - KeyError can occur when loading a module
+            for k, v in old_modules.items():
+                sys.modules[k] = v
+            changed_keys = [k for k in sys.modules if k not in old_modules]
+        for k in changed_keys:
+            if k in old_modules:
+                sys.modules[k] = old_modules[k]
+            else:
+                sys.modules.pop(k, None)
+
+
+SYS_CONTEXT_LOCK = threading.RLock()
+"""
+Process wide lock serializing the modules executions : sys.path and sys.modules are shared by all the threads. It is
+held by sys_context (and thus by batch_context), by the mutable mode contexts and by the plugins on demand loads.
+"""
+
+META_PATH_ISOLATION = False
+"""
+Find the plugins modules with a finder of the loading thread instead of inserting the plugins python paths in sys.path,
+in the immutable contexts (@see glpp_import_finder). The imports of the other threads are then neither altered nor
+attributed to the plugins loads, so that the host application can import modules while plugins are loaded. The mutable
+contexts insert the python paths in sys.path : the plugins modules may import modules after the load.
+"""
+
+FULL_SYS_MODULES_DIFF = False
+"""
+Force sys_context and the batch checkpoints to compare every sys.modules entry instead of finding the added entries
+incrementally. Set it to True if plugins replace existing sys.modules entries in place in a batch : the checkpoints
+only check the entries of the loaded modules otherwise.
+"""
+
+
+def _is_file_changed(new_module: types.ModuleType, old_module: types.ModuleType) -> bool:
+    """
+    Check if a sys.modules entry now points to another file
+    :return: True if both modules have a __file__ attribute and they differ
+    """
+    try:
+        return new_module.__file__ != old_module.__file__
+    except AttributeError:
+        return False
+
+
+class GlppSysModulesTracker(object):
+    """
+    Tracker of the sys.modules changes since its creation (@see sys_context).
+
+    sys.modules is an insertion ordered dictionary : the entries added since a point in time are the ones after the
+    last key at this point. They are found by walking sys.modules backward until this key. This is valid as long as
+    no entry existing at this point has been removed (or removed then added again), which is checked by counting the
+    entries before the last key. Otherwise, and if FULL_SYS_MODULES_DIFF is True, every entry is compared.
+    In place replacements of existing entries are found by an identity check of the entries at creation, except by
+    the checkpoints which only check their watch_keys in the first case.
+
+    Checkpoints split the changes between successive loads in the same context (@see checkpoint).
+    """
+    def __init__(self) -> None:
+        self.old_modules = sys.modules.copy()
+        """
+        Copy of sys.modules at creation
+        """
+        self._attributed = set()
+        self._mark = None
+        self.reset_checkpoint()
+
+    def reset_checkpoint(self) -> None:
+        """
+        Set the checkpoint to the current sys.modules state
+        :return:
+        """
+        last_key = next(reversed(sys.modules), None)
+        self._mark = (len(sys.modules), last_key, sys.modules.get(last_key))
+
+    def remove(self, keys: List[str]) -> None:
+        """
+        Remove entries added since the tracker creation from sys.modules. They can then be reported again by a
+        checkpoint if they are added again. The checkpoint is reset.
+        :param keys: the keys to remove
+        :return:
+        """
+        for k in keys:
+            sys.modules.pop(k, None)
+            self._attributed.discard(k)
+        self.reset_checkpoint()
+
+    def _get_added_keys(self, mark: Tuple) -> List[str] or None:
+        """
+        Get the keys added since a mark
+        :param mark: (size of sys.modules, last key, last value)
+        :return: the keys in insertion order, or None if they cannot be found without a full comparison
+        """
+        old_len, last_key, last_value = mark
+        modules = sys.modules
+        if FULL_SYS_MODULES_DIFF or last_key not in modules or modules[last_key] is not last_value:
+            return None
+        added = []
+        for k in reversed(modules):
+            if k == last_key:
+                break
+            added.append(k)
+        if len(modules) - len(added) != old_len:
+            return None
+        added.reverse()
+        return added
+
+    def _get_replaced_keys(self, watch_keys: List[str]) -> List[str]:
+        old_modules = self.old_modules
+        return [k for k in watch_keys if k in old_modules and sys.modules.get(k) is not old_modules[k]]
+
+    def checkpoint(self, watch_keys: List[str] = ()) -> List[Tuple[str, types.ModuleType]]:
+        """
+        Get the changes since the last checkpoint and set a new checkpoint
+        :param watch_keys: existing keys that may have been replaced in place since the last checkpoint
+        :return: (name, module) of the added entries and of the replaced entries pointing to another file, that
+                 have not been reported by a previous checkpoint
+        """
+        modules = sys.modules
+        old_modules = self.old_modules
+        added = self._get_added_keys(self._mark)
+        if added is None:
+            added = [k for k in modules if k not in old_modules and k not in self._attributed]
+            watch_keys = old_modules.keys()
+        changes = [(k, modules[k]) for k in self._get_replaced_keys(watch_keys)
+                   if k not in self._attributed and k in modules and _is_file_changed(modules[k], old_modules[k])]
+        changes.extend((k, modules[k]) for k in added if k not in self._attributed)
+        self._attributed.update(k for k, _ in changes)
+        self.reset_checkpoint()
+        return changes
+
+    def get_changes(self) -> Tuple[List, List[str]]:
+        """
+        Get all the sys.modules changes since the tracker creation
+        :return: a tuple (modules_changes, changed_keys) :
+                 - modules_changes : (name, module) of the added entries and of the replaced entries pointing to
+                                     another file, in sys.modules order
+                 - changed_keys : keys of the added, replaced and deleted entries
+        """
+        modules = sys.modules
+        old_modules = self.old_modules
+        last_key = next(reversed(old_modules), None)
+        added = self._get_added_keys((len(old_modules), last_key, old_modules.get(last_key)))
+        if added is not None:
+            replaced = [k for k, v in old_modules.items() if modules.get(k) is not v]
+            modules_changes = [(k, modules[k]) for k in replaced
+                               if k in modules and _is_file_changed(modules[k], old_modules[k])]
+            modules_changes.extend((k, modules[k]) for k in added)
+            return modules_changes, replaced + added
+
+        modules_changes = []
+        changed_keys = []
+        for k, v in modules.items():
+            if k not in old_modules:
+                modules_changes.append((k, v))
+                changed_keys.append(k)
+                continue
+            if v is not old_modules[k]:
+                changed_keys.append(k)
+            if _is_file_changed(v, old_modules[k]):
+                modules_changes.append((k, v))
+        changed_keys.extend(k for k in old_modules if k not in modules)
+        return modules_changes, changed_keys
 
 
 @contextmanager
@@ -52,7 +223,8 @@ def sys_context(dir_path: str or List[str],
                      callback_init: Callable = sys_context_callback_init,
                      callback_init_kwargs: Dict or None = None,
                      callback_terminate: Callable = sys_context_callback_terminate,
-                     callback_terminate_kwargs: Dict or None = None) -> Generator[str, None, None]:
+                     callback_terminate_kwargs: Dict or None = None,
+                     added_paths: List[str] or None = None) -> Generator[GlppSysModulesTracker, None, None]:
     """
     Context for sys.path and sys.modules management used while dynamic loading python modules.
     If immutable is True the state at call will be restored before exiting.
@@ -61,8 +233,12 @@ def sys_context(dir_path: str or List[str],
     Regardless of the immutable argument value, the modules changes that occurred temporary or permanently are saved inm
     the modules_changes buffer.
 
+    The contexts of the threads are serialized (@see SYS_CONTEXT_LOCK).
+
     Note : loading a module alters the sys.modules dictionary by adding entries for each module imported
     at module execution time.
+    The changes are tracked with a cost proportional to the number of entries added in the context (@see
+    GlppSysModulesTracker), plus an identity check of the existing entries.
 
     :param dir_path: list of paths to add to sys.path
     :param modules_changes: list to serve as a buffer to store the changes that have occurred to sys.modules
@@ -71,54 +247,81 @@ def sys_context(dir_path: str or List[str],
     :callback_init_kwargs: keyword args dict for the callback_init call
     :callback_terminate: callback function to be called after the yield instruction
     :callback_terminate_kwargs: keyword args dict for the callback_init call
-    :return:
-    """
-    if not is_sequence(dir_path):
-        dir_path = [dir_path]
-    # Extend dir_path to add to sys.path with config.GLPP_SYS_PATH
-    # This mechanism can be used when integrating gulppy.
-    dir_path.extend(GLPP_SYS_PATH)
-    GLPP_LOGGER.debug('Context | sys.path and sys.modules : inserting {} to sys.path'.format(dir_path))
-
-    # save the current states
-    old_path = sys.path.copy()
-    old_modules = sys.modules.copy()
-    # Fix issue #1 - KeyError can occur when loading a module
-    # sys.modules = old_modules.copy()
-
-    GLPP_LOGGER.debug('Calling callback init function')
-    if callback_init_kwargs is None:
-        callback_init_kwargs = {}
-    callback_init_kwargs.update({"dir_path": dir_path,
-                                 "immutable": immutable,
-                                 "old_path": old_path,
-                                 "old_modules": old_modules,
-                                 "module_changes": modules_changes})
-    callback_init(**callback_init_kwargs)
+    :param added_paths: list to fill, if immutable is False, with the entries the context inserted in sys.path (and
+                        left at exit)
+    :return: the changes tracker, whose checkpoints can be used to split the changes between several loads
+    """
+    with SYS_CONTEXT_LOCK:
+        if not is_sequence(dir_path):
+            dir_path = [dir_path]
+        # Extend dir_path to add to sys.path with config.GLPP_SYS_PATH
+        # This mechanism can be used when integrating gulppy.
+        dir_path.extend(GLPP_SYS_PATH)
+        meta_path_isolation = META_PATH_ISOLATION and immutable
+        if meta_path_isolation:
+            GLPP_LOGGER.debug('Context | sys.modules : finding modules in {}'.format(dir_path))
+        else:
+            GLPP_LOGGER.debug('Context | sys.path and sys.modules : inserting {} to sys.path'.format(dir_path))
+
+        # save the current states
+        old_path = sys.path.copy()
+        tracker = GlppSysModulesTracker()
+        old_modules = tracker.old_modules
+        # Fix issue #1 - KeyError can occur when loading a module
+        # sys.modules = old_modules.copy()
+
+        with glpp_import_finder.finder_context(dir_path) if meta_path_isolation else nullcontext() as finder:
+            GLPP_LOGGER.debug('Calling callback init function')
+            if callback_init_kwargs is None:
+                callback_init_kwargs = {}
+            callback_init_kwargs.update({"dir_path": dir_path,
+                                         "immutable": immutable,
+                                         "old_path": old_path,
+                                         "old_modules": old_modules,
+                                         "module_changes": modules_changes,
+                                         "meta_path_isolation": meta_path_isolation})
+            callback_init(**callback_init_kwargs)
 
-    try:
-        # Code will be played here
-        yield
-    finally:
-        # store changes in modules_changes
-        for k, v in sys.modules.items():
-            if k not in old_modules:
-                modules_changes.append((k, v))
-                continue
             try:
-                if v.__file__ != old_modules[k].__file__:
-                    modules_changes.append((k, v))
-            except AttributeError:
-                pass
+                # Code will be played here
+                yield tracker
+            finally:
+                # store changes in modules_changes
+                changes, changed_keys = tracker.get_changes()
+                if finder is not None:
+                    # the modules imported meanwhile by the other threads are left as they are
+                    changes = [(k, v) for k, v in changes if k not in finder.foreign]
+                    changed_keys = [k for k in changed_keys if k not in finder.foreign]
+                modules_changes.extend(changes)
+
+                GLPP_LOGGER.debug('Calling callback terminate function')
+                if callback_terminate_kwargs is None:
+                    callback_terminate_kwargs = {}
+                callback_terminate_kwargs.update({"immutable": immutable,
+                                                  "old_path": old_path,
+                                                  "old_modules": old_modules,
+                                                  "module_changes": modules_changes,
+                                                  "changed_keys": changed_keys,
+                                                  "meta_path_isolation": meta_path_isolation})
+                callback_terminate(**callback_terminate_kwargs)
+                if added_paths is not None and not immutable:
+                    added_paths.extend(_get_added_paths(old_path))
+
 
-        GLPP_LOGGER.debug('Calling callback terminate function')
-        if callback_terminate_kwargs is None:
-            callback_terminate_kwargs = {}
-        callback_terminate_kwargs.update({"immutable": immutable,
-                                          "old_path": old_path,
-                                          "old_modules": old_modules,
-                                          "module_changes": modules_changes})
-        callback_terminate(**callback_terminate_kwargs)
+def _get_added_paths(old_path: List[str]) -> List[str]:
+    """
+    Get the sys.path entries added since a copy of sys.path. An entry inserted again is added.
+    :param old_path: the copy of sys.path
+    :return: the added entries, in sys.path order
+    """
+    remaining = Counter(old_path)
+    added = []
+    for cpath in sys.path:
+        if remaining[cpath] > 0:
+            remaining[cpath] -= 1
+        else:
+            added.append(cpath)
+    return added
 
 
 def is_sequence(iterable: List or str) -> bool:
@@ -155,6 +358,86 @@ def is_in_package(filename: str) -> bool:
     return False
 
 
+def _absolute_path(path: Path or str) -> Path or str:
+    """
+    Convert a relative path to an absolute path, with a warning
+    """
+    if not Path(path).is_absolute():
+        old_ = path
+        path = Path(path).resolve()
+        GLPP_LOGGER.warning('Automatic conversion from relative to absolute path : {} -> {}.\n'
+                            'Please provide absolute path'.format(old_, path))
+    return path
+
+
+def _get_existing_module(module_fullname: str, module_path: Path or str, immutable: bool) -> types.ModuleType or None:
+    """
+    Check a module name against sys.modules before loading it
+    :return: the module already loaded from module_path in mutable mode, None if the module has to be loaded
+    """
+    if module_fullname in sys.modules:
+        # Module already exists in sys.modules
+        # If we want sys.modules and sys.path to be mutable we cannot load this module
+        if not immutable:
+            if not glpp_archive.is_same_file(module_path, sys.modules[module_fullname].__file__):
+                # Not the same file
+                raise glpp_exceptions.ModuleAlreadyExistsError(module_fullname, sys.modules[module_fullname])
+            else:
+                # Already loaded
+                return sys.modules[module_fullname]
+        else:
+            if not glpp_archive.is_same_file(module_path, sys.modules[module_fullname].__file__):
+                GLPP_LOGGER.warning('An existing module with the same name but pointing to an other file already exists'
+                                    ' in sys.modules for module {}'.format(sys.modules[module_fullname]))
+    return None
+
+
+def _exec_module(module_fullname: str,
+                 module_path: Path or str,
+                 namespace: glpp_namespace.GlppNamespace or None = None) -> types.ModuleType:
+    """
+    Execute a module file and register it in sys.modules.
+    As with the import system, the module is registered before its execution so that the modules it imports can
+    import it (the submodules of a package importing their package for instance).
+    The module of a namespace is compiled from its sources with its imports rewritten (@see glpp_namespace).
+    """
+    if namespace is not None:
+        spec = glpp_namespace.spec_from_file_location(namespace, module_fullname, module_path)
+    else:
+        spec = glpp_bundle.find_frozen_spec(module_fullname, module_path)
+    if spec is None:
+        spec = glpp_archive.spec_from_file_location(module_fullname, module_path)
+    module = importlib_util.module_from_spec(spec)
+    previous = sys.modules.get(module_fullname)
+    sys.modules[module_fullname] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        if previous is None:
+            sys.modules.pop(module_fullname, None)
+        else:
+            sys.modules[module_fullname] = previous
+        raise
+    # the execution may have replaced the entry. A new entry is moved after the entries of the imported modules, as
+    # if it had been added after the execution.
+    if previous is None:
+        sys.modules.pop(module_fullname, None)
+    sys.modules[module_fullname] = module
+    return module
+
+
+def _set_module_package(module: types.ModuleType, module_fullname: str, module_path: Path or str) -> None:
+    """
+    Set the package attributes of a loaded module
+    """
+    if is_package(module_path):
+        module.__path__ = [os.fspath(Path(module_path).parent)]
+        module.__package__ = module_fullname
+    else:
+        module_package, _, _ = module_fullname.rpartition('.')
+        module.__package__ = module_package
+
+
 def load_module(module_fullname: str,
                 module_path: Path or str,
                 module_root_path: str or List[str] = (),
@@ -162,7 +445,10 @@ def load_module(module_fullname: str,
                 callback_init: Callable = sys_context_callback_init,
                 callback_init_kwargs: Dict or None = None,
                 callback_terminate: Callable = sys_context_callback_terminate,
-                callback_terminate_kwargs: Dict or None = None) -> Tuple[types.ModuleType, List]:
+                callback_terminate_kwargs: Dict or None = None,
+                preload: Dict[str, types.ModuleType] or None = None,
+                namespace: glpp_namespace.GlppNamespace or None = None,
+                added_paths: List[str] or None = None) -> Tuple[types.ModuleType, List]:
     """
     Load a python module
 
@@ -175,50 +461,35 @@ def load_module(module_fullname: str,
     :callback_init_kwargs: keyword args dict for the callback_init call
     :callback_terminate: callback function to be called after the yield instruction
     :callback_terminate_kwargs: keyword args dict for the callback_init call
+    :param preload: {module_fullname: module} of already loaded modules to put in sys.modules for the load
+                    (@see load_modules)
+    :param namespace: registered namespace to import the module under (@see glpp_namespace). The module name, the
+                      preloaded modules names and the added modules names are given without the namespace prefix.
+    :param added_paths: list to fill, if immutable is False, with the entries inserted in sys.path (@see sys_context)
     :return: a tuple (module, added_modules) :
          - module : the effective loaded module
          - added_modules : list of modules added in the loading context. If immutable is True, those modules are
                            not presents in the output context.
     """
     # check if absolute path are given for module_path
-    if not Path(module_path).is_absolute():
-        old_ = module_path
-        module_path = Path(module_path).resolve()
-        GLPP_LOGGER.warning('Automatic conversion from relative to absolute path : {} -> {}.\n'
-                            'Please provide absolute path'.format(old_, module_path))
+    module_path = _absolute_path(module_path)
 
     # also check if absolute path are given for module_path
     # first test if module_root_path is a single string or a sequence of paths
     if not is_sequence(module_root_path):
         module_root_path = [module_root_path]
-    module_root_path_ = []
-    for cpath in module_root_path:
-        if not Path(cpath).is_absolute():
-            old_ = cpath
-            cpath = Path(cpath).resolve()
-            GLPP_LOGGER.warning('Automatic conversion from relative to absolute path : {} -> {}.\n'
-                                'Please provide absolute path'.format(old_, cpath))
-        module_root_path_.append(cpath)
-    module_root_path = module_root_path_
+    module_root_path = [_absolute_path(cpath) for cpath in module_root_path]
 
     # just to be sure : we replace / by . in module_fullname
     module_fullname = '.'.join(module_fullname.split(os.sep))
+    if namespace is not None:
+        module_fullname = namespace.to_sys(module_fullname)
+        preload = _to_sys_names(namespace, preload)
     GLPP_LOGGER.debug('Loading module {} from file {}...'.format(module_fullname, module_path))
 
-    if module_fullname in sys.modules:
-        # Module already exists in sys.modules
-        # If we want sys.modules and sys.path to be mutable we cannot load this module
-        if not immutable:
-            if not Path(module_path).resolve().samefile(Path(sys.modules[module_fullname].__file__).resolve()):
-                # Not the same file
-                raise glpp_exceptions.ModuleAlreadyExistsError(module_fullname, sys.modules[module_fullname])
-            else:
-                # Already loaded
-                return sys.modules[module_fullname], []
-        else:
-            if not Path(module_path).resolve().samefile(Path(sys.modules[module_fullname].__file__).resolve()):
-                GLPP_LOGGER.warning('An existing module with the same name but pointing to an other file already exists'
-                                    ' in sys.modules for module {}'.format(sys.modules[module_fullname]))
+    module = _get_existing_module(module_fullname, module_path, immutable)
+    if module is not None:
+        return module, []
 
     # load module in a context in order to manage mutable or immutable sys.path and sys.module
     # if immutable is True : sys.path and sys.module will be restored to their previous state and no reference of the
@@ -230,18 +501,227 @@ def load_module(module_fullname: str,
                      callback_init=callback_init,
                      callback_init_kwargs=callback_init_kwargs,
                      callback_terminate=callback_terminate,
-                     callback_terminate_kwargs=callback_terminate_kwargs):
-        spec = importlib_util.spec_from_file_location(module_fullname, module_path)
-        module = importlib_util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        # manually add the modules to the sys.modules
-        sys.modules[module_fullname] = module
+                     callback_terminate_kwargs=callback_terminate_kwargs,
+                     added_paths=added_paths):
+        with _preload_context(preload, immutable):
+            module = _exec_module(module_fullname, module_path, namespace)
 
-    if is_package(module_path):
-        module.__path__ = [module_path]
-        module.__package__ = module_fullname
+    if preload:
+        added_modules[:] = [(k, v) for k, v in added_modules if preload.get(k) is not v]
+    _set_module_package(module, module_fullname, module_path)
+    if namespace is not None:
+        added_modules[:] = [(namespace.from_sys(k), v) for k, v in added_modules]
+    return module, added_modules
+
+
+def _to_sys_names(namespace: glpp_namespace.GlppNamespace,
+                  modules: Dict[str, types.ModuleType] or None) -> Dict[str, types.ModuleType] or None:
+    """
+    Convert the names of modules to their sys.modules names in a namespace (@see glpp_namespace.GlppNamespace.to_sys)
+    """
+    if modules is None:
+        return None
+    return {namespace.to_sys(k): v for k, v in modules.items()}
+
+
+@contextmanager
+def _preload_context(preload: Dict[str, types.ModuleType] or None,
+                     immutable: bool) -> Generator[Dict[str, types.ModuleType], None, None]:
+    """
+    Put already loaded modules in sys.modules within a load context (@see load_modules)
+    :param preload: {module_fullname: module} of the modules to put in sys.modules
+    :param immutable: boolean flag to replace the existing entries, put back at exit. Otherwise the existing entries
+                      are kept.
+    :return: the preloaded modules
+    """
+    preload = preload or {}
+    # entries replaced by the preloaded modules are put back before exiting the context
+    replaced = {k: sys.modules[k] for k in preload if k in sys.modules} if immutable else {}
+    for module_fullname, module in preload.items():
+        if immutable:
+            sys.modules[module_fullname] = module
+        else:
+            sys.modules.setdefault(module_fullname, module)
+    try:
+        yield preload
+    finally:
+        sys.modules.update(replaced)
+
+
+_BATCH = threading.local()
+
+
+@contextmanager
+def batch_context() -> Generator[GlppSysModulesTracker, None, None]:
+    """
+    Immutable context shared by several load_modules calls (typically the plugins of a repository).
+
+    Within a batch context, load_modules calls in immutable mode and with the default callbacks do not open their
+    own sys_context : they insert their paths in sys.path, load their modules and, at exit, restore sys.path and
+    remove from sys.modules the modules located in their paths. The other added modules (third party or standard
+    modules) are kept in sys.modules until the end of the batch, so that they are executed once for all the loads.
+    They are attributed to the first load that imported them. sys.path and sys.modules are restored at exit.
+    :return: the changes tracker of the batch
+    """
+    previous = getattr(_BATCH, 'tracker', None)
+    with sys_context([], modules_changes=[], immutable=True) as tracker:
+        _BATCH.tracker = tracker
+        try:
+            yield tracker
+        finally:
+            _BATCH.tracker = previous
+
+
+def _is_module_in_paths(module: types.ModuleType, paths: List[str]) -> bool:
+    """
+    Check if a module file (or a namespace package path) is located in one of the paths
+    """
+    files = [getattr(module, '__file__', None)] + list(getattr(module, '__path__', None) or [])
+    return any(isinstance(f, str) and any(f.startswith(p) for p in paths) for f in files)
+
+
+@contextmanager
+def _batch_sub_context(tracker: GlppSysModulesTracker,
+                       dir_path: List[str]) -> Generator[GlppSysModulesTracker, None, None]:
+    """
+    Load context used within a batch context (@see batch_context)
+    :param tracker: the batch changes tracker
+    :param dir_path: list of paths to add to sys.path
+    :return: the batch changes tracker
+    """
+    old_path = sys.path
+    dir_path = [os.fspath(Path(cpath).resolve()) for cpath in list(dir_path) + list(GLPP_SYS_PATH)]
+    meta_path_isolation = META_PATH_ISOLATION
+    if meta_path_isolation:
+        finder_context = glpp_import_finder.finder_context(dir_path)
     else:
-        module_package, _, _ = module_fullname.rpartition('.')
-        module.__package__ = module_package
+        finder_context = nullcontext()
+        sys.path = dir_path + old_path
+    mark = tracker._mark
+    tracker.reset_checkpoint()
+    try:
+        with finder_context:
+            yield tracker
+    finally:
+        if not meta_path_isolation:
+            sys.path = old_path
+        added = tracker._get_added_keys(mark)
+        if added is None:
+            added = [k for k in sys.modules if k not in tracker.old_modules]
+        prefixes = [p.rstrip(os.sep) + os.sep for p in dir_path]
+        tracker.remove([k for k in added
+                        if k in sys.modules and _is_module_in_paths(sys.modules[k], prefixes)])
 
-    return module, added_modules
+
+def _load_batch_module(tracker: GlppSysModulesTracker,
+                       module_fullname: str,
+                       module_path: str,
+                       immutable: bool,
+                       executed: List,
+                       namespace: glpp_namespace.GlppNamespace or None = None) -> Tuple[types.ModuleType, List]:
+    """
+    Load a module in the context of load_modules
+    :param executed: list of the executed modules (module, module_fullname, module_path) to complete
+    :param namespace: namespace of the module, whose name is prefixed
+    :return: a tuple (module, added_modules)
+    """
+    GLPP_LOGGER.debug('Loading module {} from file {}...'.format(module_fullname, module_path))
+    module = sys.modules.get(module_fullname)
+    module_file = getattr(module, '__file__', None)
+    if module_fullname not in tracker.old_modules and module_file is not None and \
+            glpp_archive.is_same_file(module_path, module_file):
+        # already loaded in this context as a dependency of a previous module
+        return module, []
+    module = _get_existing_module(module_fullname, module_path, immutable)
+    if module is not None:
+        return module, []
+    module = _exec_module(module_fullname, module_path, namespace)
+    executed.append((module, module_fullname, module_path))
+    changes = tracker.checkpoint(watch_keys=[module_fullname])
+    foreign = glpp_import_finder.get_foreign_modules()
+    return module, [(k, v) for k, v in changes if k not in foreign] if foreign else changes
+
+
+def load_modules(modules: List[Tuple[str, Path or str]],
+                 module_root_path: str or List[str] = (),
+                 immutable: bool = True,
+                 callback_init: Callable = sys_context_callback_init,
+                 callback_init_kwargs: Dict or None = None,
+                 callback_terminate: Callable = sys_context_callback_terminate,
+                 callback_terminate_kwargs: Dict or None = None,
+                 stats: List[Dict] or None = None,
+                 profiler: GlppImportProfiler or None = None,
+                 preload: Dict[str, types.ModuleType] or None = None,
+                 namespace: glpp_namespace.GlppNamespace or None = None,
+                 added_paths: List[str] or None = None) -> List[Tuple[types.ModuleType, List]]:
+    """
+    Load several python modules in a single sys_context (@see load_module).
+
+    The modules are loaded in order. A module can use the modules loaded before it : a dependency shared by several
+    modules is executed once and attributed to the first module that imported it. Within a batch context (@see
+    batch_context), the shared batch context is used instead of a new sys_context if immutable is True and the
+    default callbacks are used.
+
+    :param modules: list of (module_fullname, module_path)
+    :param module_root_path: path (or list of path) that needed to be (temporary if immutable) added to the sys.path
+    :param immutable: boolean flag to not permanently alter sys.path and sys.modules
+    :callback_init: callback function to be called right before the yield instruction
+    :callback_init_kwargs: keyword args dict for the callback_init call
+    :callback_terminate: callback function to be called after the yield instruction
+    :callback_terminate_kwargs: keyword args dict for the callback_init call
+    :param stats: list to fill with the measure of each module load (@see glpp_load_stats.measure). Modules already
+                  loaded are measured too.
+    :param profiler: started import profiler (@see glpp_import_profiler) : each module is recorded as a section
+    :param preload: {module_fullname: module} of already loaded modules to put in sys.modules for the loads (the
+                    parent packages of the modules for instance). In immutable mode they are removed at exit. In
+                    mutable mode, existing sys.modules entries are not replaced. They are not reported as added
+                    modules. A loaded module is bound to its parent package if the parent is preloaded.
+    :param namespace: registered namespace to import the modules under (@see load_module)
+    :param added_paths: list to fill, if immutable is False, with the entries inserted in sys.path (@see sys_context)
+    :return: for each module, a tuple (module, added_modules) (@see load_module)
+    """
+    if not is_sequence(module_root_path):
+        module_root_path = [module_root_path]
+    module_root_path = [_absolute_path(cpath) for cpath in module_root_path]
+    modules = [('.'.join(module_fullname.split(os.sep)), _absolute_path(module_path))
+               for module_fullname, module_path in modules]
+    if namespace is not None:
+        modules = [(namespace.to_sys(module_fullname), module_path) for module_fullname, module_path in modules]
+        preload = _to_sys_names(namespace, preload)
+
+    batch_tracker = getattr(_BATCH, 'tracker', None)
+    if batch_tracker is not None and immutable and callback_init is sys_context_callback_init and \
+            callback_terminate is sys_context_callback_terminate:
+        context = _batch_sub_context(batch_tracker, module_root_path)
+    else:
+        context = sys_context(module_root_path,
+                              modules_changes=[],
+                              immutable=immutable,
+                              callback_init=callback_init,
+                              callback_init_kwargs=callback_init_kwargs,
+                              callback_terminate=callback_terminate,
+                              callback_terminate_kwargs=callback_terminate_kwargs,
+                              added_paths=added_paths)
+
+    results = []
+    executed = []
+    with context as tracker, _preload_context(preload, immutable) as preload:
+        tracker.reset_checkpoint()
+        for module_fullname, module_path in modules:
+            with glpp_load_stats.measure() as module_stats, \
+                    profiler.section(module_fullname) if profiler is not None else nullcontext():
+                results.append(_load_batch_module(tracker, module_fullname, module_path, immutable, executed,
+                                                  namespace))
+            parent_name, _, attr_name = module_fullname.rpartition('.')
+            if parent_name in preload:
+                # as done by the import system : a from import of the module gets it from its parent package
+                setattr(preload[parent_name], attr_name, results[-1][0])
+            if stats is not None:
+                stats.append(module_stats)
+
+    for module, module_fullname, module_path in executed:
+        _set_module_package(module, module_fullname, module_path)
+    if namespace is not None:
+        results = [(module, [(namespace.from_sys(k), v) for k, v in context_modules])
+                   for module, context_modules in results]
+    return results
@@ -2,12 +2,14 @@
 """
 Gulppy Module Plugin class definition
 """
-from pathlib import Path
 from typing import NoReturn, List, Dict, Tuple
 import types
 from gulppy.core.glpp_abstract_plugin import GlppAbstractPlugin, safe_python_path, GlppPluginLoadStatus
 from gulppy.core.glpp_plugin_factory import GlppPluginFactory
-from gulppy.core.glpp_module_loader import load_module
+from gulppy.core.glpp_plugin_descriptor import GlppPluginDescriptor
+from gulppy.core.glpp_module_loader import SYS_CONTEXT_LOCK, load_module, load_modules
+from gulppy.core import glpp_load_stats, glpp_archive, glpp_bundle
+from gulppy.core.glpp_import_profiler import GlppImportProfiler
 from gulppy.config import GLPP_LOGGER
 
 
@@ -19,13 +21,26 @@ class GlppModulePlugin(GlppAbstractPlugin):
     This implementation is based on an explicit declaration of the modules that have to be imported.
     Therefore it does not import python modules that may be present in the package and not somehow used by
     the declared modules.
+
+    In lazy mode (@see GlppAbstractPlugin.load), the load only checks that the main modules files exist and registers
+    them as pending modules. A pending module is executed the first time it is requested by get_module, using the
+    mutable mode that was active at load. Requesting an unknown key executes all the pending modules, as it may be
+    an internal module of one of them.
     """
     IMMUTABLE_SYS_PATH_MODULE = True
 
+    _MATERIALIZE_LOCK = SYS_CONTEXT_LOCK
+    """
+    Lock serializing the lazy modules executions : sys.modules and sys.path are process wide
+    (@see glpp_module_loader.SYS_CONTEXT_LOCK)
+    """
+
     def __init__(self,
                  plugin_desc: str,
-                 load: bool = True) -> None:
-        super().__init__(plugin_desc, load)
+                 load: bool = True,
+                 descriptor: GlppPluginDescriptor or None = None) -> None:
+        self._pending_modules = {}
+        super().__init__(plugin_desc, load, descriptor)
 
     def _load(self):
         """
@@ -33,9 +48,118 @@ class GlppModulePlugin(GlppAbstractPlugin):
         This implementation overrides AbstractPlugin.load abstract method.
         :return:
         """
-        self._load_all_modules(self.desc_main_modules)
+        if self.lazy:
+            self._register_all_modules(self.desc_main_modules)
+        else:
+            self._load_all_modules(self.desc_main_modules)
+
+    @property
+    def pending_modules(self) -> List[str]:
+        """
+        Get the main modules tags that have not been executed yet (lazy mode)
+        """
+        return list(self._pending_modules)
+
+    def get_modules_status(self) -> Dict[str, GlppPluginLoadStatus]:
+        """
+        Get the load status of each main module : LOADED once the module has been executed, NOT_LOADED otherwise
+        :return: {module_tag: load status}
+        """
+        return {module_tag: GlppPluginLoadStatus.LOADED if module_tag in self._modules
+                else GlppPluginLoadStatus.NOT_LOADED
+                for module_tag in self.desc_main_modules}
+
+    def get_module(self, key: str) -> types.ModuleType:
+        """
+        Get a module in the current plugin from its key (@see GlppAbstractPlugin.get_module).
+        In lazy mode, the module is executed at first request.
+        :param key: the key of the module
+        :return: a python module
+        """
+        try:
+            return self._modules[key]
+        except KeyError:
+            pass
+        if len(self._pending_modules) > 0:
+            if key in self._pending_modules:
+                self.load_pending_modules(module_tags=[key])
+            elif key not in self._i_modules:
+                # the key may be an internal module of a pending module
+                self.load_pending_modules()
+        return super().get_module(key)
+
+    def load_pending_modules(self, module_tags: List[str] or None = None) -> NoReturn:
+        """
+        Execute pending modules (lazy mode)
+        :param module_tags: the main modules tags to execute. If None, all the pending modules are executed.
+        :return: None
+        """
+        with self.__class__._MATERIALIZE_LOCK:
+            if module_tags is None:
+                module_tags = list(self._pending_modules)
+            for module_tag in module_tags:
+                # another thread may have executed the module while waiting for the lock
+                module_file = self._pending_modules.get(module_tag)
+                if module_file is None:
+                    continue
+                with self._plugin_errors(), glpp_load_stats.measure() as stats, self._profile_imports(module_tag):
+                    module, context_modules = self._load_module(module_name=module_tag,
+                                                                file=module_file,
+                                                                immutable=self._immutable)
+                self._add_module_stats(module_tag, stats, len(context_modules))
+                self._indirect_modules.extend(context_modules)
+                self._i_modules = {k: v for k, v in self._indirect_modules
+                                   if k not in self._modules and k != module_tag}
+                self._modules[module_tag] = module
+                self._record_dependencies(module_tag, context_modules)
+                del self._pending_modules[module_tag]
+
+    def _clear_modules(self) -> None:
+        """
+        Drop the references to the loaded and pending modules (@see GlppAbstractPlugin.unload)
+        :return:
+        """
+        with self.__class__._MATERIALIZE_LOCK:
+            super()._clear_modules()
+            self._indirect_modules = []
+            self._pending_modules = {}
 
-    def _load_module(self, module_name: str, file: str) -> Tuple[types.ModuleType, List]:
+    def reload_changed(self) -> List[str]:
+        """
+        Execute again the changed modules and their dependents (@see GlppAbstractPlugin.reload_changed)
+        """
+        with self.__class__._MATERIALIZE_LOCK:
+            return super().reload_changed()
+
+    def _replace_module(self, module_name: str, module: types.ModuleType, context_modules: List) -> None:
+        """
+        Replace a module executed again, in the indirect modules as well (@see GlppAbstractPlugin.reload_changed)
+        """
+        super()._replace_module(module_name, module, context_modules)
+        self._indirect_modules = [(k, module if k == module_name else v) for k, v in self._indirect_modules] + \
+            list(context_modules)
+
+    def _register_all_modules(self, main_modules_desc: Dict[str, str]) -> NoReturn:
+        """
+        Register all modules declared in the main_modules_desc dictionary as pending modules without executing them
+
+        :param main_modules_desc: dictionary containing the modules to load as key=module_tag and value=module_file
+        :return: None
+        """
+        for module_tag, module_file in main_modules_desc.items():
+            module_path = safe_python_path(path=module_file, root=self.plugin_root)
+            if not glpp_archive.is_file(module_path) and glpp_bundle.get_frozen_code(module_path) is None:
+                raise FileNotFoundError('Module file {} of module {} not found'.format(module_file, module_tag))
+        self._indirect_modules = []
+        self._modules = {}
+        self._i_modules = {}
+        self._pending_modules = dict(main_modules_desc)
+        self._load_status = GlppPluginLoadStatus.LOADED
+
+    def _load_module(self,
+                     module_name: str,
+                     file: str,
+                     immutable: bool or None = None) -> Tuple[types.ModuleType, List]:
         """
         Load a python module file.
 
@@ -45,24 +169,56 @@ class GlppModulePlugin(GlppAbstractPlugin):
 
         :param module_tag: the module name that will be used as the module name.
         :param file: path of the module
+        :param immutable: mutable mode to use. If None, the mutable mode of the plugin load is used.
         :return: a tuple containing the module and the list of added modules (dependancies)
         """
         GLPP_LOGGER.debug('Loading module <{}> from file {}...'.format(module_name, file))
-        file = safe_python_path(path=file, root=Path(self.plugin_desc).resolve().parent)
+        file = safe_python_path(path=file, root=self.plugin_root)
+        if immutable is None:
+            immutable = self._immutable
         module, context_modules = load_module(module_fullname=module_name,
                                               module_path=file,
-                                              module_root_path=self.python_path,
-                                              immutable=self.__class__.IMMUTABLE_SYS_PATH_MODULE,
+                                              module_root_path=self._get_module_root_path(),
+                                              immutable=immutable,
                                               callback_init=self.sys_context_callback_init,
-                                              callback_terminate=self.sys_context_callback_terminate)
+                                              callback_terminate=self.sys_context_callback_terminate,
+                                              preload=self._get_dependency_modules(),
+                                              namespace=self._namespace,
+                                              added_paths=self._sys_path_added)
         return module, context_modules
 
+    def _load_modules(self,
+                      main_modules_desc: Dict[str, str],
+                      stats: List[Dict] or None = None,
+                      profiler: GlppImportProfiler or None = None) -> List[Tuple[types.ModuleType, List]]:
+        """
+        Load python module files in a single context (@see glpp_module_loader.load_modules).
+        A dependency shared by several modules is executed once and attributed to the first module importing it.
+
+        :param main_modules_desc: dictionary containing the modules to load as key=module_tag and value=module_file
+        :param stats: list to fill with the measure of each module load (@see glpp_load_stats.measure)
+        :param profiler: started import profiler recording each module (@see glpp_module_loader.load_modules)
+        :return: for each module, a tuple containing the module and the list of added modules (dependancies)
+        """
+        GLPP_LOGGER.debug('Loading modules {} in a single context...'.format(list(main_modules_desc)))
+        return load_modules(modules=[(module_tag, safe_python_path(path=module_file, root=self.plugin_root))
+                                     for module_tag, module_file in main_modules_desc.items()],
+                            module_root_path=self._get_module_root_path(),
+                            immutable=self._immutable,
+                            callback_init=self.sys_context_callback_init,
+                            callback_terminate=self.sys_context_callback_terminate,
+                            stats=stats,
+                            profiler=profiler,
+                            preload=self._get_dependency_modules(),
+                            namespace=self._namespace,
+                            added_paths=self._sys_path_added)
+
     def _load_all_modules(self, main_modules_desc: Dict[str, str]) -> NoReturn:
         """
         Load all modules declared in the main_modules_desc dictionary
 
         This method add the _indirect_modules member as a list. It contains all modules that are inserted as dependancies
-        for all the independantly loaded modules.
+        for all the independantly loaded modules (or, in batch mode, for the modules loaded in a single context).
         Note : _indirect_modules and _modules members could have intersections.
 
         :param main_modules_desc: dictionary containing the modules to load as key=module_tag and value=module_file
@@ -70,9 +226,22 @@ class GlppModulePlugin(GlppAbstractPlugin):
         """
         self._indirect_modules = []
         self._modules = {}
-        for module_tag, module_file in main_modules_desc.items():
-            module, context_modules = self._load_module(module_name=module_tag, file=module_file)
+        self._pending_modules = {}
+        stats = []
+        if self.batch:
+            with self._profile_imports() as profiler:
+                loaded = self._load_modules(main_modules_desc, stats=stats, profiler=profiler)
+        else:
+            loaded = []
+            for module_tag, module_file in main_modules_desc.items():
+                with glpp_load_stats.measure() as module_stats, self._profile_imports(module_tag):
+                    loaded.append(self._load_module(module_name=module_tag, file=module_file))
+                stats.append(module_stats)
+        for module_tag, (module, context_modules), module_stats in zip(main_modules_desc, loaded, stats):
             self._modules[module_tag] = module
             self._indirect_modules.extend(context_modules)
+            self._add_module_stats(module_tag, module_stats, len(context_modules))
         self._i_modules = {k: v for k, v in self._indirect_modules if k not in self._modules}
+        for module_tag, (_, context_modules) in zip(main_modules_desc, loaded):
+            self._record_dependencies(module_tag, context_modules)
         self._load_status = GlppPluginLoadStatus.LOADED
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+Gulppy plugins namespaces
+
+In the namespaced mutable mode (@see glpp_plugin_factory.MutableModeEnum.NAMESPACED), the modules of a plugin are
+imported under a prefix derived from its unique id (@see GlppAbstractPlugin.get_unique_id) :
+my_plugin.plugin_1_main is registered in sys.modules as _glpp_ns.my_plugin__1_0.my_plugin.plugin_1_main. Several
+plugins, or several versions of a plugin, defining the same modules names can then be loaded in mutable mode.
+
+The modules of a namespace are found by a finder of sys.meta_path (@see install) in the python paths of the plugin :
+they are not inserted in sys.path. The sources of the modules are compiled with their absolute imports of the plugin
+top level modules rewritten to the prefix (@see GlppNamespaceLoader) :
+
+    import my_plugin.lib            ->  import _glpp_ns.my_plugin__1_0.my_plugin.lib as my_plugin
+                                        from _glpp_ns.my_plugin__1_0 import my_plugin
+    from my_plugin.lib import lib   ->  from _glpp_ns.my_plugin__1_0.my_plugin.lib import lib
+
+The relative imports need no rewriting. The imports of the top level modules of namespaced dependencies are
+rewritten to their namespace (@see GlppNamespace.aliases). The dynamic imports (importlib.import_module, __import__)
+and the frozen or compiled modules are not rewritten.
+"""
+import ast
+import importlib
+import os
+import pkgutil
+import re
+import sys
+import threading
+import types
+from importlib import abc as importlib_abc
+from importlib import util as importlib_util
+from importlib.machinery import ModuleSpec, PathFinder
+from pathlib import Path
+from typing import Dict, Iterable, List
+from gulppy.core import glpp_archive
+
+NAMESPACE_ROOT = '_glpp_ns'
+"""
+Package holding the plugins namespaces in sys.modules
+"""
+
+
+class GlppNamespace(object):
+    """
+    The namespace of a plugin : its prefix and the top level modules names imported under the prefix
+    """
+    def __init__(self,
+                 unique_id: str,
+                 paths: List[str or Path],
+                 names: Iterable[str] = (),
+                 aliases: Dict[str, str] or None = None) -> None:
+        """
+        Constructor
+        :param unique_id: the plugin unique id, converted to a module name
+        :param paths: the plugin python paths, in priority order
+        :param names: module names to import under the prefix in addition to the top level modules of the python
+                      paths (the main modules)
+        :param aliases: {top level module name: prefix} of the modules imported from another namespace (the
+                        dependencies). The names of the namespace take precedence.
+        """
+        self.prefix = '{}.{}'.format(NAMESPACE_ROOT, re.sub(r'\W', '_', unique_id))
+        self.paths = [os.fspath(Path(p).resolve()) for p in paths]
+        self.local_names = {name for _, name, _ in pkgutil.iter_modules(self.paths)}
+        self.local_names.update(name.partition('.')[0] for name in names)
+        self.aliases = {k: v for k, v in (aliases or {}).items() if k not in self.local_names}
+
+    def to_sys(self, module_fullname: str) -> str:
+        """
+        Get the sys.modules name of a module imported by the plugin
+        :param module_fullname: the module name, as written in the plugin sources
+        :return: the prefixed name for the modules of the namespace (or of an aliased namespace), the name otherwise
+        """
+        top_name = module_fullname.partition('.')[0]
+        if top_name in self.local_names:
+            return '{}.{}'.format(self.prefix, module_fullname)
+        if top_name in self.aliases:
+            return '{}.{}'.format(self.aliases[top_name], module_fullname)
+        return module_fullname
+
+    def from_sys(self, module_fullname: str) -> str:
+        """
+        Get the name written in the plugin sources of a sys.modules entry (@see to_sys)
+        """
+        for prefix in [self.prefix] + list(self.aliases.values()):
+            if module_fullname.startswith(prefix + '.'):
+                return module_fullname[len(prefix) + 1:]
+        return module_fullname
+
+
+class _GlppImportTransformer(ast.NodeTransformer):
+    """
+    Rewrite the absolute imports of a namespace modules (@see GlppNamespace.to_sys)
+    """
+    def __init__(self, namespace: GlppNamespace) -> None:
+        self.namespace = namespace
+
+    def visit_Import(self, node: ast.Import) -> List[ast.stmt]:
+        statements = []
+        for alias in node.names:
+            name = self.namespace.to_sys(alias.name)
+            if name == alias.name:
+                statements.append(ast.Import(names=[alias]))
+            elif alias.asname is not None:
+                statements.append(ast.Import(names=[ast.alias(name=name, asname=alias.asname)]))
+            else:
+                # import a.b binds a : the submodules are imported, then the top level module is bound
+                top_name = alias.name.partition('.')[0]
+                if '.' in alias.name:
+                    statements.append(ast.Import(names=[ast.alias(name=name, asname=top_name)]))
+                statements.append(ast.ImportFrom(module=name[:-len(alias.name) - 1],
+                                                 names=[ast.alias(name=top_name, asname=None)],
+                                                 level=0))
+        return [ast.copy_location(statement, node) for statement in statements]
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> ast.ImportFrom:
+        if node.level == 0 and node.module is not None:
+            node.module = self.namespace.to_sys(node.module)
+        return node
+
+
+class GlppNamespaceLoader(importlib_abc.SourceLoader):
+    """
+    Loader of the python sources of a namespace (in an archive or not), compiled with their imports rewritten. The
+    compiled code is not cached : the bytecode cache of the sources is left to the not namespaced loads.
+    """
+    def __init__(self, namespace: GlppNamespace, fullname: str, path: str) -> None:
+        self.namespace = namespace
+        self.name = fullname
+        self.path = path
+
+    def get_filename(self, fullname: str or None = None) -> str:
+        return self.path
+
+    def get_data(self, path: str) -> bytes:
+        return glpp_archive.read_bytes(path)
+
+    def get_code(self, fullname: str) -> types.CodeType:
+        tree = _GlppImportTransformer(self.namespace).visit(ast.parse(self.get_data(self.path), self.path))
+        return compile(ast.fix_missing_locations(tree), self.path, 'exec', dont_inherit=True)
+
+
+def spec_from_file_location(namespace: GlppNamespace, module_fullname: str, module_path: str or Path) -> ModuleSpec:
+    """
+    Get the spec of a python source file of a namespace (@see glpp_archive.spec_from_file_location)
+    :param module_fullname: the prefixed module name
+    """
+    module_path = os.fspath(module_path)
+    return importlib_util.spec_from_file_location(module_fullname, module_path,
+                                                 loader=GlppNamespaceLoader(namespace, module_fullname, module_path))
+
+
+class _GlppPackageLoader(importlib_abc.Loader):
+    """
+    Loader of the empty packages holding the namespaces
+    """
+    def create_module(self, spec: ModuleSpec) -> None:
+        return None
+
+    def exec_module(self, module: types.ModuleType) -> None:
+        pass
+
+
+_NAMESPACES = {}
+"""
+The registered namespaces {prefix: namespace}
+"""
+
+_LOCK = threading.Lock()
+
+
+class _GlppNamespaceFinder(importlib_abc.MetaPathFinder):
+    """
+    sys.meta_path entry finding the modules of the registered namespaces
+    """
+    def find_spec(self,
+                  fullname: str,
+                  path: List[str] or None = None,
+                  target: types.ModuleType or None = None) -> ModuleSpec or None:
+        if fullname != NAMESPACE_ROOT and not fullname.startswith(NAMESPACE_ROOT + '.'):
+            return None
+        parts = fullname.split('.')
+        if len(parts) <= 2:
+            if len(parts) == 2 and fullname not in _NAMESPACES:
+                return None
+            return ModuleSpec(fullname, _PACKAGE_LOADER, is_package=True)
+        namespace = _NAMESPACES.get('.'.join(parts[:2]))
+        if namespace is None:
+            return None
+        # the top level modules are looked up in the python paths, the submodules in their package path
+        spec = PathFinder.find_spec(fullname, namespace.paths if len(parts) == 3 else path, target)
+        if spec is not None and isinstance(spec.origin, str) and spec.origin.endswith('.py'):
+            spec.loader = GlppNamespaceLoader(namespace, fullname, spec.origin)
+        return spec
+
+
+_PACKAGE_LOADER = _GlppPackageLoader()
+_FINDER = _GlppNamespaceFinder()
+
+
+def install() -> None:
+    """
+    Insert the namespaces finder at the beginning of sys.meta_path (once)
+    :return:
+    """
+    with _LOCK:
+        if _FINDER not in sys.meta_path:
+            sys.meta_path.insert(0, _FINDER)
+
+
+def register(namespace: GlppNamespace) -> types.ModuleType:
+    """
+    Register a namespace : its modules can be imported under its prefix
+    :param namespace: the namespace. It replaces a registered namespace with the same prefix.
+    :return: the namespace package
+    """
+    install()
+    with _LOCK:
+        _NAMESPACES[namespace.prefix] = namespace
+    return importlib.import_module(namespace.prefix)
+
+
+def release(namespace: GlppNamespace) -> List[str]:
+    """
+    Unregister a namespace and remove its modules from sys.modules
+    :param namespace: the namespace
+    :return: the list of removed module names
+    """
+    with _LOCK:
+        if _NAMESPACES.get(namespace.prefix) is not namespace:
+            # replaced by a new load of the plugin
+            return []
+        del _NAMESPACES[namespace.prefix]
+    removed = [k for k in list(sys.modules) if k == namespace.prefix or k.startswith(namespace.prefix + '.')]
+    for k in removed:
+        sys.modules.pop(k, None)
+    parent = sys.modules.get(NAMESPACE_ROOT)
+    if parent is not None:
+        parent.__dict__.pop(namespace.prefix.rpartition('.')[2], None)
+    return removed
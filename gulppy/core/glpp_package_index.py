@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Gulppy package tree indexing
+"""
+import ast
+import importlib.util
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+from gulppy.core import glpp_archive
+from gulppy.config import GLPP_LOGGER
+
+PACKAGE_INIT = '__init__.py'
+
+
+class GlppDirectoryCache(object):
+    """
+    A process wide cache of the python content of directories.
+
+    An entry gives the subpackages (sub directories holding an __init__.py file) and the python modules of a
+    directory without listing it again. Entries are keyed by the resolved path of the directory and validated
+    against its signature (mtime and inode) : adding, removing or renaming a file changes the directory mtime.
+    The directories of archives (@see glpp_archive) are listed from the archive central directory instead.
+    """
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _list(path: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        packages = []
+        modules = []
+        with os.scandir(path) as it:
+            for entry in sorted(it, key=lambda e: e.name):
+                try:
+                    if entry.is_dir():
+                        if entry.name.isidentifier() and os.path.isfile(os.path.join(entry.path, PACKAGE_INIT)):
+                            packages.append(entry.name)
+                    elif entry.name.endswith('.py') and entry.name != PACKAGE_INIT and \
+                            entry.name[:-3].isidentifier():
+                        modules.append(entry.name[:-3])
+                except OSError:
+                    continue
+        return tuple(packages), tuple(modules)
+
+    def list_dir(self, path: str or Path) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """
+        Get the python content of a directory
+        :param path: path of the directory
+        :return: a tuple (packages, modules) of the sorted names of the subpackages and of the modules (without the
+                 .py extension, __init__.py excluded)
+        """
+        content = glpp_archive.list_dir(path)
+        if content is not None:
+            # the archives are listed from their central directory, which is already cached
+            dirs, files = content
+            packages = tuple(d for d in dirs if d.isidentifier() and
+                             glpp_archive.is_file(os.path.join(os.fspath(path), d, PACKAGE_INIT)))
+            modules = tuple(f[:-3] for f in files if f.endswith('.py') and f != PACKAGE_INIT and f[:-3].isidentifier())
+            return packages, modules
+        path = os.path.realpath(os.fspath(path))
+        st = os.stat(path)
+        signature = (st.st_mtime_ns, st.st_ino)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self.invalidations += 1
+            self.misses += 1
+        content = self._list(path)
+        with self._lock:
+            self._entries[path] = (signature, content)
+        return content
+
+    def clear(self) -> None:
+        """
+        Clear the entries and the counters
+        :return: None
+        """
+        with self._lock:
+            self._entries = {}
+            self.hits = self.misses = self.invalidations = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters
+        :return: a dictionary with the keys : hits, misses, invalidations and entries
+        """
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'invalidations': self.invalidations,
+                    'entries': len(self._entries)}
+
+
+DIRECTORY_CACHE = GlppDirectoryCache()
+"""
+The process wide directory listings cache
+"""
+
+
+def index_package(package_name: str,
+                  package_dir: str or Path,
+                  cache: GlppDirectoryCache = DIRECTORY_CACHE) -> Dict[str, Path]:
+    """
+    Index the tree of a package : its modules and its subpackages, recursively
+    :param package_name: full name of the package
+    :param package_dir: directory of the package
+    :param cache: directory listings cache
+    :return: {module fullname: module file} in depth first order, packages first (their file is their __init__.py)
+    """
+    index = {}
+    stack = [(package_name, Path(package_dir))]
+    while len(stack) > 0:
+        name, path = stack.pop()
+        index[name] = path.joinpath(PACKAGE_INIT)
+        packages, modules = cache.list_dir(path)
+        for module in modules:
+            index['{}.{}'.format(name, module)] = path.joinpath('{}.py'.format(module))
+        stack.extend(('{}.{}'.format(name, package), path.joinpath(package)) for package in reversed(packages))
+    return index
+
+
+def get_parent_names(module_fullname: str) -> List[str]:
+    """
+    Get the names of the parent packages of a module
+    :param module_fullname: full name of the module
+    :return: the names, the top level package first
+    """
+    parts = module_fullname.split('.')
+    return ['.'.join(parts[:i]) for i in range(1, len(parts))]
+
+
+def get_module_dependencies(module_fullname: str, module_path: str or Path, index: Dict) -> Set[str]:
+    """
+    Get the modules of an index that a module imports at top level or in functions (static analysis)
+    :param module_fullname: full name of the module
+    :param module_path: file of the module
+    :param index: the package index (@see index_package)
+    :return: the names of the imported indexed modules (parent packages included)
+    """
+    try:
+        tree = ast.parse(glpp_archive.read_bytes(module_path), filename=os.fspath(module_path))
+    except (OSError, SyntaxError, ValueError) as e:
+        GLPP_LOGGER.debug('Cannot analyse the imports of {} : {}'.format(module_path, e))
+        return set()
+    package = module_fullname if Path(module_path).name == PACKAGE_INIT else module_fullname.rpartition('.')[0]
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            try:
+                base = importlib.util.resolve_name('.' * node.level + (node.module or ''), package) \
+                    if node.level > 0 else node.module
+            except (ImportError, ValueError):
+                continue
+            names.append(base)
+            names.extend('{}.{}'.format(base, alias.name) for alias in node.names)
+    dependencies = set()
+    for name in names:
+        for cname in get_parent_names(name) + [name]:
+            if cname in index and cname != module_fullname:
+                dependencies.add(cname)
+    return dependencies
+
+
+def sort_modules(index: Dict[str, Path], names: List[str] or None = None) -> List[str]:
+    """
+    Sort modules of an index in dependency order : a module comes after its parent packages and after the indexed
+    modules it imports (@see get_module_dependencies). The modules of an import cycle are kept in index order.
+    :param index: the package index (@see index_package)
+    :param names: the modules to sort. If None, all the indexed modules are sorted.
+    :return: the sorted names. The dependencies of the modules are not added if they are not in names.
+    """
+    names = list(index) if names is None else list(names)
+    selected = set(names)
+    dependencies = {name: {d for d in get_module_dependencies(name, index[name], index) | set(get_parent_names(name))
+                           if d in selected}
+                    for name in names}
+    # Kahn algorithm, ties broken by index order
+    order = {name: i for i, name in enumerate(names)}
+    sorted_names = []
+    done = set()
+    remaining = list(names)
+    while len(remaining) > 0:
+        ready = [name for name in remaining if dependencies[name] <= done]
+        if len(ready) == 0:
+            # import cycle : its first module is loaded first, it will import the others
+            GLPP_LOGGER.debug('Import cycle between modules {}'.format(remaining))
+            ready = [min(remaining, key=order.get)]
+        sorted_names.extend(ready)
+        done.update(ready)
+        ready = set(ready)
+        remaining = [name for name in remaining if name not in ready]
+    return sorted_names
@@ -1,10 +1,39 @@
 # -*- coding: utf-8 -*-
 """
 Gulppy Package Plugin class definition
--- NOT YET AVAILABLE --
 """
-from gulppy.core.glpp_abstract_plugin import GlppAbstractPlugin
+import threading
+import types
+import weakref
+from pathlib import Path
+from typing import NoReturn, List, Dict
+from gulppy.core.glpp_abstract_plugin import GlppAbstractPlugin, safe_python_path, GlppPluginLoadStatus
 from gulppy.core.glpp_plugin_factory import GlppPluginFactory
+from gulppy.core.glpp_plugin_descriptor import GlppPluginDescriptor
+from gulppy.core.glpp_module_loader import SYS_CONTEXT_LOCK, load_modules
+from gulppy.core.glpp_package_index import index_package, get_parent_names, sort_modules, PACKAGE_INIT
+from gulppy.core import glpp_exceptions, glpp_archive
+from gulppy.config import GLPP_LOGGER
+
+
+class _GlppSubmoduleGetter(object):
+    """
+    Module __getattr__ (PEP 562) of the packages of a package plugin : an attribute naming an indexed submodule that
+    has not been loaded yet loads it. The plugin is weakly referenced so that its modules do not keep it alive.
+    """
+    def __init__(self, plugin: 'GlppPackagePlugin', package_name: str, previous=None) -> None:
+        self._plugin = weakref.ref(plugin)
+        self._package_name = package_name
+        self._previous = previous
+
+    def __call__(self, name: str):
+        plugin = self._plugin()
+        submodule_name = '{}.{}'.format(self._package_name, name)
+        if plugin is not None and not name.startswith('__') and plugin.is_submodule_loadable(submodule_name):
+            return plugin.get_module(submodule_name)
+        if self._previous is not None:
+            return self._previous(name)
+        raise AttributeError('module {!r} has no attribute {!r}'.format(self._package_name, name))
 
 
 @GlppPluginFactory.register('package')
@@ -12,20 +41,229 @@ class GlppPackagePlugin(GlppAbstractPlugin):
     """
     Package plugin class implementation
 
-    This implementation automatically import recursively all modules in the package tree.
+    Each main module of the description file is a package : its tag is the package name and its file the package
+    directory (or its __init__.py file). The package tree (subpackages and modules) is indexed at load from cached
+    directory listings (@see glpp_package_index.DIRECTORY_CACHE) and its modules are loaded on demand :
+    - the load executes the packages only. In lazy mode (@see GlppAbstractPlugin.load), nothing is executed.
+    - a submodule is executed the first time it is requested by get_module or as an attribute of its parent package.
+      Its parent packages are executed first if needed.
+    - if EAGER_SUBMODULES is True (or with the package_eager plugin mode), the load executes the whole tree in
+      dependency order (@see glpp_package_index.sort_modules). load_submodules does the same on demand.
+    Modules are executed with the isolation of the plugin mutable mode (@see glpp_module_loader.load_modules) : the
+    already loaded modules of the plugin are put in sys.modules during the executions so that the submodules share
+    their parent packages, and removed at exit in immutable mode.
+
+    All the loaded modules of the package trees are direct modules (@see get_module), keyed by their full name.
     """
     IMMUTABLE_SYS_PATH_MODULE = True
 
+    EAGER_SUBMODULES = False
+    """
+    Execute the whole packages trees at load
+    """
+
+    _LOAD_LOCK = SYS_CONTEXT_LOCK
+    """
+    Lock serializing the modules executions : sys.modules and sys.path are process wide
+    (@see glpp_module_loader.SYS_CONTEXT_LOCK)
+    """
+
     def __init__(self,
                  plugin_desc: str,
-                 load: bool = True) -> None:
-        super().__init__(plugin_desc, load)
+                 load: bool = True,
+                 descriptor: GlppPluginDescriptor or None = None) -> None:
+        self._index = {}
+        self._loading_thread = None
+        super().__init__(plugin_desc, load, descriptor)
+
+    @property
+    def index(self) -> Dict[str, Path]:
+        """
+        Get _index : {module fullname: module file} of the packages trees (@see glpp_package_index.index_package)
+        """
+        return self._index
+
+    @property
+    def pending_modules(self) -> List[str]:
+        """
+        Get the indexed modules that have not been executed yet
+        """
+        return [name for name in self._index if name not in self._modules]
+
+    def is_submodule_loadable(self, module_fullname: str) -> bool:
+        """
+        Check if a module can be loaded on demand : it is indexed, not loaded yet, and the current thread is not
+        loading modules of the plugin (the import system then loads the submodules itself)
+        """
+        return self._loading_thread != threading.get_ident() and module_fullname in self._index and \
+            module_fullname not in self._modules
+
+    def _get_package_dir(self, package_name: str, package_file: str) -> Path:
+        """
+        Get the directory of a main package
+        """
+        path = safe_python_path(path=package_file, root=self.plugin_root)
+        if path.name == PACKAGE_INIT:
+            path = path.parent
+        if not glpp_archive.is_file(path.joinpath(PACKAGE_INIT)):
+            raise FileNotFoundError('Package {} of module {} not found'.format(path, package_name))
+        return path
 
     def _load(self):
         """
-        Method to load all python modules in the package
+        Method to index the packages declared as main modules in description file and to load them
         This implementation overrides AbstractPlugin.load abstract method.
         :return:
         """
-        # TODO
-        raise NotImplemented
+        index = {}
+        for package_name, package_file in self.desc_main_modules.items():
+            index.update(index_package(package_name, self._get_package_dir(package_name, package_file)))
+        self._index = index
+        self._modules = {}
+        self._i_modules = {}
+        self._load_status = GlppPluginLoadStatus.LOADED
+        if self.lazy:
+            return
+        if self.__class__.EAGER_SUBMODULES:
+            self.load_submodules()
+        else:
+            self._load_package_modules(list(self.desc_main_modules))
+
+    def get_module(self, key: str) -> types.ModuleType:
+        """
+        Get a module in the current plugin from its key (@see GlppAbstractPlugin.get_module).
+        An indexed module is executed at first request.
+        :param key: the key of the module
+        :return: a python module
+        """
+        try:
+            return self._modules[key]
+        except KeyError:
+            pass
+        if key in self._index:
+            self._load_package_modules([key])
+        return super().get_module(key)
+
+    def load_submodules(self, package_name: str or None = None) -> NoReturn:
+        """
+        Execute the modules of a package tree that are not loaded yet, in dependency order
+        :param package_name: the (sub)package whose tree is executed. If None, all the indexed modules are executed.
+        :return: None
+        """
+        if package_name is not None and package_name not in self._index:
+            raise glpp_exceptions.UnknownModuleError(self.name, self.version, package_name)
+        prefix = None if package_name is None else package_name + '.'
+        names = [name for name in self.pending_modules
+                 if prefix is None or name == package_name or name.startswith(prefix)]
+        if len(names) > 0:
+            self._load_package_modules(sort_modules(self._index, names))
+
+    def _load_package_modules(self, names: List[str]) -> NoReturn:
+        """
+        Execute indexed modules, and their parent packages first, in a single context
+        :param names: full names of the modules, in execution order
+        :return: None
+        """
+        with self.__class__._LOAD_LOCK:
+            ordered = {}
+            for name in names:
+                for cname in get_parent_names(name) + [name]:
+                    if cname in self._index and cname not in self._modules:
+                        ordered.setdefault(cname)
+            ordered = list(ordered)
+            if len(ordered) == 0:
+                return
+            GLPP_LOGGER.debug('Loading modules {} of plugin {}...'.format(ordered, self.name))
+            stats = []
+            self._loading_thread = threading.get_ident()
+            try:
+                with self._plugin_errors(), self._profile_imports() as profiler:
+                    loaded = load_modules(modules=[(name, self._index[name]) for name in ordered],
+                                          module_root_path=self._get_module_root_path(),
+                                          immutable=self._immutable,
+                                          namespace=self._namespace,
+                                          callback_init=self.sys_context_callback_init,
+                                          callback_terminate=self.sys_context_callback_terminate,
+                                          stats=stats,
+                                          profiler=profiler,
+                                          preload=dict(self._get_dependency_modules(), **self._modules),
+                                          added_paths=self._sys_path_added)
+            finally:
+                self._loading_thread = None
+            for name, (module, context_modules), module_stats in zip(ordered, loaded, stats):
+                self._add_module_stats(name, module_stats, len(context_modules))
+                self._register_module(name, module)
+                for cname, cmodule in context_modules:
+                    # indexed modules imported by the executed code
+                    if cname in self._index and cname not in self._modules and \
+                            getattr(cmodule, '__file__', None) is not None and \
+                            Path(cmodule.__file__).resolve() == self._index[cname].resolve():
+                        self._register_module(cname, cmodule)
+                    elif cname not in self._index:
+                        self._i_modules[cname] = cmodule
+                self._record_dependencies(name, context_modules)
+
+    def _register_module(self, module_fullname: str, module: types.ModuleType) -> None:
+        """
+        Register a loaded module of the packages trees : it is bound to its parent package and, if it is a package,
+        its not loaded submodules are served on attribute access
+        """
+        self._modules[module_fullname] = module
+        self._i_modules.pop(module_fullname, None)
+        parent_name, _, attr_name = module_fullname.rpartition('.')
+        parent = self._modules.get(parent_name)
+        if parent is not None and parent.__dict__.get(attr_name) is not module:
+            setattr(parent, attr_name, module)
+        if self._index[module_fullname].name == PACKAGE_INIT:
+            previous = module.__dict__.get('__getattr__')
+            if not isinstance(previous, _GlppSubmoduleGetter):
+                module.__getattr__ = _GlppSubmoduleGetter(self, module_fullname, previous)
+
+    def reload_changed(self) -> List[str]:
+        """
+        Execute again the changed modules and their dependents (@see GlppAbstractPlugin.reload_changed). The
+        submodules imported by the executions are loaded by the import system.
+        """
+        with self.__class__._LOAD_LOCK:
+            self._loading_thread = threading.get_ident()
+            try:
+                return super().reload_changed()
+            finally:
+                self._loading_thread = None
+
+    def _replace_module(self, module_name: str, module: types.ModuleType, context_modules: List) -> None:
+        """
+        Replace a module executed again, bound to its parent package (@see GlppAbstractPlugin.reload_changed)
+        """
+        if module_name not in self._index:
+            super()._replace_module(module_name, module, context_modules)
+            return
+        self._register_module(module_name, module)
+        for cname, cmodule in context_modules:
+            if cname not in self._index:
+                self._i_modules[cname] = cmodule
+
+    def _clear_modules(self) -> None:
+        """
+        Drop the references to the loaded modules and the index (@see GlppAbstractPlugin.unload)
+        :return:
+        """
+        with self.__class__._LOAD_LOCK:
+            super()._clear_modules()
+            self._index = {}
+
+    def get_modules_status(self) -> Dict[str, GlppPluginLoadStatus]:
+        """
+        Get the load status of each indexed module : LOADED once the module has been executed, NOT_LOADED otherwise
+        :return: {module fullname: load status}
+        """
+        return {name: GlppPluginLoadStatus.LOADED if name in self._modules else GlppPluginLoadStatus.NOT_LOADED
+                for name in self._index}
+
+
+@GlppPluginFactory.register('package_eager')
+class GlppEagerPackagePlugin(GlppPackagePlugin):
+    """
+    Package plugin executing its whole packages trees at load (@see GlppPackagePlugin.EAGER_SUBMODULES)
+    """
+    EAGER_SUBMODULES = True
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Gulppy Plugin descriptor definition
+"""
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Tuple, List, Any
+from gulppy.core import glpp_exceptions
+from gulppy.core.glpp_archive import read_bytes
+
+DESCR_FIELDS = ('plugin_name', 'plugin_version', 'plugin_mode', 'plugin_main_modules', 'python_path', 'plugin_hacks',
+               'plugin_requires')
+"""
+Fields of the plugin description file used by gulppy
+"""
+DESCR_REQUIRED_FIELDS = ('plugin_name', 'plugin_version', 'plugin_main_modules', 'python_path')
+"""
+Fields that must be defined in a plugin description file
+"""
+
+
+def load_yaml(content: bytes or str) -> Any:
+    """
+    Parse a yaml content.
+    The libyaml based CSafeLoader is preferred when available, the pure python SafeLoader is used otherwise.
+    yaml is imported at first call so that importing gulppy.core does not pay for it.
+    :param content: the yaml content
+    :return: the parsed content
+    """
+    import yaml
+    return yaml.load(content, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+
+def _intern(value: Any) -> Any:
+    """
+    Intern a value if it is a string : plugin descriptions share a lot of identical strings (python paths, module
+    names, module files...)
+    :param value: any value
+    :return: the interned value
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+class GlppPluginDescriptor(object):
+    """
+    Immutable description of a plugin, as parsed from its description file.
+
+    A descriptor is parsed once (@see from_file) and is then handed to the plugin factory and to the plugin
+    constructor. Strings are interned so that large catalogs of plugins share their repeated values.
+
+    - plugin_desc : resolved path of the description file
+    - plugin_root : resolved path of the directory containing the description file
+    - name, version, mode : plugin_name, plugin_version and plugin_mode properties (mode is None if undefined)
+    - main_modules : plugin_main_modules property as a tuple of (module_tag, module_file) pairs
+    - python_path : python_path property as a tuple of (unresolved) paths
+    - hacks_init, hacks_terminate : plugin_hacks scripts, None if undefined
+    - requires : plugin_requires property as a tuple of (plugin name, version constraint) pairs, the constraint being
+                 None if any version is accepted (@see glpp_version.parse_constraint)
+    """
+    __slots__ = ('plugin_desc', 'plugin_root', 'name', 'version', 'mode', 'main_modules', 'python_path',
+                 'hacks_init', 'hacks_terminate', 'requires')
+
+    def __init__(self,
+                 plugin_desc: str,
+                 name: str,
+                 version: Any,
+                 mode: str or None,
+                 main_modules: Tuple[Tuple[str, str], ...],
+                 python_path: Tuple[str, ...],
+                 hacks_init: str or None = None,
+                 hacks_terminate: str or None = None,
+                 requires: Tuple[Tuple[str, str or None], ...] = ()) -> None:
+        """
+        Constructor. Prefer the from_file and from_dict class methods.
+        """
+        setter = super().__setattr__
+        setter('plugin_desc', plugin_desc)
+        setter('plugin_root', os.path.dirname(plugin_desc))
+        setter('name', _intern(name))
+        setter('version', _intern(version))
+        setter('mode', _intern(mode))
+        setter('main_modules', tuple((_intern(k), _intern(v)) for k, v in main_modules))
+        setter('python_path', tuple(_intern(p) for p in python_path))
+        setter('hacks_init', _intern(hacks_init))
+        setter('hacks_terminate', _intern(hacks_terminate))
+        setter('requires', tuple((_intern(k), _intern(v)) for k, v in requires))
+
+    def __setattr__(self, key, value):
+        raise AttributeError('{} is immutable'.format(self.__class__.__name__))
+
+    def __delattr__(self, key):
+        raise AttributeError('{} is immutable'.format(self.__class__.__name__))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, GlppPluginDescriptor):
+            return NotImplemented
+        return all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
+
+    def __hash__(self) -> int:
+        return hash(tuple(getattr(self, k) for k in self.__slots__))
+
+    def __repr__(self) -> str:
+        return '{}(name={!r}, version={!r}, mode={!r}, plugin_desc={!r})'.format(self.__class__.__name__, self.name,
+                                                                                 self.version, self.mode,
+                                                                                 self.plugin_desc)
+
+    @classmethod
+    def from_dict(cls, plugin_desc: str or Path, description: Dict) -> 'GlppPluginDescriptor':
+        """
+        Create a descriptor from the parsed content of a description file
+        :param plugin_desc: path of the description file
+        :param description: parsed content of the description file
+        :return: a descriptor
+        """
+        if not isinstance(description, dict):
+            raise glpp_exceptions.PluginDescriptionMissingProperty('plugin_name', plugin_desc)
+        for field in DESCR_REQUIRED_FIELDS:
+            if field not in description:
+                raise glpp_exceptions.PluginDescriptionMissingProperty(field, plugin_desc)
+        hacks = description.get('plugin_hacks') or {}
+        requires = description.get('plugin_requires') or {}
+        if not isinstance(requires, dict):
+            # a list of plugin names : any version is accepted
+            requires = dict.fromkeys(requires)
+        return cls(plugin_desc=os.fspath(Path(plugin_desc).resolve()),
+                   name=description['plugin_name'],
+                   version=description['plugin_version'],
+                   mode=description.get('plugin_mode'),
+                   main_modules=tuple((description['plugin_main_modules'] or {}).items()),
+                   python_path=tuple(description['python_path'] or ()),
+                   hacks_init=hacks.get('sys_context_callback_init'),
+                   hacks_terminate=hacks.get('sys_context_callback_terminate'),
+                   requires=tuple((name, None if constraint is None else str(constraint))
+                                  for name, constraint in requires.items()))
+
+    @classmethod
+    def from_file(cls, plugin_desc: str or Path) -> 'GlppPluginDescriptor':
+        """
+        Parse a plugin description file
+        :param plugin_desc: path of the description file
+        :return: a descriptor
+        """
+        return cls.from_dict(plugin_desc, load_yaml(read_bytes(plugin_desc)))
+
+    def to_dict(self) -> Dict:
+        """
+        Get the descriptor as the content of a description file restricted to the fields used by gulppy
+        (@see DESCR_FIELDS). This is the reverse of from_dict.
+        :return: a dictionary
+        """
+        description = {'plugin_name': self.name,
+                       'plugin_version': self.version,
+                       'plugin_main_modules': dict(self.main_modules),
+                       'python_path': list(self.python_path)}
+        if self.mode is not None:
+            description['plugin_mode'] = self.mode
+        hacks = {}
+        if self.hacks_init is not None:
+            hacks['sys_context_callback_init'] = self.hacks_init
+        if self.hacks_terminate is not None:
+            hacks['sys_context_callback_terminate'] = self.hacks_terminate
+        if len(hacks) > 0:
+            description['plugin_hacks'] = hacks
+        if len(self.requires) > 0:
+            description['plugin_requires'] = dict(self.requires)
+        return description
+
+    def get_main_modules(self) -> Dict[str, str]:
+        """
+        Get the main modules as a dictionary
+        :return: {module_tag: module_file}
+        """
+        return dict(self.main_modules)
+
+    def get_python_path(self) -> List[Path]:
+        """
+        Get the python paths resolved against the plugin root
+        :return: the list of python paths
+        """
+        root = Path(self.plugin_root)
+        return [Path(p) if Path(p).is_absolute() else root.joinpath(p) for p in self.python_path]
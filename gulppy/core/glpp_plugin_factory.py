@@ -2,13 +2,15 @@
 """
 Gulppy Plugin factory
 """
+from concurrent.futures import Executor
 from pathlib import Path
-from typing import Generator, Callable
+from typing import Generator, Callable, Tuple
 from contextlib import contextmanager
 from enum import Enum
 from gulppy.config import GLPP_LOGGER
 from gulppy.core import glpp_exceptions
 from gulppy.core.glpp_abstract_plugin import GlppAbstractPlugin
+from gulppy.core.glpp_plugin_descriptor import GlppPluginDescriptor
 
 
 class MutableModeEnum(Enum):
@@ -27,6 +29,45 @@ class MutableModeEnum(Enum):
     """
     Use a immutable mode
     """
+    NAMESPACED = 4
+    """
+    Use a mutable mode where the plugin modules are imported under a namespace of the plugin (@see glpp_namespace), so
+    that several plugins, or several versions of a plugin, defining the same modules names can be loaded.
+    """
+
+
+class BatchModeEnum(Enum):
+    """
+    Enumeration for the sharing of sys_context between modules loads (@see glpp_module_loader.load_modules)
+    """
+    NONE = 1
+    """
+    Each module is loaded in its own context
+    """
+    PLUGIN = 2
+    """
+    All the main modules of a plugin are loaded in a single context
+    """
+    REPOSITORY = 3
+    """
+    All the plugins of a repository are loaded in a single context (@see glpp_module_loader.batch_context).
+    Only applies to the immutable mode and to the plugins without hack scripts, the others are loaded per plugin.
+    """
+
+
+def get_mutable_flags(mutable_mode: MutableModeEnum) -> Tuple[bool or None, bool or None]:
+    """
+    Get the load flags of a mutable mode (@see GlppAbstractPlugin.load)
+    :param mutable_mode: the mutable mode
+    :return: a tuple (immutable, namespaced). None stands for the plugin class default value.
+    """
+    if mutable_mode == MutableModeEnum.IMMUTABLE:
+        return True, None
+    elif mutable_mode == MutableModeEnum.MUTABLE:
+        return False, None
+    elif mutable_mode == MutableModeEnum.NAMESPACED:
+        return False, True
+    return None, None
 
 
 @contextmanager
@@ -34,21 +75,24 @@ def mutable_context(plugin_cls: GlppAbstractPlugin,
                     mutable_mode: MutableModeEnum) -> Generator[str, None, None]:
     """
     Create a context using a specific mutable mode
+    The mode is set on the plugin class : it applies to the loads of all the threads. Pass the mode to the load
+    instead (@see get_mutable_flags) when plugins are loaded concurrently.
     :param plugin_cls: the plugin class to use in the context
     :param mutable_mode: the mutable mode to activate
     :return:
     """
     mutable_default_value = plugin_cls.IMMUTABLE_SYS_PATH_MODULE
-    if mutable_mode == MutableModeEnum.DEFAULT:
-        pass
-    elif mutable_mode == MutableModeEnum.IMMUTABLE:
-        plugin_cls.IMMUTABLE_SYS_PATH_MODULE = True
-    elif mutable_mode == MutableModeEnum.MUTABLE:
-        plugin_cls.IMMUTABLE_SYS_PATH_MODULE = False
-    else:
-        pass
-    yield
-    plugin_cls.IMMUTABLE_SYS_PATH_MODULE = mutable_default_value
+    namespaced_default_value = plugin_cls.NAMESPACED_SYS_MODULES
+    immutable, namespaced = get_mutable_flags(mutable_mode)
+    if immutable is not None:
+        plugin_cls.IMMUTABLE_SYS_PATH_MODULE = immutable
+    if namespaced is not None:
+        plugin_cls.NAMESPACED_SYS_MODULES = namespaced
+    try:
+        yield
+    finally:
+        plugin_cls.IMMUTABLE_SYS_PATH_MODULE = mutable_default_value
+        plugin_cls.NAMESPACED_SYS_MODULES = namespaced_default_value
 
 
 class GlppPluginFactory(object):
@@ -58,23 +102,51 @@ class GlppPluginFactory(object):
     def create_plugin(cls,
                       plugin_desc: str or Path,
                       load: bool = True,
-                      mutable_mode: MutableModeEnum = MutableModeEnum.DEFAULT) -> GlppAbstractPlugin:
+                      mutable_mode: MutableModeEnum = MutableModeEnum.DEFAULT,
+                      descriptor: GlppPluginDescriptor or None = None) -> GlppAbstractPlugin:
         """
         A function to create a plugin from its description file
         :param plugin_desc: plugin description file
         :param load: boolean flag to load modules at creation
         :param mutable_mode: mutable mode to use for the plugin load
+        :param descriptor: already parsed plugin descriptor. If None the plugin description file is parsed.
+                           The descriptor is parsed only once and handed to the plugin constructor.
         :return: a plugin instance
         """
-        plugin_mode = GlppAbstractPlugin.get_plugin_mode(plugin_desc)
+        if descriptor is None:
+            descriptor = GlppPluginDescriptor.from_file(plugin_desc)
+        plugin_mode = descriptor.mode
+        if plugin_mode is None:
+            raise glpp_exceptions.PluginDescriptionMissingProperty("plugin_mode", plugin_desc)
         try:
             plugin_cls = cls.GLPP_PLUGIN_REGISTRY[plugin_mode]
         except KeyError:
             raise glpp_exceptions.UnknownPluginMode(plugin_mode)
         else:
-            with mutable_context(plugin_cls=plugin_cls, mutable_mode=mutable_mode):
-                return plugin_cls(plugin_desc=plugin_desc, load=load)
+            cplugin = plugin_cls(plugin_desc=plugin_desc, load=False, descriptor=descriptor)
+            if load:
+                immutable, namespaced = get_mutable_flags(mutable_mode)
+                cplugin.load(immutable=immutable, namespaced=namespaced)
+            return cplugin
 
+    @classmethod
+    async def create_plugin_async(cls,
+                                  plugin_desc: str or Path,
+                                  mutable_mode: MutableModeEnum = MutableModeEnum.DEFAULT,
+                                  descriptor: GlppPluginDescriptor or None = None,
+                                  executor: Executor or None = None) -> GlppAbstractPlugin:
+        """
+        Asyncio counterpart of create_plugin : the plugin is loaded in an executor (@see GlppAbstractPlugin.load_async)
+        :param plugin_desc: plugin description file
+        :param mutable_mode: mutable mode to use for the plugin load
+        :param descriptor: already parsed plugin descriptor. If None the plugin description file is parsed.
+        :param executor: the executor running the load. If None, the default executor of the event loop is used.
+        :return: a loaded plugin instance
+        """
+        cplugin = cls.create_plugin(plugin_desc, load=False, descriptor=descriptor)
+        immutable, namespaced = get_mutable_flags(mutable_mode)
+        await cplugin.load_async(immutable=immutable, namespaced=namespaced, executor=executor)
+        return cplugin
 
     @classmethod
     def register(cls, name: str) -> Callable:
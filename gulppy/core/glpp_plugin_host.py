@@ -0,0 +1,514 @@
+# -*- coding: utf-8 -*-
+"""
+Gulppy out of process plugin hosts
+"""
+import collections
+import itertools
+import multiprocessing
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List, Tuple
+from gulppy.core import glpp_exceptions
+from gulppy.config import GLPP_LOGGER
+
+DEFAULT_SHM_THRESHOLD = 64 * 1024
+"""
+Size in bytes from which bytes and numpy arrays are passed through shared memory instead of being pickled
+"""
+
+LATENCY_WINDOW = 1000
+"""
+Number of recent calls used to compute the latency percentiles of a host
+"""
+
+
+class _GlppSharedRef(object):
+    """
+    Reference to a bytes like object or a numpy array stored in a shared memory block
+    """
+    __slots__ = ('name', 'size', 'kind', 'dtype', 'shape')
+
+    def __init__(self, name: str, size: int, kind: str, dtype: str or None = None,
+                 shape: Tuple[int, ...] or None = None) -> None:
+        self.name = name
+        self.size = size
+        self.kind = kind
+        self.dtype = dtype
+        self.shape = shape
+
+    def __getstate__(self):
+        return self.name, self.size, self.kind, self.dtype, self.shape
+
+    def __setstate__(self, state):
+        self.name, self.size, self.kind, self.dtype, self.shape = state
+
+
+def _is_ndarray(obj: Any) -> bool:
+    # numpy is never imported by gulppy : an array can only be received if the caller imported numpy
+    return type(obj).__name__ == 'ndarray' and type(obj).__module__ == 'numpy'
+
+
+def _to_shared(data: memoryview, kind: str, dtype: str or None = None,
+               shape: Tuple[int, ...] or None = None) -> _GlppSharedRef:
+    shm = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+    try:
+        shm.buf[:data.nbytes] = data.cast('B')
+        return _GlppSharedRef(shm.name, data.nbytes, kind, dtype, shape)
+    finally:
+        # the block lives until the receiver unlinks it
+        shm.close()
+
+
+def encode_shared(obj: Any, threshold: int = DEFAULT_SHM_THRESHOLD) -> Any:
+    """
+    Replace the large bytes, bytearray, memoryview and numpy arrays of an object (recursively in lists, tuples and
+    dictionaries values) by references to shared memory blocks. The blocks are unlinked by decode_shared.
+    :param obj: the object to encode
+    :param threshold: minimal size in bytes of the objects passed through shared memory
+    :return: the encoded object
+    """
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        data = memoryview(obj)
+        if data.nbytes >= threshold:
+            return _to_shared(data, 'bytearray' if isinstance(obj, bytearray) else 'bytes')
+        return obj
+    if _is_ndarray(obj):
+        if obj.nbytes >= threshold and obj.dtype.hasobject is False:
+            import numpy as np
+            data = memoryview(np.ascontiguousarray(obj))
+            return _to_shared(data, 'ndarray', obj.dtype.str, tuple(obj.shape))
+        return obj
+    if type(obj) in (list, tuple):
+        return type(obj)(encode_shared(v, threshold) for v in obj)
+    if type(obj) is dict:
+        return {k: encode_shared(v, threshold) for k, v in obj.items()}
+    return obj
+
+
+def decode_shared(obj: Any) -> Any:
+    """
+    Replace the shared memory references of an encoded object (@see encode_shared) by copies of their content and
+    unlink the shared memory blocks
+    :param obj: the encoded object
+    :return: the decoded object
+    """
+    if isinstance(obj, _GlppSharedRef):
+        shm = shared_memory.SharedMemory(name=obj.name)
+        try:
+            if obj.kind == 'ndarray':
+                import numpy as np
+                return np.ndarray(obj.shape, dtype=np.dtype(obj.dtype), buffer=shm.buf[:obj.size]).copy()
+            data = bytes(shm.buf[:obj.size])
+            return bytearray(data) if obj.kind == 'bytearray' else data
+        finally:
+            shm.close()
+            shm.unlink()
+    if type(obj) in (list, tuple):
+        return type(obj)(decode_shared(v) for v in obj)
+    if type(obj) is dict:
+        return {k: decode_shared(v) for k, v in obj.items()}
+    return obj
+
+
+def release_shared(obj: Any) -> None:
+    """
+    Unlink the shared memory blocks of an encoded object that will not be decoded
+    :param obj: the encoded object
+    :return: None
+    """
+    try:
+        decode_shared(obj)
+    except Exception:
+        pass
+
+
+def _host_main(conn, shm_threshold: int) -> None:
+    """
+    Plugin host process main loop : requests are served one at a time
+    :param conn: connection to the parent process
+    :param shm_threshold: @see encode_shared
+    """
+    from gulppy.core.glpp_plugin_factory import GlppPluginFactory, MutableModeEnum, get_mutable_flags
+    plugins = {}
+    while True:
+        try:
+            op, call_id, payload = conn.recv()
+        except (EOFError, OSError):
+            break
+        if op == 'stop':
+            break
+        try:
+            if op == 'load':
+                uid, plugin_desc, mutable_mode, lazy = payload
+                cplugin = GlppPluginFactory.create_plugin(plugin_desc=plugin_desc, load=False)
+                immutable, namespaced = get_mutable_flags(MutableModeEnum[mutable_mode])
+                cplugin.load(lazy=lazy, immutable=immutable, namespaced=namespaced)
+                plugins[uid] = cplugin
+                result = None
+            elif op == 'unload':
+                cplugin = plugins.pop(payload, None)
+                if cplugin is not None:
+                    cplugin.unload(check_leaks=False)
+                result = None
+            elif op == 'call':
+                uid, module_key, function, args, kwargs = payload
+                args = decode_shared(args)
+                kwargs = decode_shared(kwargs)
+                target = plugins[uid].get_module(module_key)
+                for attr in function.split('.'):
+                    target = getattr(target, attr)
+                result = encode_shared(target(*args, **kwargs), shm_threshold)
+            else:
+                raise ValueError('Unknown plugin host request {}'.format(op))
+        except Exception as e:
+            conn.send(('error', call_id, '{}: {}\n{}'.format(type(e).__name__, e, traceback.format_exc())))
+        else:
+            try:
+                conn.send(('ok', call_id, result))
+            except Exception as e:
+                release_shared(result)
+                conn.send(('error', call_id, 'Cannot send the result : {}: {}'.format(type(e).__name__, e)))
+
+
+class GlppPluginHost(object):
+    """
+    A worker process hosting plugins (@see GlppPluginHostPool).
+
+    Requests are sent through a pipe and served one at a time by the process. A thread of the calling process
+    receives the replies and resolves the corresponding futures. The host keeps its call latency (time between the
+    request and the reply, waiting time included) and its queue depth (number of requests sent and not replied).
+    """
+    def __init__(self,
+                 index: int,
+                 start_method: str or None = None,
+                 shm_threshold: int = DEFAULT_SHM_THRESHOLD) -> None:
+        """
+        Constructor : the process is started
+        :param index: index of the host in its pool
+        :param start_method: multiprocessing start method (fork, spawn, forkserver). None means spawn.
+        :param shm_threshold: @see encode_shared
+        """
+        self.index = index
+        self.start_method = start_method or 'spawn'
+        self.shm_threshold = shm_threshold
+        self.calls = 0
+        self.errors = 0
+        self.restarts = 0
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self.process = None
+        self._conn = None
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._reader = None
+        self.start()
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Number of requests sent to the host and not replied yet
+        """
+        return len(self._pending)
+
+    def is_alive(self) -> bool:
+        """
+        Check if the host process is running
+        """
+        return self.process is not None and self.process.is_alive()
+
+    def start(self) -> None:
+        """
+        Start the host process
+        :return:
+        """
+        # the hosts have to share the resource tracker of the current process : the shared memory blocks are created
+        # and unlinked by different processes
+        resource_tracker.ensure_running()
+        ctx = multiprocessing.get_context(self.start_method)
+        parent_conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_host_main, args=(child_conn, self.shm_threshold),
+                                   name='gulppy-plugin-host-{}'.format(self.index), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        self._reader = threading.Thread(target=self._read_replies, args=(parent_conn,),
+                                        name='gulppy-plugin-host-{}-reader'.format(self.index), daemon=True)
+        self._reader.start()
+        GLPP_LOGGER.debug('Plugin host {} started (pid {})'.format(self.index, self.process.pid))
+
+    def _read_replies(self, conn) -> None:
+        while True:
+            try:
+                status, call_id, payload = conn.recv()
+            except (EOFError, OSError):
+                break
+            with self._lock:
+                future, start, description = self._pending.pop(call_id, (None, None, None))
+            if future is None:
+                continue
+            self.latencies.append(time.perf_counter() - start)
+            if status == 'ok':
+                try:
+                    result = decode_shared(payload)
+                except Exception as e:
+                    # the reader thread has to go on : the other requests are still to be replied
+                    self.errors += 1
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+            else:
+                self.errors += 1
+                future.set_exception(glpp_exceptions.PluginHostCallError(description[0], description[1],
+                                                                         self.index, payload))
+        self._fail_pending(conn, 'process exited with code {}'.format(self.process.exitcode
+                                                                      if self.process is not None else None))
+
+    def _fail_pending(self, conn, reason: str) -> None:
+        """
+        Fail the requests sent on a connection that will not be replied
+        """
+        with self._lock:
+            if conn is not self._conn:
+                return
+            pending, self._pending = self._pending, {}
+        for future, _, description in pending.values():
+            self.errors += 1
+            future.set_exception(glpp_exceptions.PluginHostError(self.index, reason))
+
+    def submit(self, op: str, payload: Any, description: Tuple[str, str] = ('', '')) -> Future:
+        """
+        Send a request to the host
+        :param op: request type : load, unload or call
+        :param payload: request content
+        :param description: (target, plugin id) used in the error messages
+        :return: a future of the reply
+        """
+        future = Future()
+        with self._lock:
+            if not self.is_alive():
+                raise glpp_exceptions.PluginHostError(self.index, 'process is not running')
+            call_id = next(self._ids)
+            self._pending[call_id] = (future, time.perf_counter(), description)
+            try:
+                self._conn.send((op, call_id, payload))
+            except Exception:
+                del self._pending[call_id]
+                raise
+        if op == 'call':
+            self.calls += 1
+        return future
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the host process. Pending requests fail with a PluginHostError.
+        :param timeout: time to wait for the process to exit before terminating it
+        :return:
+        """
+        conn = self._conn
+        if self.process is not None:
+            try:
+                with self._lock:
+                    conn.send(('stop', None, None))
+            except Exception:
+                pass
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(timeout)
+        self._fail_pending(conn, 'host stopped')
+        if conn is not None:
+            conn.close()
+
+    def restart(self) -> None:
+        """
+        Stop then start the host process (the plugins have to be loaded again, @see GlppPluginHostPool.restart_host)
+        :return:
+        """
+        self.stop()
+        self.restarts += 1
+        self.start()
+
+    def get_stats(self) -> Dict:
+        """
+        Get the host metrics
+        :return: a dictionary with the keys : index, pid, alive, queue_depth, calls, errors, restarts and the latency
+                 statistics in seconds over the last LATENCY_WINDOW requests (latency_mean, latency_p50, latency_p95,
+                 latency_max)
+        """
+        latencies = sorted(self.latencies)
+        stats = {'index': self.index,
+                 'pid': self.process.pid if self.process is not None else None,
+                 'alive': self.is_alive(),
+                 'queue_depth': self.queue_depth,
+                 'calls': self.calls,
+                 'errors': self.errors,
+                 'restarts': self.restarts,
+                 'latency_mean': None,
+                 'latency_p50': None,
+                 'latency_p95': None,
+                 'latency_max': None}
+        if len(latencies) > 0:
+            stats.update({'latency_mean': sum(latencies) / len(latencies),
+                          'latency_p50': latencies[int(0.50 * (len(latencies) - 1))],
+                          'latency_p95': latencies[int(0.95 * (len(latencies) - 1))],
+                          'latency_max': latencies[-1]})
+        return stats
+
+
+class GlppPluginHostPool(object):
+    """
+    A pool of plugin hosts.
+
+    Each hosted plugin is loaded in every host, and each call is forwarded to the running host with the smallest
+    queue depth : CPU bound plugins can use several cores and a plugin crashing its host does not crash the caller.
+    Dead hosts are restarted (and their plugins loaded again) at the next call if auto_restart is True.
+    Large bytes and numpy arrays arguments and results are passed through shared memory (@see encode_shared).
+    """
+    def __init__(self,
+                 n_hosts: int = 2,
+                 start_method: str or None = None,
+                 shm_threshold: int = DEFAULT_SHM_THRESHOLD,
+                 auto_restart: bool = True) -> None:
+        """
+        Constructor : the hosts processes are started
+        :param n_hosts: number of hosts
+        :param start_method: multiprocessing start method (fork, spawn, forkserver). None means spawn.
+        :param shm_threshold: @see encode_shared
+        :param auto_restart: boolean flag to restart the dead hosts
+        """
+        self.shm_threshold = shm_threshold
+        self.auto_restart = auto_restart
+        self.hosts = [GlppPluginHost(i, start_method=start_method, shm_threshold=shm_threshold)
+                      for i in range(n_hosts)]
+        self.plugins = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load_in_host(self, host: GlppPluginHost, uid: str) -> Future:
+        plugin_desc, mutable_mode, lazy = self.plugins[uid]
+        return host.submit('load', (uid, plugin_desc, mutable_mode, lazy), description=('load', uid))
+
+    def load_plugin(self, uid: str, plugin_desc: str, mutable_mode: str = 'DEFAULT', lazy: bool = False) -> None:
+        """
+        Load a plugin in all the hosts
+        :param uid: plugin unique id
+        :param plugin_desc: path of the plugin description file
+        :param mutable_mode: name of the MutableModeEnum value to use in the hosts
+        :param lazy: @see GlppAbstractPlugin.load
+        :return:
+        """
+        with self._lock:
+            self.plugins[uid] = (str(plugin_desc), mutable_mode, lazy)
+            futures = [self._load_in_host(host, uid) for host in self.hosts]
+        for future in futures:
+            future.result()
+
+    def unload_plugin(self, uid: str) -> None:
+        """
+        Drop a plugin from all the hosts
+        :param uid: plugin unique id
+        :return:
+        """
+        with self._lock:
+            self.plugins.pop(uid, None)
+            futures = [host.submit('unload', uid) for host in self.hosts if host.is_alive()]
+        for future in futures:
+            future.result()
+
+    def restart_host(self, index: int) -> None:
+        """
+        Restart a host (for instance to release the memory leaked by a plugin) and load its plugins again
+        :param index: index of the host
+        :return:
+        """
+        with self._lock:
+            host = self.hosts[index]
+            host.restart()
+            futures = [self._load_in_host(host, uid) for uid in self.plugins]
+        for future in futures:
+            future.result()
+
+    def _select_host(self) -> GlppPluginHost:
+        alive = [host for host in self.hosts if host.is_alive()]
+        if len(alive) < len(self.hosts) and self.auto_restart:
+            for host in self.hosts:
+                if not host.is_alive():
+                    GLPP_LOGGER.warning('Plugin host {} is dead : restarting it'.format(host.index))
+                    self.restart_host(host.index)
+            alive = [host for host in self.hosts if host.is_alive()]
+        if len(alive) == 0:
+            raise glpp_exceptions.PluginHostError('pool', 'no running host')
+        return min(alive, key=lambda h: h.queue_depth)
+
+    def call_async(self, uid: str, module_key: str, function: str, *args, **kwargs) -> Future:
+        """
+        Forward a call to a host
+        :param uid: plugin unique id
+        :param module_key: key of the plugin module (@see GlppAbstractPlugin.get_module)
+        :param function: name of the function to call in the module (a dotted path can be used)
+        :param args: positional arguments
+        :param kwargs: keyword arguments
+        :return: a future of the result
+        """
+        if uid not in self.plugins:
+            raise glpp_exceptions.PluginHostError('pool', 'plugin {} is not hosted'.format(uid))
+        host = self._select_host()
+        args = encode_shared(args, self.shm_threshold)
+        kwargs = encode_shared(kwargs, self.shm_threshold)
+        try:
+            return host.submit('call', (uid, module_key, function, args, kwargs),
+                               description=('{}.{}'.format(module_key, function), uid))
+        except Exception:
+            release_shared(args)
+            release_shared(kwargs)
+            raise
+
+    def call(self, uid: str, module_key: str, function: str, *args, **kwargs) -> Any:
+        """
+        Forward a call to a host and wait for the result (@see call_async)
+        """
+        return self.call_async(uid, module_key, function, *args, **kwargs).result()
+
+    def get_stats(self) -> List[Dict]:
+        """
+        Get the hosts metrics (@see GlppPluginHost.get_stats)
+        :return: the list of the hosts metrics
+        """
+        return [host.get_stats() for host in self.hosts]
+
+    def shutdown(self) -> None:
+        """
+        Stop all the hosts
+        :return:
+        """
+        for host in self.hosts:
+            host.stop()
+
+
+class GlppHostedPlugin(object):
+    """
+    Proxy of a plugin loaded in a plugin host pool
+    """
+    def __init__(self, pool: GlppPluginHostPool, name: str, version: Any, uid: str) -> None:
+        self.pool = pool
+        self.name = name
+        self.version = version
+        self.uid = uid
+
+    def get_unique_id(self) -> str:
+        return self.uid
+
+    def call(self, module_key: str, function: str, *args, **kwargs) -> Any:
+        """
+        Call a function of a plugin module in a host (@see GlppPluginHostPool.call)
+        """
+        return self.pool.call(self.uid, module_key, function, *args, **kwargs)
+
+    def call_async(self, module_key: str, function: str, *args, **kwargs) -> Future:
+        """
+        Call a function of a plugin module in a host without waiting for the result
+        (@see GlppPluginHostPool.call_async)
+        """
+        return self.pool.call_async(self.uid, module_key, function, *args, **kwargs)
@@ -2,15 +2,29 @@
 """
 Gulppy Plugin manager definition
 """
-import pandas as pd
-from typing import NoReturn, Dict
+import json
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from typing import NoReturn, Dict, List, Tuple, Callable, TYPE_CHECKING
 from enum import Enum
 from gulppy.core.glpp_abstract_plugin import GlppPluginLoadStatus, GlppAbstractPlugin
 from gulppy.core.glpp_plugin_repository import GlppPluginRepository
-from gulppy.core.glpp_plugin_factory import MutableModeEnum
-from gulppy.core import glpp_exceptions
+from gulppy.core.glpp_plugin_registry import GlppPluginRegistry
+from gulppy.core.glpp_version import GlppVersionResolver
+from gulppy.core.glpp_discovery import GlppDiscoveryWalker
+from gulppy.core.glpp_plugin_factory import MutableModeEnum, BatchModeEnum
+from gulppy.core.glpp_refresh import GlppRefreshResult, GlppRepositoryWatcher
+from gulppy.core.glpp_import_profiler import GlppImportProfiler
+from gulppy.core.glpp_dependencies import resolve_requirements, get_load_levels
+from gulppy.core import glpp_exceptions, glpp_load_stats, glpp_module_loader
 from gulppy.config import GLPP_LOGGER
 
+if TYPE_CHECKING:
+    # multiprocessing is only imported when plugin hosts are started
+    from gulppy.core.glpp_plugin_host import GlppPluginHostPool, GlppHostedPlugin
+
 
 class GlppPluginDuplicatePolicy(Enum):
     """
@@ -37,33 +51,194 @@ class GlppPluginManager(object):
     """
     def __init__(self) -> None:
         self.repositories = []
-        self.plugins = {}
+        self.plugins = self._new_registry()
+        self._repositories_index = {}
+        self._resolver = GlppVersionResolver(get_registry=lambda: self.plugins, get_plugin=lambda value: value[0])
+        self.plugin_duplicate_policy = GlppPluginDuplicatePolicy.ERROR
+        self.watcher = None
+        self.host_pool = None
+        self._refresh_lock = threading.RLock()
+        self._pending_loads = {}
 
-    def add_repository(self, repo_path: str, repo_tag: str = None) -> bool:
+    def add_repository(self,
+                       repo_path: str,
+                       repo_tag: str = None,
+                       descriptor_cache: bool = False,
+                       cache_dir: str or None = None,
+                       discovery: GlppDiscoveryWalker or None = None,
+                       use_hash: bool = False,
+                       bundle: bool = False,
+                       bundle_file: str or None = None,
+                       bundle_check: str = 'signature') -> bool:
         """
         Add a repository to the manager
         :param repo_path: the path of the repository to add
         :param repo_tag: the tag to use for the repository
+        :param descriptor_cache: boolean flag to use a persistent cache of the parsed plugin description files
+        :param cache_dir: directory where to store the cache file. If None, the cache is stored at the repository root.
+        :param discovery: the walker used to discover the plugin description files (@see GlppDiscoveryWalker)
+        :param use_hash: boolean flag to detect plugins changes on their files content (@see refresh)
+        :param bundle: boolean flag to initialize the repository from its frozen bundle (@see GlppPluginRepository)
+        :param bundle_file: path of the bundle file. If None, the bundle is stored at the repository root.
+        :param bundle_check: check of the bundle freshness (@see glpp_bundle.BUNDLE_CHECKS)
         :return: True if repository is added to the context, False otherwise (in case of duplicate)
         """
         GLPP_LOGGER.info('Adding plugin repository : {}'.format(repo_path))
         # Create the repository object (does not load the python modules inside)
-        if not repo_path in [r.repo_path for r in self.repositories]:
-            crepo = GlppPluginRepository(repo_path=repo_path, repo_tag=repo_tag)
+        if not repo_path in self._repositories_index:
+            crepo = GlppPluginRepository(repo_path=repo_path,
+                                         repo_tag=repo_tag,
+                                         descriptor_cache=descriptor_cache,
+                                         cache_dir=cache_dir,
+                                         discovery=discovery,
+                                         use_hash=use_hash,
+                                         bundle=bundle,
+                                         bundle_file=bundle_file,
+                                         bundle_check=bundle_check)
             self.repositories.append(crepo)
+            self._repositories_index[repo_path] = crepo
             return True
         else:
             GLPP_LOGGER.info('Repository {} already exists in current context.'.format(repo_path))
             return False
 
+    async def add_repository_async(self,
+                                   repo_path: str,
+                                   repo_tag: str = None,
+                                   descriptor_cache: bool = False,
+                                   cache_dir: str or None = None,
+                                   discovery: GlppDiscoveryWalker or None = None,
+                                   use_hash: bool = False,
+                                   bundle: bool = False,
+                                   bundle_file: str or None = None,
+                                   bundle_check: str = 'signature',
+                                   max_workers: int = 1,
+                                   executor: Executor or None = None) -> bool:
+        """
+        Asyncio counterpart of add_repository : the repository is scanned and its plugin description files are parsed
+        in an executor so that the event loop is not blocked. Several repositories can be added concurrently : they
+        are registered in the order their scans complete.
+        :param max_workers: number of threads used to parse the plugin description files
+                            (@see GlppPluginRepository.initialize)
+        :param executor: the executor running the scan. If None, the default executor of the event loop is used.
+        :return: True if repository is added to the context, False otherwise (in case of duplicate)
+        """
+        GLPP_LOGGER.info('Adding plugin repository : {}'.format(repo_path))
+        if repo_path not in self._repositories_index:
+            create = partial(GlppPluginRepository,
+                             repo_path=repo_path,
+                             repo_tag=repo_tag,
+                             descriptor_cache=descriptor_cache,
+                             cache_dir=cache_dir,
+                             max_workers=max_workers,
+                             discovery=discovery,
+                             use_hash=use_hash,
+                             bundle=bundle,
+                             bundle_file=bundle_file,
+                             bundle_check=bundle_check)
+            import asyncio
+            crepo = await asyncio.get_running_loop().run_in_executor(executor, create)
+            # another task may have added the repository during the scan
+            if repo_path not in self._repositories_index:
+                self.repositories.append(crepo)
+                self._repositories_index[repo_path] = crepo
+                return True
+        GLPP_LOGGER.info('Repository {} already exists in current context.'.format(repo_path))
+        return False
+
+    def add_repositories(self,
+                         repo_paths: List[str],
+                         repo_tags: List[str] or None = None,
+                         max_workers: int = 4,
+                         descriptor_cache: bool = False,
+                         cache_dir: str or None = None,
+                         discovery: GlppDiscoveryWalker or None = None,
+                         use_hash: bool = False) -> List[bool]:
+        """
+        Add several repositories to the manager.
+        Repositories are scanned and their plugin description files are parsed concurrently on a pool of threads
+        (the cold start is dominated by the filesystem latency). The result is the same as calling add_repository
+        for each repository in order : repositories and plugins are registered in the same order, and the same
+        error is raised for the first faulty repository (the previous ones being added).
+
+        :param repo_paths: the paths of the repositories to add
+        :param repo_tags: the tags to use for the repositories (same length as repo_paths). None means no tags.
+        :param max_workers: number of threads used to scan the repositories and parse the description files
+        :param descriptor_cache: boolean flag to use a persistent cache of the parsed plugin description files
+        :param cache_dir: directory where to store the cache files. If None, the caches are stored at the
+                          repositories roots.
+        :param discovery: the walker used to discover the plugin description files (@see GlppDiscoveryWalker)
+        :param use_hash: boolean flag to detect plugins changes on their files content (@see refresh)
+        :return: for each repository, True if it is added to the context, False otherwise (in case of duplicate)
+        """
+        if repo_tags is None:
+            repo_tags = [None] * len(repo_paths)
+        known_paths = set(self._repositories_index)
+        added = []
+        new_repositories = []
+        for repo_path, repo_tag in zip(repo_paths, repo_tags):
+            GLPP_LOGGER.info('Adding plugin repository : {}'.format(repo_path))
+            if repo_path in known_paths:
+                GLPP_LOGGER.info('Repository {} already exists in current context.'.format(repo_path))
+                added.append(False)
+            else:
+                known_paths.add(repo_path)
+                new_repositories.append(GlppPluginRepository(repo_path=repo_path,
+                                                             repo_tag=repo_tag,
+                                                             descriptor_cache=descriptor_cache,
+                                                             cache_dir=cache_dir,
+                                                             auto_initialize=False,
+                                                             discovery=discovery,
+                                                             use_hash=use_hash))
+                added.append(True)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            scans = [executor.submit(crepo.scan) for crepo in new_repositories]
+            # Parsing tasks are submitted as soon as a repository is scanned. The first scan error is raised after
+            # registering the previous repositories : the next repositories are not parsed.
+            parsed = []
+            pending = list(scans)
+            try:
+                for crepo, scan in zip(new_repositories, scans):
+                    try:
+                        desc_list = scan.result()
+                    except Exception as e:
+                        parsed.append((None, None, e))
+                        break
+                    descriptors = [executor.submit(crepo.get_descriptor, desc_file) for desc_file in desc_list]
+                    pending.extend(descriptors)
+                    parsed.append((desc_list, descriptors, None))
+                for crepo, (desc_list, descriptors, scan_error) in zip(new_repositories, parsed):
+                    if scan_error is not None:
+                        raise scan_error
+                    crepo.register_plugins(desc_list, [f.result for f in descriptors])
+                    self.repositories.append(crepo)
+                    self._repositories_index[crepo.repo_path] = crepo
+            except BaseException:
+                # do not wait for the pending scans and parses at the executor shutdown
+                for future in pending:
+                    future.cancel()
+                raise
+        return added
+
     def load(self,
              plugin_duplicate_policy: GlppPluginDuplicatePolicy = GlppPluginDuplicatePolicy.ERROR,
              err_mod_dup: bool = True,
              err_import: bool = True,
-             mutable_mode: MutableModeEnum = MutableModeEnum.DEFAULT) -> NoReturn:
+             mutable_mode: MutableModeEnum = MutableModeEnum.DEFAULT,
+             lazy: bool = False,
+             batch: BatchModeEnum = BatchModeEnum.NONE,
+             trace_memory: bool = False,
+             profile_imports: bool = False,
+             max_workers: int = 1) -> NoReturn:
         """
         Load all the repositories plugins
 
+        If plugins declare requirements (plugin_requires property, @see glpp_dependencies), the plugins of all the
+        repositories are loaded in dependency order : the requirements are resolved before any module is executed
+        (a missing dependency or a dependency cycle raises an error), then the plugins are loaded level by level
+        (@see _load_dependency_levels). Otherwise the repositories are loaded one after the other.
+
         :param plugin_duplicate_policy: option to manage duplicate plugins across different repositories. You should use
                                         ERROR in case of mutable mode otherwise you may have stange behaviour.
                                         (Please note that the mutable mode is not advised)
@@ -72,66 +247,434 @@ class GlppPluginManager(object):
         :param err_import: An option flag to throw an exception in case of an error during a module import.
                            It is advised to set it to True.
         :param mutable_mode: Mutable mode for plugins.
+        :param lazy: boolean flag to execute the plugins modules at first access instead of at load
+                     (@see GlppAbstractPlugin.load)
+        :param batch: sharing of the load contexts between the plugins modules (@see BatchModeEnum). With REPOSITORY,
+                      each repository is loaded in its own shared context.
+        :param trace_memory: boolean flag to measure the memory allocated by the plugins loads with tracemalloc
+                             (@see get_load_report). This slows down the loads.
+        :param profile_imports: boolean flag to record the imports tree of each plugin load
+                                (@see export_import_profile)
+        :param max_workers: number of threads loading the independent plugins of a dependency level. Only the
+                            modules executions are serialized (@see glpp_module_loader.SYS_CONTEXT_LOCK). Ignored if no
+                            plugin declares requirements.
         :return:
         """
-        self.plugins = {}
+        self.plugin_duplicate_policy = plugin_duplicate_policy
+        self.plugins = self._new_registry()
+        if self._has_requirements():
+            self._load_dependency_levels(plugin_duplicate_policy, max_workers,
+                                         mutable_mode=mutable_mode, err_mod_dup=err_mod_dup, err_import=err_import,
+                                         lazy=lazy, batch=batch, trace_memory=trace_memory,
+                                         profile_imports=profile_imports)
+            return
         for repo in self.repositories:
             # Load plugins in current repository
             # If mutable_mode is set to mutable and err_mod_dup is True : the load_plugins method will raise an
             # exception. We do not catch it here : its a fatal one that should be treated by the caller.
             # If there is an import error : its a fatal error that should be treated by the caller.
-            repo.load_plugins(mutable_mode=mutable_mode, err_mod_dup=err_mod_dup, err_import=err_import)
-
-            # Plugins should be uniquely defined by their name and version.
-            # If multiples repositories contains the same unique plugin (regarding its name and version)
-            # then this methods should raise an exception.
-            # Note : a repositories cannot contains plugin duplicates (@see GlppPluginRepository.initialize())
-            repo_df = repo.get_list_of_plugins_as_dataframe(only_loaded=True)
-            plugins_df = self.get_list_of_plugins_as_dataframe(only_loaded=True)
-            plugins_duplicates = pd.merge(plugins_df, repo_df, how='inner', on=['name', 'version'])
-            plugins_duplicates.dropna(inplace=True)
-
-            if len(plugins_duplicates) > 0:
-                # There is atleast one duplicate !
-                if plugin_duplicate_policy == GlppPluginDuplicatePolicy.ERROR:
-                    # Raise an error according to the policy
-                    dup_as_string = ','.join(['{}:{}'.format(*v) for v in plugins_duplicates[['name', 'version']].values])
-                    raise glpp_exceptions.PluginDuplicateError(dup_as_string, repo.repo_path)
-
-                elif plugin_duplicate_policy == GlppPluginDuplicatePolicy.IGNORE:
-                    # We got to ignore the duplicates and add the others
-                    plugin_to_add = {(cplugin_name, cplugin_version): (cplugin, repo)
-                                     for (cplugin_name, cplugin_version), cplugin in repo.plugins.items()
-                                     if not (cplugin_name, cplugin_version) in plugins_duplicates[['name', 'version']].values}
-                    print('plugin to add: ', plugin_to_add)
-
-                elif plugin_duplicate_policy == GlppPluginDuplicatePolicy.OVERLOAD:
-                    # Add all plugins in the current repo. The dict update will overwrite the plugin associated
-                    # with the key
-                    plugin_to_add = {(cplugin_name, cplugin_version): (cplugin, repo)
-                                     for (cplugin_name, cplugin_version), cplugin in repo.plugins.items()}
-                    print('plugin to add: ', plugin_to_add)
-            else:
-                plugin_to_add = {(cplugin_name, cplugin_version): (cplugin, repo)
-                                 for (cplugin_name, cplugin_version), cplugin in repo.plugins.items()}
+            repo.load_plugins(mutable_mode=mutable_mode, err_mod_dup=err_mod_dup, err_import=err_import, lazy=lazy,
+                              batch=batch, trace_memory=trace_memory, profile_imports=profile_imports)
+            self._merge_repository_plugins(self.plugins, repo, plugin_duplicate_policy)
 
-            self.plugins.update(plugin_to_add)
+    def _select_plugins(self, plugin_duplicate_policy: GlppPluginDuplicatePolicy) -> Dict:
+        """
+        Select the plugins to load among the repositories plugins according to the duplicate policy
+        (@see _merge_repository_plugins)
+        :return: {(name, version): (plugin, repository)} in the repositories order
+        """
+        selected = {}
+        for repo in self.repositories:
+            plugins_duplicates = [(p.name, p.version) for p in repo.plugins_to_load if (p.name, p.version) in selected]
+            if len(plugins_duplicates) > 0 and plugin_duplicate_policy == GlppPluginDuplicatePolicy.ERROR:
+                dup_as_string = ','.join(['{}:{}'.format(*v) for v in plugins_duplicates])
+                raise glpp_exceptions.PluginDuplicateError(dup_as_string, repo.repo_path)
+            for cplugin in repo.plugins_to_load:
+                key = (cplugin.name, cplugin.version)
+                if key not in selected or plugin_duplicate_policy == GlppPluginDuplicatePolicy.OVERLOAD:
+                    selected[key] = (cplugin, repo)
+        return selected
 
-    def get_list_of_plugins_as_dataframe(self, only_loaded : bool = False) -> pd.DataFrame:
+    def _has_requirements(self) -> bool:
+        """
+        Check if a plugin of the repositories declares requirements : the plugins are then loaded in dependency order
+        (@see _load_dependency_levels)
+        """
+        return any(len(cplugin.requires) > 0 for repo in self.repositories for cplugin in repo.plugins_to_load)
+
+    def _load_dependency_levels(self,
+                                plugin_duplicate_policy: GlppPluginDuplicatePolicy,
+                                max_workers: int,
+                                level_callback: Callable[[List[Tuple]], None] or None = None,
+                                **options) -> None:
+        """
+        Load the repositories plugins in dependency order (@see load).
+        The plugins of a level only depend on plugins of the previous levels : they are loaded concurrently on a pool
+        of max_workers threads. Each plugin is given its dependencies (@see GlppAbstractPlugin.set_dependencies) so that
+        its modules import their modules without executing them again. A plugin whose dependency failed to load
+        (err_import or err_mod_dup being False) is not loaded.
+        The duplicates are handled before the load : only the plugins selected by the duplicate policy are loaded.
+        In batch REPOSITORY mode, the plugins are loaded one by one in a single batch context.
+        The loaded plugins of a level are managed as soon as the level is loaded. The load_stats of a repository
+        aggregate the load_stats of its plugins (@see glpp_load_stats.sum_load_stats).
+        :param plugin_duplicate_policy: option to manage duplicate plugins across different repositories
+        :param max_workers: number of threads loading a level
+        :param level_callback: function called with the keys of the plugins of each level, once the level is loaded
+        :param options: the load options (@see GlppPluginRepository.load_plugins)
+        :return:
+        """
+        selected = self._select_plugins(plugin_duplicate_policy)
+        graph = resolve_requirements({key: cplugin for key, (cplugin, _) in selected.items()})
+        levels = get_load_levels(graph)
+        GLPP_LOGGER.debug('Plugins load levels : {}'.format(
+            [['{}:{}'.format(*key) for key in level] for level in levels]))
+        for repo in self.repositories:
+            repo.prepare_load(**options)
+        shared_batch = options['batch'] == BatchModeEnum.REPOSITORY and not options['lazy']
+        if shared_batch or options['trace_memory']:
+            # the batch context is thread local and memory tracing is process wide
+            max_workers = 1
+
+        def load_plugin(key):
+            cplugin, repo = selected[key]
+            return repo.load_plugin(cplugin)
+
+        failed = set()
+        attempted = []
+        with glpp_module_loader.batch_context() if shared_batch else nullcontext(), \
+                ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for level in levels:
+                to_load = []
+                for key in level:
+                    missing = [dependency for dependency in graph[key] if dependency in failed]
+                    if len(missing) > 0:
+                        GLPP_LOGGER.warning('Plugin {}:{} is not loaded : its dependencies {} are not loaded'.format(
+                            key[0], key[1], ','.join(['{}:{}'.format(*v) for v in missing])))
+                        failed.add(key)
+                        continue
+                    selected[key][0].set_dependencies([selected[dependency][0] for dependency in graph[key]])
+                    to_load.append(key)
+                loaded = executor.map(load_plugin, to_load) if max_workers > 1 else map(load_plugin, to_load)
+                failed.update(key for key, is_loaded in zip(to_load, list(loaded)) if not is_loaded)
+                attempted.extend(to_load)
+                # the selected plugins are unique : they are managed without merging the repositories
+                self.plugins.update((key, selected[key]) for key in to_load if key not in failed)
+                if level_callback is not None:
+                    level_callback(level)
+        plugins = self._new_registry()
+        for repo in self.repositories:
+            repo.load_stats = dict(glpp_load_stats.sum_load_stats(selected[key][0].load_stats for key in attempted
+                                                                  if selected[key][1] is repo),
+                                   n_plugins=len(repo.plugins_to_load),
+                                   n_loaded=len(repo.plugins))
+            self._merge_repository_plugins(plugins, repo, plugin_duplicate_policy)
+        self.plugins = plugins
+
+    async def load_async(self,
+                         plugin_duplicate_policy: GlppPluginDuplicatePolicy = GlppPluginDuplicatePolicy.ERROR,
+                         err_mod_dup: bool = True,
+                         err_import: bool = True,
+                         mutable_mode: MutableModeEnum = MutableModeEnum.DEFAULT,
+                         lazy: bool = False,
+                         batch: BatchModeEnum = BatchModeEnum.NONE,
+                         trace_memory: bool = False,
+                         profile_imports: bool = False,
+                         executor: Executor or None = None,
+                         max_workers: int = 1) -> None:
+        """
+        Asyncio counterpart of load : the repositories are loaded in an executor so that the event loop is not
+        blocked, and their plugins are managed as soon as their repository is loaded. Only the modules executions
+        are serialized with the other threads (@see glpp_module_loader.SYS_CONTEXT_LOCK).
+        If plugins declare requirements, the plugins are loaded in dependency order as by load and are managed as soon
+        as their dependency level is loaded.
+        While loading, the plugins can be awaited with get_plugin_async. If a repository load fails, the waiters of
+        the plugins not loaded yet get the error.
+        :param executor: the executor running the loads. If None, the default executor of the event loop is used.
+        :param max_workers: @see load
+        :return:
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        repositories = list(self.repositories)
+        pending = {}
+        for repo in repositories:
+            for cplugin in repo.plugins_to_load:
+                pending.setdefault((cplugin.name, cplugin.version), loop.create_future())
+        self._pending_loads = pending
+        self.plugin_duplicate_policy = plugin_duplicate_policy
+        self.plugins = self._new_registry()
+
+        def resolve(keys):
+            for key in keys:
+                future = pending.get(key)
+                if future is not None and not future.done():
+                    future.set_result(None)
+
+        try:
+            if self._has_requirements():
+                await loop.run_in_executor(executor, partial(self._load_dependency_levels,
+                                                             plugin_duplicate_policy,
+                                                             max_workers,
+                                                             level_callback=partial(loop.call_soon_threadsafe, resolve),
+                                                             mutable_mode=mutable_mode,
+                                                             err_mod_dup=err_mod_dup,
+                                                             err_import=err_import,
+                                                             lazy=lazy,
+                                                             batch=batch,
+                                                             trace_memory=trace_memory,
+                                                             profile_imports=profile_imports))
+                # the duplicates not selected by the policy are not in the levels
+                resolve(pending)
+                return
+            for i, repo in enumerate(repositories):
+                await loop.run_in_executor(executor, partial(repo.load_plugins,
+                                                             mutable_mode=mutable_mode,
+                                                             err_mod_dup=err_mod_dup,
+                                                             err_import=err_import,
+                                                             lazy=lazy,
+                                                             batch=batch,
+                                                             trace_memory=trace_memory,
+                                                             profile_imports=profile_imports))
+                self._merge_repository_plugins(self.plugins, repo, plugin_duplicate_policy)
+                # a plugin is resolved once the repositories that may provide it (or overload it) are loaded
+                remaining = {(p.name, p.version) for crepo in repositories[i + 1:] for p in crepo.plugins_to_load}
+                resolve([key for key in pending if key not in remaining])
+        except BaseException as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # the error is raised to the caller : do not log it again if the future is not awaited
+                    future.exception()
+            raise
+        finally:
+            if self._pending_loads is pending:
+                self._pending_loads = {}
+
+    async def get_plugin_async(self,
+                               plugin_name: str,
+                               constraint: str or None = None,
+                               prerelease: bool = False) -> GlppAbstractPlugin:
+        """
+        Asyncio counterpart of get_plugin : if the manager is loading (@see load_async), wait for the versions of the
+        plugin to be loaded before resolving the constraint.
+        :param plugin_name: the plugin name
+        :param constraint: the version constraint (e.g. '>=1.2,<2'). None means the latest version.
+        :param prerelease: boolean flag to consider the pre-release versions even if a final version matches
+        :return: the plugin
+        """
+        futures = [future for key, future in self._pending_loads.items() if key[0] == plugin_name]
+        if len(futures) > 0:
+            import asyncio
+            await asyncio.gather(*futures)
+        return self.get_plugin(plugin_name, constraint=constraint, prerelease=prerelease)
+
+    @staticmethod
+    def _new_registry() -> GlppPluginRegistry:
+        """
+        Create an empty managed plugins registry indexed by name and by repository path
+        """
+        return GlppPluginRegistry(repo_getter=lambda value: value[1].repo_path)
+
+    @staticmethod
+    def _merge_repository_plugins(plugins: Dict,
+                                  repo: GlppPluginRepository,
+                                  plugin_duplicate_policy: GlppPluginDuplicatePolicy) -> None:
+        """
+        Add the loaded plugins of a repository to a managed plugins dictionary according to the duplicate policy
+        :param plugins: {(name, version): (plugin, repository)} dictionary to update
+        :param repo: the repository
+        :param plugin_duplicate_policy: option to manage duplicate plugins across different repositories
+        :return:
+        """
+        # Plugins should be uniquely defined by their name and version.
+        # If multiples repositories contains the same unique plugin (regarding its name and version)
+        # then this methods should raise an exception.
+        # Note : a repositories cannot contains plugin duplicates (@see GlppPluginRepository.initialize())
+        # Each repository plugin is looked up once in the hash index : the merge is linear in the number of plugins
+        plugins_duplicates = [key for key, cplugin in repo.plugins.items()
+                              if key in plugins and cplugin.load_status == GlppPluginLoadStatus.LOADED]
+
+        if len(plugins_duplicates) > 0:
+            # There is atleast one duplicate !
+            if plugin_duplicate_policy == GlppPluginDuplicatePolicy.ERROR:
+                # Raise an error according to the policy
+                dup_as_string = ','.join(['{}:{}'.format(*v) for v in plugins_duplicates])
+                raise glpp_exceptions.PluginDuplicateError(dup_as_string, repo.repo_path)
+
+            elif plugin_duplicate_policy == GlppPluginDuplicatePolicy.IGNORE:
+                # We got to ignore the duplicates and add the others
+                plugins_duplicates = set(plugins_duplicates)
+                plugin_to_add = [(key, (cplugin, repo)) for key, cplugin in repo.plugins.items()
+                                 if key not in plugins_duplicates]
+                GLPP_LOGGER.debug('Ignored duplicates plugins of repository {} : {}'.format(
+                    repo.repo_path, ','.join(['{}:{}'.format(*v) for v in plugins_duplicates])))
+
+            elif plugin_duplicate_policy == GlppPluginDuplicatePolicy.OVERLOAD:
+                # Add all plugins in the current repo. The registry update will overwrite the plugin associated
+                # with the key
+                plugin_to_add = [(key, (cplugin, repo)) for key, cplugin in repo.plugins.items()]
+                GLPP_LOGGER.debug('Overloaded plugins by repository {} : {}'.format(
+                    repo.repo_path, ','.join(['{}:{}'.format(*v) for v in plugins_duplicates])))
+        else:
+            plugin_to_add = [(key, (cplugin, repo)) for key, cplugin in repo.plugins.items()]
+
+        plugins.update(plugin_to_add)
+
+    def refresh(self) -> GlppRefreshResult:
+        """
+        Refresh all the repositories (@see GlppPluginRepository.refresh) : new plugins are loaded, changed plugins
+        are reloaded, removed plugins are dropped and the other plugins are left untouched.
+        The managed plugins are then merged again using the duplicate policy of the last load.
+        This method is thread safe (it is called by the repository watcher thread, @see start_watcher).
+        :return: the aggregated refresh result of all the repositories
+        """
+        with self._refresh_lock:
+            result = GlppRefreshResult()
+            for repo in list(self.repositories):
+                result.extend(repo.refresh())
+            if result.has_changes():
+                # build the new dictionary before publishing it so that readers never see a partial state
+                plugins = self._new_registry()
+                for repo in self.repositories:
+                    self._merge_repository_plugins(plugins, repo, self.plugin_duplicate_policy)
+                self.plugins = plugins
+            return result
+
+    def start_watcher(self,
+                      interval: float = 60.0,
+                      use_inotify: bool = True,
+                      debounce: float = 1.0) -> GlppRepositoryWatcher:
+        """
+        Start a background thread refreshing the repositories when they change (@see GlppRepositoryWatcher)
+        :param interval: polling period in seconds
+        :param use_inotify: boolean flag to use inotify (Linux only) to refresh as soon as files change
+        :param debounce: quiet period in seconds before refreshing after an inotify event
+        :return: the watcher thread
+        """
+        self.stop_watcher()
+        self.watcher = GlppRepositoryWatcher(callback=self.refresh,
+                                             paths=lambda: [r.repo_path for r in self.repositories],
+                                             interval=interval,
+                                             use_inotify=use_inotify,
+                                             debounce=debounce)
+        self.watcher.start()
+        return self.watcher
+
+    def stop_watcher(self, timeout: float or None = None) -> None:
+        """
+        Stop the repository watcher thread if any
+        :param timeout: time to wait for the thread to terminate
+        :return:
+        """
+        if self.watcher is not None:
+            self.watcher.stop(timeout=timeout)
+            self.watcher = None
+
+    def get_load_report(self) -> Dict:
+        """
+        Get the load metrics of all the repositories plugins (@see GlppAbstractPlugin.load_stats), the slowest first.
+        :return: a dictionary with the keys :
+                 - plugins : list of {name, version, repo_path, repo_tag, status, managed, stats} sorted by decreasing
+                             load wall time. managed is False for the plugins ignored or overloaded as duplicates.
+                 - repositories : list of {repo_path, repo_tag, stats} (@see GlppPluginRepository.load_stats)
+                 - totals : {n_plugins, n_loaded, wall_time, cpu_time, descriptor_time, hacks_time,
+                             n_sys_modules_added, allocated_bytes} summed over the plugins (memory is None unless
+                             traced)
+        """
+        plugins = []
+        for repo in self.repositories:
+            for cplugin in repo.plugins_to_load:
+                managed = self.plugins.get((cplugin.name, cplugin.version))
+                plugins.append({'name': cplugin.name,
+                                'version': cplugin.version,
+                                'repo_path': repo.repo_path,
+                                'repo_tag': repo.repo_tag,
+                                'status': cplugin.load_status.name,
+                                'managed': managed is not None and managed[0] is cplugin,
+                                'stats': dict(cplugin.load_stats, descriptor_time=cplugin.descriptor_time)})
+        plugins.sort(key=lambda p: p['stats'].get('wall_time') or 0., reverse=True)
+
+        totals = {'n_plugins': len(plugins),
+                  'n_loaded': sum(p['status'] == GlppPluginLoadStatus.LOADED.name for p in plugins)}
+        for key in ('wall_time', 'cpu_time', 'descriptor_time', 'hacks_time', 'n_sys_modules_added',
+                    'allocated_bytes'):
+            values = [p['stats'].get(key) for p in plugins if p['stats'].get(key) is not None]
+            totals[key] = sum(values) if len(values) > 0 else None
+        return {'plugins': plugins,
+                'repositories': [{'repo_path': repo.repo_path, 'repo_tag': repo.repo_tag, 'stats': repo.load_stats}
+                                 for repo in self.repositories],
+                'totals': totals}
+
+    def export_load_report(self, path: str or None = None, indent: int or None = 2) -> str:
+        """
+        Export the load report (@see get_load_report) as json
+        :param path: file where to write the report. If None, the report is only returned.
+        :param indent: json indentation
+        :return: the json report
+        """
+        report = json.dumps(self.get_load_report(), indent=indent, default=str)
+        if path is not None:
+            with open(path, 'w') as fp:
+                fp.write(report)
+        return report
+
+    def get_import_profiles(self) -> Dict[str, GlppImportProfiler]:
+        """
+        Get the imports trees recorded by the last load with profile_imports (@see load)
+        :return: {plugin unique id: import profiler} for the managed plugins whose imports have been profiled
+        """
+        return {cplugin.get_unique_id(): cplugin.import_profile for cplugin, _ in self.plugins.values()
+                if cplugin.import_profile is not None}
+
+    def export_import_profile(self, path: str or None = None, fmt: str = 'folded', limit: int or None = None) -> str:
+        """
+        Export the imports trees of the managed plugins (@see get_import_profiles)
+        :param path: file where to write the profile. If None, the profile is only returned.
+        :param fmt: output format :
+                    - folded : folded stacks whose base frame is the plugin unique id, to be rendered as a flamegraph
+                               by flamegraph.pl, speedscope or inferno (@see GlppImportProfiler.to_folded)
+                    - report : text report of each plugin, modules sorted by decreasing cumulative time
+                    - json : trees as json (@see GlppImportProfiler.to_dict)
+        :param limit: maximum number of modules per plugin in the report format
+        :return: the exported profile
+        """
+        profiles = self.get_import_profiles()
+        if fmt == 'folded':
+            output = '\n'.join(line for uid, profiler in profiles.items() for line in profiler.to_folded(prefix=uid))
+        elif fmt == 'report':
+            output = '\n\n'.join('{}\n{}'.format(uid, profiler.format_report(limit=limit))
+                                  for uid, profiler in profiles.items())
+        elif fmt == 'json':
+            output = json.dumps({uid: profiler.to_dict() for uid, profiler in profiles.items()}, indent=2)
+        else:
+            raise ValueError('Unknown import profile format {}'.format(fmt))
+        if path is not None:
+            with open(path, 'w') as fp:
+                fp.write(output + '\n')
+        return output
+
+    def get_list_of_plugins(self, only_loaded: bool = False) -> List[Dict]:
+        """
+        Get the list of plugins as rows (pandas free equivalent of get_list_of_plugins_as_dataframe).
+        Each row is a dictionary with the keys : name, version, status, repo_path and repo_tag
+        :param only_loaded: a flag to filter loaded plugins
+        :return: a list of dictionaries
+        """
+        return [{'name': name, 'version': version, 'status': plugin.load_status,
+                 'repo_path': repo.repo_path, 'repo_tag': repo.repo_tag}
+                for (name, version), (plugin, repo) in self.plugins.items()
+                if not only_loaded or plugin.load_status == GlppPluginLoadStatus.LOADED]
+
+    def get_list_of_plugins_as_dataframe(self, only_loaded : bool = False) -> 'pd.DataFrame':
         """
         Get the list of plugins as a pandas dataframe with the columns : name, version, status, repo_path and repo_tag
         :param only_loaded: a flag to filter loaded plugins
         :return: a pandas dataframe
         """
-        data = {'name': [k[0] for k, _ in self.plugins.items()],
-                'version': [k[1] for k, _ in self.plugins.items()],
-                'status': [v[0].load_status for _, v in self.plugins.items()],
-                'repo_path': [v[1].repo_path for _, v in self.plugins.items()],
-                'repo_tag': [v[1].repo_tag for _, v in self.plugins.items()]}
-        df = pd.DataFrame(data)
-        if only_loaded:
-            df = df[df["status"] == GlppPluginLoadStatus.LOADED]
-        return df
+        # pandas is only needed for tabular display : import it lazily
+        import pandas as pd
+        return pd.DataFrame(self.get_list_of_plugins(only_loaded=only_loaded),
+                            columns=['name', 'version', 'status', 'repo_path', 'repo_tag'])
 
     def display(self) -> NoReturn:
         """
@@ -139,6 +682,7 @@ class GlppPluginManager(object):
         :return:
         """
         GLPP_LOGGER.info('Managed plugins : ')
+        import pandas as pd
         df = self.get_list_of_plugins_as_dataframe()
         pd.set_option('display.max_rows', None)
         pd.set_option('display.max_columns', None)
@@ -151,6 +695,68 @@ class GlppPluginManager(object):
         """
         return self.plugins
 
+    def get_repository(self, repo_path: str) -> GlppPluginRepository:
+        """
+        Get a repository by its path
+        :param repo_path: the path of the repository (as given to add_repository)
+        :return: the repository
+        """
+        try:
+            return self._repositories_index[repo_path]
+        except KeyError as e:
+            raise glpp_exceptions.RepositoryNotFound(repo_path) from e
+
+    def get_plugins_by_name(self, plugin_name: str) -> Dict:
+        """
+        Get the managed plugins of a given name
+        :param plugin_name: the plugin name
+        :return: {version: plugin:GlppAbstractPlugin} in load order (empty if there is no such plugin)
+        """
+        return {version: cplugin for version, (cplugin, _) in self.plugins.get_versions(plugin_name).items()}
+
+    def get_plugins_by_repository(self, repo_path: str) -> Dict:
+        """
+        Get the managed plugins coming from a repository (the duplicates ignored or overloaded are not included)
+        :param repo_path: the path of the repository
+        :return: {(name, version): plugin:GlppAbstractPlugin}
+        """
+        return {key: self.plugins[key][0] for key in self.plugins.get_keys_by_repository(repo_path)}
+
+    def get_plugin(self,
+                   plugin_name: str,
+                   constraint: str or None = None,
+                   prerelease: bool = False) -> GlppAbstractPlugin:
+        """
+        Get the newest managed plugin of a given name satisfying a version constraint
+        (@see glpp_version.parse_constraint). Versions are normalized so that 1.0 (float parsed by the yaml loader)
+        and '1.0' are the same version.
+        :param plugin_name: the plugin name
+        :param constraint: the version constraint (e.g. '>=1.2,<2'). None means the latest version.
+        :param prerelease: boolean flag to consider the pre-release versions even if a final version matches
+        :return: the plugin
+        """
+        resolved = self._resolver.resolve(plugin_name, constraint=constraint, prerelease=prerelease)
+        if resolved is None:
+            raise glpp_exceptions.PluginNotFound(plugin_name, constraint)
+        return resolved[1]
+
+    def get_latest(self, plugin_name: str, prerelease: bool = False) -> GlppAbstractPlugin:
+        """
+        Get the newest version of a managed plugin (@see get_plugin)
+        :param plugin_name: the plugin name
+        :param prerelease: boolean flag to consider the pre-release versions even if a final version exists
+        :return: the plugin
+        """
+        return self.get_plugin(plugin_name, prerelease=prerelease)
+
+    def get_plugin_versions(self, plugin_name: str) -> List:
+        """
+        Get the managed versions of a plugin
+        :param plugin_name: the plugin name
+        :return: the versions sorted from the oldest to the newest
+        """
+        return self._resolver.get_versions(plugin_name)
+
     def get_plugin_by_name_and_version(self, plugin_name: str, plugin_version: str) -> GlppAbstractPlugin:
         """
         Get plugin by its name and version
@@ -162,3 +768,115 @@ class GlppPluginManager(object):
             return self.get_plugins_as_dict()[(plugin_name, plugin_version)][0]
         except KeyError as e:
             raise glpp_exceptions.PluginNotFound(plugin_name, plugin_version) from e
+
+    def unload_plugin(self, plugin_name: str, plugin_version: str, check_leaks: bool = True) -> Dict:
+        """
+        Unload a managed plugin (@see GlppAbstractPlugin.unload) and drop it from the managed plugins and from its
+        repository loaded plugins. It is also dropped from the plugin hosts if it is hosted. The plugin stays
+        registered in its repository : a new load loads it again.
+        This method is thread safe with respect to refresh.
+        :param plugin_name: the plugin name
+        :param plugin_version: the plugin version
+        :param check_leaks: boolean flag to verify the reclamation of the plugin modules
+        :return: the unload report (@see GlppAbstractPlugin.unload)
+        """
+        key = (plugin_name, plugin_version)
+        with self._refresh_lock:
+            try:
+                cplugin, repo = self.plugins[key]
+            except KeyError:
+                raise glpp_exceptions.PluginNotFound(plugin_name, plugin_version)
+            # publish a new registry so that readers never see a partial state
+            plugins = self.plugins.copy()
+            del plugins[key]
+            self.plugins = plugins
+            if repo.plugins.get(key) is cplugin:
+                del repo.plugins[key]
+        if self.host_pool is not None and cplugin.get_unique_id() in self.host_pool.plugins:
+            self.host_pool.unload_plugin(cplugin.get_unique_id())
+        return cplugin.unload(check_leaks=check_leaks)
+
+    def start_plugin_hosts(self,
+                           plugins: List[Tuple[str, str]],
+                           n_hosts: int = 2,
+                           mutable_mode: MutableModeEnum = MutableModeEnum.DEFAULT,
+                           lazy: bool = False,
+                           start_method: str or None = None,
+                           shm_threshold: int or None = None,
+                           auto_restart: bool = True) -> 'GlppPluginHostPool':
+        """
+        Load plugins out of process in a pool of plugin hosts (@see GlppPluginHostPool).
+        The hosted plugins are then called through proxies (@see get_hosted_plugin).
+        :param plugins: the list of (name, version) of the plugins to host. The plugins do not need to be loaded in
+                        the current process.
+        :param n_hosts: number of host processes
+        :param mutable_mode: the mutable mode used to load the plugins in the hosts
+        :param lazy: boolean flag to load the plugins lazily in the hosts (@see GlppModulePlugin.get_module)
+        :param start_method: multiprocessing start method (fork, spawn, forkserver). None means spawn.
+        :param shm_threshold: size in bytes from which bytes and numpy arrays are passed through shared memory. If
+                              None, glpp_plugin_host.DEFAULT_SHM_THRESHOLD is used.
+        :param auto_restart: boolean flag to restart the crashed hosts
+        :return: the pool of plugin hosts
+        """
+        from gulppy.core.glpp_plugin_host import GlppPluginHostPool, DEFAULT_SHM_THRESHOLD
+        if shm_threshold is None:
+            shm_threshold = DEFAULT_SHM_THRESHOLD
+        descriptions = []
+        for plugin_name, plugin_version in plugins:
+            cplugin = self._find_plugin(plugin_name, plugin_version)
+            descriptions.append((cplugin.get_unique_id(), cplugin.plugin_desc))
+        self.stop_plugin_hosts()
+        self.host_pool = GlppPluginHostPool(n_hosts=n_hosts,
+                                            start_method=start_method,
+                                            shm_threshold=shm_threshold,
+                                            auto_restart=auto_restart)
+        try:
+            for uid, plugin_desc in descriptions:
+                self.host_pool.load_plugin(uid, plugin_desc, mutable_mode=mutable_mode.name, lazy=lazy)
+        except Exception:
+            self.stop_plugin_hosts()
+            raise
+        return self.host_pool
+
+    def _find_plugin(self, plugin_name: str, plugin_version: str) -> GlppAbstractPlugin:
+        """
+        Find a plugin in the managed plugins or, if it is not loaded, in the repositories
+        """
+        if (plugin_name, plugin_version) in self.plugins:
+            return self.plugins[(plugin_name, plugin_version)][0]
+        for repo in self.repositories:
+            cplugin = repo.registered_plugins.get((plugin_name, plugin_version))
+            if cplugin is not None:
+                return cplugin
+        raise glpp_exceptions.PluginNotFound(plugin_name, plugin_version)
+
+    def get_hosted_plugin(self, plugin_name: str, plugin_version: str) -> 'GlppHostedPlugin':
+        """
+        Get the proxy of a plugin loaded in the plugin hosts (@see start_plugin_hosts)
+        :param plugin_name: the plugin name
+        :param plugin_version: the plugin version
+        :return: the hosted plugin proxy
+        """
+        from gulppy.core.glpp_plugin_host import GlppHostedPlugin
+        uid = GlppAbstractPlugin.get_unique_id_cls(plugin_name, plugin_version)
+        if self.host_pool is None or uid not in self.host_pool.plugins:
+            raise glpp_exceptions.PluginNotFound(plugin_name, plugin_version)
+        return GlppHostedPlugin(self.host_pool, plugin_name, plugin_version, uid)
+
+    def get_hosts_stats(self) -> List[Dict]:
+        """
+        Get the plugin hosts metrics : call latency, queue depth, ... (@see GlppPluginHost.get_stats)
+        :return: the list of the hosts metrics (empty if no host is running)
+        """
+        if self.host_pool is None:
+            return []
+        return self.host_pool.get_stats()
+
+    def stop_plugin_hosts(self) -> None:
+        """
+        Stop the plugin hosts if any
+        :return:
+        """
+        if self.host_pool is not None:
+            self.host_pool.shutdown()
+            self.host_pool = None
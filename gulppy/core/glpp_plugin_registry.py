@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Gulppy hash indexed plugin registry
+"""
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Tuple
+
+
+class GlppPluginRegistry(dict):
+    """
+    A dictionary of plugins keyed by (name, version) with secondary hash indexes :
+    - by plugin name : {name: {version: value}} in insertion order
+    - by repository (optional) : {repository key: {(name, version): None}} in insertion order, the repository key of
+      a value being given by repo_getter
+
+    All the dictionary mutators keep the indexes up to date so that the lookups by name or by repository do not scan
+    the registry, and increment the generation counter so that derived caches can be invalidated
+    (@see GlppVersionResolver). The registry is not thread safe : publish a new registry instead of mutating a shared
+    one.
+    """
+    def __init__(self,
+                 items: Iterable[Tuple[Tuple[str, Any], Any]] or Dict = (),
+                 repo_getter: Callable[[Any], Hashable] or None = None) -> None:
+        """
+        Constructor
+        :param items: initial content, a dictionary or an iterable of ((name, version), value)
+        :param repo_getter: callable giving the repository key of a value. If None, there is no repository index.
+        """
+        super().__init__()
+        self.repo_getter = repo_getter
+        self.generation = 0
+        self._by_name = {}
+        self._by_repo = {}
+        self.update(items)
+
+    def _index(self, key: Tuple[str, Any], value: Any) -> None:
+        self.generation += 1
+        name, version = key
+        self._by_name.setdefault(name, {})[version] = value
+        if self.repo_getter is not None:
+            self._by_repo.setdefault(self.repo_getter(value), {})[key] = None
+
+    def _unindex(self, key: Tuple[str, Any], value: Any) -> None:
+        self.generation += 1
+        name, version = key
+        versions = self._by_name[name]
+        del versions[version]
+        if len(versions) == 0:
+            del self._by_name[name]
+        if self.repo_getter is not None:
+            repo_key = self.repo_getter(value)
+            keys = self._by_repo[repo_key]
+            del keys[key]
+            if len(keys) == 0:
+                del self._by_repo[repo_key]
+
+    def __setitem__(self, key: Tuple[str, Any], value: Any) -> None:
+        if key in self:
+            self._unindex(key, self[key])
+        super().__setitem__(key, value)
+        self._index(key, value)
+
+    def __delitem__(self, key: Tuple[str, Any]) -> None:
+        self._unindex(key, self[key])
+        super().__delitem__(key)
+
+    def update(self, items=(), **kwargs) -> None:
+        if isinstance(items, dict):
+            items = items.items()
+        for key, value in items:
+            self[key] = value
+        if len(kwargs) > 0:
+            raise TypeError('GlppPluginRegistry keys are (name, version) tuples')
+
+    def setdefault(self, key: Tuple[str, Any], default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    _MISSING = object()
+
+    def pop(self, key: Tuple[str, Any], default: Any = _MISSING) -> Any:
+        if key not in self:
+            if default is self._MISSING:
+                raise KeyError(key)
+            return default
+        value = self[key]
+        del self[key]
+        return value
+
+    def popitem(self) -> Tuple[Tuple[str, Any], Any]:
+        key, value = super().popitem()
+        self._unindex(key, value)
+        return key, value
+
+    def clear(self) -> None:
+        super().clear()
+        self.generation += 1
+        self._by_name = {}
+        self._by_repo = {}
+
+    def copy(self) -> 'GlppPluginRegistry':
+        return GlppPluginRegistry(self, repo_getter=self.repo_getter)
+
+    def get_names(self) -> List[str]:
+        """
+        Get the names of the registered plugins
+        :return: the list of plugin names in insertion order
+        """
+        return list(self._by_name.keys())
+
+    def get_versions(self, name: str) -> Dict[Any, Any]:
+        """
+        Get the registered versions of a plugin
+        :param name: the plugin name
+        :return: {version: value} (empty if the name is unknown)
+        """
+        return dict(self._by_name.get(name, {}))
+
+    def get_keys_by_repository(self, repo_key: Hashable) -> List[Tuple[str, Any]]:
+        """
+        Get the keys of the values of a repository (needs a repo_getter)
+        :param repo_key: the repository key (@see repo_getter)
+        :return: the list of (name, version) in insertion order
+        """
+        return list(self._by_repo.get(repo_key, {}).keys())
+
+    def get_repositories(self) -> List[Hashable]:
+        """
+        Get the keys of the repositories having values in the registry (needs a repo_getter)
+        :return: the list of repositories keys
+        """
+        return list(self._by_repo.keys())
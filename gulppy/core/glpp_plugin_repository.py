@@ -2,11 +2,22 @@
 """
 Gulppy Plugin repository definition
 """
+import os
 import pathlib
-import pandas as pd
-from typing import NoReturn, List
-from gulppy.core.glpp_abstract_plugin import GlppAbstractPlugin, DESCR_FILENAME, GlppPluginLoadStatus
-from gulppy.core.glpp_plugin_factory import GlppPluginFactory, MutableModeEnum, mutable_context
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import NoReturn, List, Dict, Callable
+from gulppy.core.glpp_abstract_plugin import GlppAbstractPlugin, GlppPluginLoadStatus
+from gulppy.core.glpp_plugin_factory import GlppPluginFactory, MutableModeEnum, BatchModeEnum, get_mutable_flags
+from gulppy.core import glpp_module_loader, glpp_load_stats
+from gulppy.core.glpp_plugin_descriptor import GlppPluginDescriptor
+from gulppy.core.glpp_plugin_registry import GlppPluginRegistry
+from gulppy.core.glpp_version import GlppVersionResolver
+from gulppy.core.glpp_descriptor_cache import GlppDescriptorCache
+from gulppy.core.glpp_discovery import GlppDiscoveryWalker
+from gulppy.core.glpp_refresh import GlppRefreshResult, get_files_signature, is_signature_changed
+from gulppy.core.glpp_bundle import GlppBundle
 from gulppy.core import glpp_exceptions
 from gulppy.config import GLPP_LOGGER
 
@@ -15,10 +26,63 @@ class GlppPluginRepository(object):
     """
     A Plugin repository represents a storage space containing one or more plugins.
     """
-    def __init__(self, repo_path: str, repo_tag: str) -> None:
+    def __init__(self,
+                 repo_path: str,
+                 repo_tag: str,
+                 descriptor_cache: bool = False,
+                 cache_dir: str or None = None,
+                 max_workers: int = 1,
+                 auto_initialize: bool = True,
+                 discovery: GlppDiscoveryWalker or None = None,
+                 use_hash: bool = False,
+                 bundle: bool = False,
+                 bundle_file: str or None = None,
+                 bundle_check: str = 'signature') -> None:
+        """
+        Constructor
+        :param repo_path: path of the repository
+        :param repo_tag: tag of the repository
+        :param descriptor_cache: boolean flag to use a persistent cache of the parsed plugin description files
+                                 (@see GlppDescriptorCache)
+        :param cache_dir: directory where to store the cache file. If None, the cache is stored at the repository root.
+        :param max_workers: number of threads used to parse the plugin description files (@see initialize)
+        :param auto_initialize: boolean flag to initialize the repository at creation. If False, initialize (or scan
+                                and register_plugins) has to be called before using the repository.
+        :param discovery: the walker used to discover the plugin description files. If None, a walker with the
+                          default options is used (@see GlppDiscoveryWalker).
+        :param use_hash: boolean flag to detect the plugins changes on their files content (sha1) instead of their
+                         mtime, size and inode (@see refresh)
+        :param bundle: boolean flag to initialize the repository from its frozen bundle (@see freeze). If the bundle
+                       is missing, stale or written by another python version, the plugins are discovered and loaded
+                       from their sources.
+        :param bundle_file: path of the bundle file. If None, the bundle is stored at the repository root.
+        :param bundle_check: check of the bundle freshness at initialization (@see glpp_bundle.BUNDLE_CHECKS)
+        """
         self.repo_path = repo_path
         self.repo_tag = repo_tag
-        self.initialize()
+        if descriptor_cache:
+            self.descriptor_cache = GlppDescriptorCache.for_repository(repo_path=repo_path, cache_dir=cache_dir)
+        else:
+            self.descriptor_cache = None
+        self.discovery = discovery if discovery is not None else GlppDiscoveryWalker()
+        self.discovery_result = None
+        self.use_hash = use_hash
+        self.use_bundle = bundle
+        self.bundle_file = bundle_file
+        self.bundle_check = bundle_check
+        self.bundle = None
+        self._bundle_signatures = {}
+        self.plugins_to_load = []
+        self.registered_plugins = GlppPluginRegistry()
+        self.plugins = GlppPluginRegistry()
+        self._signatures = {}
+        self._load_options = None
+        self._load_lock = threading.Lock()
+        self.load_stats = {}
+        self._descriptor_times = {}
+        self._resolver = GlppVersionResolver(get_registry=lambda: self.plugins)
+        if auto_initialize:
+            self.initialize(max_workers=max_workers)
 
     @property
     def repo_path(self):
@@ -49,44 +113,162 @@ class GlppPluginRepository(object):
         :return:
         """
         self.plugins_to_load.append(plugin)
+        self.registered_plugins[(plugin.name, plugin.version)] = plugin
 
-    def initialize(self) -> None:
+    def initialize(self, max_workers: int = 1) -> None:
         """
         Initialize plugin in repository.
+        :param max_workers: number of threads used to parse the plugin description files. The plugins are registered
+                            in the same order and with the same duplicates errors whatever the number of threads.
         :return:
         """
-        t_unique = []
-        self.plugins_to_load = []
-        self.plugins = {}
-        desc_list = list(pathlib.Path(self.repo_path).glob('**/{0}'.format(DESCR_FILENAME)))
+        if self.bundle is not None:
+            self.bundle.release()
+            self.bundle = None
+            self._bundle_signatures = {}
+        desc_list = None
+        if self.use_bundle:
+            # the plugins added or removed since the freeze are only seen by a discovery walk
+            desc_list = self.scan() if self.bundle_check != 'none' else None
+            if self._initialize_from_bundle(desc_list):
+                return
+        if desc_list is None:
+            desc_list = self.scan()
+        if max_workers > 1 and len(desc_list) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                descriptors = [executor.submit(self.get_descriptor, desc_file) for desc_file in desc_list]
+                self.register_plugins(desc_list, [f.result for f in descriptors])
+        else:
+            self.register_plugins(desc_list, [partial(self.get_descriptor, desc_file) for desc_file in desc_list])
+
+    def _initialize_from_bundle(self, desc_list: List[pathlib.Path] or None = None) -> bool:
+        """
+        Register the plugins of the repository bundle : the description files are not parsed and the frozen files are
+        executed from their code objects (@see glpp_bundle)
+        :param desc_list: the description files discovered in the repository, compared with the ones of the bundle
+                          (@see glpp_bundle.GlppBundle.is_stale)
+        :return: True if the plugins have been registered from the bundle
+        """
+        bundle = GlppBundle.open(repo_path=self.repo_path, bundle_file=self.bundle_file)
+        if bundle is not None and bundle.is_stale(check=self.bundle_check, desc_files=desc_list):
+            GLPP_LOGGER.warning('Bundle of repository {} is stale'.format(self.repo_path))
+            bundle = None
+        if bundle is None:
+            GLPP_LOGGER.warning('Repository {} is loaded from its sources'.format(self.repo_path))
+            return False
+        bundle.install()
+        self.bundle = bundle
+        descriptions = bundle.get_descriptions()
+        self._bundle_signatures = {d['desc_file']: d['signatures'] for d in descriptions}
+        self.register_plugins([pathlib.Path(d['desc_file']) for d in descriptions],
+                              [partial(GlppPluginDescriptor.from_dict, d['desc_file'], d['description'])
+                               for d in descriptions])
+        GLPP_LOGGER.debug('Repository {} initialized from its bundle'.format(self.repo_path))
+        return True
+
+    def freeze(self, bundle_file: str or None = None) -> pathlib.Path:
+        """
+        Freeze the plugins of the repository in a bundle (@see glpp_bundle.GlppBundle.freeze)
+        :param bundle_file: path of the bundle file. If None, the repository bundle_file is used.
+        :return: the path of the bundle file
+        """
+        desc_files = None if self.discovery_result is None else self.discovery_result.descriptors
+        return GlppBundle.freeze(repo_path=self.repo_path,
+                                 plugins=self.plugins_to_load,
+                                 bundle_file=bundle_file if bundle_file is not None else self.bundle_file,
+                                 desc_files=desc_files)
+
+    def scan(self) -> List[pathlib.Path]:
+        """
+        Scan the repository for plugin description files
+        :return: the list of plugin description files
+        """
+        self.discovery_result = self.discovery.walk(self.repo_path)
+        desc_list = self.discovery_result.descriptors
         if len(desc_list) == 0:
             GLPP_LOGGER.debug('No plugin found in repository {}'.format(self.repo_path))
         else:
             GLPP_LOGGER.debug('Found {} plugin description(s) in repository {}'.format(len(desc_list), self.repo_path))
-        for desc_file in desc_list:
+        GLPP_LOGGER.debug('Discovery for repository {} : {}'.format(self.repo_path, self.discovery_result.get_stats()))
+        return desc_list
+
+    def get_discovery_stats(self) -> Dict[str, int] or None:
+        """
+        Get the counters of the last discovery walk (@see GlppDiscoveryResult.get_stats)
+        :return: the discovery counters or None if the repository has not been scanned yet
+        """
+        if self.discovery_result is None:
+            return None
+        return self.discovery_result.get_stats()
+
+    def get_descriptor(self, desc_file: str or pathlib.Path) -> GlppPluginDescriptor:
+        """
+        Get the descriptor of a plugin description file, using the descriptor cache if enabled.
+        This method is thread safe.
+        :param desc_file: the plugin description file
+        :return: the plugin descriptor
+        """
+        with glpp_load_stats.measure() as stats:
+            if self.descriptor_cache is not None:
+                descriptor = self.descriptor_cache.get_descriptor(desc_file)
+            else:
+                descriptor = GlppPluginDescriptor.from_file(desc_file)
+        # kept for the plugin created from this descriptor (@see GlppAbstractPlugin.load_stats)
+        self._descriptor_times[os.fspath(desc_file)] = stats['wall_time']
+        return descriptor
+
+    def register_plugins(self,
+                         desc_list: List[pathlib.Path],
+                         descriptors: List[Callable[[], GlppPluginDescriptor]]) -> None:
+        """
+        Create the plugins of the repository (without loading them) in the order of desc_list.
+        :param desc_list: the list of plugin description files (@see scan)
+        :param descriptors: for each description file, a callable returning its descriptor. This allows descriptors
+                            to be parsed concurrently (future results) while errors are raised in order.
+        :return:
+        """
+        self.plugins_to_load = []
+        self.registered_plugins = GlppPluginRegistry()
+        self.plugins = GlppPluginRegistry()
+        self._signatures = {}
+        for desc_file, get_descriptor in zip(desc_list, descriptors):
             GLPP_LOGGER.debug('Found plugin : {}'.format(desc_file))
             GLPP_LOGGER.debug('Initializing plugin : {}'.format(desc_file))
             try:
                 # Here we create the plugin without loading it
-                # No need to specify the mutable_mode parameters as it has no effective effect (even if the context
-                # is changed in the create_plugin method)
+                # No need to specify the mutable_mode parameters as it has no effective effect : the mode is only
+                # passed to the load
                 cplugin = GlppPluginFactory.create_plugin(plugin_desc=desc_file,
                                                           load=False,
-                                                          )
+                                                          descriptor=get_descriptor())
+                cplugin.descriptor_time = self._descriptor_times.pop(os.fspath(desc_file), None)
             except:
                 # TODO : manage exception we want to pass...
                 raise
             else:
                 GLPP_LOGGER.debug(' -> Plugin : name = {0} - version = {1}'.format(cplugin.name, cplugin.version))
                 # Here we manage duplicates error
-                if cplugin.get_unique_id() in t_unique:
+                if (cplugin.name, cplugin.version) in self.registered_plugins:
                     # Duplicate found - force raise an exception here -> cannot predict which plugin to use
                     raise glpp_exceptions.PluginRepositoryDuplicateError(cplugin.name,
                                                                          cplugin.version,
                                                                          self.repo_path)
                 else:
                     self.add_plugin(cplugin)
-                    t_unique.append(cplugin.get_unique_id())
+                    self._update_signature(cplugin)
+        if self.descriptor_cache is not None:
+            self.descriptor_cache.save()
+            GLPP_LOGGER.debug('Descriptor cache for repository {} : {}'.format(self.repo_path,
+                                                                              self.descriptor_cache.get_stats()))
+
+    def get_cache_stats(self) -> Dict[str, int] or None:
+        """
+        Get the descriptor cache counters (@see GlppDescriptorCache.get_stats)
+        :return: the cache counters or None if the descriptor cache is not used
+        """
+        if self.descriptor_cache is None:
+            return None
+        return self.descriptor_cache.get_stats()
 
     def get_list_of_plugins_id(self) -> List[str]:
         """
@@ -95,19 +277,26 @@ class GlppPluginRepository(object):
         """
         return [module.get_unique_id() for module in self.plugins_to_load]
 
-    def get_list_of_plugins_as_dataframe(self, only_loaded: bool = False) -> pd.DataFrame:
+    def get_list_of_plugins(self, only_loaded: bool = False) -> List[Dict]:
+        """
+        Get the list of plugins described as rows (pandas free equivalent of get_list_of_plugins_as_dataframe).
+        Each row is a dictionary with the keys : name, version and status
+        :param only_loaded: only consider plugins that have a status equals to LOADED
+        :return: a list of dictionaries
+        """
+        return [{"name": p.name, "version": p.version, "status": p.load_status}
+                for p in self.plugins_to_load
+                if not only_loaded or p.load_status == GlppPluginLoadStatus.LOADED]
+
+    def get_list_of_plugins_as_dataframe(self, only_loaded: bool = False) -> 'pd.DataFrame':
         """
         Get the list of plugins described in a pandas dataframe
         :param only_loaded: only consider plugins that have a status equals to LOADED
         :return: a dataframe
         """
-        data = {"name": [p.name for p in self.plugins_to_load],
-                "version": [p.version for p in self.plugins_to_load],
-                "status": [p.load_status for p in self.plugins_to_load]}
-        df = pd.DataFrame(data)
-        if only_loaded:
-            df = df[df["status"] == GlppPluginLoadStatus.LOADED]
-        return df
+        # pandas is only needed for tabular display : import it lazily
+        import pandas as pd
+        return pd.DataFrame(self.get_list_of_plugins(only_loaded=only_loaded), columns=["name", "version", "status"])
 
     def display(self) -> NoReturn:
         """
@@ -115,6 +304,7 @@ class GlppPluginRepository(object):
         :return: 
         """
         GLPP_LOGGER.info('Repository <{0}> : {1}'.format(self.repo_tag, self.repo_path))
+        import pandas as pd
         df = self.get_list_of_plugins_as_dataframe()
         pd.set_option('display.max_rows', None)
         pd.set_option('display.max_columns', None)
@@ -132,7 +322,11 @@ class GlppPluginRepository(object):
     def load_plugins(self,
                      mutable_mode: MutableModeEnum = MutableModeEnum.DEFAULT,
                      err_mod_dup: bool = True,
-                     err_import: bool = True) -> NoReturn:
+                     err_import: bool = True,
+                     lazy: bool = False,
+                     batch: BatchModeEnum = BatchModeEnum.NONE,
+                     trace_memory: bool = False,
+                     profile_imports: bool = False) -> NoReturn:
         """
         Load all plugins found in repository
         :param mutable_mode: Mutable mode for plugins.
@@ -140,28 +334,180 @@ class GlppPluginRepository(object):
                             It is advised to set it to True.
         :param err_import: An option flag to throw an exception in case of an error during a module import.
                            It is advised to set it to True.
+        :param lazy: boolean flag to execute the plugins modules at first access (@see GlppAbstractPlugin.load).
+                     Import errors are then raised at first access.
+        :param batch: sharing of the load contexts between the plugins modules (@see BatchModeEnum)
+        :param trace_memory: boolean flag to measure the memory allocated by the plugins loads
+                             (@see GlppAbstractPlugin.load_stats)
+        :param profile_imports: boolean flag to record the imports tree of each plugin load
+                                (@see GlppAbstractPlugin.import_profile)
         :return:
         """
         GLPP_LOGGER.debug('Load plugins for repo {}'.format(self.repo_path))
-        self.plugins = {}
-        for cplugin in self.plugins_to_load:
-            try:
-                with mutable_context(plugin_cls=cplugin.__class__, mutable_mode=mutable_mode):
-                    cplugin.load()
-            except glpp_exceptions.PluginModuleSysModuleDuplicateError as e:
-                GLPP_LOGGER.error(str(e))
-                if err_mod_dup:
-                    raise
-                else:
-                    # ignore error : module is just not loaded
-                    pass
-            except glpp_exceptions.PluginImportError as e:
-                if err_import:
-                    raise
-                else:
-                    GLPP_LOGGER.warning(str(e))
+        self.prepare_load(mutable_mode=mutable_mode, err_mod_dup=err_mod_dup, err_import=err_import, lazy=lazy,
+                          batch=batch, trace_memory=trace_memory, profile_imports=profile_imports)
+        # tracing is started once for all the plugins (@see glpp_load_stats.trace_memory)
+        with glpp_load_stats.trace_memory(enabled=trace_memory) as memory_stats, \
+                glpp_load_stats.measure() as stats:
+            if batch == BatchModeEnum.REPOSITORY and not lazy:
+                # plugins loaded in mutable mode or with hack scripts do not use the shared context
+                # (@see glpp_module_loader.load_modules)
+                with glpp_module_loader.batch_context():
+                    for cplugin in self.plugins_to_load:
+                        self.load_plugin(cplugin)
             else:
+                for cplugin in self.plugins_to_load:
+                    self.load_plugin(cplugin)
+        self.load_stats = dict(stats,
+                               peak_bytes=memory_stats['peak_bytes'],
+                               n_plugins=len(self.plugins_to_load),
+                               n_loaded=len(self.plugins))
+
+    def prepare_load(self,
+                     mutable_mode: MutableModeEnum = MutableModeEnum.DEFAULT,
+                     err_mod_dup: bool = True,
+                     err_import: bool = True,
+                     lazy: bool = False,
+                     batch: BatchModeEnum = BatchModeEnum.NONE,
+                     trace_memory: bool = False,
+                     profile_imports: bool = False) -> None:
+        """
+        Set the load options (@see load_plugins) and drop the loaded plugins, the plugins being then loaded one by one
+        with load_plugin (@see GlppPluginManager.load)
+        :return:
+        """
+        self._load_options = {'mutable_mode': mutable_mode, 'err_mod_dup': err_mod_dup, 'err_import': err_import,
+                              'lazy': lazy, 'batch': batch, 'trace_memory': trace_memory,
+                              'profile_imports': profile_imports}
+        self.plugins = GlppPluginRegistry()
+
+    def load_plugin(self, cplugin: GlppAbstractPlugin) -> bool:
+        """
+        Load a plugin of the repository with the options of the last load (@see prepare_load).
+        Several plugins can be loaded concurrently.
+        :param cplugin: a plugin of the repository
+        :return: True if the plugin is loaded
+        """
+        return self._load_plugin(cplugin, **self._load_options)
+
+    def _load_plugin(self,
+                     cplugin: GlppAbstractPlugin,
+                     mutable_mode: MutableModeEnum = MutableModeEnum.DEFAULT,
+                     err_mod_dup: bool = True,
+                     err_import: bool = True,
+                     lazy: bool = False,
+                     batch: BatchModeEnum = BatchModeEnum.NONE,
+                     trace_memory: bool = False,
+                     profile_imports: bool = False) -> bool:
+        """
+        Load a plugin of the repository (@see load_plugins)
+        :return: True if the plugin is loaded
+        """
+        try:
+            immutable, namespaced = get_mutable_flags(mutable_mode)
+            cplugin.load(lazy=lazy, batch=batch != BatchModeEnum.NONE, trace_memory=trace_memory,
+                         profile_imports=profile_imports, immutable=immutable, namespaced=namespaced)
+        except glpp_exceptions.PluginModuleSysModuleDuplicateError as e:
+            GLPP_LOGGER.error(str(e))
+            if err_mod_dup:
+                raise
+            else:
+                # ignore error : module is just not loaded
+                pass
+        except glpp_exceptions.PluginImportError as e:
+            if err_import:
+                raise
+            else:
+                GLPP_LOGGER.warning(str(e))
+        else:
+            with self._load_lock:
                 self.plugins[(cplugin.name, cplugin.version)] = cplugin
+                # the loaded modules files are now known : track them too
+                self._update_signature(cplugin)
+            return True
+        return False
+
+    def _update_signature(self, cplugin: GlppAbstractPlugin) -> None:
+        """
+        Record the signature of the plugin files (@see refresh)
+        :param cplugin: a plugin of the repository
+        :return:
+        """
+        signatures = self._bundle_signatures.get(cplugin.descriptor.plugin_desc)
+        if signatures is not None and not self.use_hash:
+            # the signatures of the frozen files, recorded at freeze
+            self._signatures[cplugin.descriptor.plugin_desc] = dict(signatures)
+            return
+        self._signatures[cplugin.descriptor.plugin_desc] = get_files_signature(cplugin.get_source_files(),
+                                                                               use_hash=self.use_hash)
+
+    def refresh(self) -> GlppRefreshResult:
+        """
+        Synchronize the repository with its directory without touching the plugins that did not change.
+        The repository is scanned again and compared with the previous scan :
+        - plugins whose description file is new are created (and loaded if the repository has been loaded)
+        - plugins whose files (description file, hack scripts, main modules and loaded modules files located in the
+          plugin) have changed are created again (and reloaded if the repository has been loaded)
+        - plugins whose description file does not exist anymore are dropped
+        - other plugins objects and modules are left as they are
+        Changes are detected on the files mtime, size and inode, or on their content if use_hash is True.
+        The changed and removed plugins are unloaded (@see GlppAbstractPlugin.unload) before being reloaded or dropped.
+        :return: the refresh result
+        """
+        GLPP_LOGGER.debug('Refresh plugins for repo {}'.format(self.repo_path))
+        result = GlppRefreshResult()
+        previous = {p.descriptor.plugin_desc: p for p in self.plugins_to_load}
+        plugins_to_load = []
+        registered_plugins = GlppPluginRegistry()
+        for desc_file in self.scan():
+            key = os.fspath(pathlib.Path(desc_file).resolve())
+            old_plugin = previous.pop(key, None)
+            if old_plugin is not None and not is_signature_changed(self._signatures[key], use_hash=self.use_hash):
+                cplugin = old_plugin
+                result.unchanged.append(cplugin)
+            else:
+                cplugin = GlppPluginFactory.create_plugin(plugin_desc=desc_file,
+                                                          load=False,
+                                                          descriptor=self.get_descriptor(desc_file))
+                cplugin.descriptor_time = self._descriptor_times.pop(os.fspath(desc_file), None)
+                if old_plugin is None:
+                    result.added.append(cplugin)
+                else:
+                    result.changed.append((old_plugin, cplugin))
+            if (cplugin.name, cplugin.version) in registered_plugins:
+                raise glpp_exceptions.PluginRepositoryDuplicateError(cplugin.name, cplugin.version, self.repo_path)
+            registered_plugins[(cplugin.name, cplugin.version)] = cplugin
+            plugins_to_load.append(cplugin)
+        result.removed.extend(previous.values())
+        if self.descriptor_cache is not None:
+            self.descriptor_cache.save()
+
+        # drop the removed and outdated plugins
+        for old_plugin in result.removed + [old for old, _ in result.changed]:
+            self._signatures.pop(old_plugin.descriptor.plugin_desc, None)
+            if self._bundle_signatures.pop(old_plugin.descriptor.plugin_desc, None) is not None:
+                # the plugin files are executed from their sources from now on
+                self.bundle.release(old_plugin.descriptor.plugin_desc)
+            if self.plugins.get((old_plugin.name, old_plugin.version)) is old_plugin:
+                del self.plugins[(old_plugin.name, old_plugin.version)]
+            if old_plugin.load_status == GlppPluginLoadStatus.LOADED:
+                # drops the importers caches of the plugin directories : the released bundle files are looked up again
+                old_plugin.unload(check_leaks=False)
+        self.plugins_to_load = plugins_to_load
+        self.registered_plugins = registered_plugins
+
+        # create (and load) the new ones
+        for old_plugin, cplugin in [(None, new) for new in result.added] + result.changed:
+            if old_plugin is not None and old_plugin.requires == cplugin.requires:
+                # the dependencies are resolved by the manager (@see GlppPluginManager.load)
+                cplugin.set_dependencies(old_plugin.dependencies)
+            self._update_signature(cplugin)
+            if self._load_options is not None:
+                self._load_plugin(cplugin, **self._load_options)
+        if result.has_changes():
+            GLPP_LOGGER.info('Repository {} refreshed : {}'.format(self.repo_path,
+                                                                  {k: len(v) for k, v in result.get_summary().items()}))
+        return result
 
     def get_plugin_by_name_and_version(self, plugin_name: str, plugin_version: str) -> GlppAbstractPlugin:
         """
@@ -174,3 +520,29 @@ class GlppPluginRepository(object):
             return self.plugins[(plugin_name, plugin_version)]
         except KeyError:
             raise glpp_exceptions.PluginNotExistsInRepository(plugin_name, plugin_version, self.repo_path)
+
+    def get_plugin(self,
+                   plugin_name: str,
+                   constraint: str or None = None,
+                   prerelease: bool = False) -> GlppAbstractPlugin:
+        """
+        Get the newest loaded plugin of a given name satisfying a version constraint
+        (@see GlppPluginManager.get_plugin)
+        :param plugin_name: name of the plugin
+        :param constraint: the version constraint (e.g. '>=1.2,<2'). None means the latest version.
+        :param prerelease: boolean flag to consider the pre-release versions even if a final version matches
+        :return: the plugin if it exists
+        """
+        resolved = self._resolver.resolve(plugin_name, constraint=constraint, prerelease=prerelease)
+        if resolved is None:
+            raise glpp_exceptions.PluginNotExistsInRepository(plugin_name, constraint, self.repo_path)
+        return resolved[1]
+
+    def get_latest(self, plugin_name: str, prerelease: bool = False) -> GlppAbstractPlugin:
+        """
+        Get the newest version of a loaded plugin (@see get_plugin)
+        :param plugin_name: name of the plugin
+        :param prerelease: boolean flag to consider the pre-release versions even if a final version exists
+        :return: the plugin if it exists
+        """
+        return self.get_plugin(plugin_name, prerelease=prerelease)
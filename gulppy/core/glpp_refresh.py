@@ -0,0 +1,375 @@
+# -*- coding: utf-8 -*-
+"""
+Gulppy incremental refresh tools : plugin files signatures, refresh results and repository watcher
+"""
+import hashlib
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Callable, Tuple
+from gulppy.core.glpp_archive import read_bytes, get_file_signature
+from gulppy.core.glpp_discovery import DEFAULT_EXCLUDE_PATTERNS, GlppDiscoveryWalker
+from gulppy.config import GLPP_LOGGER
+
+
+def get_files_signature(files: Iterable[str or Path], use_hash: bool = False) -> Dict[str, Tuple]:
+    """
+    Get the signature of a set of files.
+    :param files: the files
+    :param use_hash: boolean flag to use the files content sha1 instead of their mtime, size and inode
+    :return: {file: signature}. The signature of a missing file is None.
+    """
+    signature = {}
+    for cfile in files:
+        cfile = os.fspath(cfile)
+        try:
+            if use_hash:
+                signature[cfile] = (hashlib.sha1(read_bytes(cfile)).hexdigest(),)
+            else:
+                signature[cfile] = tuple(get_file_signature(cfile))
+        except OSError:
+            signature[cfile] = None
+    return signature
+
+
+def is_signature_changed(signature: Dict[str, Tuple], use_hash: bool = False) -> bool:
+    """
+    Check if a files signature does not match the files anymore
+    :param signature: a signature returned by get_files_signature
+    :param use_hash: boolean flag used to compute the signature
+    :return: True if at least a file has changed
+    """
+    return get_files_signature(signature.keys(), use_hash=use_hash) != signature
+
+
+class GlppRefreshResult(object):
+    """
+    Result of a repository refresh (@see GlppPluginRepository.refresh)
+    """
+    def __init__(self) -> None:
+        self.added = []
+        """
+        New plugins
+        """
+        self.changed = []
+        """
+        (old plugin, new plugin) pairs of the plugins whose files have changed
+        """
+        self.removed = []
+        """
+        Plugins that do not exist anymore
+        """
+        self.unchanged = []
+        """
+        Plugins left untouched
+        """
+
+    def has_changes(self) -> bool:
+        """
+        Check if the refresh found any change
+        :return: True if plugins have been added, changed or removed
+        """
+        return len(self.added) > 0 or len(self.changed) > 0 or len(self.removed) > 0
+
+    def extend(self, other: 'GlppRefreshResult') -> 'GlppRefreshResult':
+        """
+        Aggregate another refresh result in this one
+        :param other: another refresh result
+        :return: self
+        """
+        self.added.extend(other.added)
+        self.changed.extend(other.changed)
+        self.removed.extend(other.removed)
+        self.unchanged.extend(other.unchanged)
+        return self
+
+    def get_summary(self) -> Dict[str, List[str]]:
+        """
+        Get the refresh result as plugins unique ids
+        :return: a dictionary with the keys : added, changed, removed and unchanged
+        """
+        return {'added': [p.get_unique_id() for p in self.added],
+                'changed': [p.get_unique_id() for _, p in self.changed],
+                'removed': [p.get_unique_id() for p in self.removed],
+                'unchanged': [p.get_unique_id() for p in self.unchanged]}
+
+
+class _Inotify(object):
+    """
+    Minimal Linux inotify binding using ctypes. ctypes and select are imported on use : they are only needed by the
+    repository watcher.
+    """
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | \
+        IN_DELETE_SELF | IN_MOVE_SELF
+    _EVENT_SIZE = 16
+    """
+    Size of the inotify_event structure without its name : wd (int), mask, cookie and len (uint32)
+    """
+
+    _libc = None
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """
+        Check if inotify can be used
+        :return: True on Linux if the libc exposes inotify
+        """
+        if not sys.platform.startswith('linux'):
+            return False
+        if cls._libc is None:
+            import ctypes
+            import ctypes.util
+            try:
+                cls._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+                cls._libc.inotify_init1
+            except (OSError, AttributeError):
+                cls._libc = False
+        return cls._libc is not False
+
+    def __init__(self) -> None:
+        import ctypes
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+
+    def add_watch(self, path: str) -> int:
+        """
+        Watch a directory
+        :param path: the directory
+        :return: the watch descriptor, negative if the directory cannot be watched
+        """
+        import ctypes
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK)
+        if wd < 0:
+            GLPP_LOGGER.debug('Cannot watch {} (errno {})'.format(path, ctypes.get_errno()))
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        """
+        Stop watching a directory. The watches of the deleted directories are already removed by the kernel.
+        :param wd: the watch descriptor
+        :return: None
+        """
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self, timeout: float) -> List[Tuple[int, int, str]]:
+        """
+        Wait for events
+        :param timeout: timeout in seconds
+        :return: the (watch descriptor, mask, name) of the received events, empty on timeout
+        """
+        import select
+        import struct
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        events = []
+        if len(readable) == 0:
+            return events
+        while True:
+            try:
+                buffer = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            if len(buffer) == 0:
+                break
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, length = struct.unpack_from('iIII', buffer, offset)
+                offset += self._EVENT_SIZE
+                name = os.fsdecode(buffer[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                events.append((wd, mask, name))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class GlppRepositoryWatcher(threading.Thread):
+    """
+    A daemon thread calling a refresh callback when the watched repositories change.
+
+    On Linux, inotify is used to watch the repositories directories : the callback is called once the changes
+    settle (no new event for debounce seconds). The directory trees are walked once, with the exclude patterns and
+    the symlink loops protection of the discovery (@see GlppDiscoveryWalker.walk_dirs), then the watches are added
+    and removed as directories are created and deleted. Otherwise, or if use_inotify is False, the callback is called
+    every interval seconds (the refresh itself only reloads what has changed).
+    """
+    def __init__(self,
+                 callback: Callable[[], object],
+                 paths: Iterable[str or Path] or Callable[[], Iterable[str or Path]],
+                 interval: float = 60.0,
+                 use_inotify: bool = True,
+                 debounce: float = 1.0,
+                 exclude_patterns: Iterable[str] = DEFAULT_EXCLUDE_PATTERNS) -> None:
+        """
+        Constructor
+        :param callback: the refresh function to call
+        :param paths: the directories to watch, or a callable returning them (evaluated at each watch cycle)
+        :param interval: polling period in seconds (also used as a safety period with inotify)
+        :param use_inotify: boolean flag to use inotify when available
+        :param debounce: quiet period in seconds before calling the callback after an inotify event
+        :param exclude_patterns: gitignore style patterns of the directories not to watch
+        """
+        super().__init__(name='gulppy-repository-watcher', daemon=True)
+        self.callback = callback
+        self.paths = paths if callable(paths) else [os.fspath(p) for p in paths]
+        self.interval = interval
+        self.use_inotify = use_inotify and _Inotify.is_available()
+        self.debounce = debounce
+        self.n_refresh = 0
+        self._walker = GlppDiscoveryWalker(exclude_patterns=exclude_patterns)
+        self._stop_event = threading.Event()
+        self._inotify = None
+        self._roots = []
+        self._watches = {}
+        """
+        {watch descriptor: (path, path relative to its root, (st_dev, st_ino))} of the watched directories
+        """
+        self._watched_paths = {}
+        """
+        {path: watch descriptor} of the watched directories
+        """
+        self._visited = set()
+
+    def stop(self, timeout: float or None = None) -> None:
+        """
+        Stop the watcher thread
+        :param timeout: time to wait for the thread to terminate
+        :return: None
+        """
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def get_watched_dirs(self) -> List[str]:
+        """
+        Get the directories watched with inotify
+        :return: the directories paths
+        """
+        return list(self._watched_paths.copy())
+
+    def _refresh(self) -> None:
+        try:
+            self.callback()
+        except Exception as e:
+            GLPP_LOGGER.error('Repository watcher refresh failed : {}'.format(e))
+        self.n_refresh += 1
+
+    def _watch(self, path: str, rel_path: str) -> None:
+        """
+        Watch a directory tree
+        :param path: the tree root directory
+        :param rel_path: path of the directory relative to its watched root
+        :return: None
+        """
+        for cpath, crel_path, key in self._walker.walk_dirs(path, rel_path, self._visited):
+            wd = self._inotify.add_watch(cpath)
+            if wd < 0:
+                self._visited.discard(key)
+                continue
+            self._watches[wd] = (cpath, crel_path, key)
+            self._watched_paths[cpath] = wd
+
+    def _unwatch(self, path: str) -> None:
+        """
+        Stop watching a directory tree
+        :param path: the tree root directory
+        :return: None
+        """
+        prefix = os.path.join(path, '')
+        for cpath in [p for p in self._watched_paths if p == path or p.startswith(prefix)]:
+            wd = self._watched_paths.pop(cpath)
+            self._visited.discard(self._watches.pop(wd)[2])
+            self._inotify.rm_watch(wd)
+
+    def _update_roots(self) -> None:
+        """
+        Watch the new repositories directories and stop watching the removed ones
+        :return: None
+        """
+        roots = [os.fspath(p) for p in (self.paths() if callable(self.paths) else self.paths)]
+        for root in self._roots:
+            if root not in roots:
+                self._unwatch(root)
+        for root in roots:
+            if root not in self._roots or root not in self._watched_paths:
+                self._watch(root, '')
+        self._roots = roots
+
+    def _read_events(self, timeout: float) -> bool:
+        """
+        Wait for inotify events and update the watches on the directories creation and deletion
+        :param timeout: timeout in seconds
+        :return: True if events have been received
+        """
+        events = self._inotify.read_events(timeout)
+        for wd, mask, name in events:
+            if mask & _Inotify.IN_Q_OVERFLOW:
+                # events are lost : watch the trees again
+                for root in self._roots:
+                    self._unwatch(root)
+                    self._watch(root, '')
+                continue
+            watch = self._watches.get(wd)
+            if watch is None:
+                continue
+            path, rel_path, key = watch
+            if mask & _Inotify.IN_IGNORED:
+                # the watch has been removed by the kernel : the directory is deleted or unmounted
+                del self._watches[wd]
+                self._watched_paths.pop(path, None)
+                self._visited.discard(key)
+            elif mask & _Inotify.IN_ISDIR and len(name) > 0:
+                sub_path = os.path.join(path, name)
+                if mask & (_Inotify.IN_DELETE | _Inotify.IN_MOVED_FROM):
+                    self._unwatch(sub_path)
+                if mask & (_Inotify.IN_CREATE | _Inotify.IN_MOVED_TO):
+                    sub_rel_path = name if rel_path == '' else '{}/{}'.format(rel_path, name)
+                    if not self._walker.is_excluded(sub_rel_path, is_dir=True):
+                        self._watch(sub_path, sub_rel_path)
+        return len(events) > 0
+
+    def run(self) -> None:
+        if not self.use_inotify:
+            while not self._stop_event.wait(self.interval):
+                self._refresh()
+            return
+
+        self._inotify = _Inotify()
+        try:
+            while not self._stop_event.is_set():
+                # the repositories may have been added or removed meanwhile
+                self._update_roots()
+                changed = False
+                remaining = self.interval
+                while not self._stop_event.is_set() and remaining > 0:
+                    step = min(remaining, 0.5)
+                    if self._read_events(step):
+                        changed = True
+                        # wait for the changes to settle
+                        while self._read_events(self.debounce) and not self._stop_event.is_set():
+                            pass
+                        break
+                    remaining -= step
+                if not self._stop_event.is_set() and (changed or remaining <= 0):
+                    self._refresh()
+        finally:
+            self._inotify.close()
+            self._inotify = None
+            self._roots = []
+            self._watches = {}
+            self._watched_paths = {}
+            self._visited = set()
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Gulppy plugin versions normalization and resolution
+"""
+import bisect
+import functools
+import re
+import threading
+from typing import Any, Callable, List, Tuple
+from gulppy.core.glpp_plugin_registry import GlppPluginRegistry
+from gulppy.core import glpp_exceptions
+
+_VERSION_REGEX = re.compile(r'^v?(\d+(?:\.\d+)*)'
+                            r'(?:[-_.]?(dev|a|alpha|b|beta|c|rc|pre|preview|post|rev|r)[-_.]?(\d*))?$',
+                            re.IGNORECASE)
+
+_SPECIFIER_REGEX = re.compile(r'^(~=|==|!=|<=|>=|<|>)?\s*(\S+)$')
+
+_SUFFIX_RANKS = {'dev': 0, 'a': 1, 'alpha': 1, 'b': 2, 'beta': 2, 'c': 3, 'rc': 3, 'pre': 3, 'preview': 3,
+                 'post': 5, 'rev': 5, 'r': 5}
+
+_FINAL_RANK = 4
+
+
+def get_version_key(version: Any) -> Tuple:
+    """
+    Get the sort key of a plugin version.
+    Versions are compared on their release numbers (trailing zeros ignored : 1 == 1.0 == 1.0.0), then on their
+    suffix : dev < a (alpha) < b (beta) < rc < final release < post. Versions parsed as floats by the yaml loader are
+    compared through their string representation (1.0 -> '1.0' but 1.10 -> '1.1' : quote such versions in the
+    plugin description files).
+    Versions that cannot be parsed are sorted before all the others, in string order.
+    :param version: the plugin version (string, float or int)
+    :return: a tuple (valid, release, suffix rank, suffix number, raw string)
+    """
+    raw = str(version).strip()
+    match = _VERSION_REGEX.match(raw)
+    if match is None:
+        return 0, (), 0, 0, raw
+    release = _get_release(match)
+    while len(release) > 1 and release[-1] == 0:
+        release = release[:-1]
+    suffix = match.group(2)
+    if suffix is None:
+        return 1, release, _FINAL_RANK, 0, ''
+    return 1, release, _SUFFIX_RANKS[suffix.lower()], int(match.group(3) or 0), ''
+
+
+def _get_release(match: re.Match) -> Tuple[int, ...]:
+    return tuple(int(v) for v in match.group(1).split('.'))
+
+
+def _release_floor(release: Tuple[int, ...]) -> Tuple:
+    # key lower than the keys of all the versions starting with release (dev versions included)
+    return 1, release, -1, 0, ''
+
+
+def _next_release_floor(release: Tuple[int, ...]) -> Tuple:
+    # key lower than the keys of all the versions following the versions starting with release
+    return _release_floor(release[:-1] + (release[-1] + 1,))
+
+
+def is_prerelease(version_key: Tuple) -> bool:
+    """
+    Check if a version key (@see get_version_key) is a dev, alpha, beta or release candidate version
+    """
+    return version_key[0] == 1 and version_key[2] < _FINAL_RANK
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_constraint(constraint: str or None) -> Tuple[Tuple[str, Tuple, str], ...]:
+    """
+    Parse a version constraint made of comma separated specifiers. A specifier is an operator (==, !=, <, <=, >, >=,
+    ~=) followed by a version, no operator meaning ==.
+    - ==X.* and !=X.* match a release prefix (==1.* matches 1.0 and 1.2.3 but not 2.0)
+    - ~=X.Y is the compatible release : >=X.Y,==X.*
+    - versions that cannot be parsed (@see get_version_key) can only be used with == and !=
+    :param constraint: the constraint (e.g. '>=1.2,<2'). None, '' or '*' means any version.
+    :return: the tuple of specifiers (operator, bound key(s), raw version). Prefix operators are '==*' and '!=*'
+             with (floor key, next floor key) bounds. ~= is translated to >= and <.
+    """
+    if constraint is None:
+        return ()
+    specifiers = []
+    for item in str(constraint).split(','):
+        item = item.strip()
+        if item in ('', '*'):
+            continue
+        spec_match = _SPECIFIER_REGEX.match(item)
+        if spec_match is None:
+            raise glpp_exceptions.PluginVersionConstraintError(constraint, item)
+        op, raw = spec_match.group(1) or '==', spec_match.group(2)
+        prefix = raw.endswith('.*')
+        version_match = _VERSION_REGEX.match(raw[:-2] if prefix else raw)
+        if prefix:
+            if op not in ('==', '!=') or version_match is None or version_match.group(2) is not None:
+                raise glpp_exceptions.PluginVersionConstraintError(constraint, item)
+            release = _get_release(version_match)
+            specifiers.append((op + '*', (_release_floor(release), _next_release_floor(release)), raw))
+        elif op == '~=':
+            if version_match is None or len(_get_release(version_match)) < 2:
+                raise glpp_exceptions.PluginVersionConstraintError(constraint, item)
+            specifiers.append(('>=', get_version_key(raw), raw))
+            specifiers.append(('<', _next_release_floor(_get_release(version_match)[:-1]), raw))
+        elif version_match is None and op not in ('==', '!='):
+            raise glpp_exceptions.PluginVersionConstraintError(constraint, item)
+        else:
+            specifiers.append((op, get_version_key(raw), raw))
+    return tuple(specifiers)
+
+
+def _match(key: Tuple, specifiers: Tuple[Tuple[str, Tuple, str], ...]) -> bool:
+    """
+    Check if a version key satisfies all the specifiers of a constraint (@see parse_constraint)
+    """
+    for op, bound, _ in specifiers:
+        if op == '==*' or op == '!=*':
+            inside = bound[0] <= key < bound[1]
+            if inside != (op == '==*'):
+                return False
+        elif not {'==': key == bound, '!=': key != bound, '<': key < bound, '<=': key <= bound,
+                  '>': key > bound, '>=': key >= bound}[op]:
+            return False
+    return True
+
+
+def _get_bounds(keys: List[Tuple], specifiers: Tuple[Tuple[str, Tuple, str], ...]) -> Tuple[int, int]:
+    """
+    Get the range [lo, hi[ of the sorted keys allowed by the bounding specifiers (binary searches)
+    """
+    lo, hi = 0, len(keys)
+    for op, bound, _ in specifiers:
+        if op == '==':
+            lo = max(lo, bisect.bisect_left(keys, bound))
+            hi = min(hi, bisect.bisect_right(keys, bound))
+        elif op == '==*':
+            lo = max(lo, bisect.bisect_left(keys, bound[0]))
+            hi = min(hi, bisect.bisect_left(keys, bound[1]))
+        elif op == '>=':
+            lo = max(lo, bisect.bisect_left(keys, bound))
+        elif op == '>':
+            lo = max(lo, bisect.bisect_right(keys, bound))
+        elif op == '<=':
+            hi = min(hi, bisect.bisect_right(keys, bound))
+        elif op == '<':
+            hi = min(hi, bisect.bisect_left(keys, bound))
+    return lo, hi
+
+
+class GlppVersionResolver(object):
+    """
+    Resolve plugins by name and version constraint from a plugin registry (@see GlppPluginRegistry).
+
+    For each plugin name, the registered versions are sorted once by their normalized version (@see get_version_key)
+    and a constraint is resolved with binary searches on this index. The sorted indexes and the resolutions are
+    cached until the registry changes (mutation or replacement of the registry object).
+    """
+    def __init__(self,
+                 get_registry: Callable[[], GlppPluginRegistry],
+                 get_plugin: Callable[[Any], Any] or None = None) -> None:
+        """
+        Constructor
+        :param get_registry: callable returning the current registry
+        :param get_plugin: callable giving the plugin of a registry value. If None, the values are the plugins.
+        """
+        self.get_registry = get_registry
+        self.get_plugin = get_plugin if get_plugin is not None else (lambda value: value)
+        self._registry = None
+        self._generation = None
+        self._indexes = {}
+        self._resolutions = {}
+        self._lock = threading.Lock()
+
+    def _check_registry(self) -> GlppPluginRegistry:
+        # drop the caches if the plugin set changed
+        registry = self.get_registry()
+        if registry is not self._registry or registry.generation != self._generation:
+            self._registry = registry
+            self._generation = registry.generation
+            self._indexes = {}
+            self._resolutions = {}
+        return registry
+
+    def _get_index(self, registry: GlppPluginRegistry, name: str) -> Tuple[List[Tuple], List[Tuple[Any, Any]]]:
+        index = self._indexes.get(name)
+        if index is None:
+            entries = sorted(((get_version_key(version), version, value)
+                              for version, value in registry.get_versions(name).items()), key=lambda e: e[0])
+            index = ([e[0] for e in entries], [(e[1], e[2]) for e in entries])
+            self._indexes[name] = index
+        return index
+
+    def get_versions(self, name: str) -> List[Any]:
+        """
+        Get the versions of a plugin sorted from the oldest to the newest
+        :param name: the plugin name
+        :return: the list of versions (as registered)
+        """
+        with self._lock:
+            registry = self._check_registry()
+            return [version for version, _ in self._get_index(registry, name)[1]]
+
+    def resolve(self, name: str, constraint: str or None = None, prerelease: bool = False) -> Tuple[Any, Any] or None:
+        """
+        Get the newest version of a plugin satisfying a constraint
+        :param name: the plugin name
+        :param constraint: the version constraint (@see parse_constraint). None means any version.
+        :param prerelease: boolean flag to consider the pre-release versions (dev, alpha, beta, rc). If False, they
+                           are only used if no other version satisfies the constraint.
+        :return: the (version, plugin) or None if no version satisfies the constraint
+        """
+        specifiers = parse_constraint(constraint)
+        with self._lock:
+            registry = self._check_registry()
+            cache_key = (name, constraint, prerelease)
+            if cache_key in self._resolutions:
+                return self._resolutions[cache_key]
+            keys, entries = self._get_index(registry, name)
+            lo, hi = _get_bounds(keys, specifiers)
+            result = None
+            fallback = None
+            # the newest matching version is usually the first one below the upper bound
+            for i in range(hi - 1, lo - 1, -1):
+                if not _match(keys[i], specifiers):
+                    continue
+                version, value = entries[i]
+                if prerelease or not is_prerelease(keys[i]):
+                    result = (version, self.get_plugin(value))
+                    break
+                if fallback is None:
+                    fallback = (version, self.get_plugin(value))
+            if result is None:
+                result = fallback
+            self._resolutions[cache_key] = result
+            return result
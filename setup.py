@@ -18,5 +18,7 @@ setuptools.setup(
     license='BSD-3-Clause',
     packages=['gulppy', 'gulppy.core'],
     package_data={'gulppy': ['core/*json']},
-    install_requires=['pyyaml', 'pandas'],
+    install_requires=['pyyaml'],
+    # pandas is only used to build display tables (lazily imported)
+    extras_require={'display': ['pandas']},
 )
\ No newline at end of file
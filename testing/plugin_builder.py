@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers to write throwaway plugins for tests
+"""
+import uuid
+from pathlib import Path
+from typing import Dict, List
+
+
+def unique_package_name(prefix: str = 'glpp_test_pkg') -> str:
+    """
+    Get a python package name that cannot collide with modules already imported by other tests
+    :param prefix: prefix of the name
+    :return: a package name
+    """
+    return '{}_{}'.format(prefix, uuid.uuid4().hex[:12])
+
+
+def write_plugin(plugin_root: str or Path,
+                 name: str,
+                 version: str or float,
+                 main_modules: Dict[str, str],
+                 files: Dict[str, str],
+                 python_path: List[str] = ('.',),
+                 mode: str = 'module',
+                 extra: str = '') -> Path:
+    """
+    Write a plugin on disk
+    :param plugin_root: directory of the plugin (created if needed)
+    :param name: plugin name
+    :param version: plugin version
+    :param main_modules: {module_tag: module_file}
+    :param files: {relative_path: content} of the files to write in the plugin directory
+    :param python_path: python paths of the plugin
+    :param mode: plugin mode
+    :param extra: additional yaml content appended to the description file
+    :return: the path of the description file
+    """
+    plugin_root = Path(plugin_root)
+    plugin_root.mkdir(parents=True, exist_ok=True)
+    for rel_path, content in files.items():
+        cfile = plugin_root.joinpath(rel_path)
+        cfile.parent.mkdir(parents=True, exist_ok=True)
+        cfile.write_text(content)
+    lines = ['---',
+             'plugin_name: {}'.format(name),
+             'plugin_version: {}'.format(version),
+             'plugin_mode: {}'.format(mode),
+             'plugin_main_modules:']
+    lines += ['    {} : {}'.format(k, v) for k, v in main_modules.items()]
+    lines += ['python_path:']
+    lines += ['  - "{}"'.format(p) for p in python_path]
+    desc_file = plugin_root.joinpath('descr.yaml')
+    desc_file.write_text('\n'.join(lines) + '\n' + extra)
+    return desc_file
+
+
+def write_simple_plugin(plugin_root: str or Path,
+                        name: str,
+                        version: str or float,
+                        package: str,
+                        value: str = 'v1',
+                        extra: str = '') -> Path:
+    """
+    Write a plugin with a main module <package>.main importing an internal module <package>.lib.
+    <package>.main.get_value() returns the lib VALUE attribute.
+    :param plugin_root: directory of the plugin
+    :param name: plugin name
+    :param version: plugin version
+    :param package: python package name of the plugin (@see unique_package_name)
+    :param value: value returned by the plugin
+    :param extra: additional yaml content appended to the description file
+    :return: the path of the description file
+    """
+    return write_plugin(plugin_root, name, version,
+                        main_modules={'{}.main'.format(package): '{}/main.py'.format(package)},
+                        files={'{}/__init__.py'.format(package): '',
+                               '{}/lib.py'.format(package): 'VALUE = {!r}\n'.format(value),
+                               '{}/main.py'.format(package): 'from {} import lib\n\n\n'
+                                                             'def get_value():\n'
+                                                             '    return lib.VALUE\n'.format(package)},
+                        extra=extra)
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy zip and wheel archives
+"""
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+from gulppy.core.glpp_plugin_factory import MutableModeEnum
+from gulppy.core.glpp_plugin_manager import GlppPluginManager
+from gulppy.core.glpp_plugin_repository import GlppPluginRepository
+from gulppy.core import glpp_archive
+from gulppy.config import GLPP_LOGGER, init_logger
+from plugin_builder import unique_package_name, write_plugin
+init_logger()
+
+ARCHIVES_SRC = '../testing_data/archives/src'
+
+HACK_SCRIPT = '''
+from gulppy.core import glpp_module_loader
+
+
+def sys_context_callback_init(**kwargs):
+    glpp_module_loader.sys_context_callback_init(**kwargs)
+    import os
+    os.environ['GLPP_TEST_ARCHIVE_HACK'] = '1'
+'''
+
+
+def zip_dir(src_dir, archive, prefix=''):
+    with zipfile.ZipFile(archive, 'w') as zf:
+        for root, dirs, files in os.walk(src_dir):
+            dirs[:] = [d for d in dirs if d != '__pycache__']
+            for name in files:
+                path = os.path.join(root, name)
+                zf.write(path, os.path.join(prefix, os.path.relpath(path, src_dir)))
+
+
+class TestArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.src_dir = os.path.join(self.tmp_dir, 'src')
+        self.package = unique_package_name()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+        os.environ.pop('GLPP_TEST_ARCHIVE_HACK', None)
+
+    def write_plugin(self, name, value):
+        pkg = self.package
+        files = {'{}/__init__.py'.format(pkg): '',
+                 '{}/lib.py'.format(pkg): 'VALUE = {}\n'.format(value),
+                 '{}/main.py'.format(pkg): 'from . import lib\n\ndef get_value():\n    return lib.VALUE\n',
+                 'hacks/init.py': HACK_SCRIPT}
+        return write_plugin(os.path.join(self.src_dir, name), name, '1.0',
+                            main_modules={pkg + '.main': '{}/main.py'.format(pkg)}, files=files,
+                            extra='plugin_hacks:\n    sys_context_callback_init: "@PLUGIN_ROOT@/hacks/init.py"\n')
+
+    def test_archive_repository(self):
+        """
+        The plugins of a zip repository are loaded from the archive without extraction
+        """
+        GLPP_LOGGER.info('\n\n>>  test_archive_repository\n')
+        self.write_plugin('plugin_1', 1)
+        archive = os.path.join(self.tmp_dir, 'repo.zip')
+        zip_dir(self.src_dir, archive)
+        shutil.rmtree(self.src_dir)
+
+        pmanager = GlppPluginManager()
+        pmanager.add_repository(repo_path=archive, repo_tag='zip', descriptor_cache=True)
+        self.assertEqual(pmanager.repositories[0].get_discovery_stats()['visited_archives'], 1)
+        pmanager.load(mutable_mode=MutableModeEnum.IMMUTABLE)
+        cplugin = pmanager.get_plugin_by_name_and_version('plugin_1', 1.0)
+        main = cplugin.get_module(self.package + '.main')
+        self.assertEqual(main.get_value(), 1)
+        self.assertEqual(os.environ.get('GLPP_TEST_ARCHIVE_HACK'), '1')
+        self.assertTrue(main.lib.__file__.startswith(os.path.join(archive, 'plugin_1')))
+        self.assertEqual([k for k in sys.modules if k.startswith(self.package)], [])
+        # the descriptors cache is written next to the archive
+        self.assertTrue(any(name.endswith('.json') for name in os.listdir(self.tmp_dir)))
+
+        # an archive replaced is opened again and its plugins are reloaded
+        self.write_plugin('plugin_1', 2)
+        zip_dir(self.src_dir, archive)
+        os.utime(archive, ns=(0, os.stat(archive).st_mtime_ns + 10 ** 9))
+        result = pmanager.refresh()
+        self.assertEqual(len(result.changed), 1)
+        cplugin = pmanager.get_plugin_by_name_and_version('plugin_1', 1.0)
+        self.assertEqual(cplugin.get_module(self.package + '.main').get_value(), 2)
+
+    def test_plugin_archives(self):
+        """
+        We use testing_data/archives/src : plugin_1 is a module mode plugin and plugin_2 a package mode plugin.
+        Single plugin archives (zip or wheel) are discovered in a plain repository, in module and package modes
+        """
+        GLPP_LOGGER.info('\n\n>>  test_plugin_archives\n')
+        repo_dir = os.path.join(self.tmp_dir, 'repo')
+        os.mkdir(repo_dir)
+        zip_dir(os.path.join(ARCHIVES_SRC, 'plugin_1'), os.path.join(repo_dir, 'plugin_1.zip'))
+        zip_dir(os.path.join(ARCHIVES_SRC, 'plugin_2'), os.path.join(repo_dir, 'plugin_2-1.0-py3-none-any.whl'),
+                prefix='plugin_2')
+
+        o_repo = GlppPluginRepository(repo_path=repo_dir, repo_tag='tag')
+        self.assertEqual(sorted(o_repo.registered_plugins), [('plugin_1', 1.0), ('plugin_2', 1.0)])
+        o_repo.load_plugins(mutable_mode=MutableModeEnum.MUTABLE)
+        self.assertEqual(o_repo.plugins[('plugin_1', 1.0)].get_module('my_archive_plugin.main').get_value(), 1)
+        package = o_repo.plugins[('plugin_2', 1.0)].get_module('my_archive_package')
+        self.assertEqual(package.main.get_value(), 2)
+        self.assertTrue(package.__file__.startswith(os.path.join(repo_dir, 'plugin_2-1.0-py3-none-any.whl')))
+        for k in [k for k in sys.modules if k.startswith('my_archive_plugin') or k.startswith('my_archive_package')]:
+            del sys.modules[k]
+
+    def test_archive_paths(self):
+        """
+        We use testing_data/archives/src : the sources of the archive.
+        Paths going through an archive are split, read and listed from the archive
+        """
+        GLPP_LOGGER.info('\n\n>>  test_archive_paths\n')
+        archive = os.path.join(self.tmp_dir, 'repo.zip')
+        zip_dir(ARCHIVES_SRC, archive)
+        lib_file = os.path.join(archive, 'plugin_1', 'my_archive_plugin', 'lib.py')
+        self.assertEqual(glpp_archive.split_archive_path(lib_file), (archive, 'plugin_1/my_archive_plugin/lib.py'))
+        self.assertIsNone(glpp_archive.split_archive_path(ARCHIVES_SRC))
+        self.assertTrue(glpp_archive.is_file(lib_file))
+        self.assertFalse(glpp_archive.is_file(os.path.join(archive, 'plugin_1')))
+        self.assertEqual(glpp_archive.read_bytes(lib_file), b'VALUE = 1\n')
+        self.assertEqual(glpp_archive.list_dir(os.path.join(archive, 'plugin_1')),
+                         (['hacks', 'my_archive_plugin'], ['__init__.py', 'descr.yaml']))
+        self.assertIs(glpp_archive.get_archive(archive), glpp_archive.get_archive(archive))
+        self.assertEqual(glpp_archive.get_file_signature(lib_file), glpp_archive.get_file_signature(archive))
+        with self.assertRaises(FileNotFoundError):
+            glpp_archive.read_bytes(os.path.join(archive, 'missing.py'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy asyncio loading API
+"""
+import unittest
+import asyncio
+from gulppy.core.glpp_abstract_plugin import GlppPluginLoadStatus
+from gulppy.core.glpp_module_plugin import GlppModulePlugin
+from gulppy.core.glpp_plugin_factory import MutableModeEnum
+from gulppy.core.glpp_plugin_manager import GlppPluginManager
+from gulppy.core import glpp_exceptions
+from gulppy.config import GLPP_LOGGER, init_logger
+init_logger()
+
+
+class TestAsyncLoad(unittest.TestCase):
+
+    def test_manager_load_async(self):
+        """
+        We use testing_data/async_load/repo_1 : its slow_plugin main module sleeps while executed.
+        The event loop is served while the repositories are scanned and loaded, and the plugins can be awaited
+        """
+        GLPP_LOGGER.info('\n\n>>  test_manager_load_async\n')
+
+        async def run():
+            pmanager = GlppPluginManager()
+            added = await asyncio.gather(pmanager.add_repository_async('../testing_data/async_load/repo_1', 'tag-1'),
+                                         pmanager.add_repository_async('../testing_data/normal/repo_1', 'tag-2'))
+            self.assertEqual(added, [True, True])
+            self.assertFalse(await pmanager.add_repository_async('../testing_data/async_load/repo_1'))
+            ticks = []
+
+            async def ticker():
+                while True:
+                    ticks.append(None)
+                    await asyncio.sleep(0.01)
+
+            ticker_task = asyncio.ensure_future(ticker())
+            load_task = asyncio.ensure_future(pmanager.load_async(mutable_mode=MutableModeEnum.IMMUTABLE))
+            await asyncio.sleep(0)
+            cplugin = await pmanager.get_plugin_async('slow_plugin')
+            self.assertEqual(cplugin.load_status, GlppPluginLoadStatus.LOADED)
+            await load_task
+            ticker_task.cancel()
+            self.assertGreater(len(ticks), 5)
+            self.assertEqual(len(pmanager.plugins), 3)
+            self.assertIs(await pmanager.get_plugin_async('slow_plugin'), cplugin)
+            with self.assertRaises(glpp_exceptions.PluginNotFound):
+                await pmanager.get_plugin_async('unknown_plugin')
+
+        asyncio.run(run())
+
+    def test_load_error(self):
+        """
+        We use testing_data/async_load/repo_2 : its faulty_plugin main module raises an error.
+        The waiters of the plugins not loaded get the load error
+        """
+        GLPP_LOGGER.info('\n\n>>  test_load_error\n')
+
+        async def run():
+            pmanager = GlppPluginManager()
+            await pmanager.add_repository_async('../testing_data/async_load/repo_2')
+            load_task = asyncio.ensure_future(pmanager.load_async())
+            await asyncio.sleep(0)
+            with self.assertRaises(glpp_exceptions.PluginImportError):
+                await pmanager.get_plugin_async('faulty_plugin')
+            with self.assertRaises(glpp_exceptions.PluginImportError):
+                await load_task
+
+        asyncio.run(run())
+
+    def test_load_async_dependencies(self):
+        """
+        We use testing_data/dependencies : app_plugin of repo_a requires base_plugin<2, repo_b holds base_plugin 1.0
+        and 2.0.
+        The plugins declaring requirements are loaded in dependency order
+        """
+        GLPP_LOGGER.info('\n\n>>  test_load_async_dependencies\n')
+
+        async def run():
+            pmanager = GlppPluginManager()
+            await pmanager.add_repository_async('../testing_data/dependencies/repo_a', 'a')
+            await pmanager.add_repository_async('../testing_data/dependencies/repo_b', 'b')
+            load_task = asyncio.ensure_future(pmanager.load_async(mutable_mode=MutableModeEnum.IMMUTABLE))
+            await asyncio.sleep(0)
+            app = await pmanager.get_plugin_async('app_plugin')
+            self.assertIs(app.get_dependency('base_plugin'), await pmanager.get_plugin_async('base_plugin', '<2'))
+            await load_task
+            self.assertEqual(len(pmanager.plugins), 3)
+
+        asyncio.run(run())
+
+    def test_plugin_load_async(self):
+        """
+        Concurrent plugin loads are serialized on the modules executions
+        """
+        GLPP_LOGGER.info('\n\n>>  test_plugin_load_async\n')
+        plugins = [GlppModulePlugin(plugin_desc='../testing_data/async_load/repo_1/slow_plugin/descr.yaml', load=False)
+                   for _ in range(3)]
+
+        async def run():
+            await asyncio.gather(*[cplugin.load_async() for cplugin in plugins])
+
+        asyncio.run(run())
+        self.assertTrue(all(cplugin.load_status == GlppPluginLoadStatus.LOADED for cplugin in plugins))
+        self.assertTrue(all(len(cplugin.pending_modules) == 0 for cplugin in plugins))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy batched load contexts
+"""
+import unittest
+import os
+import sys
+import types
+from gulppy.core.glpp_module_plugin import GlppModulePlugin
+from gulppy.core.glpp_plugin_repository import GlppPluginRepository
+from gulppy.core.glpp_plugin_factory import BatchModeEnum
+from gulppy.config import GLPP_LOGGER, init_logger
+init_logger()
+
+
+class TestBatchLoad(unittest.TestCase):
+
+    def setUp(self):
+        """
+        We use testing_data/batch : the plugins of repo_1 use the same package name, their main_a module imports the
+        external module my_batch_external, outside of the plugins paths. The executions of the lib and external
+        modules are recorded in the glpp_batch_counter module.
+        """
+        # executions of the plugins modules are recorded in a module existing before the loads
+        self.counter = types.ModuleType('glpp_batch_counter')
+        self.counter.calls = []
+        sys.modules[self.counter.__name__] = self.counter
+        # a module outside of the plugins paths, shared by the plugins
+        self.external = 'my_batch_external'
+        self.external_dir = os.path.abspath('../testing_data/batch/external')
+        sys.path.insert(0, self.external_dir)
+        self.package = 'my_batch_plugin'
+
+    def tearDown(self):
+        sys.path.remove(self.external_dir)
+        del sys.modules[self.counter.__name__]
+
+    def test_plugin_batch(self):
+        """
+        The main modules of a plugin share a single context : internal dependencies are executed once
+        """
+        GLPP_LOGGER.info('\n\n>>  test_plugin_batch\n')
+        package = self.package
+        desc_file = '../testing_data/batch/repo_1/plugin_a/descr.yaml'
+        lib = '{}.lib'.format(package)
+        for batch, n_calls in ((False, 2), (True, 1)):
+            self.counter.calls = []
+            o_plug = GlppModulePlugin(plugin_desc=desc_file, load=False)
+            before = dict(sys.modules)
+            o_plug.load(batch=batch)
+            self.assertEqual(dict(sys.modules), before)
+            self.assertEqual(self.counter.calls.count(lib), n_calls)
+            self.assertIn(lib, o_plug._i_modules)
+            self.assertIn(package, o_plug._i_modules)
+            self.assertIn(self.external, o_plug._i_modules)
+            self.assertEqual(set(o_plug._modules.keys()) & set(o_plug._i_modules.keys()), set())
+            same_lib = o_plug.get_module('{}.main_a'.format(package)).lib is \
+                o_plug.get_module('{}.main_b'.format(package)).lib
+            self.assertEqual(same_lib, batch)
+
+    def test_repository_batch(self):
+        """
+        The plugins of a repository share a single context but not their own modules
+        """
+        GLPP_LOGGER.info('\n\n>>  test_repository_batch\n')
+        # both plugins use the same package name
+        package = self.package
+        o_repo = GlppPluginRepository(repo_path='../testing_data/batch/repo_1', repo_tag='repo')
+        before = dict(sys.modules)
+        o_repo.load_plugins(batch=BatchModeEnum.REPOSITORY)
+        self.assertEqual(dict(sys.modules), before)
+        plugin_a = o_repo.get_plugin_by_name_and_version('plugin_a', 1.0)
+        plugin_b = o_repo.get_plugin_by_name_and_version('plugin_b', 1.0)
+        self.assertEqual(plugin_a.get_module('{}.lib'.format(package)).VALUE, 'a')
+        self.assertEqual(plugin_b.get_module('{}.lib'.format(package)).VALUE, 'b')
+        # the external module is executed once and attributed to the first plugin importing it
+        self.assertEqual(self.counter.calls.count(self.external), 1)
+        self.assertIn(self.external, plugin_a._i_modules)
+        self.assertNotIn(self.external, plugin_b._i_modules)
+        self.assertIs(plugin_a.get_module('{}.main_a'.format(package)).__dict__[self.external],
+                      plugin_b.get_module('{}.main_a'.format(package)).__dict__[self.external])
+
+    def test_repository_batch_fixtures(self):
+        """
+        Plugins with hack scripts are loaded in their own context within a repository batch
+        """
+        GLPP_LOGGER.info('\n\n>>  test_repository_batch_fixtures\n')
+        o_repo = GlppPluginRepository(repo_path="../testing_data/normal/repo_1", repo_tag="repo_1")
+        before = dict(sys.modules)
+        o_repo.load_plugins(batch=BatchModeEnum.REPOSITORY)
+        self.assertEqual(len(o_repo.plugins), 2)
+        self.assertEqual(dict(sys.modules), before)
+        for cplugin in o_repo.plugins.values():
+            for module in cplugin._modules.values():
+                module.call_lib_function()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy benchmark suite and its synthetic repositories
+"""
+import unittest
+import shutil
+import tempfile
+from benchmarks.bench_suite import run, compare, MEASURES
+from benchmarks.synthetic_repository import write_synthetic_repositories, count_modules
+from gulppy.core.glpp_plugin_factory import MutableModeEnum
+from gulppy.core.glpp_plugin_manager import GlppPluginManager, GlppPluginDuplicatePolicy
+from gulppy.config import GLPP_LOGGER, init_logger
+init_logger()
+
+
+class TestBenchSuite(unittest.TestCase):
+
+    def test_synthetic_repositories(self):
+        """
+        Synthetic plugins are loadable and duplicated across repositories as requested
+        """
+        GLPP_LOGGER.info('\n\n>>  test_synthetic_repositories\n')
+        root = tempfile.mkdtemp()
+        try:
+            synthetic = write_synthetic_repositories(root, n_plugins=4, n_repos=2, n_main_modules=2, fan_out=3,
+                                                     depth=2, hacks=True, duplicates=0.5)
+            self.assertEqual(len(synthetic['plugins']), 6)
+            pmanager = GlppPluginManager()
+            for repo_path in synthetic['repo_paths']:
+                pmanager.add_repository(repo_path=repo_path)
+            pmanager.load(plugin_duplicate_policy=GlppPluginDuplicatePolicy.OVERLOAD,
+                          mutable_mode=MutableModeEnum.IMMUTABLE)
+            self.assertEqual(len(pmanager.plugins), 6)
+            for name, version, tags in synthetic['plugins']:
+                cplugin = pmanager.get_plugin_by_name_and_version(name, version)
+                self.assertEqual([cplugin.get_module(tag).get_value() for tag in tags], [0, 1])
+                self.assertEqual(len(cplugin.get_list_of_modules()), count_modules(2, 3, 2))
+        finally:
+            shutil.rmtree(root)
+
+    def test_run_and_compare(self):
+        """
+        The suite measures every scale and compares them with a baseline
+        """
+        GLPP_LOGGER.info('\n\n>>  test_run_and_compare\n')
+        results = run(scales=[2], repeat=1, n_repos=1, n_main_modules=1, fan_out=1, depth=1)
+        self.assertEqual(set(results['results']['2']), set(MEASURES) | {'n_plugins', 'n_modules'})
+        baseline = {'results': {'2': {k: v / 2. for k, v in results['results']['2'].items()}}}
+        rows = compare(results, baseline, tolerance=0.5)
+        self.assertEqual(len(rows), len(MEASURES))
+        self.assertTrue(all(row['regression'] and abs(row['ratio'] - 2.) < 1e-9 for row in rows))
+        self.assertEqual(compare(results, {'results': {'3': {}}}), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
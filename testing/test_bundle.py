@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy frozen repository bundles
+"""
+import unittest
+import os
+import shutil
+import tempfile
+from gulppy.core.glpp_plugin_factory import MutableModeEnum
+from gulppy.core.glpp_plugin_repository import GlppPluginRepository
+from gulppy.core import glpp_bundle
+from gulppy.config import GLPP_LOGGER, init_logger
+from plugin_builder import unique_package_name, write_plugin
+init_logger()
+
+HACK_SCRIPT = '''
+from gulppy.core import glpp_module_loader
+
+
+def sys_context_callback_init(**kwargs):
+    glpp_module_loader.sys_context_callback_init(**kwargs)
+    import os
+    os.environ['GLPP_TEST_BUNDLE_HACK'] = '{}'
+'''
+
+
+class TestBundle(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.package = unique_package_name()
+        self.plugin_root = os.path.join(self.tmp_dir, 'bundle_plugin')
+        self.repositories = []
+        self.write_sources(value=1)
+        self.bundle_file = GlppPluginRepository(repo_path=self.tmp_dir, repo_tag='tag').freeze()
+
+    def tearDown(self):
+        for repo in self.repositories:
+            if repo.bundle is not None:
+                repo.bundle.release()
+        shutil.rmtree(self.tmp_dir)
+        os.environ.pop('GLPP_TEST_BUNDLE_HACK', None)
+
+    def write_sources(self, value):
+        write_plugin(self.plugin_root, 'bundle_plugin', '1.0',
+                     main_modules={self.package + '.main': '{}/main.py'.format(self.package)},
+                     files={'{}/__init__.py'.format(self.package): '',
+                            '{}/lib.py'.format(self.package): 'VALUE = {}\n'.format(value),
+                            '{}/main.py'.format(self.package):
+                                'from . import lib\n\ndef get_value():\n    return lib.VALUE\n',
+                            'hacks/init.py': HACK_SCRIPT.format(value)},
+                     extra='plugin_hacks:\n    sys_context_callback_init: "@PLUGIN_ROOT@/hacks/init.py"\n')
+
+    def load_repository(self, **kwargs):
+        repo = GlppPluginRepository(repo_path=self.tmp_dir, repo_tag='tag', bundle=True, **kwargs)
+        self.repositories.append(repo)
+        repo.load_plugins(mutable_mode=MutableModeEnum.IMMUTABLE)
+        return repo, repo.get_plugin_by_name_and_version('bundle_plugin', 1.0)
+
+    def test_load_from_bundle(self):
+        """
+        The main modules, the modules of the python paths and the hack scripts are executed from the bundle
+        """
+        GLPP_LOGGER.info('\n\n>>  test_load_from_bundle\n')
+        self.assertEqual(os.fspath(self.bundle_file), os.path.join(os.path.realpath(self.tmp_dir),
+                                                                   glpp_bundle.BUNDLE_FILENAME))
+        # the sources changed after the freeze are not read with the none check
+        self.write_sources(value=2)
+        repo, o_plug = self.load_repository(bundle_check='none')
+        self.assertIsNotNone(repo.bundle)
+        self.assertEqual(o_plug.get_module(self.package + '.main').get_value(), 1)
+        self.assertEqual(os.environ['GLPP_TEST_BUNDLE_HACK'], '1')
+        for name in (self.package + '.main', self.package + '.lib', self.package):
+            module = o_plug.get_module(name)
+            self.assertIsInstance(module.__loader__, glpp_bundle.GlppFrozenLoader, name)
+            self.assertIsNone(module.__loader__.get_source(name))
+
+    def test_stale_bundle(self):
+        """
+        A stale bundle, or a bundle written by another python version, is not used
+        """
+        GLPP_LOGGER.info('\n\n>>  test_stale_bundle\n')
+        self.write_sources(value=22)
+        for check in ('signature', 'hash'):
+            repo, o_plug = self.load_repository(bundle_check=check)
+            self.assertIsNone(repo.bundle)
+            self.assertEqual(o_plug.get_module(self.package + '.main').get_value(), 22)
+            self.assertNotIsInstance(o_plug.get_module(self.package + '.lib').__loader__,
+                                     glpp_bundle.GlppFrozenLoader)
+
+        GlppPluginRepository(repo_path=self.tmp_dir, repo_tag='tag').freeze()
+        with open(self.bundle_file, 'r+b') as fp:
+            fp.write(b'\0\0')
+        self.assertIsNone(glpp_bundle.GlppBundle.open(self.tmp_dir))
+        repo, o_plug = self.load_repository()
+        self.assertIsNone(repo.bundle)
+        self.assertEqual(o_plug.get_module(self.package + '.main').get_value(), 22)
+
+    def test_added_plugin(self):
+        """
+        A plugin added after the freeze makes the bundle stale, unless the bundle is trusted
+        """
+        GLPP_LOGGER.info('\n\n>>  test_added_plugin\n')
+        package = unique_package_name()
+        write_plugin(os.path.join(self.tmp_dir, 'added_plugin'), 'added_plugin', '1.0',
+                     main_modules={package + '.main': '{}/main.py'.format(package)},
+                     files={'{}/__init__.py'.format(package): '', '{}/main.py'.format(package): 'VALUE = 1\n'})
+        for check in ('signature', 'hash'):
+            repo, o_plug = self.load_repository(bundle_check=check)
+            self.assertIsNone(repo.bundle)
+            self.assertEqual(len(repo.plugins), 2)
+            self.assertEqual(repo.get_plugin_by_name_and_version('added_plugin', 1.0).get_module(
+                package + '.main').VALUE, 1)
+        repo, o_plug = self.load_repository(bundle_check='none')
+        self.assertIsNotNone(repo.bundle)
+        self.assertEqual(len(repo.plugins), 1)
+
+    def test_refresh_releases_bundle(self):
+        """
+        A bundled plugin whose sources changed is reloaded from its sources by refresh
+        """
+        GLPP_LOGGER.info('\n\n>>  test_refresh_releases_bundle\n')
+        repo, o_plug = self.load_repository()
+        self.assertIsNotNone(repo.bundle)
+        self.assertEqual(o_plug.get_module(self.package + '.main').get_value(), 1)
+        self.assertTrue(repo.refresh().get_summary()['unchanged'])
+
+        self.write_sources(value=333)
+        result = repo.refresh()
+        self.assertEqual(len(result.changed), 1)
+        new_plug = repo.get_plugin_by_name_and_version('bundle_plugin', 1.0)
+        self.assertEqual(new_plug.get_module(self.package + '.main').get_value(), 333)
+        self.assertEqual(os.environ['GLPP_TEST_BUNDLE_HACK'], '333')
+        self.assertIsNone(glpp_bundle.get_frozen_code(os.path.join(self.plugin_root, self.package, 'lib.py')))
+
+
+if __name__ == '__main__':
+    unittest.main()
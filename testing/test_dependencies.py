@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy inter-plugin dependencies
+"""
+import unittest
+from gulppy.core.glpp_abstract_plugin import GlppPluginLoadStatus
+from gulppy.core.glpp_plugin_factory import MutableModeEnum
+from gulppy.core.glpp_plugin_manager import GlppPluginManager
+from gulppy.core.glpp_dependencies import get_load_levels
+from gulppy.core import glpp_exceptions
+from gulppy.config import GLPP_LOGGER, init_logger
+init_logger()
+
+
+class TestDependencies(unittest.TestCase):
+
+    def test_dependency_order(self):
+        """
+        We use testing_data/dependencies : app_plugin of repo_a requires base_plugin<2, repo_b holds base_plugin 1.0
+        and 2.0.
+        The dependencies are loaded first and their modules are shared with the dependent plugins
+        """
+        GLPP_LOGGER.info('\n\n>>  test_dependency_order\n')
+        for lazy in (False, True):
+            pmanager = GlppPluginManager()
+            # the dependent plugin repository comes first
+            pmanager.add_repository(repo_path='../testing_data/dependencies/repo_a', repo_tag='a')
+            pmanager.add_repository(repo_path='../testing_data/dependencies/repo_b', repo_tag='b')
+            pmanager.load(mutable_mode=MutableModeEnum.IMMUTABLE, lazy=lazy, max_workers=2)
+            app = pmanager.get_plugin_by_name_and_version('app_plugin', 1.0)
+            base = app.get_dependency('base_plugin')
+            self.assertIs(base, pmanager.get_plugin_by_name_and_version('base_plugin', 1.0))
+            core = app.get_module('my_app_plugin.main').get_core()
+            self.assertEqual(core.VERSION, '1.0')
+            # the dependency module is not executed again
+            self.assertIs(core, base.get_module('my_base_plugin.core'))
+            self.assertNotIn('my_base_plugin.core', [m['name'] for m in app.get_list_of_modules()])
+            with self.assertRaises(glpp_exceptions.PluginNotFound):
+                app.get_dependency('other_plugin')
+            # the repositories stats aggregate their plugins stats
+            repo_a, repo_b = pmanager.repositories
+            self.assertEqual(repo_a.load_stats['wall_time'], app.load_stats['wall_time'])
+            self.assertEqual(repo_b.load_stats['cpu_time'],
+                             sum(p.load_stats['cpu_time'] for p in repo_b.plugins.values()))
+            self.assertEqual((repo_b.load_stats['n_plugins'], repo_b.load_stats['n_loaded']), (2, 2))
+
+    def test_missing_dependency_and_cycle(self):
+        """
+        Missing dependencies and cycles are detected before executing any module
+        """
+        GLPP_LOGGER.info('\n\n>>  test_missing_dependency_and_cycle\n')
+        # testing_data/dependencies/repo_missing : app_plugin requires base_plugin>=3, the repository holds 1.0
+        pmanager = GlppPluginManager()
+        pmanager.add_repository(repo_path='../testing_data/dependencies/repo_missing', repo_tag='tag')
+        with self.assertRaises(glpp_exceptions.PluginDependencyNotFound):
+            pmanager.load(mutable_mode=MutableModeEnum.IMMUTABLE)
+        self.assertTrue(all(p.load_status == GlppPluginLoadStatus.NOT_LOADED
+                            for p in pmanager.repositories[0].plugins_to_load))
+
+        # testing_data/dependencies/repo_cycle : app_1 requires app_2, app_2 requires app_3, app_3 requires app_1
+        pmanager = GlppPluginManager()
+        pmanager.add_repository(repo_path='../testing_data/dependencies/repo_cycle', repo_tag='tag')
+        with self.assertRaises(glpp_exceptions.PluginDependencyCycleError) as ctx:
+            pmanager.load(mutable_mode=MutableModeEnum.IMMUTABLE)
+        self.assertIn('app_1:1.0 -> app_2:1.0 -> app_3:1.0 -> app_1:1.0', str(ctx.exception))
+        self.assertEqual(len(pmanager.plugins), 0)
+
+    def test_load_levels(self):
+        """
+        The independent plugins are in the same level
+        """
+        GLPP_LOGGER.info('\n\n>>  test_load_levels\n')
+        graph = {('app', 1): [('left', 1), ('right', 1)],
+                 ('left', 1): [('base', 1)],
+                 ('right', 1): [('base', 1)],
+                 ('base', 1): [],
+                 ('tool', 1): []}
+        self.assertEqual(get_load_levels(graph), [[('base', 1), ('tool', 1)],
+                                                  [('left', 1), ('right', 1)],
+                                                  [('app', 1)]])
+        with self.assertRaises(glpp_exceptions.PluginDependencyCycleError):
+            get_load_levels({('self', 1): [('self', 1)]})
+
+
+if __name__ == '__main__':
+    unittest.main()
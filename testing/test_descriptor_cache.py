@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy persistent descriptor cache
+"""
+import unittest
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from gulppy.core.glpp_plugin_repository import GlppPluginRepository
+from gulppy.core.glpp_descriptor_cache import CACHE_FILENAME
+from gulppy.config import GLPP_LOGGER, init_logger
+init_logger()
+
+
+class TestDescriptorCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.repo_path = os.path.join(self.tmp_dir, 'repo_1')
+        shutil.copytree("../testing_data/normal/repo_1", self.repo_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_cache_hits_and_invalidation(self):
+        """
+        A second repository construction is served from the cache, a modified description is parsed again and
+        a removed description is dropped from the cache
+        """
+        GLPP_LOGGER.info('\n\n>>  test_cache_hits_and_invalidation\n')
+        o_repo = GlppPluginRepository(repo_path=self.repo_path, repo_tag="repo_1", descriptor_cache=True)
+        self.assertEqual(o_repo.get_cache_stats(), {'hits': 0, 'misses': 2, 'invalidations': 0, 'entries': 2})
+        self.assertTrue(Path(self.repo_path).joinpath(CACHE_FILENAME).is_file())
+
+        o_repo = GlppPluginRepository(repo_path=self.repo_path, repo_tag="repo_1", descriptor_cache=True)
+        self.assertEqual(o_repo.get_cache_stats(), {'hits': 2, 'misses': 0, 'invalidations': 0, 'entries': 2})
+        self.assertEqual(sorted(o_repo.get_list_of_plugins_id()), ['my_plugin__1.0', 'my_plugin__2.0'])
+
+        desc_file = Path(self.repo_path).joinpath('plugin_2', 'descr.yaml')
+        desc_file.write_text(desc_file.read_text().replace('plugin_version: 2.0', 'plugin_version: 2.1'))
+        shutil.rmtree(os.path.join(self.repo_path, 'plugin_1'))
+        o_repo = GlppPluginRepository(repo_path=self.repo_path, repo_tag="repo_1", descriptor_cache=True)
+        self.assertEqual(o_repo.get_cache_stats(), {'hits': 0, 'misses': 1, 'invalidations': 1, 'entries': 1})
+        self.assertEqual(o_repo.get_list_of_plugins_id(), ['my_plugin__2.1'])
+
+    def test_cache_dir(self):
+        """
+        The cache file can be stored outside of the repository
+        """
+        GLPP_LOGGER.info('\n\n>>  test_cache_dir\n')
+        cache_dir = os.path.join(self.tmp_dir, 'cache')
+        GlppPluginRepository(repo_path=self.repo_path, repo_tag="repo_1", descriptor_cache=True, cache_dir=cache_dir)
+        o_repo = GlppPluginRepository(repo_path=self.repo_path, repo_tag="repo_1",
+                                      descriptor_cache=True, cache_dir=cache_dir)
+        self.assertEqual(o_repo.get_cache_stats()['hits'], 2)
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+        self.assertFalse(Path(self.repo_path).joinpath(CACHE_FILENAME).exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
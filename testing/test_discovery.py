@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy plugin discovery engine
+"""
+import unittest
+import os
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+from gulppy.core.glpp_discovery import GlppDiscoveryWalker, compile_exclude_pattern
+from gulppy.core.glpp_plugin_repository import GlppPluginRepository
+from gulppy.config import GLPP_LOGGER, init_logger
+init_logger()
+
+
+class TestDiscovery(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Build a tree :
+            root/a/descr.yaml
+            root/a/data/nested/descr.yaml   (inside a plugin root)
+            root/b/c/descr.yaml
+            root/.git/objects/descr.yaml    (excluded by default)
+            root/data/raw/x/descr.yaml
+            root/b/loop -> root             (symlink loop)
+        """
+        self.root = Path(tempfile.mkdtemp())
+        for d in ['a/data/nested', 'b/c', '.git/objects', 'data/raw/x']:
+            self.root.joinpath(d).mkdir(parents=True)
+        for d in ['a', 'a/data/nested', 'b/c', '.git/objects', 'data/raw/x']:
+            self.root.joinpath(d, 'descr.yaml').write_text('---\n')
+        os.symlink(str(self.root), str(self.root.joinpath('b', 'loop')))
+
+    def tearDown(self):
+        shutil.rmtree(str(self.root))
+
+    def _rel(self, result):
+        return [p.relative_to(self.root).as_posix() for p in result.descriptors]
+
+    def test_default_walk(self):
+        """
+        Nested plugin roots are found, .git is excluded and the symlink loop is skipped
+        """
+        GLPP_LOGGER.info('\n\n>>  test_default_walk\n')
+        result = GlppDiscoveryWalker().walk(self.root)
+        self.assertEqual(self._rel(result), ['a/descr.yaml', 'a/data/nested/descr.yaml', 'b/c/descr.yaml',
+                                             'data/raw/x/descr.yaml'])
+        self.assertEqual(result.excluded_dirs, 1)
+        self.assertEqual(result.skipped_links, 1)
+        self.assertEqual(result.pruned_dirs, 0)
+        # root, a, a/data, a/data/nested, b, b/c, data, data/raw, data/raw/x
+        self.assertEqual(result.visited_dirs, 9)
+
+    def test_walk_options(self):
+        """
+        max_depth, exclude patterns and plugin root pruning options
+        """
+        GLPP_LOGGER.info('\n\n>>  test_walk_options\n')
+        result = GlppDiscoveryWalker(max_depth=2).walk(self.root)
+        self.assertEqual(self._rel(result), ['a/descr.yaml', 'b/c/descr.yaml'])
+        result = GlppDiscoveryWalker(exclude_patterns=['.git/', '/data/**', 'c']).walk(self.root)
+        self.assertEqual(self._rel(result), ['a/descr.yaml', 'a/data/nested/descr.yaml'])
+        result = GlppDiscoveryWalker(stop_at_plugin_root=True, follow_symlinks=False).walk(self.root)
+        self.assertEqual(self._rel(result), ['a/descr.yaml', 'b/c/descr.yaml', 'data/raw/x/descr.yaml'])
+        self.assertEqual(result.pruned_dirs, 1)
+
+        # the directory only patterns do not exclude the archive files
+        with zipfile.ZipFile(str(self.root.joinpath('plugins.zip')), 'w') as zf:
+            zf.writestr('p/descr.yaml', '---\n')
+        result = GlppDiscoveryWalker(exclude_patterns=['.git/', '/data/', '*.zip/']).walk(self.root)
+        self.assertIn('plugins.zip/p/descr.yaml', self._rel(result))
+        result = GlppDiscoveryWalker(exclude_patterns=['.git/', '/data/', '*.zip']).walk(self.root)
+        self.assertNotIn('plugins.zip/p/descr.yaml', self._rel(result))
+
+    def test_exclude_patterns(self):
+        """
+        gitignore style patterns
+        """
+        GLPP_LOGGER.info('\n\n>>  test_exclude_patterns\n')
+        walker = GlppDiscoveryWalker(exclude_patterns=['*.egg-info/', 'build', '/top', 'a/**/z', '!keep/build'])
+        self.assertTrue(walker.is_excluded('x/y.egg-info', is_dir=True))
+        self.assertFalse(walker.is_excluded('x/y.egg-info', is_dir=False))
+        self.assertTrue(walker.is_excluded('x/build', is_dir=True))
+        self.assertFalse(walker.is_excluded('keep/build', is_dir=True))
+        self.assertTrue(walker.is_excluded('top', is_dir=True))
+        self.assertFalse(walker.is_excluded('x/top', is_dir=True))
+        self.assertTrue(walker.is_excluded('a/z', is_dir=True))
+        self.assertTrue(walker.is_excluded('a/b/c/z', is_dir=True))
+        regex, negate, dir_only = compile_exclude_pattern('!d[0-9]/')
+        self.assertTrue(negate and dir_only and regex.match('x/d1'))
+
+    def test_repository_discovery_stats(self):
+        """
+        The repository exposes the discovery counters
+        """
+        GLPP_LOGGER.info('\n\n>>  test_repository_discovery_stats\n')
+        o_repo = GlppPluginRepository(repo_path="../testing_data/normal/repo_1", repo_tag="repo_1")
+        self.assertEqual(o_repo.get_discovery_stats()['descriptors'], 2)
+        self.assertEqual(len(o_repo.get_list_of_plugins_id()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy hack scripts cache
+"""
+import unittest
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+from gulppy.core.glpp_hack_cache import GlppHackCache, HACK_CACHE
+from gulppy.core.glpp_module_plugin import GlppModulePlugin
+from gulppy.config import GLPP_LOGGER, init_logger
+init_logger()
+
+HACK_SCRIPT = '''
+def sys_context_callback_init(**kwargs):
+    from gulppy.core import glpp_module_loader
+    glpp_module_loader.sys_context_callback_init(**kwargs)
+'''
+
+
+class TestHackCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.script = Path(self.tmp_dir, 'hacks', 'init.py')
+        self.script.parent.mkdir()
+        self.script.write_text(HACK_SCRIPT)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_shared_hack_script(self):
+        """
+        We use testing_data/hacks/repo_1 : its plugins use the same hack script.
+        Plugins sharing a hack script share its compiled callables
+        """
+        GLPP_LOGGER.info('\n\n>>  test_shared_hack_script\n')
+        plugins = [GlppModulePlugin(plugin_desc='../testing_data/hacks/repo_1/{}/descr.yaml'.format(name), load=False)
+                   for name in ('plugin_a', 'plugin_b')]
+        stats = HACK_CACHE.get_stats()
+        for cplugin in plugins:
+            cplugin.load()
+        self.assertEqual(plugins[0].load_stats['hacks_cache'], {'hits': 0, 'misses': 1})
+        self.assertEqual(plugins[1].load_stats['hacks_cache'], {'hits': 1, 'misses': 0})
+        self.assertIs(plugins[0].sys_context_callback_init, plugins[1].sys_context_callback_init)
+        plugins[0].load()
+        self.assertEqual(plugins[0].load_stats['hacks_cache'], {'hits': 1, 'misses': 0})
+        self.assertEqual(HACK_CACHE.get_stats()['hits'] - stats['hits'], 2)
+
+    def test_invalidation(self):
+        """
+        A modified script is compiled again
+        """
+        GLPP_LOGGER.info('\n\n>>  test_invalidation\n')
+        for use_hash in (False, True):
+            cache = GlppHackCache(use_hash=use_hash)
+            callback, hit = cache.get_callback(self.script, 'sys_context_callback_init', {})
+            self.assertFalse(hit)
+            self.assertIs(cache.get_callback(self.script, 'sys_context_callback_init', {})[0], callback)
+            self.script.write_text(HACK_SCRIPT + '\n\nVALUE = {}\n'.format(use_hash))
+            new_callback, hit = cache.get_callback(self.script, 'sys_context_callback_init', {})
+            self.assertFalse(hit)
+            self.assertIsNot(new_callback, callback)
+            self.assertEqual(cache.get_stats(), {'hits': 1, 'misses': 2, 'invalidations': 1, 'bytecode_hits': 0,
+                                                 'entries': 1})
+
+    def test_bytecode_persistence(self):
+        """
+        A new cache reads the persisted bytecode instead of compiling the script
+        """
+        GLPP_LOGGER.info('\n\n>>  test_bytecode_persistence\n')
+        cache_dir = os.path.join(self.tmp_dir, 'cache')
+        GlppHackCache(cache_dir=cache_dir).get_callback(self.script, 'sys_context_callback_init', {})
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+        cache = GlppHackCache(cache_dir=cache_dir)
+        with mock.patch('gulppy.core.glpp_hack_cache.compile', create=True, side_effect=AssertionError):
+            callback, hit = cache.get_callback(self.script, 'sys_context_callback_init', {})
+        self.assertTrue(callable(callback))
+        self.assertEqual(cache.get_stats()['bytecode_hits'], 1)
+
+        # outdated or corrupted bytecode is ignored
+        self.script.write_text(HACK_SCRIPT + '\n')
+        cache = GlppHackCache(cache_dir=cache_dir)
+        cache.get_callback(self.script, 'sys_context_callback_init', {})
+        self.assertEqual(cache.get_stats()['bytecode_hits'], 0)
+        bytecode_file = Path(cache_dir, os.listdir(cache_dir)[0])
+        bytecode_file.write_bytes(b'garbage')
+        cache = GlppHackCache(cache_dir=cache_dir)
+        cache.get_callback(self.script, 'sys_context_callback_init', {})
+        self.assertEqual(cache.get_stats()['bytecode_hits'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
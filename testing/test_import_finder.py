@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy per-plugin import finders
+"""
+import unittest
+import os
+import sys
+from gulppy.core.glpp_plugin_factory import GlppPluginFactory, MutableModeEnum, BatchModeEnum
+from gulppy.core.glpp_plugin_manager import GlppPluginManager
+from gulppy.core import glpp_module_loader
+from gulppy.config import GLPP_LOGGER, init_logger
+init_logger()
+
+
+class TestImportFinder(unittest.TestCase):
+
+    def setUp(self):
+        self.previous = glpp_module_loader.META_PATH_ISOLATION
+        glpp_module_loader.META_PATH_ISOLATION = True
+
+    def tearDown(self):
+        glpp_module_loader.META_PATH_ISOLATION = self.previous
+
+    def test_sys_path_untouched(self):
+        """
+        We use testing_data/finder/repo_1 : the main module of finder_plugin keeps a copy of sys.path.
+        The plugin modules are found without inserting the plugin python paths in sys.path
+        """
+        GLPP_LOGGER.info('\n\n>>  test_sys_path_untouched\n')
+        o_plug = GlppPluginFactory.create_plugin('../testing_data/finder/repo_1/finder_plugin/descr.yaml',
+                                                 mutable_mode=MutableModeEnum.IMMUTABLE)
+        main = o_plug.get_module('my_finder_plugin.main')
+        self.assertEqual(main.lib.VALUE, 1)
+        self.assertEqual(main.SYS_PATH, sys.path)
+        self.assertFalse(any(k.startswith('my_finder_plugin') for k in sys.modules))
+
+    def test_concurrent_host_import(self):
+        """
+        We use testing_data/finder/host and testing_data/finder/repo_2 : the host directory holds the
+        glpp_finder_host module, the main module of helper_plugin imports the my_finder_helper module, which imports
+        the host module and the plugin package from another thread.
+        The imports of the other threads do not see the plugin modules and are not attributed to the plugin
+        """
+        GLPP_LOGGER.info('\n\n>>  test_concurrent_host_import\n')
+        host_dir = os.path.abspath('../testing_data/finder/host')
+        host_module = 'glpp_finder_host'
+        helper_module = 'my_finder_helper'
+        sys.path.append(host_dir)
+        try:
+            o_plug = GlppPluginFactory.create_plugin('../testing_data/finder/repo_2/helper_plugin/descr.yaml',
+                                                     mutable_mode=MutableModeEnum.IMMUTABLE)
+            result = o_plug.get_module(helper_module).RESULT
+            self.assertFalse(result['plugin_visible'])
+            self.assertEqual(result['host'].VALUE, 42)
+            # the host module is left in sys.modules and is not a plugin module
+            self.assertIs(sys.modules.get(host_module), result['host'])
+            self.assertNotIn(host_module, [m['name'] for m in o_plug.get_list_of_modules()])
+            self.assertNotIn(helper_module, sys.modules)
+        finally:
+            sys.path.remove(host_dir)
+            sys.modules.pop(host_module, None)
+
+    def test_concurrent_sys_path_change(self):
+        """
+        We use testing_data/finder/repo_3 : the main modules of plugin_0 and plugin_1 append to sys.path, from
+        another thread, the 'added' path of their package directory.
+        The sys.path changes made by the other threads during a load are kept
+        """
+        GLPP_LOGGER.info('\n\n>>  test_concurrent_sys_path_change\n')
+        repo_dir = '../testing_data/finder/repo_3'
+        paths = [os.path.join(os.path.realpath(os.path.join(repo_dir, 'plugin_{}'.format(i))),
+                              'my_finder_path_{}'.format(i), 'added') for i in range(2)]
+        try:
+            GlppPluginFactory.create_plugin(os.path.join(repo_dir, 'plugin_0', 'descr.yaml'),
+                                            mutable_mode=MutableModeEnum.IMMUTABLE)
+            self.assertIn(paths[0], sys.path)
+            pmanager = GlppPluginManager()
+            pmanager.add_repository(repo_path=repo_dir, repo_tag='tag')
+            pmanager.load(mutable_mode=MutableModeEnum.IMMUTABLE, batch=BatchModeEnum.REPOSITORY)
+            self.assertEqual(len(pmanager.plugins), 2)
+            self.assertIn(paths[1], sys.path)
+        finally:
+            sys.path[:] = [p for p in sys.path if p not in paths]
+
+    def test_batch_and_mutable(self):
+        """
+        We use testing_data/finder/repo_4 : the main module of plugin_<i> returns the value v<i>.
+        The batch contexts use the finders as well, the mutable mode inserts the python paths in sys.path
+        """
+        GLPP_LOGGER.info('\n\n>>  test_batch_and_mutable\n')
+        packages = ['my_finder_simple_0', 'my_finder_simple_1']
+        pmanager = GlppPluginManager()
+        pmanager.add_repository(repo_path='../testing_data/finder/repo_4', repo_tag='tag')
+        sys_path = list(sys.path)
+        pmanager.load(mutable_mode=MutableModeEnum.IMMUTABLE, batch=BatchModeEnum.REPOSITORY)
+        self.assertEqual(sys.path, sys_path)
+        for i, package in enumerate(packages):
+            o_plug = pmanager.get_plugin_by_name_and_version('plugin_{}'.format(i), 1.0)
+            self.assertEqual(o_plug.get_module(package + '.main').get_value(), 'v{}'.format(i))
+        self.assertFalse(any(k.startswith(p) for k in sys.modules for p in packages))
+
+        pmanager.load(mutable_mode=MutableModeEnum.MUTABLE)
+        o_plug = pmanager.get_plugin_by_name_and_version('plugin_0', 1.0)
+        self.assertIn(os.fspath(o_plug.python_path[0].resolve()), sys.path)
+        self.assertIn(packages[0] + '.main', sys.modules)
+        for i in range(len(packages)):
+            pmanager.unload_plugin('plugin_{}'.format(i), 1.0)
+        self.assertEqual(sys.path, sys_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
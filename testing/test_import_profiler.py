@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy import-tree profiler
+"""
+import unittest
+import builtins
+import json
+import os
+import shutil
+import sys
+import tempfile
+from gulppy.core.glpp_import_profiler import GlppImportProfiler
+from gulppy.core.glpp_module_plugin import GlppModulePlugin
+from gulppy.core.glpp_plugin_factory import MutableModeEnum
+from gulppy.core.glpp_plugin_manager import GlppPluginManager
+from gulppy.config import GLPP_LOGGER, init_logger
+init_logger()
+
+
+class TestImportProfiler(unittest.TestCase):
+
+    def setUp(self):
+        """
+        We use testing_data/profiler/repo_1 : the main modules of profiled_plugin import the lib module, which
+        imports the deep module, which imports os
+        """
+        self.tmp_dir = tempfile.mkdtemp()
+        self.package = 'my_profiled_plugin'
+        self.main_a = '{}.main_a'.format(self.package)
+        self.main_b = '{}.main_b'.format(self.package)
+        self.desc_file = '../testing_data/profiler/repo_1/profiled_plugin/descr.yaml'
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _check_tree(self, profiler, executed_by=None):
+        lib = '{}.lib'.format(self.package)
+        deep = '{}.deep'.format(self.package)
+        executed_by = self.main_a if executed_by is None else executed_by
+        stacks = {stack: node for stack, node in profiler.walk()}
+        self.assertFalse(stacks[(executed_by, self.package)].cached)
+        self.assertFalse(stacks[(executed_by, lib)].cached)
+        self.assertFalse(stacks[(executed_by, lib, deep)].cached)
+        self.assertTrue(stacks[(executed_by, lib, deep, 'os')].cached)
+        node = stacks[(executed_by, lib)]
+        self.assertAlmostEqual(node.self_time + sum(c.cumulative_time for c in node.children), node.cumulative_time)
+        return stacks
+
+    def test_plugin_profile(self):
+        """
+        The imports tree of each main module is recorded, executed and cached modules being distinguished
+        """
+        GLPP_LOGGER.info('\n\n>>  test_plugin_profile\n')
+        o_plug = GlppModulePlugin(plugin_desc=self.desc_file, load=False)
+        o_plug.load()
+        self.assertIsNone(o_plug.import_profile)
+        for options in ({'batch': True}, {}):
+            o_plug.load(profile_imports=True, **options)
+            profiler = o_plug.import_profile
+            self.assertEqual([root.name for root in profiler.roots], [self.main_a, self.main_b])
+            stacks = self._check_tree(profiler)
+            # the plugin modules are shared by the main modules in batch mode only
+            self.assertEqual(stacks[(self.main_b, '{}.lib'.format(self.package))].cached, options.get('batch', False))
+        self.assertNotIn(profiler._finder, sys.meta_path)
+        self.assertIsNot(builtins.__import__, profiler._import_hook)
+        self.assertEqual(o_plug.get_module(self.main_a).lib.__loader__.__class__.__name__, 'SourceFileLoader')
+
+    def test_lazy_profile(self):
+        """
+        In lazy mode, the modules are profiled as they are executed
+        """
+        GLPP_LOGGER.info('\n\n>>  test_lazy_profile\n')
+        o_plug = GlppModulePlugin(plugin_desc=self.desc_file, load=False)
+        o_plug.load(lazy=True, profile_imports=True)
+        self.assertEqual(o_plug.import_profile.roots, [])
+        o_plug.get_module(self.main_b)
+        self.assertEqual([root.name for root in o_plug.import_profile.roots], [self.main_b])
+        self._check_tree(o_plug.import_profile, executed_by=self.main_b)
+
+    def test_reports(self):
+        """
+        The profile is rendered as a sorted report and as folded stacks
+        """
+        GLPP_LOGGER.info('\n\n>>  test_reports\n')
+        with GlppImportProfiler() as profiler:
+            with profiler.section('root'):
+                import json as _
+        rows = profiler.get_rows()
+        self.assertEqual(rows[0]['name'], 'root')
+        self.assertEqual([row['name'] for row in rows if row['cached']], ['json'])
+        self.assertEqual(profiler.format_report().count('\n'), len(rows))
+        folded = profiler.to_folded(prefix='plugin')
+        self.assertEqual(folded[1].rsplit(' ', 1)[0], 'plugin;root;json (cached)')
+        self.assertTrue(all(line.rsplit(' ', 1)[1].isdigit() for line in folded))
+
+    def test_manager_export(self):
+        """
+        The manager exports the profiles of its plugins
+        """
+        GLPP_LOGGER.info('\n\n>>  test_manager_export\n')
+        pmanager = GlppPluginManager()
+        pmanager.add_repository(repo_path="../testing_data/normal/repo_1", repo_tag="tag-1")
+        pmanager.add_repository(repo_path="../testing_data/profiler/repo_1", repo_tag="tag-2")
+        pmanager.load(mutable_mode=MutableModeEnum.IMMUTABLE, profile_imports=True)
+        profiles = pmanager.get_import_profiles()
+        self.assertEqual(len(profiles), 3)
+        folded_file = os.path.join(self.tmp_dir, 'imports.folded')
+        folded = pmanager.export_import_profile(folded_file)
+        self.assertTrue(all(line.split(';')[0] in profiles for line in folded.splitlines()))
+        self.assertIn('profiled_plugin__1.0;{};{}.lib'.format(self.main_a, self.package), folded)
+        with open(folded_file) as fp:
+            self.assertEqual(fp.read(), folded + '\n')
+        self.assertEqual(set(json.loads(pmanager.export_import_profile(fmt='json'))), set(profiles))
+        self.assertIn('cumul [us]', pmanager.export_import_profile(fmt='report', limit=3))
+        with self.assertRaises(ValueError):
+            pmanager.export_import_profile(fmt='svg')
+
+
+if __name__ == '__main__':
+    unittest.main()
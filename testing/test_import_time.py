@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+Test that importing gulppy stays lightweight
+"""
+import unittest
+from benchmarks.bench_import_time import probe_import, IMPORT_TARGETS
+from gulppy.config import GLPP_LOGGER, init_logger
+init_logger()
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_no_heavy_module_at_import(self):
+        """
+        Importing gulppy core modules must not import the heavy modules (@see bench_import_time.FORBIDDEN_MODULES)
+        """
+        GLPP_LOGGER.info('\n\n>>  test_no_heavy_module_at_import\n')
+        for target in IMPORT_TARGETS:
+            res = probe_import(target)
+            GLPP_LOGGER.info('import {} : {:.2f} ms ({} modules)'.format(target, res['time'] * 1e3, res['n_modules']))
+            self.assertEqual(res['forbidden'], [], 'heavy modules imported by {}'.format(target))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy lazy module loading
+"""
+import unittest
+import sys
+from gulppy.core.glpp_module_plugin import GlppModulePlugin
+from gulppy.core.glpp_abstract_plugin import GlppPluginLoadStatus
+from gulppy.core.glpp_plugin_repository import GlppPluginRepository
+from gulppy.core.glpp_plugin_factory import MutableModeEnum
+from gulppy.core import glpp_exceptions
+from gulppy.config import GLPP_LOGGER, init_logger
+init_logger()
+
+
+class TestLazyLoad(unittest.TestCase):
+
+    def setUp(self):
+        """
+        We use testing_data/lazy/repo_1 : the main_a module of lazy_plugin imports the lib module
+        """
+        self.package = 'my_lazy_plugin'
+        self.main_a = '{}.main_a'.format(self.package)
+        self.main_b = '{}.main_b'.format(self.package)
+        self.desc_file = '../testing_data/lazy/repo_1/lazy_plugin/descr.yaml'
+
+    def test_lazy_load(self):
+        """
+        Modules are executed at first access and the modules bookkeeping is kept up to date
+        """
+        GLPP_LOGGER.info('\n\n>>  test_lazy_load\n')
+        o_plug = GlppModulePlugin(plugin_desc=self.desc_file, load=False)
+        o_plug.load(lazy=True)
+        self.assertEqual(o_plug.load_status, GlppPluginLoadStatus.LOADED)
+        self.assertEqual(o_plug.pending_modules, [self.main_a, self.main_b])
+        self.assertEqual(o_plug.get_list_of_modules(), [])
+        self.assertNotIn(self.main_a, sys.modules)
+
+        self.assertEqual(o_plug.get_module(self.main_a).VALUE, 1)
+        self.assertEqual(o_plug.get_modules_status(), {self.main_a: GlppPluginLoadStatus.LOADED,
+                                                       self.main_b: GlppPluginLoadStatus.NOT_LOADED})
+        self.assertIn('{}.lib'.format(self.package), o_plug._i_modules)
+        self.assertNotIn(self.main_a, o_plug._i_modules)
+        self.assertIs(o_plug.get_module(self.main_a), o_plug.get_module(self.main_a))
+        # the immutable mode active at load is used for the module execution
+        self.assertNotIn(self.main_a, sys.modules)
+
+        # an unknown key executes the pending modules before failing
+        with self.assertRaises(glpp_exceptions.UnknownModuleError):
+            o_plug.get_module('unknown')
+        self.assertEqual(o_plug.pending_modules, [])
+        self.assertEqual(o_plug.get_module(self.main_b).VALUE, 2)
+        self.assertEqual(set(o_plug._modules.keys()) & set(o_plug._i_modules.keys()), set())
+
+    def test_lazy_load_errors(self):
+        """
+        Missing module files are detected at load, import errors at first access
+        testing_data/lazy/repo_2 : the main_b module of lazy_plugin raises an ImportError
+        testing_data/lazy/repo_3 : the main_b module file of lazy_plugin is missing
+        """
+        GLPP_LOGGER.info('\n\n>>  test_lazy_load_errors\n')
+        o_plug = GlppModulePlugin(plugin_desc='../testing_data/lazy/repo_2/lazy_plugin/descr.yaml', load=False)
+        o_plug.load(lazy=True)
+        self.assertEqual(o_plug.get_module('my_lazy_broken_plugin.main_a').VALUE, 1)
+        with self.assertRaises(glpp_exceptions.PluginImportError):
+            o_plug.get_module('my_lazy_broken_plugin.main_b')
+        self.assertEqual(o_plug.pending_modules, ['my_lazy_broken_plugin.main_b'])
+
+        o_plug = GlppModulePlugin(plugin_desc='../testing_data/lazy/repo_3/lazy_plugin/descr.yaml', load=False)
+        with self.assertRaises(glpp_exceptions.PluginImportError):
+            o_plug.load(lazy=True)
+
+    def test_lazy_load_repository_mutable(self):
+        """
+        The mutable mode of the repository load is kept for the deferred executions
+        """
+        GLPP_LOGGER.info('\n\n>>  test_lazy_load_repository_mutable\n')
+        o_repo = GlppPluginRepository(repo_path='../testing_data/lazy/repo_1', repo_tag='lazy')
+        o_repo.load_plugins(mutable_mode=MutableModeEnum.MUTABLE, lazy=True)
+        o_plug = o_repo.get_plugin_by_name_and_version('lazy_plugin', 1.0)
+        self.assertTrue(o_plug.lazy)
+        self.assertTrue(GlppModulePlugin.IMMUTABLE_SYS_PATH_MODULE)
+        module = o_plug.get_module(self.main_b)
+        self.assertIs(sys.modules[self.main_b], module)
+        o_plug.unload(check_leaks=False)
+        self.assertNotIn(self.main_b, sys.modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy load instrumentation
+"""
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import tracemalloc
+from gulppy.core.glpp_module_plugin import GlppModulePlugin
+from gulppy.core.glpp_plugin_factory import MutableModeEnum
+from gulppy.core.glpp_plugin_manager import GlppPluginManager
+from gulppy.core import glpp_exceptions
+from gulppy.config import GLPP_LOGGER, init_logger
+init_logger()
+
+
+class TestLoadStats(unittest.TestCase):
+
+    def setUp(self):
+        """
+        We use testing_data/stats/repo_1 : the main_a module of stats_plugin imports a lib module allocating a list
+        """
+        self.tmp_dir = tempfile.mkdtemp()
+        self.package = 'my_stats_plugin'
+        self.main_a = '{}.main_a'.format(self.package)
+        self.main_b = '{}.main_b'.format(self.package)
+        self.desc_file = '../testing_data/stats/repo_1/stats_plugin/descr.yaml'
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_plugin_stats(self):
+        """
+        The plugin and modules loads are measured whatever the load mode
+        """
+        GLPP_LOGGER.info('\n\n>>  test_plugin_stats\n')
+        o_plug = GlppModulePlugin(plugin_desc=self.desc_file, load=False)
+        self.assertIsNotNone(o_plug.descriptor_time)
+        for options in ({}, {'batch': True}, {'lazy': True}):
+            o_plug.load(**options)
+            stats = o_plug.load_stats
+            self.assertGreater(stats['wall_time'], 0)
+            self.assertGreaterEqual(stats['cpu_time'], 0)
+            self.assertEqual(stats['descriptor_time'], o_plug.descriptor_time)
+            self.assertIsNone(stats['allocated_bytes'])
+            self.assertIsNone(stats['peak_bytes'])
+            self.assertFalse(stats['failed'])
+            if options.get('lazy'):
+                self.assertEqual(stats['modules'], {})
+                o_plug.get_module(self.main_a)
+            self.assertEqual(list(stats['modules']), [self.main_a] if options.get('lazy') else
+                             [self.main_a, self.main_b])
+            # main_a adds the package, lib and itself
+            self.assertEqual(stats['modules'][self.main_a]['n_sys_modules_added'], 3)
+            self.assertGreater(stats['modules'][self.main_a]['wall_time'], 0)
+            self.assertEqual(stats['n_sys_modules_added'],
+                             sum(m['n_sys_modules_added'] for m in stats['modules'].values()))
+
+    def test_trace_memory(self):
+        """
+        The memory allocated by a load is traced on demand
+        """
+        GLPP_LOGGER.info('\n\n>>  test_trace_memory\n')
+        o_plug = GlppModulePlugin(plugin_desc=self.desc_file, load=False)
+        o_plug.load(trace_memory=True)
+        stats = o_plug.load_stats
+        self.assertGreater(stats['allocated_bytes'], 10000 * 28)
+        self.assertGreaterEqual(stats['peak_bytes'], stats['allocated_bytes'])
+        self.assertGreater(stats['modules'][self.main_a]['allocated_bytes'],
+                           stats['modules'][self.main_b]['allocated_bytes'])
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_failed_load(self):
+        """
+        We use testing_data/stats/repo_2 : the main_b module of stats_plugin raises an error.
+        A failed load is measured too
+        """
+        GLPP_LOGGER.info('\n\n>>  test_failed_load\n')
+        o_plug = GlppModulePlugin(plugin_desc='../testing_data/stats/repo_2/stats_plugin/descr.yaml', load=False)
+        with self.assertRaises(glpp_exceptions.PluginImportError):
+            o_plug.load()
+        self.assertTrue(o_plug.load_stats['failed'])
+        self.assertGreater(o_plug.load_stats['wall_time'], 0)
+
+    def test_load_report(self):
+        """
+        The manager aggregates the plugins metrics and exports them as json
+        """
+        GLPP_LOGGER.info('\n\n>>  test_load_report\n')
+        pmanager = GlppPluginManager()
+        pmanager.add_repository(repo_path="../testing_data/normal/repo_1", repo_tag="tag-1")
+        pmanager.add_repository(repo_path="../testing_data/stats/repo_1", repo_tag="tag-2")
+        pmanager.load(mutable_mode=MutableModeEnum.IMMUTABLE, trace_memory=True)
+        report = pmanager.get_load_report()
+        self.assertEqual(report['totals']['n_plugins'], 3)
+        self.assertEqual(report['totals']['n_loaded'], 3)
+        wall_times = [p['stats']['wall_time'] for p in report['plugins']]
+        self.assertEqual(wall_times, sorted(wall_times, reverse=True))
+        self.assertAlmostEqual(report['totals']['wall_time'], sum(wall_times))
+        self.assertTrue(all(p['managed'] for p in report['plugins']))
+        self.assertTrue(all(p['stats']['descriptor_time'] is not None for p in report['plugins']))
+        self.assertIsNotNone(report['totals']['allocated_bytes'])
+        self.assertEqual([r['stats']['n_loaded'] for r in report['repositories']], [2, 1])
+
+        report_file = os.path.join(self.tmp_dir, 'report.json')
+        pmanager.export_load_report(report_file)
+        with open(report_file) as fp:
+            exported = json.load(fp)
+        self.assertEqual([(p['name'], p['version']) for p in exported['plugins']],
+                         [(p['name'], p['version']) for p in report['plugins']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,9 @@
 Test for the Gulppy module loader core module
 """
 import unittest
+import os
 import sys
+import types
 from gulppy.core import glpp_module_loader
 from gulppy.config import GLPP_LOGGER, init_logger
 init_logger()
@@ -64,5 +66,82 @@ class TestModuleLoader(unittest.TestCase):
         mod1.call_lib_function()
 
 
+class TestSysContextTracking(unittest.TestCase):
+
+    def setUp(self):
+        """
+        We use testing_data/sys_context : its packages main module imports their lib module, my_ctx_delete deletes
+        the glpp_dummy_module entry of sys.modules and my_ctx_json replaces the json entry
+        """
+        self.root_path = '../testing_data/sys_context'
+        self.full_diff = glpp_module_loader.FULL_SYS_MODULES_DIFF
+        self.dummy = types.ModuleType('glpp_dummy_module')
+        sys.modules[self.dummy.__name__] = self.dummy
+
+    def tearDown(self):
+        glpp_module_loader.FULL_SYS_MODULES_DIFF = self.full_diff
+        sys.modules.pop(self.dummy.__name__, None)
+
+    def load(self, package, immutable):
+        return glpp_module_loader.load_module(module_fullname='{}.main'.format(package),
+                                              module_path=os.path.join(self.root_path, package, 'main.py'),
+                                              module_root_path=[self.root_path],
+                                              immutable=immutable)
+
+    def test_incremental_tracking_matches_full_diff(self):
+        """
+        The incremental changes tracking gives the same added modules and the same final sys.modules as the full
+        comparison, in immutable and mutable mode
+        """
+        GLPP_LOGGER.info('\n\n>>  test_incremental_tracking_matches_full_diff\n')
+        for immutable in (True, False):
+            results = []
+            for full_diff in (False, True):
+                glpp_module_loader.FULL_SYS_MODULES_DIFF = full_diff
+                package = 'my_ctx_plain'
+                before = dict(sys.modules)
+                _, added_modules = self.load(package, immutable)
+                after = dict(sys.modules)
+                for k in [k for k in sys.modules if k.startswith(package)]:
+                    del sys.modules[k]
+                results.append(([k.replace(package, 'pkg') for k, _ in added_modules],
+                                {k.replace(package, 'pkg') for k in after.keys() - before.keys()},
+                                all(after.get(k) is v for k, v in before.items())))
+            self.assertEqual(results[0], results[1])
+            self.assertEqual(results[0][0], ['pkg', 'pkg.lib', 'pkg.main'])
+            self.assertEqual(len(results[0][1]), 0 if immutable else 3)
+            self.assertTrue(results[0][2])
+
+    def test_immutable_restores_replaced_and_deleted_modules(self):
+        """
+        Existing entries replaced or deleted by the loaded code are restored in immutable mode
+        """
+        GLPP_LOGGER.info('\n\n>>  test_immutable_restores_replaced_and_deleted_modules\n')
+        package = 'my_ctx_delete'
+        before = dict(sys.modules)
+        self.load(package, immutable=True)
+        self.assertIs(sys.modules[self.dummy.__name__], self.dummy)
+        self.assertEqual(dict(sys.modules), before)
+
+        # the loaded module itself may replace an existing entry
+        package = 'my_ctx_plain'
+        placeholder = types.ModuleType('{}.main'.format(package))
+        placeholder.__file__ = os.path.abspath(os.path.join(self.root_path, package, 'lib.py'))
+        sys.modules[placeholder.__name__] = placeholder
+        before = dict(sys.modules)
+        module, _ = self.load(package, immutable=True)
+        self.assertIsNot(module, placeholder)
+        self.assertEqual(dict(sys.modules), before)
+        del sys.modules[placeholder.__name__]
+
+        # an unrelated existing entry replaced in place
+        import json
+        package = 'my_ctx_json'
+        before = dict(sys.modules)
+        self.load(package, immutable=True)
+        self.assertIs(sys.modules['json'], json)
+        self.assertEqual(dict(sys.modules), before)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
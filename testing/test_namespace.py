@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy namespaced mutable mode
+"""
+import unittest
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+from gulppy.core.glpp_plugin_factory import GlppPluginFactory, MutableModeEnum
+from gulppy.core.glpp_plugin_manager import GlppPluginManager
+from gulppy.core import glpp_exceptions, glpp_namespace
+from gulppy.config import GLPP_LOGGER, init_logger
+init_logger()
+
+NAMESPACE_DATA = '../testing_data/namespace'
+
+
+class TestNamespace(unittest.TestCase):
+
+    def setUp(self):
+        """
+        We use testing_data/namespace : the versions 1.0 (module mode) and 2.0 (package mode) of ns_plugin in repo_1,
+        the versions 3.0 and 4.0 in repo_2. They all define the my_ns_plugin package, its main module imports the
+        sub.lib module in several ways.
+        """
+        self.tmp_dir = tempfile.mkdtemp()
+        self.package = 'my_ns_plugin'
+        self.plugins = []
+
+    def tearDown(self):
+        for cplugin in self.plugins:
+            cplugin.unload(check_leaks=False)
+        shutil.rmtree(self.tmp_dir)
+
+    @staticmethod
+    def get_desc_file(repo, version):
+        return os.path.join(NAMESPACE_DATA, repo, 'plugin_{}'.format(version.replace('.', '_')), 'descr.yaml')
+
+    def create_plugin(self, desc_file, mutable_mode=MutableModeEnum.NAMESPACED, **kwargs):
+        o_plug = GlppPluginFactory.create_plugin(desc_file, mutable_mode=mutable_mode, **kwargs)
+        self.plugins.append(o_plug)
+        return o_plug
+
+    def test_versions_coexist(self):
+        """
+        Several versions of a plugin defining the same modules are loaded in sys.modules
+        """
+        GLPP_LOGGER.info('\n\n>>  test_versions_coexist\n')
+        sys_path = list(sys.path)
+        plugins = [self.create_plugin(self.get_desc_file('repo_1', '1.0')),
+                   self.create_plugin(self.get_desc_file('repo_1', '2.0'))]
+        for o_plug, version in zip(plugins, ('1.0', '2.0')):
+            main = o_plug.get_module(self.package + '.main')
+            self.assertEqual(main.get_values(), (version,) * 4)
+            self.assertEqual(main.__name__, '{}.{}.main'.format(o_plug.namespace.prefix, self.package))
+            self.assertIs(sys.modules[main.__name__], main)
+        self.assertEqual(plugins[0].namespace.prefix, glpp_namespace.NAMESPACE_ROOT + '.ns_plugin__1_0')
+        self.assertIn(self.package + '.sub.lib', [m['name'] for m in plugins[0].get_list_of_modules()])
+        self.assertFalse(any(k.startswith(self.package) for k in sys.modules))
+        self.assertEqual(sys.path, sys_path)
+
+        # the plain mutable mode is not affected by the namespaced modules
+        o_plug = self.create_plugin(self.get_desc_file('repo_2', '3.0'), mutable_mode=MutableModeEnum.MUTABLE)
+        self.assertEqual(o_plug.get_module(self.package + '.main').get_values(), ('3.0',) * 4)
+        self.assertIsNone(o_plug.namespace)
+        with self.assertRaises(glpp_exceptions.PluginModuleSysModuleDuplicateError):
+            self.create_plugin(self.get_desc_file('repo_2', '4.0'), mutable_mode=MutableModeEnum.MUTABLE)
+
+    def test_lazy_reload_and_unload(self):
+        """
+        We use a copy of the version 1.0 : the test changes its sub.lib module.
+        The namespaced modules are executed on demand, reloaded and released
+        """
+        GLPP_LOGGER.info('\n\n>>  test_lazy_reload_and_unload\n')
+        plugin_root = os.path.join(self.tmp_dir, 'plugin')
+        shutil.copytree(os.path.dirname(self.get_desc_file('repo_1', '1.0')), plugin_root)
+        desc_file = os.path.join(plugin_root, 'descr.yaml')
+        o_plug = self.create_plugin(desc_file, load=False)
+        o_plug.load(lazy=True, immutable=False, namespaced=True)
+        prefix = o_plug.namespace.prefix
+        self.assertNotIn(prefix + '.' + self.package + '.main', sys.modules)
+        self.assertEqual(o_plug.get_module(self.package + '.main').get_values(), ('1.0',) * 4)
+
+        time.sleep(0.01)
+        lib_file = os.path.join(os.path.dirname(desc_file), self.package, 'sub', 'lib.py')
+        with open(lib_file, 'w') as fp:
+            fp.write('VALUE = "1.1"\n')
+        self.assertEqual(o_plug.reload_changed(), [self.package + '.sub.lib', self.package + '.main'])
+        main = o_plug.get_module(self.package + '.main')
+        self.assertEqual(main.get_values(), ('1.1',) * 4)
+        self.assertIs(sys.modules[prefix + '.' + self.package + '.main'], main)
+        del main
+
+        result = o_plug.unload()
+        self.assertEqual(result['leaked'], [])
+        self.assertIn(prefix, result['sys_modules_removed'])
+        self.assertFalse(any(k == prefix or k.startswith(prefix + '.') for k in sys.modules))
+        self.assertIsNone(o_plug.namespace)
+
+    def test_async_loads(self):
+        """
+        The namespaced mode applies to the asyncio loads of the manager and of the factory
+        """
+        GLPP_LOGGER.info('\n\n>>  test_async_loads\n')
+        pmanager = GlppPluginManager()
+        pmanager.add_repository(repo_path=os.path.join(NAMESPACE_DATA, 'repo_1'), repo_tag='repo')
+        asyncio.run(pmanager.load_async(mutable_mode=MutableModeEnum.NAMESPACED))
+        self.plugins.extend(cplugin for cplugin, _ in pmanager.plugins.values())
+        o_plug = asyncio.run(GlppPluginFactory.create_plugin_async(self.get_desc_file('repo_2', '3.0'),
+                                                                   mutable_mode=MutableModeEnum.NAMESPACED))
+        self.plugins.append(o_plug)
+        plugins = {str(cplugin.version): cplugin for cplugin in self.plugins}
+        for version in ('1.0', '2.0', '3.0'):
+            o_plug = plugins[version]
+            self.assertIsNotNone(o_plug.namespace)
+            self.assertEqual(o_plug.get_module(self.package + '.main').get_values(), (version,) * 4)
+        self.assertFalse(any(k.startswith(self.package) for k in sys.modules))
+
+    def test_namespaced_dependencies(self):
+        """
+        We use testing_data/namespace/deps : the versions 1.0 and 2.0 of app_plugin require the same version of
+        base_plugin and import its my_ns_base.core module.
+        The imports of the modules of a namespaced dependency are rewritten to its namespace
+        """
+        GLPP_LOGGER.info('\n\n>>  test_namespaced_dependencies\n')
+        base_package = 'my_ns_base'
+        pmanager = GlppPluginManager()
+        pmanager.add_repository(repo_path=os.path.join(NAMESPACE_DATA, 'deps'), repo_tag='deps')
+        pmanager.load(mutable_mode=MutableModeEnum.NAMESPACED)
+        self.plugins.extend(cplugin for cplugin, _ in pmanager.plugins.values())
+        for version in (1.0, 2.0):
+            app = pmanager.get_plugin_by_name_and_version('app_plugin', version)
+            base = pmanager.get_plugin_by_name_and_version('base_plugin', version)
+            core = app.get_module(self.package + '.main').core
+            self.assertIs(core, base.get_module(base_package + '.core'))
+            self.assertEqual(core.__name__, '{}.{}.core'.format(base.namespace.prefix, base_package))
+            self.assertNotIn(base_package + '.core', [m['name'] for m in app.get_list_of_modules()])
+        self.assertFalse(any(k.startswith(base_package) for k in sys.modules))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy package plugin mode
+"""
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+from gulppy.core.glpp_abstract_plugin import GlppPluginLoadStatus
+from gulppy.core.glpp_package_plugin import GlppPackagePlugin
+from gulppy.core.glpp_package_index import DIRECTORY_CACHE, sort_modules
+from gulppy.core.glpp_plugin_factory import GlppPluginFactory, MutableModeEnum
+from gulppy.core import glpp_exceptions
+from gulppy.config import GLPP_LOGGER, init_logger
+init_logger()
+
+
+class TestPackagePlugin(unittest.TestCase):
+
+    def setUp(self):
+        """
+        We use testing_data/packages/repo_1 : package_plugin is a package mode plugin, its package imports its core
+        module, the sub.mod module imports the core module and the other module imports the sub.mod module
+        """
+        self.tmp_dir = tempfile.mkdtemp()
+        self.package = 'my_package_plugin'
+        self.desc_file = '../testing_data/packages/repo_1/package_plugin/descr.yaml'
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+        for k in [k for k in sys.modules if k.startswith(self.package)]:
+            del sys.modules[k]
+
+    def test_lazy_submodules(self):
+        """
+        The load executes the packages only, submodules are executed at first access
+        """
+        GLPP_LOGGER.info('\n\n>>  test_lazy_submodules\n')
+        pkg = self.package
+        o_plug = GlppPluginFactory.create_plugin(self.desc_file, mutable_mode=MutableModeEnum.IMMUTABLE)
+        self.assertIsInstance(o_plug, GlppPackagePlugin)
+        self.assertEqual(list(o_plug.index), [pkg, pkg + '.core', pkg + '.other', pkg + '.sub', pkg + '.sub.mod'])
+        self.assertEqual(o_plug.pending_modules, [pkg + '.other', pkg + '.sub', pkg + '.sub.mod'])
+        self.assertEqual([k for k in sys.modules if k.startswith(pkg)], [])
+
+        package = o_plug.get_module(pkg)
+        self.assertIs(package.core, o_plug.get_module(pkg + '.core'))
+        # attribute access loads the submodules, sharing the already loaded modules
+        self.assertEqual(package.sub.mod.VALUE, 2)
+        self.assertIs(package.sub.mod.core, package.core)
+        self.assertIs(o_plug.get_module(pkg + '.sub.mod'), package.sub.mod)
+        self.assertEqual(o_plug.get_modules_status()[pkg + '.other'], GlppPluginLoadStatus.NOT_LOADED)
+        self.assertEqual(o_plug.get_module(pkg + '.other').VALUE, 3)
+        self.assertEqual(o_plug.pending_modules, [])
+        self.assertEqual([k for k in sys.modules if k.startswith(pkg)], [])
+        with self.assertRaises(AttributeError):
+            package.unknown
+        with self.assertRaises(glpp_exceptions.UnknownModuleError):
+            o_plug.get_module(pkg + '.data')
+
+    def test_lazy_load(self):
+        """
+        In lazy mode, the load only indexes the packages
+        """
+        GLPP_LOGGER.info('\n\n>>  test_lazy_load\n')
+        pkg = self.package
+        o_plug = GlppPackagePlugin(plugin_desc=self.desc_file, load=False)
+        o_plug.load(lazy=True)
+        self.assertEqual(len(o_plug.pending_modules), 5)
+        self.assertEqual(o_plug.get_module(pkg + '.sub.mod').VALUE, 2)
+        self.assertEqual(sorted(o_plug.load_stats['modules']), [pkg, pkg + '.sub', pkg + '.sub.mod'])
+        self.assertEqual(o_plug.pending_modules, [pkg + '.other'])
+
+    def test_eager_load(self):
+        """
+        We use testing_data/packages/repo_2 : package_plugin is the same plugin in package_eager mode.
+        The eager mode executes the whole tree in dependency order
+        """
+        GLPP_LOGGER.info('\n\n>>  test_eager_load\n')
+        pkg = self.package
+        o_plug = GlppPluginFactory.create_plugin('../testing_data/packages/repo_2/package_plugin/descr.yaml')
+        self.assertEqual(o_plug.pending_modules, [])
+        # the package and its core module import each other : the package is executed first
+        expected = [pkg, pkg + '.core', pkg + '.sub', pkg + '.sub.mod', pkg + '.other']
+        self.assertEqual(list(o_plug.load_stats['modules']), expected)
+        self.assertEqual(sort_modules(o_plug.index), expected)
+        self.assertIs(o_plug.get_module(pkg + '.other').mod, o_plug.get_module(pkg + '.sub.mod'))
+
+    def test_directory_cache(self):
+        """
+        We use a copy of testing_data/packages/repo_1 : the test adds a module to the plugin.
+        The packages trees are indexed from cached directory listings, invalidated when a directory changes
+        """
+        GLPP_LOGGER.info('\n\n>>  test_directory_cache\n')
+        pkg = self.package
+        shutil.copytree('../testing_data/packages/repo_1/package_plugin', os.path.join(self.tmp_dir, 'package'))
+        o_plug = GlppPackagePlugin(plugin_desc=os.path.join(self.tmp_dir, 'package', 'descr.yaml'), load=False)
+        o_plug.load(lazy=True)
+        stats = DIRECTORY_CACHE.get_stats()
+        o_plug.load(lazy=True)
+        self.assertEqual(DIRECTORY_CACHE.get_stats()['hits'], stats['hits'] + 2)
+        sub_dir = os.path.join(self.tmp_dir, 'package', pkg, 'sub')
+        with open(os.path.join(sub_dir, 'new.py'), 'w') as fp:
+            fp.write('VALUE = 4\n')
+        os.utime(sub_dir, ns=(0, os.stat(sub_dir).st_mtime_ns + 10 ** 9))
+        o_plug.load(lazy=True)
+        self.assertEqual(DIRECTORY_CACHE.get_stats()['invalidations'], stats['invalidations'] + 1)
+        self.assertEqual(o_plug.get_module(pkg).sub.new.VALUE, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
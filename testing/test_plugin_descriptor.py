@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy plugin descriptor
+"""
+import unittest
+from unittest import mock
+from gulppy.core.glpp_plugin_descriptor import GlppPluginDescriptor
+from gulppy.core.glpp_plugin_factory import GlppPluginFactory
+from gulppy.core import glpp_exceptions
+from gulppy.config import GLPP_LOGGER, init_logger
+init_logger()
+
+
+class TestPluginDescriptor(unittest.TestCase):
+
+    def test_descriptor_fields(self):
+        """
+        The descriptor exposes the description fields and cannot be modified
+        """
+        GLPP_LOGGER.info('\n\n>>  test_descriptor_fields\n')
+        descriptor = GlppPluginDescriptor.from_file("../testing_data/normal/repo_1/plugin_1/descr.yaml")
+        self.assertEqual(descriptor.name, 'my_plugin')
+        self.assertEqual(descriptor.version, 1.0)
+        self.assertEqual(descriptor.mode, 'module')
+        self.assertEqual(descriptor.get_main_modules(), {'my_plugin.plugin_1_main': 'my_plugin/plugin_1_main.py'})
+        self.assertEqual(descriptor.python_path, ('.',))
+        self.assertEqual(descriptor.hacks_init, '@PLUGIN_ROOT@/hacks/sys_context_callback_init.py')
+        self.assertEqual(GlppPluginDescriptor.from_dict(descriptor.plugin_desc, descriptor.to_dict()), descriptor)
+        with self.assertRaises(AttributeError):
+            descriptor.name = 'other'
+        with self.assertRaises(AttributeError):
+            descriptor.other = 'other'
+
+    def test_descriptor_interning(self):
+        """
+        Repeated strings are shared between descriptors
+        """
+        GLPP_LOGGER.info('\n\n>>  test_descriptor_interning\n')
+        d1 = GlppPluginDescriptor.from_file("../testing_data/normal/repo_1/plugin_1/descr.yaml")
+        d2 = GlppPluginDescriptor.from_file("../testing_data/normal/repo_1/plugin_2/descr.yaml")
+        self.assertIs(d1.python_path[0], d2.python_path[0])
+        self.assertIs(d1.main_modules[0][0], d2.main_modules[0][0])
+
+    def test_factory_parses_once(self):
+        """
+        The factory parses the description file once and hands the descriptor to the plugin
+        """
+        GLPP_LOGGER.info('\n\n>>  test_factory_parses_once\n')
+        with mock.patch.object(GlppPluginDescriptor, 'from_file', wraps=GlppPluginDescriptor.from_file) as m:
+            o_plug = GlppPluginFactory.create_plugin(plugin_desc="../testing_data/normal/repo_1/plugin_1/descr.yaml",
+                                                     load=False)
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(o_plug.get_unique_id(), 'my_plugin__1.0')
+
+    def test_missing_property(self):
+        """
+        A description without plugin mode cannot be created by the factory
+        """
+        GLPP_LOGGER.info('\n\n>>  test_missing_property\n')
+        descriptor = GlppPluginDescriptor.from_dict("descr.yaml", {'plugin_name': 'p', 'plugin_version': 1,
+                                                                   'plugin_main_modules': {}, 'python_path': []})
+        with self.assertRaises(glpp_exceptions.PluginDescriptionMissingProperty):
+            GlppPluginFactory.create_plugin(plugin_desc="descr.yaml", load=False, descriptor=descriptor)
+        with self.assertRaises(glpp_exceptions.PluginDescriptionMissingProperty):
+            GlppPluginDescriptor.from_dict("descr.yaml", {'plugin_name': 'p'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy out of process plugin hosts
+"""
+import unittest
+import os
+from unittest import mock
+import numpy as np
+from gulppy.core.glpp_plugin_manager import GlppPluginManager
+from gulppy.core import glpp_plugin_host
+from gulppy.core.glpp_plugin_host import GlppPluginHostPool, encode_shared, decode_shared, _GlppSharedRef
+from gulppy.core import glpp_exceptions
+from gulppy.config import GLPP_LOGGER, init_logger
+init_logger()
+
+
+class TestPluginHost(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        We use testing_data/hosts/repo_1 : its plugin main module functions are called in the hosts
+        """
+        cls.manager = GlppPluginManager()
+        cls.manager.add_repository(repo_path='../testing_data/hosts/repo_1', repo_tag='hosts_repo_1')
+        # the plugin is not loaded in the current process
+        cls.manager.start_plugin_hosts(plugins=[('my_host_plugin', 1.0)], n_hosts=2)
+        cls.plugin = cls.manager.get_hosted_plugin('my_host_plugin', 1.0)
+        cls.main = 'my_host_plugin.plugin_1_main'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.manager.stop_plugin_hosts()
+
+    def test_call(self):
+        """
+        Calls are forwarded to the hosts processes
+        """
+        GLPP_LOGGER.info('\n\n>>  test_call\n')
+        self.assertNotEqual(self.plugin.call(self.main, 'get_pid'), os.getpid())
+        self.assertEqual(self.plugin.call(self.main, 'double', value=21), 42)
+        futures = [self.plugin.call_async(self.main, 'double', i) for i in range(20)]
+        self.assertEqual([f.result() for f in futures], [2 * i for i in range(20)])
+        with self.assertRaises(glpp_exceptions.PluginNotFound):
+            self.manager.get_hosted_plugin('unknown', 1.0)
+
+    def test_shared_memory(self):
+        """
+        Large bytes and numpy arrays are passed through shared memory
+        """
+        GLPP_LOGGER.info('\n\n>>  test_shared_memory\n')
+        encoded = encode_shared((b'x' * 10, [b'y' * 100], {'a': np.arange(100)}), threshold=50)
+        self.assertEqual(encoded[0], b'x' * 10)
+        self.assertIsInstance(encoded[1][0], _GlppSharedRef)
+        self.assertIsInstance(encoded[2]['a'], _GlppSharedRef)
+        decoded = decode_shared(encoded)
+        self.assertEqual(decoded[1], [b'y' * 100])
+        np.testing.assert_array_equal(decoded[2]['a'], np.arange(100))
+
+        array = np.random.rand(300, 400)
+        np.testing.assert_array_equal(self.plugin.call(self.main, 'double', array), array * 2)
+        data = os.urandom(1 << 20)
+        self.assertEqual(self.plugin.call(self.main, 'double', data), data * 2)
+
+    def test_remote_error(self):
+        """
+        Exceptions raised in a host are raised as PluginHostCallError
+        """
+        GLPP_LOGGER.info('\n\n>>  test_remote_error\n')
+        with self.assertRaises(glpp_exceptions.PluginHostCallError) as ctx:
+            self.plugin.call(self.main, 'fail', 'remote failure')
+        self.assertIn('remote failure', str(ctx.exception))
+        with self.assertRaises(glpp_exceptions.PluginHostCallError):
+            self.plugin.call(self.main, 'unknown_function')
+        self.assertEqual(self.plugin.call(self.main, 'double', 1), 2)
+
+    def test_decode_error(self):
+        """
+        A reply that cannot be decoded fails its call only
+        """
+        GLPP_LOGGER.info('\n\n>>  test_decode_error\n')
+        with mock.patch.object(glpp_plugin_host, 'decode_shared', side_effect=MemoryError('decode failure')):
+            with self.assertRaises(MemoryError):
+                self.plugin.call(self.main, 'double', 1)
+        self.assertEqual(self.plugin.call(self.main, 'double', 1), 2)
+
+    def test_crash_and_restart(self):
+        """
+        A crashed host fails its pending calls and is restarted with its plugins
+        """
+        GLPP_LOGGER.info('\n\n>>  test_crash_and_restart\n')
+        pool = GlppPluginHostPool(n_hosts=1)
+        try:
+            uid = self.plugin.get_unique_id()
+            pool.load_plugin(uid, self.manager.host_pool.plugins[uid][0])
+            pid = pool.call(uid, self.main, 'get_pid')
+            with self.assertRaises(glpp_exceptions.PluginHostError):
+                pool.call(uid, self.main, 'crash')
+            pool.hosts[0].process.join(5)
+            self.assertNotEqual(pool.call(uid, self.main, 'get_pid'), pid)
+            self.assertEqual(pool.get_stats()[0]['restarts'], 1)
+            pool.restart_host(0)
+            self.assertEqual(pool.call(uid, self.main, 'double', 2), 4)
+        finally:
+            pool.shutdown()
+
+    def test_stats(self):
+        """
+        Call latency and queue depth are measured per host
+        """
+        GLPP_LOGGER.info('\n\n>>  test_stats\n')
+        for i in range(10):
+            self.plugin.call(self.main, 'double', i)
+        stats = self.manager.get_hosts_stats()
+        self.assertEqual(len(stats), 2)
+        self.assertGreaterEqual(sum(s['calls'] for s in stats), 10)
+        for s in stats:
+            self.assertTrue(s['alive'])
+            self.assertEqual(s['queue_depth'], 0)
+        host_stats = max(stats, key=lambda s: s['calls'])
+        self.assertGreater(host_stats['latency_mean'], 0)
+        self.assertLessEqual(host_stats['latency_p50'], host_stats['latency_max'])
+
+
+if __name__ == '__main__':
+    unittest.main()
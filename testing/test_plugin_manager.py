@@ -7,6 +7,7 @@ import sys
 import traceback
 from gulppy.core.glpp_plugin_factory import MutableModeEnum
 from gulppy.core.glpp_plugin_manager import GlppPluginManager, GlppPluginDuplicatePolicy
+from gulppy.core import glpp_exceptions
 from gulppy.config import GLPP_LOGGER, init_logger
 init_logger()
 
@@ -163,6 +164,39 @@ class TestPluginManager(unittest.TestCase):
                 # All plugins here share the same architecture
                 cplugin.get_module('my_plugin.plugin_1_main').call_lib_function()
 
+    def test_add_repositories_parallel(self):
+        """
+        Adding repositories in bulk on a thread pool gives the same result as adding them one by one
+        """
+        GLPP_LOGGER.info('\n\n>>  test_add_repositories_parallel\n')
+        repos = ["../testing_data/normal/repo_1",
+                 "../testing_data/normal/repo_3",
+                 "../testing_data/normal/repo_1",
+                 "../testing_data/normal/repo_2"]
+        serial = GlppPluginManager()
+        serial_added = [serial.add_repository(repo_path=repo_path, repo_tag="tag-{}".format(i + 1))
+                        for i, repo_path in enumerate(repos)]
+        bulk = GlppPluginManager()
+        bulk_added = bulk.add_repositories(repo_paths=repos,
+                                           repo_tags=["tag-{}".format(i + 1) for i in range(len(repos))],
+                                           max_workers=4)
+        self.assertEqual(bulk_added, serial_added)
+        self.assertEqual([(r.repo_path, r.repo_tag, r.get_list_of_plugins_id()) for r in bulk.repositories],
+                         [(r.repo_path, r.repo_tag, r.get_list_of_plugins_id()) for r in serial.repositories])
+
+    def test_add_repositories_parallel_error(self):
+        """
+        The first faulty repository raises the same error as the serial path, the previous ones being added
+        """
+        GLPP_LOGGER.info('\n\n>>  test_add_repositories_parallel_error\n')
+        repos = ["../testing_data/normal/repo_1",
+                 "../testing_data/anomaly/repo_1",
+                 "../testing_data/normal/repo_3"]
+        pmanager = GlppPluginManager()
+        with self.assertRaises(glpp_exceptions.UnknownPluginMode):
+            pmanager.add_repositories(repo_paths=repos, max_workers=4)
+        self.assertEqual([r.repo_path for r in pmanager.repositories], ["../testing_data/normal/repo_1"])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy hash indexed plugin registry
+"""
+import unittest
+from gulppy.core.glpp_plugin_registry import GlppPluginRegistry
+from gulppy.core.glpp_plugin_factory import MutableModeEnum
+from gulppy.core.glpp_plugin_manager import GlppPluginManager, GlppPluginDuplicatePolicy
+from gulppy.core import glpp_exceptions
+from gulppy.config import GLPP_LOGGER, init_logger
+init_logger()
+
+
+class TestPluginRegistry(unittest.TestCase):
+
+    def test_indexes(self):
+        """
+        The name and repository indexes follow the registry mutations
+        """
+        GLPP_LOGGER.info('\n\n>>  test_indexes\n')
+        registry = GlppPluginRegistry(repo_getter=lambda value: value[1])
+        registry.update({('a', 1.0): ('a1', 'repo_1'), ('a', 2.0): ('a2', 'repo_1')})
+        registry[('b', 1.0)] = ('b1', 'repo_2')
+        self.assertEqual(registry.get_names(), ['a', 'b'])
+        self.assertEqual(registry.get_versions('a'), {1.0: ('a1', 'repo_1'), 2.0: ('a2', 'repo_1')})
+        self.assertEqual(registry.get_keys_by_repository('repo_1'), [('a', 1.0), ('a', 2.0)])
+        # overwriting a key moves it to its new repository
+        registry[('a', 2.0)] = ('a2bis', 'repo_2')
+        self.assertEqual(registry.get_keys_by_repository('repo_1'), [('a', 1.0)])
+        self.assertEqual(registry.get_keys_by_repository('repo_2'), [('b', 1.0), ('a', 2.0)])
+        del registry[('a', 1.0)]
+        self.assertEqual(registry.pop(('b', 1.0)), ('b1', 'repo_2'))
+        self.assertIsNone(registry.pop(('b', 1.0), None))
+        self.assertEqual(registry.get_names(), ['a'])
+        self.assertEqual(registry.get_repositories(), ['repo_2'])
+        self.assertEqual(registry.get_versions('b'), {})
+        copy = registry.copy()
+        registry.clear()
+        self.assertEqual(registry.get_names(), [])
+        self.assertEqual(copy.get_keys_by_repository('repo_2'), [('a', 2.0)])
+        self.assertEqual(dict(copy), {('a', 2.0): ('a2bis', 'repo_2')})
+
+    def test_manager_indexes(self):
+        """
+        The managed plugins are indexed by name and by repository whatever the duplicate policy
+        """
+        GLPP_LOGGER.info('\n\n>>  test_manager_indexes\n')
+        repo_1 = "../testing_data/normal/repo_1"
+        repo_2 = "../testing_data/normal/repo_2"
+        for policy, repo_of_dup in ((GlppPluginDuplicatePolicy.IGNORE, repo_1),
+                                    (GlppPluginDuplicatePolicy.OVERLOAD, repo_2)):
+            pmanager = GlppPluginManager()
+            pmanager.add_repository(repo_path=repo_1, repo_tag="tag-1")
+            self.assertFalse(pmanager.add_repository(repo_path=repo_1, repo_tag="tag-1"))
+            pmanager.add_repository(repo_path=repo_2, repo_tag="tag-2")
+            pmanager.load(plugin_duplicate_policy=policy, mutable_mode=MutableModeEnum.IMMUTABLE)
+            self.assertIs(pmanager.get_repository(repo_2), pmanager.repositories[1])
+            by_name = pmanager.get_plugins_by_name('my_plugin')
+            self.assertEqual(sorted(by_name), [1.0, 2.0])
+            self.assertIs(by_name[1.0], pmanager.get_repository(repo_of_dup).get_plugin_by_name_and_version(
+                'my_plugin', 1.0))
+            self.assertEqual(sorted(pmanager.get_plugins_by_repository(repo_1)),
+                             [('my_plugin', 1.0), ('my_plugin', 2.0)] if repo_of_dup == repo_1
+                             else [('my_plugin', 2.0)])
+            self.assertEqual(len(pmanager.get_plugins_by_repository(repo_2)), 0 if repo_of_dup == repo_1 else 1)
+            self.assertEqual(pmanager.get_plugins_by_name('unknown'), {})
+        with self.assertRaises(glpp_exceptions.RepositoryNotFound):
+            pmanager.get_repository('unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
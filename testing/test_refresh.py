@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy incremental repository refresh
+"""
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from gulppy.core.glpp_abstract_plugin import GlppPluginLoadStatus
+from gulppy.core.glpp_plugin_repository import GlppPluginRepository
+from gulppy.core.glpp_plugin_manager import GlppPluginManager
+from gulppy.core.glpp_plugin_factory import MutableModeEnum
+from gulppy.core.glpp_refresh import GlppRepositoryWatcher, get_files_signature, is_signature_changed, _Inotify
+from gulppy.config import GLPP_LOGGER, init_logger
+from plugin_builder import unique_package_name, write_simple_plugin
+init_logger()
+
+
+class TestRefresh(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.repo_path = os.path.join(self.tmp_dir, 'repo')
+        self.package_a = unique_package_name()
+        self.package_b = unique_package_name()
+        write_simple_plugin(os.path.join(self.repo_path, 'plugin_a'), 'plugin_a', '1.0', self.package_a)
+        write_simple_plugin(os.path.join(self.repo_path, 'plugin_b'), 'plugin_b', '1.0', self.package_b)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def get_value(self, plugin, package):
+        return plugin.get_module('{}.main'.format(package)).get_value()
+
+    def test_files_signature(self):
+        """
+        Signatures detect content changes, with or without hashing
+        """
+        GLPP_LOGGER.info('\n\n>>  test_files_signature\n')
+        lib_file = Path(self.repo_path, 'plugin_a', self.package_a, 'lib.py')
+        for use_hash in (False, True):
+            signature = get_files_signature([lib_file], use_hash=use_hash)
+            self.assertFalse(is_signature_changed(signature, use_hash=use_hash))
+            lib_file.write_text(lib_file.read_text() + '\n')
+            self.assertTrue(is_signature_changed(signature, use_hash=use_hash))
+        lib_file.unlink()
+        self.assertEqual(get_files_signature([lib_file]), {os.fspath(lib_file): None})
+
+    def test_repository_refresh(self):
+        """
+        Only new and changed plugins are loaded, removed plugins are dropped, others are left untouched
+        """
+        GLPP_LOGGER.info('\n\n>>  test_repository_refresh\n')
+        o_repo = GlppPluginRepository(repo_path=self.repo_path, repo_tag="repo")
+        o_repo.load_plugins()
+        plugin_a = o_repo.get_plugin_by_name_and_version('plugin_a', 1.0)
+        plugin_b = o_repo.get_plugin_by_name_and_version('plugin_b', 1.0)
+        self.assertFalse(o_repo.refresh().has_changes())
+
+        # internal module change : only detected through the loaded modules files
+        lib_file = Path(self.repo_path, 'plugin_a', self.package_a, 'lib.py')
+        lib_file.write_text("VALUE = 'version 2'\n")
+        package_c = unique_package_name()
+        write_simple_plugin(os.path.join(self.repo_path, 'plugin_c'), 'plugin_c', '1.0', package_c)
+        shutil.rmtree(os.path.join(self.repo_path, 'plugin_b'))
+
+        result = o_repo.refresh()
+        self.assertEqual(result.get_summary(), {'added': ['plugin_c__1.0'],
+                                                'changed': ['plugin_a__1.0'],
+                                                'removed': ['plugin_b__1.0'],
+                                                'unchanged': []})
+        self.assertIs(result.changed[0][0], plugin_a)
+        self.assertIs(result.removed[0], plugin_b)
+        new_plugin_a = o_repo.get_plugin_by_name_and_version('plugin_a', 1.0)
+        self.assertIsNot(new_plugin_a, plugin_a)
+        self.assertEqual(self.get_value(new_plugin_a, self.package_a), 'version 2')
+        # the outdated and removed plugins are unloaded
+        self.assertEqual(plugin_a.load_status, GlppPluginLoadStatus.NOT_LOADED)
+        self.assertEqual(plugin_b.load_status, GlppPluginLoadStatus.NOT_LOADED)
+        self.assertEqual(self.get_value(o_repo.get_plugin_by_name_and_version('plugin_c', 1.0), package_c), 'v1')
+        self.assertEqual(sorted(o_repo.plugins.keys()), [('plugin_a', 1.0), ('plugin_c', 1.0)])
+
+        result = o_repo.refresh()
+        self.assertFalse(result.has_changes())
+        self.assertIs(o_repo.get_plugin_by_name_and_version('plugin_a', 1.0), new_plugin_a)
+
+    def test_repository_refresh_mutable(self):
+        """
+        A changed plugin loaded in mutable mode is released from sys.modules before being reloaded
+        """
+        GLPP_LOGGER.info('\n\n>>  test_repository_refresh_mutable\n')
+        o_repo = GlppPluginRepository(repo_path=self.repo_path, repo_tag="repo")
+        o_repo.load_plugins(mutable_mode=MutableModeEnum.MUTABLE)
+        self.assertIn('{}.lib'.format(self.package_a), sys.modules)
+        lib_file = Path(self.repo_path, 'plugin_a', self.package_a, 'lib.py')
+        lib_file.write_text("VALUE = 'version 2'\n")
+        result = o_repo.refresh()
+        self.assertEqual(result.get_summary()['changed'], ['plugin_a__1.0'])
+        plugin_a = o_repo.get_plugin_by_name_and_version('plugin_a', 1.0)
+        self.assertEqual(self.get_value(plugin_a, self.package_a), 'version 2')
+        self.assertEqual(sys.modules['{}.lib'.format(self.package_a)].VALUE, 'version 2')
+
+    def test_manager_refresh_and_watcher(self):
+        """
+        The manager refresh updates the managed plugins, the watcher calls it in background
+        """
+        GLPP_LOGGER.info('\n\n>>  test_manager_refresh_and_watcher\n')
+        o_manager = GlppPluginManager()
+        o_manager.add_repository(repo_path=self.repo_path, repo_tag="repo")
+        o_manager.load()
+        self.assertEqual(len(o_manager.get_plugins_as_dict()), 2)
+        package_c = unique_package_name()
+        write_simple_plugin(os.path.join(self.repo_path, 'plugin_c'), 'plugin_c', '1.0', package_c)
+        result = o_manager.refresh()
+        self.assertEqual(result.get_summary()['added'], ['plugin_c__1.0'])
+        self.assertEqual(len(o_manager.get_plugins_as_dict()), 3)
+
+        for use_inotify in (False, True):
+            watcher = o_manager.start_watcher(interval=0.05, use_inotify=use_inotify, debounce=0.05)
+            try:
+                shutil.rmtree(os.path.join(self.repo_path, 'plugin_c'))
+                deadline = time.time() + 10
+                while len(o_manager.get_plugins_as_dict()) != 2 and time.time() < deadline:
+                    time.sleep(0.05)
+                self.assertEqual(len(o_manager.get_plugins_as_dict()), 2)
+                self.assertGreater(watcher.n_refresh, 0)
+            finally:
+                o_manager.stop_watcher()
+            self.assertFalse(watcher.is_alive())
+            write_simple_plugin(os.path.join(self.repo_path, 'plugin_c'), 'plugin_c', '1.0', package_c)
+            o_manager.refresh()
+
+    def test_watcher_stop(self):
+        """
+        A watcher can be stopped while waiting
+        """
+        GLPP_LOGGER.info('\n\n>>  test_watcher_stop\n')
+        watcher = GlppRepositoryWatcher(callback=lambda: None, paths=[self.repo_path], interval=60.0)
+        watcher.start()
+        watcher.stop(timeout=5)
+        self.assertFalse(watcher.is_alive())
+        self.assertEqual(watcher.n_refresh, 0)
+
+    @unittest.skipUnless(_Inotify.is_available(), 'inotify is not available')
+    def test_watcher_watches(self):
+        """
+        The inotify watches follow the directories creations and deletions, excluded directories and symlink loops
+        are not watched
+        """
+        GLPP_LOGGER.info('\n\n>>  test_watcher_watches\n')
+        os.makedirs(os.path.join(self.repo_path, '.git', 'objects'))
+        os.symlink(self.repo_path, os.path.join(self.repo_path, 'plugin_a', 'loop'))
+        refreshed = threading.Event()
+        watcher = GlppRepositoryWatcher(callback=refreshed.set, paths=[self.repo_path], interval=60.0, debounce=0.05)
+
+        def wait_for(condition):
+            deadline = time.time() + 10
+            while not condition() and time.time() < deadline:
+                time.sleep(0.02)
+            return condition()
+
+        watcher.start()
+        try:
+            self.assertTrue(wait_for(lambda: len(watcher.get_watched_dirs()) > 0))
+            watched = set(watcher.get_watched_dirs())
+            self.assertIn(os.path.join(self.repo_path, 'plugin_a', self.package_a), watched)
+            self.assertFalse(any('.git' in p or 'loop' in p for p in watched))
+
+            new_dir = os.path.join(self.repo_path, 'plugin_c', 'sub')
+            os.makedirs(new_dir)
+            self.assertTrue(wait_for(lambda: new_dir in watcher.get_watched_dirs()))
+            self.assertTrue(refreshed.wait(10))
+            refreshed.clear()
+            # an event in the new directory triggers a refresh
+            Path(new_dir, 'descr.yaml').write_text('---\n')
+            self.assertTrue(refreshed.wait(10))
+            shutil.rmtree(os.path.join(self.repo_path, 'plugin_c'))
+            self.assertTrue(wait_for(lambda: os.path.dirname(new_dir) not in watcher.get_watched_dirs()))
+            self.assertNotIn(new_dir, watcher.get_watched_dirs())
+        finally:
+            watcher.stop(timeout=5)
+        self.assertFalse(watcher.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
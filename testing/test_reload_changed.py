@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy plugins fine-grained reload
+"""
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+from gulppy.core.glpp_plugin_factory import GlppPluginFactory, MutableModeEnum
+from gulppy.config import GLPP_LOGGER, init_logger
+from plugin_builder import unique_package_name, write_plugin
+init_logger()
+
+
+class TestReloadChanged(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.package = unique_package_name()
+        self.main = '{}.main'.format(self.package)
+        self.lib = '{}.lib'.format(self.package)
+        self.other = '{}.other'.format(self.package)
+        self.plugin_root = os.path.join(self.tmp_dir, 'plugin')
+        self.desc_file = write_plugin(self.plugin_root, 'reload_plugin', '1.0',
+                                      main_modules={self.main: '{}/main.py'.format(self.package),
+                                                    self.other: '{}/other.py'.format(self.package)},
+                                      files={'{}/__init__.py'.format(self.package): '',
+                                             '{}/lib.py'.format(self.package): 'VALUE = 1\n',
+                                             '{}/main.py'.format(self.package):
+                                                 'from {} import lib\n\n'
+                                                 'def get_value():\n    return lib.VALUE\n'.format(self.package),
+                                             '{}/other.py'.format(self.package): 'VALUE = 10\n'})
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+        for k in [k for k in sys.modules if k.startswith(self.package)]:
+            del sys.modules[k]
+
+    def edit_lib(self, value):
+        lib_file = os.path.join(self.plugin_root, self.package, 'lib.py')
+        with open(lib_file, 'w') as fp:
+            fp.write('VALUE = {}\n'.format(value))
+        os.utime(lib_file, ns=(0, os.stat(lib_file).st_mtime_ns + 10 ** 9))
+
+    def check_reload(self, o_plug):
+        package = o_plug.get_module(self.package)
+        other = o_plug.get_module(self.other)
+        self.assertEqual(o_plug.module_dependencies[self.main], [self.package, self.lib])
+        self.assertEqual(o_plug.reload_changed(), [])
+        self.edit_lib(2)
+        self.assertEqual(o_plug.reload_changed(), [self.lib, self.main])
+        self.assertEqual(o_plug.get_module(self.main).get_value(), 2)
+        self.assertIs(o_plug.get_module(self.lib), o_plug.get_module(self.main).lib)
+        # the modules that do not depend on the changed file are kept
+        self.assertIs(o_plug.get_module(self.package), package)
+        self.assertIs(o_plug.get_module(self.other), other)
+        self.assertIs(package.lib, o_plug.get_module(self.lib))
+        self.assertEqual(o_plug.reload_changed(), [])
+
+    def test_reload_immutable(self):
+        """
+        Only the changed module and its dependents are executed again
+        """
+        GLPP_LOGGER.info('\n\n>>  test_reload_immutable\n')
+        o_plug = GlppPluginFactory.create_plugin(self.desc_file, mutable_mode=MutableModeEnum.IMMUTABLE)
+        self.check_reload(o_plug)
+        self.assertEqual([k for k in sys.modules if k.startswith(self.package)], [])
+
+    def test_reload_mutable(self):
+        """
+        In mutable mode, the sys.modules entries are replaced
+        """
+        GLPP_LOGGER.info('\n\n>>  test_reload_mutable\n')
+        o_plug = GlppPluginFactory.create_plugin(self.desc_file, mutable_mode=MutableModeEnum.MUTABLE)
+        self.check_reload(o_plug)
+        self.assertIs(sys.modules[self.lib], o_plug.get_module(self.lib))
+        self.assertIs(sys.modules[self.main], o_plug.get_module(self.main))
+
+    def test_reload_static_dependents(self):
+        """
+        A module importing an already loaded module is found as a dependent from its source
+        """
+        GLPP_LOGGER.info('\n\n>>  test_reload_static_dependents\n')
+        o_plug = GlppPluginFactory.create_plugin(self.desc_file, mutable_mode=MutableModeEnum.IMMUTABLE)
+        o_plug.load(batch=True)
+        with open(os.path.join(self.plugin_root, self.package, 'other.py'), 'w') as fp:
+            fp.write('from . import lib\nVALUE = lib.VALUE\n')
+        self.assertEqual(o_plug.reload_changed(), [self.other])
+        self.assertEqual(o_plug.module_dependencies[self.other], [])
+        self.edit_lib(3)
+        self.assertEqual(o_plug.reload_changed(), [self.lib, self.main, self.other])
+        self.assertEqual(o_plug.get_module(self.other).VALUE, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy plugins unload
+"""
+import unittest
+import gc
+import linecache
+import os
+import sys
+import weakref
+from gulppy.core.glpp_abstract_plugin import GlppPluginLoadStatus
+from gulppy.core.glpp_plugin_factory import GlppPluginFactory, MutableModeEnum
+from gulppy.core.glpp_plugin_manager import GlppPluginManager
+from gulppy.core import glpp_exceptions
+from gulppy.config import GLPP_LOGGER, init_logger
+init_logger()
+
+
+class TestUnload(unittest.TestCase):
+
+    def setUp(self):
+        """
+        We use testing_data/unload/repo_1 : the main module of unload_plugin imports a lib module importing json
+        """
+        self.package = 'my_unload_plugin'
+        self.main = '{}.main'.format(self.package)
+        self.plugin_root = os.path.realpath('../testing_data/unload/repo_1/unload_plugin')
+        self.desc_file = os.path.join(self.plugin_root, 'descr.yaml')
+
+    def get_plugin_entries(self):
+        return [k for k in sys.modules if k.startswith(self.package)]
+
+    def test_unload_immutable(self):
+        """
+        The unloaded modules are reclaimed and the plugin can be loaded again
+        """
+        GLPP_LOGGER.info('\n\n>>  test_unload_immutable\n')
+        o_plug = GlppPluginFactory.create_plugin(self.desc_file, mutable_mode=MutableModeEnum.IMMUTABLE)
+        ref = weakref.ref(o_plug.get_module(self.main))
+        self.assertEqual(len(o_plug.get_module(self.main).get_data()), 1000)
+        report = o_plug.unload()
+        self.assertEqual(sorted(report['released']),
+                         sorted([self.package, self.package + '.lib', self.main]))
+        self.assertEqual(report['sys_modules_removed'], [])
+        self.assertEqual(report['leaked'], [])
+        self.assertIsNone(ref())
+        self.assertEqual(o_plug.load_status, GlppPluginLoadStatus.NOT_LOADED)
+        with self.assertRaises(glpp_exceptions.UnknownModuleError):
+            o_plug.get_module(self.main)
+        # third party modules are not released
+        self.assertIn('json', sys.modules)
+
+        o_plug.load()
+        self.assertEqual(len(o_plug.get_module(self.main).get_data()), 1000)
+        o_plug.unload()
+
+    def test_unload_mutable(self):
+        """
+        The mutable mode leftovers are removed from sys.modules, sys.path and the importer caches
+        """
+        GLPP_LOGGER.info('\n\n>>  test_unload_mutable\n')
+        o_plug = GlppPluginFactory.create_plugin(self.desc_file, mutable_mode=MutableModeEnum.MUTABLE)
+        linecache.getlines(os.path.join(self.plugin_root, self.package, 'lib.py'))
+        self.assertEqual(len(self.get_plugin_entries()), 3)
+        plugin_path = os.fspath(o_plug.python_path[0].resolve())
+        self.assertIn(plugin_path, sys.path)
+        report = o_plug.unload()
+        self.assertEqual(sorted(report['sys_modules_removed']),
+                         sorted([self.package, self.package + '.lib', self.main]))
+        self.assertEqual(report['leaked'], [])
+        self.assertEqual(self.get_plugin_entries(), [])
+        self.assertNotIn(plugin_path, sys.path)
+        self.assertFalse(any(isinstance(p, str) and p.startswith(self.plugin_root) for p in sys.path_importer_cache))
+        self.assertFalse(any(f.startswith(self.plugin_root) for f in linecache.cache))
+
+    def test_unload_mutable_leftovers_only(self):
+        """
+        The sys.path entries and the modules already there before the mutable load are left at unload
+        """
+        GLPP_LOGGER.info('\n\n>>  test_unload_mutable_leftovers_only\n')
+        plugin_path = os.path.realpath(self.plugin_root)
+        sys.path.append(plugin_path)
+        try:
+            lib = __import__(self.package + '.lib', fromlist=['lib'])
+            o_plug = GlppPluginFactory.create_plugin(self.desc_file, mutable_mode=MutableModeEnum.MUTABLE)
+            self.assertIs(o_plug.get_module(self.main).lib, lib)
+            report = o_plug.unload(check_leaks=False)
+            self.assertEqual(report['sys_modules_removed'], [self.main])
+            self.assertEqual(sys.path.count(plugin_path), 1)
+            self.assertIs(sys.modules[self.package + '.lib'], lib)
+        finally:
+            sys.path.remove(plugin_path)
+            for k in self.get_plugin_entries():
+                del sys.modules[k]
+
+    def test_leak_report(self):
+        """
+        A module still referenced after unload is reported as leaked
+        """
+        GLPP_LOGGER.info('\n\n>>  test_leak_report\n')
+        o_plug = GlppPluginFactory.create_plugin(self.desc_file, mutable_mode=MutableModeEnum.IMMUTABLE)
+        holder = {'lib': o_plug.get_module(self.package + '.lib')}
+        report = o_plug.unload()
+        self.assertEqual([leak['name'] for leak in report['leaked']], [self.package + '.lib'])
+        self.assertIn('dict', report['leaked'][0]['referrers'])
+        del holder
+        gc.collect()
+
+    def test_manager_unload(self):
+        """
+        The manager drops an unloaded plugin from the managed plugins and from its repository
+        """
+        GLPP_LOGGER.info('\n\n>>  test_manager_unload\n')
+        pmanager = GlppPluginManager()
+        pmanager.add_repository(repo_path='../testing_data/unload/repo_1', repo_tag='tag')
+        pmanager.load(mutable_mode=MutableModeEnum.IMMUTABLE)
+        ref = weakref.ref(pmanager.get_plugin_by_name_and_version('unload_plugin', 1.0).get_module(self.main))
+        report = pmanager.unload_plugin('unload_plugin', 1.0)
+        self.assertEqual(report['leaked'], [])
+        self.assertIsNone(ref())
+        self.assertNotIn(('unload_plugin', 1.0), pmanager.plugins)
+        self.assertEqual(pmanager.get_plugins_by_name('unload_plugin'), {})
+        self.assertNotIn(('unload_plugin', 1.0), pmanager.repositories[0].plugins)
+        with self.assertRaises(glpp_exceptions.PluginNotFound):
+            pmanager.unload_plugin('unload_plugin', 1.0)
+
+        pmanager.load(mutable_mode=MutableModeEnum.IMMUTABLE)
+        self.assertIn(('unload_plugin', 1.0), pmanager.plugins)
+
+
+if __name__ == '__main__':
+    unittest.main()
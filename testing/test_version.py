@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Test for the Gulppy plugin versions resolution
+"""
+import unittest
+from gulppy.core.glpp_version import GlppVersionResolver, get_version_key, parse_constraint
+from gulppy.core.glpp_plugin_registry import GlppPluginRegistry
+from gulppy.core.glpp_plugin_factory import MutableModeEnum
+from gulppy.core.glpp_plugin_manager import GlppPluginManager
+from gulppy.core.glpp_plugin_repository import GlppPluginRepository
+from gulppy.core import glpp_exceptions
+from gulppy.config import GLPP_LOGGER, init_logger
+init_logger()
+
+
+class TestVersion(unittest.TestCase):
+
+    def test_version_key(self):
+        """
+        Versions are normalized and ordered
+        """
+        GLPP_LOGGER.info('\n\n>>  test_version_key\n')
+        self.assertEqual(get_version_key(1.0), get_version_key('1'))
+        self.assertEqual(get_version_key('v1.2.0'), get_version_key('1.2'))
+        ordered = ['nightly', '0.9', '1.0.dev1', '1.0a1', '1.0b2', '1.0rc1', '1.0', '1.0.post1', '1.2', '1.10', '2']
+        self.assertEqual(sorted(ordered[::-1], key=get_version_key), ordered)
+        with self.assertRaises(glpp_exceptions.PluginVersionConstraintError):
+            parse_constraint('>=1.0,<<2')
+        with self.assertRaises(glpp_exceptions.PluginVersionConstraintError):
+            parse_constraint('~=1')
+        with self.assertRaises(glpp_exceptions.PluginVersionConstraintError):
+            parse_constraint('>=nightly')
+
+    def test_resolve(self):
+        """
+        Constraints are resolved to the newest matching version
+        """
+        GLPP_LOGGER.info('\n\n>>  test_resolve\n')
+        registry = GlppPluginRegistry((('p', v), 'p-{}'.format(v)) for v in
+                                      (1.0, '1.1', '1.2.3', '1.3rc1', 2.0, '2.1', 'nightly'))
+        resolver = GlppVersionResolver(get_registry=lambda: registry)
+        for constraint, expected in ((None, '2.1'),
+                                     ('', '2.1'),
+                                     ('>=1.2,<2', '1.2.3'),
+                                     ('<2', '1.2.3'),
+                                     ('<=2', 2.0),
+                                     ('>1.1,<1.2.3', None),
+                                     ('==1', 1.0),
+                                     ('1.1.0', '1.1'),
+                                     ('==1.*', '1.2.3'),
+                                     ('==1.*,!=1.2.3', '1.1'),
+                                     ('!=2.*', '1.2.3'),
+                                     ('~=1.1', '1.2.3'),
+                                     ('~=1.1.0', '1.1'),
+                                     ('>=1.3', '2.1'),
+                                     ('>1.2.3,<2', '1.3rc1'),
+                                     ('nightly', 'nightly'),
+                                     ('>3', None)):
+            resolved = resolver.resolve('p', constraint)
+            self.assertEqual(resolved[0] if resolved is not None else None, expected, constraint)
+        self.assertEqual(resolver.resolve('p', '<2', prerelease=True), ('1.3rc1', 'p-1.3rc1'))
+        self.assertIsNone(resolver.resolve('unknown'))
+        self.assertEqual(resolver.get_versions('p'), ['nightly', 1.0, '1.1', '1.2.3', '1.3rc1', 2.0, '2.1'])
+        # the caches follow the registry changes
+        registry[('p', '3.0')] = 'p-3.0'
+        self.assertEqual(resolver.resolve('p'), ('3.0', 'p-3.0'))
+        del registry[('p', '3.0')]
+        self.assertEqual(resolver.resolve('p'), ('2.1', 'p-2.1'))
+        registry = GlppPluginRegistry({('p', 0.1): 'p-0.1'})
+        self.assertEqual(resolver.resolve('p'), (0.1, 'p-0.1'))
+
+    def test_manager_and_repository(self):
+        """
+        The managers and the repositories resolve their plugins by constraint
+        """
+        GLPP_LOGGER.info('\n\n>>  test_manager_and_repository\n')
+        pmanager = GlppPluginManager()
+        pmanager.add_repository(repo_path="../testing_data/normal/repo_1", repo_tag="tag-1")
+        pmanager.load(mutable_mode=MutableModeEnum.IMMUTABLE)
+        self.assertIs(pmanager.get_latest('my_plugin'), pmanager.get_plugin_by_name_and_version('my_plugin', 2.0))
+        self.assertIs(pmanager.get_plugin('my_plugin', '<2'),
+                      pmanager.get_plugin_by_name_and_version('my_plugin', 1.0))
+        self.assertEqual(pmanager.get_plugin_versions('my_plugin'), [1.0, 2.0])
+        with self.assertRaises(glpp_exceptions.PluginNotFound):
+            pmanager.get_plugin('my_plugin', '>=3')
+        o_repo = GlppPluginRepository(repo_path="../testing_data/normal/repo_1", repo_tag="tag-1")
+        with self.assertRaises(glpp_exceptions.PluginNotExistsInRepository):
+            o_repo.get_latest('my_plugin')
+        o_repo.load_plugins(mutable_mode=MutableModeEnum.IMMUTABLE)
+        self.assertEqual(o_repo.get_plugin('my_plugin', '~=1.0').version, 1.0)
+        self.assertEqual(o_repo.get_latest('my_plugin').version, 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
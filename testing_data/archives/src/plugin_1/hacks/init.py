@@ -0,0 +1,7 @@
+from gulppy.core import glpp_module_loader
+
+
+def sys_context_callback_init(**kwargs):
+    glpp_module_loader.sys_context_callback_init(**kwargs)
+    import os
+    os.environ['GLPP_TEST_ARCHIVE_HACK'] = '1'
@@ -0,0 +1,5 @@
+from . import lib
+
+
+def get_value():
+    return lib.VALUE
@@ -0,0 +1,2 @@
+import glpp_batch_counter
+glpp_batch_counter.calls.append(__name__)
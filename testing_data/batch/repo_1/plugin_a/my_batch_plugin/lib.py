@@ -0,0 +1,3 @@
+import glpp_batch_counter
+glpp_batch_counter.calls.append(__name__)
+VALUE = 'a'
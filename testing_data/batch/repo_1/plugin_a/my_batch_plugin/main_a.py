@@ -0,0 +1,2 @@
+import my_batch_external
+from my_batch_plugin import lib
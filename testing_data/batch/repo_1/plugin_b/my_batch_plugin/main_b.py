@@ -0,0 +1 @@
+from my_batch_plugin import lib
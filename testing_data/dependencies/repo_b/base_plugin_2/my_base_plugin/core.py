@@ -0,0 +1,2 @@
+VERSION = '2.0'
+TOKEN = object()
@@ -0,0 +1,5 @@
+from my_base_plugin import core
+
+
+def get_core():
+    return core
@@ -0,0 +1,3 @@
+import sys
+from . import lib
+SYS_PATH = list(sys.path)
@@ -0,0 +1,18 @@
+import importlib
+import threading
+RESULT = {}
+
+
+def _host_import():
+    RESULT['host'] = importlib.import_module('glpp_finder_host')
+    try:
+        importlib.import_module('my_finder_helper_plugin')
+    except ImportError:
+        RESULT['plugin_visible'] = False
+    else:
+        RESULT['plugin_visible'] = True
+
+
+thread = threading.Thread(target=_host_import)
+thread.start()
+thread.join()
@@ -0,0 +1 @@
+import my_finder_helper
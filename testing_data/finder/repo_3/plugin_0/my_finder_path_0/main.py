@@ -0,0 +1,7 @@
+import os
+import sys
+import threading
+PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'added')
+thread = threading.Thread(target=sys.path.append, args=(PATH,))
+thread.start()
+thread.join()
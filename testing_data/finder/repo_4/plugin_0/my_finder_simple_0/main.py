@@ -0,0 +1,5 @@
+from my_finder_simple_0 import lib
+
+
+def get_value():
+    return lib.VALUE
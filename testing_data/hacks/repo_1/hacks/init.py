@@ -0,0 +1,4 @@
+
+def sys_context_callback_init(**kwargs):
+    from gulppy.core import glpp_module_loader
+    glpp_module_loader.sys_context_callback_init(**kwargs)
@@ -0,0 +1 @@
+VALUE = 'v1'
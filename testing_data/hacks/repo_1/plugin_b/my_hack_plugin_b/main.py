@@ -0,0 +1,5 @@
+from my_hack_plugin_b import lib
+
+
+def get_value():
+    return lib.VALUE
@@ -0,0 +1,17 @@
+import os
+
+
+def get_pid():
+    return os.getpid()
+
+
+def double(value):
+    return value * 2
+
+
+def fail(message):
+    raise ValueError(message)
+
+
+def crash():
+    os._exit(3)
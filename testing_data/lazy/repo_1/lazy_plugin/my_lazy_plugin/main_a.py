@@ -0,0 +1,2 @@
+from my_lazy_plugin import lib
+VALUE = lib.VALUE
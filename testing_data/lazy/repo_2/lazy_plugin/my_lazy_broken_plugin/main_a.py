@@ -0,0 +1,2 @@
+from my_lazy_broken_plugin import lib
+VALUE = lib.VALUE
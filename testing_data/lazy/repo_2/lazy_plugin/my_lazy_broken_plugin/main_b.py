@@ -0,0 +1 @@
+raise ImportError("broken")
@@ -0,0 +1 @@
+from my_ns_base import core
@@ -0,0 +1,8 @@
+import my_ns_plugin.sub.lib
+from my_ns_plugin.sub import lib as from_lib
+from .sub import lib as relative_lib
+
+
+def get_values():
+    import my_ns_plugin.sub.lib as deferred_lib
+    return my_ns_plugin.sub.lib.VALUE, from_lib.VALUE, relative_lib.VALUE, deferred_lib.VALUE
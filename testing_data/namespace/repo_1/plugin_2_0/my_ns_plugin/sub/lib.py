@@ -0,0 +1 @@
+VALUE = '2.0'
@@ -0,0 +1 @@
+VALUE = '3.0'
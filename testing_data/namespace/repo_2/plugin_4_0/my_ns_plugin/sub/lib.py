@@ -0,0 +1 @@
+VALUE = '4.0'
@@ -0,0 +1,5 @@
+from gulppy.config import GLPP_LOGGER
+
+
+def lib_function():
+    GLPP_LOGGER.info("THIS IS REPO_3 / PLUGIN_2 LIB FUNCTION")
@@ -0,0 +1,2 @@
+from .sub import mod
+VALUE = mod.VALUE + 1
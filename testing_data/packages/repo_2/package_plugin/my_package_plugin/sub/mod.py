@@ -0,0 +1,2 @@
+from .. import core
+VALUE = core.VALUE + 1
@@ -0,0 +1,2 @@
+import os
+DATA = 1
@@ -0,0 +1 @@
+from my_profiled_plugin import lib
@@ -0,0 +1 @@
+from my_stats_plugin import lib
@@ -0,0 +1 @@
+DATA = list(range(10000))
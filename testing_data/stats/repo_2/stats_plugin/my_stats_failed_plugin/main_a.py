@@ -0,0 +1 @@
+from my_stats_failed_plugin import lib
@@ -0,0 +1,3 @@
+from my_ctx_delete import lib
+import sys
+del sys.modules['glpp_dummy_module']
@@ -0,0 +1,4 @@
+from my_ctx_json import lib
+import sys
+import types
+sys.modules['json'] = types.ModuleType('fakejson')
@@ -0,0 +1 @@
+from my_ctx_plain import lib
@@ -0,0 +1,2 @@
+import json
+DATA = list(range(1000))
@@ -0,0 +1,5 @@
+from my_unload_plugin import lib
+
+
+def get_data():
+    return lib.DATA